@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+YouTube Downloader v1.3.0 - Timestamp Parser Benchmark
+
+Benchmark of chapter/timestamp extraction on very long descriptions.
+Part of the modular architecture introduced in v1.2.0.
+
+Features:
+- Synthetic descriptions (prose mixed with chapter lines in several styles)
+- Legacy six-pass re.findall parser vs the single-pass line parser
+- Scaling check: time per line should stay flat as descriptions grow
+
+Usage:
+    python benchmarks/bench_timestamps.py [--lines 20000] [--repeat 5]
+
+Architecture: Dual-Repository Workflow v1.2.0
+"""
+
+import argparse
+import random
+import re
+import sys
+import os
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from core.utils import extract_timestamps, is_valid_timestamp, timestamp_to_seconds
+
+LINE_STYLES = (
+    '{t} - {text}',
+    '{t} {text}',
+    '[{t}] {text}',
+    '({t}) {text}',
+    '{text} - {t}',
+    '- {t} {text}',
+)
+PROSE = "Thanks for watching, remember to subscribe: links and sponsors are listed below."
+
+
+def legacy_extract_timestamps(description):
+    """Dotychczasowy parser (sześć przejść re.findall) - punkt odniesienia"""
+    timestamps = []
+    patterns = [
+        r'(\d{1,2}:\d{2})\s*[-–]\s*(.+)',
+        r'(\d{1,2}:\d{2})\s+(.+)',
+        r'(\d{1,2}:\d{2}:\d{2})\s*[-–]\s*(.+)',
+        r'(\d{1,2}:\d{2}:\d{2})\s+(.+)',
+        r'\((\d{1,2}:\d{2})\)\s+(.+)',
+        r'\[(\d{1,2}:\d{2})\]\s+(.+)',
+    ]
+    for pattern in patterns:
+        for time_str, text in re.findall(pattern, description, re.IGNORECASE):
+            if is_valid_timestamp(time_str):
+                timestamps.append({'time': time_str, 'description': text.strip(),
+                                   'seconds': timestamp_to_seconds(time_str)})
+    unique, seen = [], set()
+    for ts in timestamps:
+        if ts['time'] not in seen:
+            unique.append(ts)
+            seen.add(ts['time'])
+    unique.sort(key=lambda x: x['seconds'] or 0)
+    return unique
+
+
+def make_description(lines, seed=1):
+    """Opis z rozdziałami co ~3 linie prozy"""
+    rng = random.Random(seed)
+    out = []
+    for i in range(lines):
+        if i % 4:
+            out.append(PROSE)
+        else:
+            seconds = i * 7
+            t = f"{seconds // 3600}:{seconds // 60 % 60:02d}:{seconds % 60:02d}" if seconds >= 3600 \
+                else f"{seconds // 60}:{seconds % 60:02d}"
+            out.append(rng.choice(LINE_STYLES).format(t=t, text=f"Chapter {i}"))
+    return '\n'.join(out)
+
+
+def timed(func, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Timestamp parser benchmark")
+    parser.add_argument('--lines', type=int, default=20000, help="Liczba linii najdłuższego opisu")
+    parser.add_argument('--repeat', type=int, default=5, help="Powtórzenia (liczy się najlepszy czas)")
+    args = parser.parse_args()
+
+    print(f"📊 Python {sys.version.split()[0]}")
+    print(f"{'lines':>8} {'chars':>10} {'legacy':>10} {'single-pass':>12} {'µs/line':>8} {'found':>6}")
+    lines = max(args.lines // 16, 1)
+    while lines <= args.lines:
+        description = make_description(lines)
+        legacy, _ = timed(lambda: legacy_extract_timestamps(description), args.repeat)
+        current, found = timed(lambda: extract_timestamps(description), args.repeat)
+        print(f"{lines:>8} {len(description):>10} {legacy * 1000:>8.1f}ms {current * 1000:>10.1f}ms "
+              f"{current / lines * 1e6:>8.2f} {len(found):>6}")
+        lines *= 2
+
+
+if __name__ == '__main__':
+    main()
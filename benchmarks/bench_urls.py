@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+YouTube Downloader v1.3.0 - URL Classifier Benchmark
+
+Microbenchmark of URL validation and bulk normalisation.
+Part of the modular architecture introduced in v1.2.0.
+
+Features:
+- Synthetic URL dump (mixed forms, duplicates, invalid lines)
+- Legacy per-URL checks (validate + playlist + ID, as the batch CLI and
+  journal called them) vs one pass of the precompiled classifier
+- Throughput of normalize_youtube_urls() on a whole dump
+
+Usage:
+    python benchmarks/bench_urls.py [--count 1000000]
+
+Architecture: Dual-Repository Workflow v1.2.0
+"""
+
+import argparse
+import random
+import re
+import string
+import sys
+import os
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from core.utils import classify_youtube_url, normalize_youtube_urls
+
+URL_FORMS = (
+    'https://www.youtube.com/watch?v={id}',
+    'https://www.youtube.com/watch?feature=share&v={id}&t=1m5s',
+    'https://youtu.be/{id}?si=abcdef',
+    'https://m.youtube.com/shorts/{id}',
+    'https://music.youtube.com/watch?v={id}&list=RDAMVM{id}',
+    'https://www.youtube.com/embed/{id}',
+    'https://www.youtube.com/playlist?list=PL{id}',
+    'https://example.com/watch?v={id}',
+)
+
+# Dotychczasowa walidacja - punkt odniesienia
+LEGACY_PATTERNS = [
+    r'(?:https?://)?(?:www\.)?youtube\.com/watch\?v=[\w-]+',
+    r'(?:https?://)?(?:www\.)?youtu\.be/[\w-]+',
+    r'(?:https?://)?(?:www\.)?youtube\.com/embed/[\w-]+',
+    r'(?:https?://)?(?:www\.)?youtube\.com/v/[\w-]+',
+]
+LEGACY_PLAYLIST_PATTERNS = [
+    r'(?:https?://)?(?:www\.|m\.|music\.)?youtube\.com/playlist\?(?:.*&)?list=[\w-]+',
+    r'(?:https?://)?(?:www\.|m\.)?youtube\.com/(?:channel/|c/|user/|@)[\w.-]+',
+]
+LEGACY_ID_PATTERN = r'(?:youtube\.com/watch\?v=|youtu\.be/|youtube\.com/embed/|youtube\.com/v/)([\w-]+)'
+
+
+def legacy_validate(url):
+    for pattern in LEGACY_PATTERNS:
+        if re.match(pattern, url):
+            return True
+    return False
+
+
+def legacy_classify(url):
+    """Dotychczasowy zestaw wywołań na jeden URL"""
+    if not legacy_validate(url):
+        return None
+    playlist = any(re.match(pattern, url) for pattern in LEGACY_PLAYLIST_PATTERNS)
+    match = re.search(LEGACY_ID_PATTERN, url)
+    return playlist, match.group(1) if match else None
+
+
+def make_dump(count, unique_ratio=0.3, seed=1):
+    """Syntetyczny zrzut URL z powtórzeniami"""
+    rng = random.Random(seed)
+    alphabet = string.ascii_letters + string.digits + '-_'
+    ids = [''.join(rng.choice(alphabet) for _ in range(11)) for _ in range(max(1, int(count * unique_ratio)))]
+    return [rng.choice(URL_FORMS).format(id=rng.choice(ids)) for _ in range(count)]
+
+
+def timed(label, count, func):
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<34} {elapsed:8.3f} s  {count / elapsed / 1e6:6.2f} M URL/s")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="URL classifier microbenchmark")
+    parser.add_argument('--count', type=int, default=200000, help="Liczba URL w zrzucie")
+    args = parser.parse_args()
+
+    urls = make_dump(args.count)
+    print(f"📊 {args.count} URL, Python {sys.version.split()[0]}")
+    timed("legacy validate (4x re.match)", args.count, lambda: [legacy_validate(u) for u in urls])
+    timed("legacy validate + playlist + ID", args.count, lambda: [legacy_classify(u) for u in urls])
+    timed("classify_youtube_url", args.count, lambda: [classify_youtube_url(u) for u in urls])
+    unique = timed("normalize_youtube_urls (dedupe)", args.count, lambda: list(normalize_youtube_urls(urls)))
+    print(f"✅ Unikalnych: {len(unique)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+YouTube Downloader v1.3.0 - Fake YouTube Backend
+
+Local HTTP server with synthetic media and YouTube-like info dicts for offline runs.
+Part of the modular architecture introduced in v1.2.0.
+
+Features:
+- Deterministic synthetic media of any size (no files on disk)
+- HTTP Range support (resume, chunked and multi-connection downloads)
+- Progressive and DASH (video-only / audio-only) formats in the info dict
+- Full YouTube-like format ladder (100+ formats) for format selection benchmarks
+- Signed-looking stream URLs with `expire`, so cached info dicts are reused
+
+Architecture: Dual-Repository Workflow v1.2.0
+"""
+
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Blok wzorca danych (64 KiB) - treść pliku to jego powtórzenia
+_BLOCK = bytes(range(256)) * 256
+_MEDIA_PATH_RE = re.compile(r'^/media/(?P<name>[\w-]+)/(?P<size>\d+)\.(?P<ext>\w+)')
+_RANGE_RE = re.compile(r'bytes=(\d*)-(\d*)')
+
+CONTENT_TYPES = {'mp4': 'video/mp4', 'm4a': 'audio/mp4', 'webm': 'video/webm'}
+
+# Formaty jak w odpowiedzi YouTube: progresywny 360p, DASH 1080p/720p i audio
+FORMATS = (
+    {'format_id': '18', 'ext': 'mp4', 'width': 640, 'height': 360, 'vcodec': 'avc1.42001E',
+     'acodec': 'mp4a.40.2', 'tbr': 500, 'share': 1.0},
+    {'format_id': '137', 'ext': 'mp4', 'width': 1920, 'height': 1080, 'vcodec': 'avc1.640028',
+     'acodec': 'none', 'tbr': 4000, 'share': 0.85},
+    {'format_id': '136', 'ext': 'mp4', 'width': 1280, 'height': 720, 'vcodec': 'avc1.4d401f',
+     'acodec': 'none', 'tbr': 2000, 'share': 0.5},
+    {'format_id': '140', 'ext': 'm4a', 'vcodec': 'none', 'acodec': 'mp4a.40.2', 'abr': 128, 'tbr': 128,
+     'share': 0.15},
+)
+
+
+
+def format_ladder():
+    """
+    Drabinka formatów jak w pełnej odpowiedzi YouTube (ponad 100 pozycji):
+    wideo 144p-2160p w avc1/vp9/av01, 30 i 60 fps, https i HLS, ścieżki
+    audio w kilku językach oraz formaty progresywne.
+    """
+    specs = []
+    codecs = (('h', 'avc1.640028', 'mp4', 1.0), ('v', 'vp09.00.40.08', 'webm', 0.8), ('a', 'av01.0.08M.08', 'mp4', 0.6))
+    for height in (144, 240, 360, 480, 720, 1080, 1440, 2160):
+        width = height * 16 // 9
+        for tag, vcodec, ext, factor in codecs:
+            for fps in ((30, 60) if height >= 720 else (30,)):
+                for protocol, suffix in (('https', ''), ('m3u8_native', '-hls')):
+                    tbr = round(height * 2.5 * factor * fps / 30, 1)
+                    specs.append({'format_id': f"{height}{tag}{fps}{suffix}", 'ext': ext,
+                                  'width': width, 'height': height, 'fps': fps, 'vcodec': vcodec,
+                                  'acodec': 'none', 'tbr': tbr, 'vbr': tbr, 'protocol': protocol,
+                                  'share': tbr / 10000})
+    for language in ('en', 'pl', 'de', 'fr', 'es', 'ja'):
+        for acodec, ext, abr in (('mp4a.40.5', 'm4a', 48), ('mp4a.40.2', 'm4a', 128), ('opus', 'webm', 50),
+                                 ('opus', 'webm', 70), ('opus', 'webm', 160)):
+            specs.append({'format_id': f"a{abr}{ext[0]}-{language}", 'ext': ext, 'vcodec': 'none',
+                          'acodec': acodec, 'abr': abr, 'tbr': abr, 'language': language, 'share': abr / 10000})
+    specs.append(dict(FORMATS[0]))
+    specs.append({'format_id': '22', 'ext': 'mp4', 'width': 1280, 'height': 720, 'vcodec': 'avc1.64001F',
+                  'acodec': 'mp4a.40.2', 'tbr': 1500, 'share': 0.15})
+    return tuple(specs)
+
+
+def synthetic_bytes(start, end):
+    """Treść syntetycznego pliku w zakresie [start, end)"""
+    out = bytearray()
+    position = start
+    while position < end:
+        offset = position % len(_BLOCK)
+        chunk = _BLOCK[offset:offset + (end - position)]
+        out += chunk
+        position += len(chunk)
+    return bytes(out)
+
+
+class _MediaHandler(BaseHTTPRequestHandler):
+    """GET/HEAD /media/<name>/<size>.<ext> z obsługą Range"""
+
+    protocol_version = 'HTTP/1.1'
+    # Nagłówki i treść to osobne zapisy - bez TCP_NODELAY keep-alive czeka na opóźniony ACK (~40 ms)
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def _parse(self):
+        match = _MEDIA_PATH_RE.match(self.path)
+        if not match:
+            self.send_error(404)
+            return None
+        size = int(match.group('size'))
+        start, end = 0, size
+        header = self.headers.get('Range')
+        if header:
+            range_match = _RANGE_RE.match(header)
+            if range_match and range_match.group(1):
+                start = int(range_match.group(1))
+                if range_match.group(2):
+                    end = min(int(range_match.group(2)) + 1, size)
+            elif range_match and range_match.group(2):
+                start = max(size - int(range_match.group(2)), 0)
+            if start >= size:
+                self.send_response(416)
+                self.send_header('Content-Range', f'bytes */{size}')
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return None
+        self.send_response(206 if header else 200)
+        self.send_header('Content-Type', CONTENT_TYPES.get(match.group('ext'), 'application/octet-stream'))
+        self.send_header('Accept-Ranges', 'bytes')
+        self.send_header('Content-Length', str(end - start))
+        if header:
+            self.send_header('Content-Range', f'bytes {start}-{end - 1}/{size}')
+        self.end_headers()
+        return start, end
+
+    def do_HEAD(self):
+        self._parse()
+
+    def do_GET(self):
+        span = self._parse()
+        if span is None:
+            return
+        start, end = span
+        position = start
+        try:
+            while position < end:
+                step = min(len(_BLOCK), end - position)
+                self.wfile.write(synthetic_bytes(position, position + step))
+                position += step
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True
+
+
+class FakeYouTubeServer:
+    """Lokalny serwer syntetycznych strumieni (port 0 = dowolny wolny)"""
+
+    def __init__(self, host='127.0.0.1', port=0):
+        """Inicjalizacja serwera (start() uruchamia wątek w tle)"""
+        self.httpd = ThreadingHTTPServer((host, port), _MediaHandler)
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def media_url(self, name, size, ext, expire=None):
+        """URL strumienia z podpisem ważności jak w linkach googlevideo"""
+        expire = expire if expire is not None else int(time.time()) + 6 * 3600
+        return f"{self.base_url}/media/{name}/{size}.{ext}?expire={expire}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+        return False
+
+    def make_info(self, video_id='dQw4w9WgXcQ', title='Benchmark video', size=8 * 1024 * 1024,
+                  duration=212, formats=None, description='', ladder=False):
+        """
+        Info dict w postaci zwracanej przez ekstraktor YouTube
+
+        Args:
+            size (int): Rozmiar strumienia progresywnego w bajtach (DASH proporcjonalnie)
+            formats (tuple): ID formatów do uwzględnienia (None = wszystkie z FORMATS)
+            ladder (bool): Pełna drabinka formatów (format_ladder) zamiast FORMATS
+        """
+        entries = []
+        for spec in (format_ladder() if ladder else FORMATS):
+            if formats is not None and spec['format_id'] not in formats:
+                continue
+            fmt = {key: value for key, value in spec.items() if key != 'share'}
+            filesize = max(int(size * spec['share']), 1)
+            fmt.update({
+                'url': self.media_url(f"{video_id}-{spec['format_id']}", filesize, spec['ext']),
+                'filesize': filesize,
+                'protocol': spec.get('protocol', 'http'),
+                'http_headers': {'User-Agent': 'benchmark'},
+            })
+            entries.append(fmt)
+        return {
+            'id': video_id,
+            'title': title,
+            'description': description,
+            'duration': duration,
+            'uploader': 'Benchmark',
+            'extractor': 'youtube',
+            'extractor_key': 'Youtube',
+            'webpage_url': f"https://www.youtube.com/watch?v={video_id}",
+            'original_url': f"https://www.youtube.com/watch?v={video_id}",
+            'epoch': int(time.time()),
+            'formats': entries,
+        }
@@ -0,0 +1,411 @@
+#!/usr/bin/env python3
+"""
+YouTube Downloader v1.3.0 - Offline Benchmark Suite
+
+Performance measurements against a local fake YouTube backend (no network).
+Part of the modular architecture introduced in v1.2.0.
+
+Features:
+- Cold start: import time, launcher --version, YoutubeDL instance vs pooled checkout
+- Extraction overhead: format processing of injected info dicts
+- Format selection over 100+ formats: FormatCatalog vs the yt-dlp selector chain
+- Download throughput: progressive and DASH streams from the local server
+- Short requests through the shared keep-alive pool vs a new connection each time
+- Progress-hook overhead per yt-dlp callback
+- Post-processing time (ffmpeg merge, skipped without ffmpeg)
+- core.utils hot functions (URL classifier, timestamps, sanitiser, progress text)
+- Baseline JSON with a comparison run that fails on regressions
+
+Usage:
+    python benchmarks/run.py                      # Pomiary
+    python benchmarks/run.py --save-baseline      # Zapis benchmarks/baseline.json
+    python benchmarks/run.py --compare            # Porównanie z baseline (kod 1 przy regresji)
+    python benchmarks/run.py --quick --only utils # Szybki przebieg wybranej grupy
+
+Architecture: Dual-Repository Workflow v1.2.0
+"""
+
+import argparse
+import copy
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fake_youtube import FakeYouTubeServer
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+DEFAULT_TOLERANCE = 0.25
+
+LOWER = 'lower'
+HIGHER = 'higher'
+
+MB = 1024 * 1024
+
+
+def metric(value, unit, better=LOWER):
+    """Wynik pomiaru z kierunkiem 'lepiej'"""
+    return {'value': round(value, 6), 'unit': unit, 'better': better}
+
+
+def best_of(func, repeat):
+    """Najlepszy czas (s) z kilku powtórzeń"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def make_downloader():
+    """Downloader odcięty od stanu współdzielonego (cache, limity, archiwum)"""
+    from core.archive import DownloadArchive
+    from core.bandwidth import BandwidthScheduler
+    from core.cache import VideoInfoCache
+    from core.downloader import YouTubeDownloader
+    from core.pool import YoutubeDLPool
+    from core.scoreboard import ClientScoreboard
+    return YouTubeDownloader(info_cache=VideoInfoCache(db_path=None), scoreboard=ClientScoreboard(path=None),
+                             bandwidth=BandwidthScheduler(), archive=DownloadArchive(db_path=None), quiet=True,
+                             pool=YoutubeDLPool())
+
+
+class Context:
+    """Wspólne zasoby przebiegu: serwer, katalog tymczasowy, skala"""
+
+    def __init__(self, server, workdir, quick=False):
+        self.server = server
+        self.workdir = workdir
+        self.quick = quick
+
+    def scale(self, full, quick):
+        return quick if self.quick else full
+
+    def fresh_dir(self, name):
+        path = os.path.join(self.workdir, name)
+        shutil.rmtree(path, ignore_errors=True)
+        os.makedirs(path)
+        return path
+
+
+def bench_extraction(ctx):
+    """Przetwarzanie gotowego info dict (wybór formatu) bez sieci"""
+    import yt_dlp
+    from core.formats import catalog_format_selector
+    downloader = make_downloader()
+    info = ctx.server.make_info()
+    selector = catalog_format_selector(1080, can_merge=downloader.toolchain.can_merge)
+    rounds = ctx.scale(200, 20)
+    with yt_dlp.YoutubeDL({'quiet': True, 'no_warnings': True, 'format': selector}) as ydl:
+        elapsed = best_of(lambda: [ydl.process_ie_result(copy.deepcopy(info), download=False)
+                                   for _ in range(rounds)], 3)
+    return {'extraction.process_info': metric(elapsed / rounds * 1000, 'ms'), **bench_format_selection(ctx)}
+
+
+def bench_format_selection(ctx):
+    """Wybór formatu 1080p dla filmu ze 100+ formatami: selektor z katalogu (jak przy pobieraniu)"""
+    import yt_dlp
+    from core.formats import FormatCatalog, catalog_format_selector
+    rounds = ctx.scale(200, 20)
+    with yt_dlp.YoutubeDL({'quiet': True, 'no_warnings': True, 'format': 'best'}) as ydl:
+        # Formaty po przetworzeniu przez yt-dlp (posortowane, uzupełnione) - jak przy pobieraniu
+        formats = ydl.process_ie_result(ctx.server.make_info(ladder=True), download=False)['formats']
+        selector = catalog_format_selector(1080, can_merge=True)
+
+        def select_catalog():
+            FormatCatalog(formats, 212).select(1080)
+
+        exact = FormatCatalog(formats, 212).select(1080)['format']
+        catalog = best_of(lambda: [select_catalog() for _ in range(rounds)], 3)
+        # Ścieżka pobierania: yt-dlp wywołuje selektor z listą formatów ekstrakcji
+        catalog_selector = best_of(lambda: [ydl._select_formats(formats, selector) for _ in range(rounds)], 3)
+        exact_ids = best_of(lambda: [ydl._select_formats(formats, ydl.build_format_selector(exact))
+                                     for _ in range(rounds)], 3)
+    return {
+        'extraction.format_catalog': metric(catalog / rounds * 1000, 'ms'),
+        'extraction.catalog_selector': metric(catalog_selector / rounds * 1000, 'ms'),
+        'extraction.exact_format_ids': metric(exact_ids / rounds * 1000, 'ms'),
+    }
+
+
+def bench_download(ctx):
+    """Przepustowość pobierania z lokalnego serwera"""
+    import yt_dlp
+    results = {}
+    size = ctx.scale(64, 8) * MB
+
+    downloader = make_downloader()
+    info = ctx.server.make_info(video_id='aaaaaaaaaaa', size=size, formats=('18',))
+    output_dir = ctx.fresh_dir('progressive')
+    start = time.perf_counter()
+    result = downloader.download_video('https://youtu.be/aaaaaaaaaaa', output_dir,
+                                       info={'info_dict': info, 'client': 'iOS Client'}, skip_existing=False)
+    elapsed = time.perf_counter() - start
+    results['download.progressive'] = metric(result['filesize'] / MB / elapsed, 'MB/s', HIGHER)
+
+    info = ctx.server.make_info(video_id='bbbbbbbbbbb', size=size, formats=('137', '140'))
+    output_dir = ctx.fresh_dir('dash')
+    opts = {'quiet': True, 'no_warnings': True, 'noprogress': True, 'format': '137',
+            'outtmpl': os.path.join(output_dir, '%(id)s.%(ext)s')}
+    start = time.perf_counter()
+    with yt_dlp.YoutubeDL(opts) as ydl:
+        ydl.process_ie_result(info, download=True)
+    elapsed = time.perf_counter() - start
+    downloaded = sum(os.path.getsize(os.path.join(output_dir, name)) for name in os.listdir(output_dir))
+    results['download.dash_video'] = metric(downloaded / MB / elapsed, 'MB/s', HIGHER)
+    return results
+
+
+def bench_connections(ctx):
+    """Krótkie żądania: wspólna pula keep-alive a nowe połączenie na żądanie (urllib)"""
+    import yt_dlp
+    from core.downloader import YOUTUBE_EXTRACTORS
+    from core.session import enable_keepalive, get_http_session
+
+    enable_keepalive()
+    session = get_http_session()
+    url = ctx.server.media_url('manifest', 16 * 1024, 'mp4')
+    rounds = ctx.scale(200, 20)
+    opts = {'quiet': True, 'allowed_extractors': YOUTUBE_EXTRACTORS}
+    with yt_dlp.YoutubeDL(opts) as ydl:
+        before = session.stats()
+        pooled = best_of(lambda: [ydl.urlopen(url).read() for _ in range(rounds)], 3)
+        after = session.stats()
+    with yt_dlp.YoutubeDL({**opts, 'compat_opts': ['prefer-legacy-http-handler']}) as ydl:
+        fresh = best_of(lambda: [ydl.urlopen(url).read() for _ in range(rounds)], 3)
+    requests = after['requests'] - before['requests']
+    return {
+        'connections.keepalive_request': metric(pooled / rounds * 1000, 'ms'),
+        'connections.new_connection_request': metric(fresh / rounds * 1000, 'ms'),
+        'connections.reuse_ratio': metric((after['reused'] - before['reused']) / requests, 'ratio', HIGHER),
+    }
+
+
+def bench_progress_hook(ctx):
+    """Koszt jednego wywołania hooka postępu (tracker + szyna zdarzeń)"""
+    from core.progress import ProgressTracker
+    downloader = make_downloader()
+    calls = ctx.scale(50000, 5000)
+    total = calls * 16384
+    info = {'format_id': '18', 'vcodec': 'avc1', 'acodec': 'mp4a', 'filesize': total}
+    hooks = [{'status': 'downloading', 'downloaded_bytes': i * 16384, 'total_bytes': total,
+              'speed': 5 * MB, 'eta': 10, 'info_dict': info, 'filename': 'video.mp4'}
+             for i in range(calls)]
+
+    def run():
+        tracker = ProgressTracker('bench')
+        tracker.plan(info)
+        for d in hooks:
+            downloader._progress_hook(d, 'bench', tracker)
+        downloader.progress_bus.forget('bench')
+
+    elapsed = best_of(run, 3)
+    return {'progress.hook': metric(elapsed / calls * 1e6, 'µs')}
+
+
+def bench_postprocess(ctx):
+    """Scalanie audio i wideo przez ffmpeg (pomijane bez ffmpeg)"""
+    from core.toolchain import get_toolchain
+    toolchain = get_toolchain()
+    if not toolchain.can_merge:
+        print("⏭️  postprocess: brak ffmpeg - pominięto", file=sys.stderr)
+        return {}
+    import yt_dlp
+    from yt_dlp.postprocessor import FFmpegMergerPP
+    workdir = ctx.fresh_dir('postprocess')
+    seconds = ctx.scale(30, 5)
+    video = os.path.join(workdir, 'video.mp4')
+    audio = os.path.join(workdir, 'audio.m4a')
+    ffmpeg = toolchain.path('ffmpeg')
+    subprocess.run([ffmpeg, '-y', '-loglevel', 'error', '-f', 'lavfi',
+                    '-i', f'testsrc=duration={seconds}:size=1280x720:rate=30',
+                    '-c:v', 'libx264', '-preset', 'ultrafast', video], check=True)
+    subprocess.run([ffmpeg, '-y', '-loglevel', 'error', '-f', 'lavfi', '-i', f'sine=duration={seconds}',
+                    '-c:a', 'aac', audio], check=True)
+    output = os.path.join(workdir, 'merged.mp4')
+    with yt_dlp.YoutubeDL({'quiet': True, 'ffmpeg_location': ffmpeg}) as ydl:
+        merger = FFmpegMergerPP(ydl)
+
+        def run():
+            merger.run({'filepath': output, '__files_to_merge': [video, audio], 'ext': 'mp4'})
+
+        elapsed = best_of(run, 3)
+    return {'postprocess.merge': metric(elapsed * 1000, 'ms')}
+
+
+def bench_utils(ctx):
+    """Gorące funkcje core.utils"""
+    from bench_urls import make_dump
+    from bench_timestamps import make_description
+    from core.utils import classify_youtube_url, extract_timestamps, format_progress
+    from core.paths import sanitize_component
+
+    urls = make_dump(ctx.scale(100000, 10000))
+    description = make_description(ctx.scale(5000, 500))
+    titles = [f"Film {i}: część \"{i % 7}\" / test?" for i in range(ctx.scale(20000, 2000))]
+    event = {'percent': 45.3, 'speed': 3.2 * MB, 'eta': 83, 'phase': 'download'}
+    events = ctx.scale(50000, 5000)
+    return {
+        'utils.classify_youtube_url': metric(best_of(lambda: [classify_youtube_url(u) for u in urls], 3)
+                                             / len(urls) * 1e6, 'µs'),
+        'utils.extract_timestamps': metric(best_of(lambda: extract_timestamps(description), 3) * 1000, 'ms'),
+        'utils.sanitize_component': metric(best_of(lambda: [sanitize_component(t) for t in titles], 3)
+                                           / len(titles) * 1e6, 'µs'),
+        'utils.format_progress': metric(best_of(lambda: [format_progress(event) for _ in range(events)], 3)
+                                        / events * 1e6, 'µs'),
+    }
+
+
+def bench_startup(ctx):
+    """Zimny start: import modułów, komendy launchera i przygotowanie instancji YoutubeDL"""
+    import yt_dlp
+    from core.downloader import YOUTUBE_EXTRACTORS
+    from core.pool import YoutubeDLPool
+    from core.startup import import_time_report, measure_command
+
+    repeat = ctx.scale(5, 2)
+    opts = {'quiet': True, 'allowed_extractors': YOUTUBE_EXTRACTORS}
+    yt_dlp.YoutubeDL(opts)  # Rozgrzanie: import ekstraktorów poza pomiarem
+    # Opcje zadania jak przy pobieraniu: hooki, szablon nazwy, selektor formatu
+    job = {'outtmpl': os.path.join(ctx.workdir, '%(title)s.%(ext)s'), 'format': 'bv*[height<=1080]+ba/b',
+           'progress_hooks': [lambda d: None], 'noprogress': True}
+    pool = YoutubeDLPool()
+
+    def checkout():
+        with pool.checkout('iOS Client', opts, job):
+            pass
+
+    checkout()
+    return {
+        'startup.import_cli': metric(import_time_report('ui.cli')['total_ms'], 'ms'),
+        'startup.launcher_version': metric(measure_command(('launcher.py', '--version'), repeat), 'ms'),
+        'startup.youtubedl_instance': metric(best_of(lambda: yt_dlp.YoutubeDL({**opts, **job}), repeat) * 1000,
+                                             'ms'),
+        'startup.pool_checkout': metric(best_of(checkout, repeat) * 1000, 'ms'),
+    }
+
+
+BENCHMARKS = (
+    ('startup', bench_startup),
+    ('extraction', bench_extraction),
+    ('download', bench_download),
+    ('connections', bench_connections),
+    ('progress', bench_progress_hook),
+    ('postprocess', bench_postprocess),
+    ('utils', bench_utils),
+)
+
+
+def run_benchmarks(only=None, quick=False):
+    """Uruchomienie wybranych grup pomiarów; zwraca słownik wyników"""
+    results = {}
+    workdir = tempfile.mkdtemp(prefix='ytdl-bench-')
+    try:
+        with FakeYouTubeServer() as server:
+            ctx = Context(server, workdir, quick)
+            for name, bench in BENCHMARKS:
+                if only and name not in only:
+                    continue
+                print(f"⏱️  {name}...", file=sys.stderr)
+                results.update(bench(ctx))
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+
+def environment():
+    """Opis środowiska zapisywany z wynikami"""
+    try:
+        import yt_dlp
+        ytdlp_version = yt_dlp.version.__version__
+    except Exception:
+        ytdlp_version = None
+    return {'python': platform.python_version(), 'platform': platform.platform(),
+            'yt_dlp': ytdlp_version, 'time': time.strftime('%Y-%m-%dT%H:%M:%S')}
+
+
+def compare_results(current, baseline, tolerance=DEFAULT_TOLERANCE):
+    """
+    Porównanie z baseline
+
+    Returns:
+        list: Regresje - słowniki {'name', 'baseline', 'current', 'change'}; change to
+            względne pogorszenie (0.3 = 30% gorzej) niezależnie od kierunku metryki
+    """
+    regressions = []
+    for name, result in current.items():
+        base = baseline.get(name)
+        if not base or not base.get('value') or not result.get('value'):
+            continue
+        if result.get('better', LOWER) == LOWER:
+            change = result['value'] / base['value'] - 1
+        else:
+            change = base['value'] / result['value'] - 1
+        if change > tolerance:
+            regressions.append({'name': name, 'baseline': base['value'], 'current': result['value'],
+                                'change': change})
+    return regressions
+
+
+def print_results(results, baseline=None):
+    print(f"{'benchmark':<30} {'value':>12} {'unit':<5} {'baseline':>12}")
+    for name, result in sorted(results.items()):
+        base = (baseline or {}).get(name, {}).get('value')
+        base_text = f"{base:>12.3f}" if base is not None else f"{'-':>12}"
+        print(f"{name:<30} {result['value']:>12.3f} {result['unit']:<5} {base_text}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline benchmark suite")
+    parser.add_argument('--only', nargs='+', choices=[name for name, _ in BENCHMARKS], help="Wybrane grupy")
+    parser.add_argument('--quick', action='store_true', help="Mniejsze dane (szybki przebieg)")
+    parser.add_argument('--json', metavar='PATH', help="Zapis wyników do pliku JSON")
+    parser.add_argument('--save-baseline', nargs='?', const=DEFAULT_BASELINE, metavar='PATH',
+                        help="Zapis wyników jako baseline")
+    parser.add_argument('--compare', nargs='?', const=DEFAULT_BASELINE, metavar='PATH',
+                        help="Porównanie z baseline (kod wyjścia 1 przy regresji)")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help="Dopuszczalne pogorszenie względem baseline (0.25 = 25%%)")
+    args = parser.parse_args()
+
+    baseline = None
+    if args.compare:
+        try:
+            with open(args.compare, 'r', encoding='utf-8') as f:
+                baseline = json.load(f)['results']
+        except (OSError, ValueError, KeyError) as e:
+            print(f"❌ Nie można wczytać baseline {args.compare}: {e}", file=sys.stderr)
+            return 2
+
+    results = run_benchmarks(args.only, args.quick)
+    print_results(results, baseline)
+
+    document = {'environment': environment(), 'quick': args.quick, 'results': results}
+    for path in (args.json, args.save_baseline):
+        if path:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(document, f, indent=2, ensure_ascii=False)
+                f.write('\n')
+            print(f"💾 Zapisano: {path}")
+
+    if baseline is not None:
+        regressions = compare_results(results, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"❌ Regresja {regression['name']}: {regression['baseline']:.3f} -> "
+                  f"{regression['current']:.3f} ({regression['change']:+.0%})")
+        if regressions:
+            return 1
+        print(f"✅ Brak regresji (tolerancja {args.tolerance:.0%})")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
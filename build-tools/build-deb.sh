@@ -121,16 +121,11 @@ copy_application_files() {
     
     # Struktura modułów - core/
     mkdir -p "$PACKAGE_DIR/usr/share/$PACKAGE_NAME/core"
-    cp "$PROJECT_ROOT/core/__init__.py" "$PACKAGE_DIR/usr/share/$PACKAGE_NAME/core/"
-    cp "$PROJECT_ROOT/core/downloader.py" "$PACKAGE_DIR/usr/share/$PACKAGE_NAME/core/"
-    cp "$PROJECT_ROOT/core/utils.py" "$PACKAGE_DIR/usr/share/$PACKAGE_NAME/core/"
-    cp "$PROJECT_ROOT/core/translations.py" "$PACKAGE_DIR/usr/share/$PACKAGE_NAME/core/"
+    cp "$PROJECT_ROOT"/core/*.py "$PACKAGE_DIR/usr/share/$PACKAGE_NAME/core/"
     
     # Struktura modułów - ui/
     mkdir -p "$PACKAGE_DIR/usr/share/$PACKAGE_NAME/ui"
-    cp "$PROJECT_ROOT/ui/__init__.py" "$PACKAGE_DIR/usr/share/$PACKAGE_NAME/ui/"
-    cp "$PROJECT_ROOT/ui/gui.py" "$PACKAGE_DIR/usr/share/$PACKAGE_NAME/ui/"
-    cp "$PROJECT_ROOT/ui/cli.py" "$PACKAGE_DIR/usr/share/$PACKAGE_NAME/ui/"
+    cp "$PROJECT_ROOT"/ui/*.py "$PACKAGE_DIR/usr/share/$PACKAGE_NAME/ui/"
     
     # Dokumentacja
     cp "$PROJECT_ROOT/README.md" "$PACKAGE_DIR/usr/share/$PACKAGE_NAME/"
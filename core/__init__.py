@@ -6,6 +6,22 @@ application. Part of the modular architecture introduced in v1.2.0.
 
 Components:
 - downloader.py: YouTube download engine with fallback strategies
+- manager.py: Concurrent download manager with a bounded worker pool
+- cache.py: Persistent video metadata cache (LRU + SQLite)
+- scoreboard.py: Adaptive client ordering based on measured success and latency
+- journal.py: Crash-safe job journal for resumable downloads
+- progress.py: Throttled structured progress event bus
+- toolchain.py: Cached ffmpeg/ffprobe/aria2c capability probe
+- backends.py: Pluggable download backends (native, multi-connection aria2c)
+- fragments.py: Adaptive (AIMD) concurrent fragment downloads for DASH/HLS
+- bandwidth.py: Shared token-bucket bandwidth scheduler with job priorities
+- archive.py: Indexed archive of completed downloads (skip videos already on disk)
+- paths.py: Output path planner with atomic name reservation
+- startup.py: Lazy heavy imports and import-time / cold-start report
+- environment.py: Cached launcher GUI diagnostics keyed on the display environment
+- pool.py: Pool of warm YoutubeDL instances per client profile with per-job overrides
+- session.py: Shared keep-alive HTTP connection pool with connection-reuse metrics
+- formats.py: Indexed format catalog resolving exact format IDs per video
 - utils.py: Shared utilities for filename sanitization and validation
 - translations.py: Internationalization support
 
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+YouTube Downloader v1.3.0 - Download Archive
+
+Indexed archive of completed downloads used to skip videos already on disk.
+Part of the modular architecture introduced in v1.2.0.
+
+Features:
+- Video ID + format variant + directory -> file path, size and optional SHA-256
+- In-memory index: O(1) lookups without network or database queries
+- SQLite store (WAL) safe for concurrent writers (threads and processes)
+- Incremental refresh of entries added by other processes
+- Stored in the persistent user data directory (survives reboots)
+
+Architecture: Dual-Repository Workflow v1.2.0
+"""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+from .utils import DATA_DIR, ensure_parent_dir
+
+DEFAULT_ARCHIVE_PATH = os.path.join(DATA_DIR, "archive.sqlite3")
+
+CHECKSUM_CHUNK = 1024 * 1024
+
+
+def file_sha256(path):
+    """Suma SHA-256 pliku (odczyt blokami)"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHECKSUM_CHUNK), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class DownloadArchive:
+    """
+    Archiwum pobranych filmów.
+
+    Klucz to (ID filmu, wariant formatu, katalog docelowy) - ten sam film
+    w innej rozdzielczości lub w innym katalogu jest osobnym wpisem.
+    Sprawdzenie obecności to jedno wyszukiwanie w słowniku w pamięci;
+    SQLite jest czytany tylko przy starcie i gdy inny proces coś dopisał.
+    db_path=None - archiwum tylko w pamięci (testy).
+    """
+
+    def __init__(self, db_path=DEFAULT_ARCHIVE_PATH, checksums=False):
+        """
+        Inicjalizacja archiwum
+
+        Args:
+            checksums (bool): Zapis sumy SHA-256 przy dodaniu (pełny odczyt pliku
+                w wątku pobierania - domyślnie tylko rozmiar)
+        """
+        self.db_path = db_path
+        self.checksums = checksums
+        self._entries = {}
+        self._last_rowid = 0
+        self._data_version = None
+        self._conn = None
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(video_id, variant, output_dir):
+        return (video_id, variant, os.path.abspath(output_dir))
+
+    def _get_conn(self):
+        """Leniwe otwarcie bazy SQLite (None jeśli dysk niedostępny)"""
+        if self._conn is None and self.db_path:
+            try:
+                ensure_parent_dir(self.db_path)
+                conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=10)
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS archive ("
+                    " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+                    " video_id TEXT NOT NULL, variant TEXT NOT NULL, output_dir TEXT NOT NULL,"
+                    " path TEXT NOT NULL, size INTEGER NOT NULL, sha256 TEXT, title TEXT,"
+                    " downloaded REAL NOT NULL,"
+                    " UNIQUE (video_id, variant, output_dir))"
+                )
+                conn.commit()
+                self._conn = conn
+            except (sqlite3.Error, OSError) as e:
+                logging.warning(f"⚠️ Archiwum pobrań niedostępne ({self.db_path}): {e}")
+                self.db_path = None
+        return self._conn
+
+    def _refresh(self):
+        """Doczytanie wpisów dodanych od ostatniego odczytu (wywoływane pod lockiem)"""
+        conn = self._get_conn()
+        if conn is None:
+            return
+        try:
+            version = conn.execute("PRAGMA data_version").fetchone()[0]
+            if self._loaded and version == self._data_version:
+                return
+            rows = conn.execute(
+                "SELECT id, video_id, variant, output_dir, path, size, sha256, title, downloaded"
+                " FROM archive WHERE id > ?", (self._last_rowid,)
+            ).fetchall()
+            for rowid, video_id, variant, output_dir, path, size, sha256, title, downloaded in rows:
+                self._entries[(video_id, variant, output_dir)] = {
+                    'video_id': video_id, 'variant': variant, 'path': path, 'size': size,
+                    'sha256': sha256, 'title': title, 'downloaded': downloaded}
+                self._last_rowid = max(self._last_rowid, rowid)
+            self._data_version = version
+            self._loaded = True
+        except sqlite3.Error as e:
+            logging.debug(f"Archive refresh failed: {e}")
+
+    def get(self, video_id, variant, output_dir):
+        """Wpis archiwum (słownik) lub None"""
+        if not video_id:
+            return None
+        key = self._key(video_id, variant, output_dir)
+        with self._lock:
+            record = self._entries.get(key)
+            if record is None:
+                # Nietrafienie - sprawdź czy inny proces czegoś nie dopisał
+                self._refresh()
+                record = self._entries.get(key)
+            return dict(record) if record else None
+
+    def contains(self, video_id, variant, output_dir):
+        """Czy film (w danym wariancie i katalogu) jest w archiwum"""
+        return self.get(video_id, variant, output_dir) is not None
+
+    def lookup(self, video_id, variant, output_dir, verify_checksum=False):
+        """
+        Wpis archiwum, jeśli plik nadal istnieje i ma zapisany rozmiar.
+
+        Plik usunięty lub zmieniony powoduje usunięcie wpisu (film zostanie
+        pobrany ponownie).
+        """
+        record = self.get(video_id, variant, output_dir)
+        if record is None:
+            return None
+        try:
+            valid = os.path.getsize(record['path']) == record['size']
+        except OSError:
+            valid = False
+        if valid and verify_checksum and record['sha256']:
+            valid = file_sha256(record['path']) == record['sha256']
+        if not valid:
+            logging.info(f"🗃️ Plik z archiwum zniknął lub się zmienił: {record['path']}")
+            self.remove(video_id, variant, output_dir)
+            return None
+        return record
+
+    def add(self, video_id, variant, output_dir, path, title=None):
+        """Zapis ukończonego pobierania (pomijany gdy pliku nie ma na dysku)"""
+        if not video_id or not path or not os.path.exists(path):
+            return None
+        size = os.path.getsize(path)
+        sha256 = file_sha256(path) if self.checksums else None
+        key = self._key(video_id, variant, output_dir)
+        record = {'video_id': video_id, 'variant': variant, 'path': path, 'size': size,
+                  'sha256': sha256, 'title': title, 'downloaded': time.time()}
+        with self._lock:
+            conn = self._get_conn()
+            if conn is not None:
+                try:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO archive"
+                        " (video_id, variant, output_dir, path, size, sha256, title, downloaded)"
+                        " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                        (*key, path, size, sha256, title, record['downloaded']),
+                    )
+                    conn.commit()
+                except sqlite3.Error as e:
+                    logging.debug(f"Archive write failed for {video_id}: {e}")
+            self._entries[key] = record
+        return dict(record)
+
+    def remove(self, video_id, variant, output_dir):
+        """Usunięcie wpisu z archiwum"""
+        key = self._key(video_id, variant, output_dir)
+        with self._lock:
+            self._entries.pop(key, None)
+            conn = self._get_conn()
+            if conn is not None:
+                try:
+                    conn.execute("DELETE FROM archive WHERE video_id = ? AND variant = ? AND output_dir = ?", key)
+                    conn.commit()
+                except sqlite3.Error as e:
+                    logging.debug(f"Archive delete failed for {video_id}: {e}")
+
+    def __len__(self):
+        with self._lock:
+            self._refresh()
+            return len(self._entries)
+
+    def close(self):
+        """Zamknięcie połączenia z bazą"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+_default_archive = None
+_default_archive_lock = threading.Lock()
+
+
+def get_download_archive():
+    """Współdzielone (na proces) archiwum pobrań"""
+    global _default_archive
+    with _default_archive_lock:
+        if _default_archive is None:
+            _default_archive = DownloadArchive()
+        return _default_archive
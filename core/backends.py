@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+YouTube Downloader v1.3.0 - Download Backends
+
+Pluggable byte-transfer backends selectable per download job.
+Part of the modular architecture introduced in v1.2.0.
+
+Features:
+- Native yt-dlp HTTP downloader (default)
+- aria2c with multiple connections per file for large streams
+- aria2c progress translated into regular yt-dlp progress hooks
+- Cancellation terminates the aria2c process immediately
+- Bandwidth cap passed to aria2c (--max-overall-download-limit)
+
+Architecture: Dual-Repository Workflow v1.2.0
+"""
+
+import logging
+import os
+import re
+import subprocess
+import threading
+import time
+from functools import lru_cache
+
+from .toolchain import get_toolchain
+
+BACKEND_NATIVE = 'native'
+BACKEND_ARIA2C = 'aria2c'
+BACKENDS = (BACKEND_NATIVE, BACKEND_ARIA2C)
+
+# Domyślna liczba połączeń aria2c na plik
+DEFAULT_CONNECTIONS = 8
+
+# Odczyt konsoli aria2c: [#2089b0 400.0KiB/33.2MiB(1%) CN:8 DL:1.2MiB ETA:27s]
+_READOUT_RE = re.compile(
+    r'\[#\w+\s+([\d.]+\w*)/([\d.]+\w*)\((\d+)%\)(?:[^\]]*?DL:([\d.]+\w*))?(?:[^\]]*?ETA:(\w+))?')
+
+
+def parse_aria2c_readout(text):
+    """
+    Ostatni odczyt postępu z wyjścia konsoli aria2c.
+
+    Returns:
+        dict: downloaded_bytes, total_bytes, speed, eta (lub None gdy brak odczytu)
+    """
+    matches = _READOUT_RE.findall(text)
+    if not matches:
+        return None
+    from yt_dlp.utils import parse_filesize
+    downloaded, total, _, speed, eta = matches[-1]
+    seconds = None
+    if eta:
+        units = {'h': 3600, 'm': 60, 's': 1}
+        seconds = sum(int(value) * units[unit] for value, unit in re.findall(r'(\d+)([hms])', eta))
+    return {
+        'downloaded_bytes': parse_filesize(downloaded),
+        'total_bytes': parse_filesize(total) or None,
+        'speed': parse_filesize(speed) if speed else None,
+        'eta': seconds,
+    }
+
+
+@lru_cache(maxsize=None)
+def aria2c_backend_class():
+    """
+    Klasa downloadera aria2c zarejestrowana w yt-dlp.
+
+    Tworzona przy pierwszym użyciu, żeby import modułu nie ładował yt-dlp.
+    """
+    from yt_dlp.downloader import external
+    from yt_dlp.downloader.external import Aria2cFD
+    from yt_dlp.utils import Popen
+
+    class Aria2cBackendFD(Aria2cFD):
+        """
+        aria2c z raportowaniem postępu i anulowaniem.
+
+        Standardowy Aria2cFD z yt-dlp zgłasza tylko zakończenie pobierania;
+        ta wersja odczytuje konsolę aria2c i co POLL_INTERVAL sekund wywołuje
+        hooki postępu. Wyjątek z hooka (anulowanie) kończy proces aria2c.
+        Odczyt konsoli jest włączony zawsze (także w trybie quiet/noprogress) -
+        trafia do potoku, nie na terminal. Rozmiar pliku .part nie mówi nic
+        o postępie (prealokacja, segmenty pisane pod różnymi przesunięciami).
+        Małe pliki (poniżej MIN_FILESIZE) zostają przy natywnym downloaderze -
+        start zewnętrznego procesu kosztuje więcej niż zyskują dodatkowe połączenia.
+        """
+
+        EXE_NAME = 'aria2c'
+        POLL_INTERVAL = 0.5
+        MIN_FILESIZE = 10 * 1024 * 1024
+        FORCED_OPTIONS = ('--show-console-readout=true', '--file-allocation=none')
+        FORCED_OPTIONS_PREFIXES = ('--show-console-readout', '--file-allocation')
+
+        @classmethod
+        def available(cls, path=None):
+            """Dostępność aria2c według sondowania narzędzi (bez dodatkowego procesu)"""
+            path = get_toolchain().path('aria2c')
+            if not path:
+                return False
+            cls.exe = path
+            return path
+
+        @classmethod
+        def supports(cls, info_dict):
+            size = info_dict.get('filesize') or info_dict.get('filesize_approx')
+            if size and size < cls.MIN_FILESIZE:
+                return False
+            return super().supports(info_dict)
+
+        def _call_downloader(self, tmpfilename, info_dict):
+            self._tmpfilename = tmpfilename
+            self._started = time.time()
+            return super()._call_downloader(tmpfilename, info_dict)
+
+        def _make_cmd(self, tmpfilename, info_dict):
+            cmd = super()._make_cmd(tmpfilename, info_dict)
+            # Odczyt postępu wymaga konsoli aria2c niezależnie od noprogress i argumentów użytkownika
+            filtered = []
+            args = iter(cmd)
+            for arg in args:
+                if arg in self.FORCED_OPTIONS_PREFIXES:
+                    next(args, None)  # Wartość jako osobny argument: --file-allocation prealloc
+                elif not arg.startswith(self.FORCED_OPTIONS_PREFIXES):
+                    filtered.append(arg)
+            index = filtered.index('--allow-overwrite=true')
+            return filtered[:index] + list(self.FORCED_OPTIONS) + filtered[index:]
+
+        def _call_process(self, cmd, info_dict):
+            """Uruchomienie aria2c z odczytem konsoli i zgłaszaniem postępu"""
+            output = {'stdout': '', 'stderr': ''}
+            proc = Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            readers = [threading.Thread(target=self._drain, args=(proc.stdout, output, 'stdout'), daemon=True),
+                       threading.Thread(target=self._drain, args=(proc.stderr, output, 'stderr'), daemon=True)]
+            for reader in readers:
+                reader.start()
+            try:
+                while True:
+                    try:
+                        proc.wait(timeout=self.POLL_INTERVAL)
+                        break
+                    except subprocess.TimeoutExpired:
+                        self._report_progress(output['stdout'], info_dict)
+            finally:
+                if proc.poll() is None:
+                    proc.kill()
+                    proc.wait()
+                for reader in readers:
+                    reader.join(timeout=1)
+            return output['stdout'], output['stderr'], proc.returncode
+
+        @staticmethod
+        def _drain(stream, output, key):
+            """Odczyt strumienia procesu (zachowany tylko ostatni fragment stdout)"""
+            for chunk in iter(lambda: os.read(stream.fileno(), 4096), b''):
+                text = output[key] + chunk.decode('utf-8', 'replace')
+                output[key] = text[-4096:] if key == 'stdout' else text
+
+        def _report_progress(self, stdout, info_dict):
+            """Zgłoszenie postępu aria2c przez standardowe hooki yt-dlp"""
+            # Przed pierwszym odczytem konsoli - brak postępu (hook wywoływany dla anulowania)
+            readout = parse_aria2c_readout(stdout) or {'downloaded_bytes': 0}
+            status = {
+                'status': 'downloading',
+                'filename': self.undo_temp_name(self._tmpfilename),
+                'tmpfilename': self._tmpfilename,
+                'elapsed': time.time() - self._started,
+                'total_bytes': info_dict.get('filesize'),
+                'total_bytes_estimate': info_dict.get('filesize_approx'),
+                **{k: v for k, v in readout.items() if v is not None},
+            }
+            self._hook_progress(status, info_dict)
+
+    # Rejestracja w yt-dlp pod własną nazwą - wybierana przez opcję external_downloader
+    external._BY_NAME.setdefault(Aria2cBackendFD.get_basename(), Aria2cBackendFD)
+    return Aria2cBackendFD
+
+
+def __getattr__(name):
+    if name == 'Aria2cBackendFD':
+        return aria2c_backend_class()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def build_backend_opts(backend, toolchain=None, connections=DEFAULT_CONNECTIONS, ratelimit=None):
+    """
+    Opcje yt-dlp dla wybranego backendu pobierania.
+
+    Args:
+        backend (str): 'native' lub 'aria2c' (None = natywny)
+        connections (int): Liczba połączeń aria2c na plik
+        ratelimit (float): Limit zadania w bajtach/s (None = bez limitu) - aria2c
+            to osobny proces, którego hook postępu nie spowolni
+
+    Returns:
+        dict: Opcje do połączenia z ydl_opts (pusty dla natywnego backendu
+              lub gdy aria2c nie jest zainstalowany)
+    """
+    if backend in (None, BACKEND_NATIVE):
+        return {}
+    if backend != BACKEND_ARIA2C:
+        raise ValueError(f"Unknown download backend: {backend}")
+    toolchain = toolchain or get_toolchain()
+    if not toolchain.has('aria2c'):
+        logging.warning("⚠️ aria2c nie jest zainstalowany - używam natywnego pobierania")
+        return {}
+    connections = max(1, min(16, int(connections)))
+    name = aria2c_backend_class().get_basename()
+    opts = {
+        # Tylko HTTP(S) - strumienie DASH YouTube to bezpośrednie linki HTTPS
+        'external_downloader': {'http': name},
+        'external_downloader_args': {
+            name: ['-x', str(connections), '-s', str(connections), '-k', '1M'],
+        },
+    }
+    if ratelimit:
+        # Aria2cFD przekazuje 'ratelimit' jako --max-overall-download-limit
+        opts['ratelimit'] = int(ratelimit)
+    return opts
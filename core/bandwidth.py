@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+YouTube Downloader v1.3.0 - Bandwidth Scheduler
+
+Process-wide token-bucket rate limiting shared by all download jobs.
+Part of the modular architecture introduced in v1.2.0.
+
+Features:
+- Global bandwidth cap shared by every YouTubeDownloader job
+- Per-job weights and priorities (interactive > normal > background)
+- Lower-priority jobs keep a minimum share and are never starved
+- Time-of-day profiles (e.g. a lower cap during working hours)
+- Idle jobs do not hold on to their share (work-conserving)
+- External downloaders (aria2c) started with the job's current share as their rate limit
+
+Architecture: Dual-Repository Workflow v1.2.0
+"""
+
+import datetime
+import json
+import logging
+import os
+import threading
+import time
+
+from .utils import CONFIG_DIR
+
+# Priorytety zadań - wyższa liczba wygrywa
+PRIORITY_BACKGROUND = 0
+PRIORITY_NORMAL = 1
+PRIORITY_INTERACTIVE = 2
+
+# Limity w osobnym pliku ustawień użytkownika (klucze bandwidth_limit, bandwidth_profiles) -
+# nie w /tmp, gdzie każdy może je podmienić, i nie w konfiguracji GUI, którą GUI nadpisuje
+CONFIG_PATH = os.path.join(CONFIG_DIR, "bandwidth.json")
+
+
+def _parse_clock(value):
+    """'HH:MM' -> datetime.time"""
+    hours, minutes = value.split(':')
+    return datetime.time(int(hours), int(minutes))
+
+
+class BandwidthProfile:
+    """Limit obowiązujący w przedziale godzin (może przechodzić przez północ)"""
+
+    def __init__(self, start, end, rate):
+        self.start = _parse_clock(start) if isinstance(start, str) else start
+        self.end = _parse_clock(end) if isinstance(end, str) else end
+        self.rate = rate
+
+    def matches(self, moment):
+        """Czy profil obowiązuje o danej godzinie"""
+        if self.start <= self.end:
+            return self.start <= moment < self.end
+        return moment >= self.start or moment < self.end
+
+
+class _JobBucket:
+    """Kubełek tokenów pojedynczego zadania"""
+
+    def __init__(self, weight, priority, now):
+        self.weight = weight
+        self.priority = priority
+        self.tokens = 0.0
+        self.updated = now
+        self.last_active = now
+        self.consumed = 0
+        self.waited = 0.0
+
+
+class BandwidthScheduler:
+    """
+    Współdzielony ogranicznik przepustowości (token bucket na zadanie).
+
+    Limit globalny dzielony jest między aktywne zadania: zadania
+    o najwyższym priorytecie dzielą się (wagowo) całością poza
+    `min_share`, którą zachowują zadania o niższym priorytecie.
+    Zadanie bez pobierania przez `idle_after` sekund nie zajmuje udziału.
+    """
+
+    def __init__(self, rate=None, profiles=None, min_share=0.1, burst=0.5, idle_after=2.0,
+                 clock=time.monotonic, now=None):
+        """
+        Inicjalizacja ogranicznika
+
+        Args:
+            rate (float): Limit globalny w bajtach/s (None = bez limitu)
+            profiles (list): BandwidthProfile lub słowniki {'start', 'end', 'rate'}
+            min_share (float): Udział zarezerwowany dla zadań o niższym priorytecie
+            burst (float): Pojemność kubełka w sekundach przepustowości
+        """
+        self.rate = rate
+        self.profiles = [p if isinstance(p, BandwidthProfile) else BandwidthProfile(**p)
+                         for p in (profiles or [])]
+        self.min_share = min_share
+        self.burst = burst
+        self.idle_after = idle_after
+        self._clock = clock
+        self._now = now or (lambda: datetime.datetime.now().time())
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def current_rate(self):
+        """Limit obowiązujący teraz (profil godzinowy lub globalny)"""
+        moment = self._now()
+        for profile in self.profiles:
+            if profile.matches(moment):
+                return profile.rate
+        return self.rate
+
+    def set_rate(self, rate):
+        """Zmiana limitu globalnego w trakcie działania"""
+        with self._lock:
+            self.rate = rate
+
+    def register(self, job_id, weight=1.0, priority=PRIORITY_NORMAL):
+        """Rejestracja zadania przed pobieraniem"""
+        with self._lock:
+            self._jobs[job_id] = _JobBucket(max(weight, 0.01), priority, self._clock())
+
+    def unregister(self, job_id):
+        """Wyrejestrowanie zakończonego zadania"""
+        with self._lock:
+            self._jobs.pop(job_id, None)
+
+    def _share(self, job_id, now):
+        """Udział zadania w limicie globalnym (wywoływane pod lockiem)"""
+        job = self._jobs[job_id]
+        active = [j for key, j in self._jobs.items()
+                  if key == job_id or now - j.last_active <= self.idle_after]
+        top = max(j.priority for j in active)
+        lower = [j for j in active if j.priority < top]
+        if not lower:
+            return job.weight / sum(j.weight for j in active)
+        if job.priority == top:
+            winners = [j for j in active if j.priority == top]
+            return (1 - self.min_share) * job.weight / sum(j.weight for j in winners)
+        return self.min_share * job.weight / sum(j.weight for j in lower)
+
+    def job_rate(self, job_id):
+        """
+        Bieżący limit zadania w bajtach/s (None = bez limitu)
+
+        Dla procesów zewnętrznych (aria2c), których nie spowolni czekanie
+        w hooku postępu - limit przekazywany przy starcie procesu.
+        """
+        rate = self.current_rate()
+        if not rate:
+            return None
+        with self._lock:
+            if job_id not in self._jobs:
+                return rate
+            return max(1.0, rate * self._share(job_id, self._clock()))
+
+    def consume(self, job_id, nbytes, cancel_event=None):
+        """
+        Pobranie `nbytes` tokenów - czeka, jeśli zadanie przekroczyło udział.
+
+        Returns:
+            float: Czas oczekiwania w sekundach
+        """
+        rate = self.current_rate()
+        if not rate or nbytes <= 0:
+            return 0.0
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return 0.0
+            now = self._clock()
+            job_rate = max(1.0, rate * self._share(job_id, now))
+            capacity = job_rate * self.burst
+            job.tokens = min(capacity, job.tokens + (now - job.updated) * job_rate) - nbytes
+            job.updated = now
+            job.last_active = now
+            job.consumed += nbytes
+            delay = -job.tokens / job_rate if job.tokens < 0 else 0.0
+            job.waited += delay
+        if delay > 0:
+            if cancel_event is not None:
+                # Anulowanie przerywa oczekiwanie natychmiast
+                cancel_event.wait(delay)
+            else:
+                time.sleep(delay)
+        return delay
+
+    def progress_hook(self, job_id, cancel_event=None):
+        """Hook postępu yt-dlp naliczający pobrane bajty zadania"""
+        last = {}
+
+        def hook(d):
+            if d.get('status') != 'downloading':
+                return
+            filename = d.get('filename')
+            downloaded = d.get('downloaded_bytes') or 0
+            delta = downloaded - last.get(filename, downloaded)
+            last[filename] = downloaded
+            self.consume(job_id, delta, cancel_event)
+        return hook
+
+    def stats(self):
+        """Stan ogranicznika: limit i udziały zadań"""
+        with self._lock:
+            now = self._clock()
+            rate = self.current_rate()
+            return {
+                'rate': rate,
+                'jobs': {
+                    job_id: {
+                        'priority': job.priority,
+                        'weight': job.weight,
+                        'share': self._share(job_id, now),
+                        'consumed_bytes': job.consumed,
+                        'waited': round(job.waited, 3),
+                    }
+                    for job_id, job in self._jobs.items()
+                },
+            }
+
+
+def load_bandwidth_config(path=CONFIG_PATH):
+    """Limit i profile godzinowe z pliku ustawień przepustowości"""
+    if not path or not os.path.exists(path):
+        return None, []
+    try:
+        with open(path, 'r') as f:
+            config = json.load(f)
+        return config.get('bandwidth_limit'), config.get('bandwidth_profiles') or []
+    except (OSError, ValueError) as e:
+        logging.debug(f"Bandwidth config load failed: {e}")
+        return None, []
+
+
+_default_scheduler = None
+_default_scheduler_lock = threading.Lock()
+
+
+def get_bandwidth_scheduler():
+    """Współdzielony (na proces) ogranicznik przepustowości"""
+    global _default_scheduler
+    with _default_scheduler_lock:
+        if _default_scheduler is None:
+            rate, profiles = load_bandwidth_config()
+            try:
+                _default_scheduler = BandwidthScheduler(rate=rate, profiles=profiles)
+            except (TypeError, ValueError) as e:
+                logging.warning(f"⚠️ Nieprawidłowe profile przepustowości w konfiguracji: {e}")
+                _default_scheduler = BandwidthScheduler(rate=rate)
+        return _default_scheduler
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+YouTube Downloader v1.3.0 - Video Metadata Cache
+
+Two-level cache for video metadata keyed by YouTube video ID.
+Part of the modular architecture introduced in v1.2.0.
+
+Features:
+- In-memory LRU layer for instant repeat lookups
+- Persistent SQLite store shared between runs
+- TTL with stale-while-revalidate refresh in the background
+- Size-based eviction of the on-disk store
+
+Architecture: Dual-Repository Workflow v1.2.0
+"""
+
+import copy
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from .utils import CACHE_DIR, ensure_parent_dir
+
+DEFAULT_CACHE_PATH = os.path.join(CACHE_DIR, "info-cache.sqlite3")
+
+
+class VideoInfoCache:
+    """
+    Cache informacji o filmach: LRU w pamięci + SQLite na dysku.
+
+    Wpis jest świeży przez `ttl` sekund, a potem przez `stale_ttl` sekund
+    może być zwracany jako nieaktualny, podczas gdy odświeżanie działa w tle.
+    """
+
+    def __init__(self, db_path=DEFAULT_CACHE_PATH, max_entries=256,
+                 max_disk_bytes=64 * 1024 * 1024, ttl=3600, stale_ttl=24 * 3600):
+        """Inicjalizacja cache"""
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.max_disk_bytes = max_disk_bytes
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._memory = OrderedDict()
+        self._lock = threading.RLock()
+        self._conn = None
+        self._refreshing = set()
+
+    def _get_conn(self):
+        """Leniwe otwarcie bazy SQLite (None jeśli dysk niedostępny)"""
+        if self._conn is None and self.db_path:
+            try:
+                ensure_parent_dir(self.db_path)
+                conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=5)
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS info_cache ("
+                    " key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL,"
+                    " created REAL NOT NULL, accessed REAL NOT NULL)"
+                )
+                conn.commit()
+                self._conn = conn
+            except (sqlite3.Error, OSError) as e:
+                logging.warning(f"⚠️ Cache na dysku niedostępny ({self.db_path}): {e}")
+                self.db_path = None
+        return self._conn
+
+    def lookup(self, key):
+        """
+        Wyszukanie wpisu w cache.
+
+        Returns:
+            tuple: (wartość lub None, czy_świeży)
+        """
+        if not key:
+            return None, False
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None:
+                entry = self._load_from_disk(key)
+                if entry is not None:
+                    self._remember(key, entry)
+            else:
+                self._memory.move_to_end(key)
+
+            if entry is None:
+                return None, False
+
+            value, created = entry
+            age = now - created
+            if age > self.ttl + self.stale_ttl:
+                self._delete(key)
+                return None, False
+            # Głęboka kopia - zmiany w formats / info_dict u wywołującego nie psują wpisu
+            return copy.deepcopy(value), age <= self.ttl
+
+    def get(self, key):
+        """Zwraca tylko świeży wpis (bez wpisów nieaktualnych)"""
+        value, fresh = self.lookup(key)
+        return value if fresh else None
+
+    def put(self, key, value):
+        """Zapisanie wpisu w cache"""
+        if not key or value is None:
+            return
+        now = time.time()
+        with self._lock:
+            # Kopia - późniejsze zmiany słownika u wywołującego nie trafiają do cache
+            self._remember(key, (copy.deepcopy(value), now))
+            conn = self._get_conn()
+            if conn is None:
+                return
+            try:
+                payload = json.dumps(value, default=str)
+                conn.execute(
+                    "INSERT OR REPLACE INTO info_cache (key, value, size, created, accessed)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    (key, payload, len(payload), now, now),
+                )
+                self._evict_disk(conn)
+                conn.commit()
+            except (sqlite3.Error, TypeError, ValueError) as e:
+                logging.debug(f"Cache write failed for {key}: {e}")
+
+    def invalidate(self, key):
+        """Usunięcie wpisu z cache"""
+        with self._lock:
+            self._delete(key)
+
+    def clear(self):
+        """Wyczyszczenie całego cache"""
+        with self._lock:
+            self._memory.clear()
+            conn = self._get_conn()
+            if conn is not None:
+                conn.execute("DELETE FROM info_cache")
+                conn.commit()
+
+    def revalidate(self, key, fetch):
+        """
+        Odświeżenie wpisu w tle (stale-while-revalidate).
+
+        Args:
+            key (str): Klucz wpisu
+            fetch (callable): Funkcja zwracająca nową wartość
+        """
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def worker():
+            try:
+                self.put(key, fetch())
+                logging.info(f"🔄 Odświeżono cache dla {key}")
+            except Exception as e:
+                logging.debug(f"Cache revalidation failed for {key}: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=worker, daemon=True).start()
+
+    def _remember(self, key, entry):
+        """Dodanie wpisu do warstwy LRU w pamięci"""
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _load_from_disk(self, key):
+        """Odczyt wpisu z SQLite"""
+        conn = self._get_conn()
+        if conn is None:
+            return None
+        try:
+            row = conn.execute(
+                "SELECT value, created FROM info_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute("UPDATE info_cache SET accessed = ? WHERE key = ?", (time.time(), key))
+            conn.commit()
+            return json.loads(row[0]), row[1]
+        except (sqlite3.Error, ValueError) as e:
+            logging.debug(f"Cache read failed for {key}: {e}")
+            return None
+
+    def _delete(self, key):
+        """Usunięcie wpisu z obu warstw"""
+        self._memory.pop(key, None)
+        conn = self._get_conn()
+        if conn is not None:
+            conn.execute("DELETE FROM info_cache WHERE key = ?", (key,))
+            conn.commit()
+
+    def _evict_disk(self, conn):
+        """Usuwanie najdawniej używanych wpisów po przekroczeniu limitu rozmiaru"""
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM info_cache").fetchone()[0]
+        if total <= self.max_disk_bytes:
+            return
+        rows = conn.execute("SELECT key, size FROM info_cache ORDER BY accessed ASC").fetchall()
+        for key, size in rows:
+            if total <= self.max_disk_bytes:
+                break
+            conn.execute("DELETE FROM info_cache WHERE key = ?", (key,))
+            self._memory.pop(key, None)
+            total -= size
+
+    def close(self):
+        """Zamknięcie połączenia z bazą"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_info_cache():
+    """Współdzielona (na proces) instancja cache"""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = VideoInfoCache()
+        return _default_cache
@@ -15,24 +15,138 @@ Architecture: Dual-Repository Workflow v1.2.0
 """
 
 import os
+import copy
+import time
+import uuid
 import threading
 import logging
-import yt_dlp
+from functools import lru_cache
 from pathlib import Path
-from .utils import sanitize_filename
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from urllib.parse import urlparse, parse_qs
+from .utils import parse_youtube_id, format_variant
 from .translations import t
+from .cache import get_info_cache
+from .scoreboard import get_client_scoreboard
+from .journal import DownloadJournal, journal_postprocessor_class
+from .progress import ProgressBus, ProgressTracker, make_progress_event
+from .toolchain import get_toolchain
+from .backends import build_backend_opts
+from .fragments import get_fragment_controller
+from .bandwidth import PRIORITY_NORMAL, get_bandwidth_scheduler
+from .archive import get_download_archive
+from .paths import get_path_planner
+from .pool import get_ytdl_pool
+from .formats import catalog_for, catalog_format_selector, parse_height
+from .startup import lazy_import
+
+# yt-dlp ładowany przy pierwszym użyciu - import kosztuje więcej niż cały start aplikacji
+yt_dlp = lazy_import('yt_dlp')
+
+# Tylko ekstraktory YouTube - pełny zestaw (~1700) wydłuża każde YoutubeDL(...) o ~100 ms
+YOUTUBE_EXTRACTORS = ['youtube', r'youtube:.*']
+
+# Opcje zadania przy pobieraniu samych informacji o filmie
+INFO_OPTS = {'quiet': True, 'no_warnings': True, 'extract_flat': False}
+
+# Profil mobilny dla listy formatów i walidacji URL
+MOBILE_PROFILE = 'Mobile Formats'
+
+
+@lru_cache(maxsize=None)
+def callback_postprocessor_class():
+    """Klasa postprocesora z wywołaniem zwrotnym (tworzona po załadowaniu yt-dlp)"""
+    from yt_dlp.postprocessor.common import PostProcessor
+
+    class _CallbackPostProcessor(PostProcessor):
+        """Postprocesor wywołujący funkcję z info dict (np. przed pobieraniem)"""
+
+        def __init__(self, callback):
+            super().__init__()
+            self.callback = callback
+
+        def run(self, info):
+            self.callback(info)
+            return [], info
+
+    return _CallbackPostProcessor
+
+
+def __getattr__(name):
+    # Zgodność wsteczna: klasa dziedzicząca po yt-dlp dostępna jako atrybut modułu
+    if name == '_CallbackPostProcessor':
+        return callback_postprocessor_class()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 class YouTubeDownloader:
-    def __init__(self):
-        """Inicjalizacja downloadera"""
-        self._cancel_event = threading.Event()
+    def __init__(self, info_cache=None, scoreboard=None, hedge_delay=None, progress_bus=None,
+                 toolchain=None, backend=None, fragment_controller=None, bandwidth=None, quiet=False,
+                 archive=None, path_planner=None, pool=None, cancel_event=None):
+        """
+        Inicjalizacja downloadera
+
+        Args:
+            hedge_delay (float): Budżet opóźnienia dla równoległych prób klientów
+                w get_video_info (None = próby po kolei, 0 = wszystkie naraz)
+            toolchain (Toolchain): Wynik sondowania ffmpeg/aria2c (None = współdzielony w procesie)
+            backend (str): Domyślny backend pobierania ('native' lub 'aria2c')
+            fragment_controller: Sterownik równoległości fragmentów (None = współdzielony w procesie)
+            bandwidth (BandwidthScheduler): Ogranicznik przepustowości (None = współdzielony w procesie)
+            quiet (bool): Bez wyjścia yt-dlp na konsolę podczas pobierania (tryb wsadowy, serwer)
+            archive (DownloadArchive): Archiwum pobranych filmów (None = współdzielone w procesie)
+            path_planner (OutputPathPlanner): Planer ścieżek plików (None = współdzielony w procesie)
+            pool (YoutubeDLPool): Pula instancji YoutubeDL (None = współdzielona w procesie)
+            cancel_event: Token anulowania (np. zadania menedżera lub Event między
+                procesami; None = własny threading.Event)
+        """
+        self._cancel_event = cancel_event if cancel_event is not None else threading.Event()
         self.current_download = None
+        # Cache metadanych współdzielony w procesie (LRU + SQLite)
+        self.info_cache = info_cache if info_cache is not None else get_info_cache()
+        # Statystyki klientów ustalające kolejność prób
+        self.scoreboard = scoreboard if scoreboard is not None else get_client_scoreboard()
+        self.hedge_delay = hedge_delay
+        # Szyna zdarzeń postępu (GUI, CLI i inni subskrybenci)
+        self.progress_bus = progress_bus if progress_bus is not None else ProgressBus()
+        # Możliwości narzędzi zewnętrznych - sondowane leniwie przy pierwszym pobieraniu
+        self._toolchain = toolchain
+        self.backend = backend
+        # Liczba równoległych fragmentów DASH/HLS dobierana do przepustowości
+        self.fragment_controller = (fragment_controller if fragment_controller is not None
+                                    else get_fragment_controller())
+        # Wspólny limit przepustowości wszystkich zadań w procesie
+        self.bandwidth = bandwidth if bandwidth is not None else get_bandwidth_scheduler()
+        self.quiet = quiet
+        # Indeks ukończonych pobrań - pomijanie filmów, które już są na dysku
+        self.archive = archive if archive is not None else get_download_archive()
+        # Nazwy plików ustalane i rezerwowane przed pobieraniem (bez kolizji między zadaniami)
+        self.path_planner = path_planner if path_planner is not None else get_path_planner()
+        # Gotowe instancje YoutubeDL per profil klienta (bez budowy przy każdej próbie)
+        self.pool = pool if pool is not None else get_ytdl_pool()
+
+    @property
+    def toolchain(self):
+        """Możliwości ffmpeg/ffprobe/aria2c (sondowanie raz na proces)"""
+        if self._toolchain is None:
+            self._toolchain = get_toolchain()
+        return self._toolchain
         
     def _get_client_configs(self):
         """
         Zwraca ustandaryzowane konfiguracje klientów YouTube.
         Używane konsekwentnie przez get_video_info i download_video.
+        Kolejność ustala tablica wyników (skuteczność i czas ekstrakcji).
         """
+        return self.scoreboard.order(self._default_client_configs())
+
+    @staticmethod
+    def _profile_opts(config):
+        """Opcje profilu klienta w puli (czytane przy budowie instancji YoutubeDL)"""
+        return {'allowed_extractors': YOUTUBE_EXTRACTORS, **config['opts']}
+
+    def _default_client_configs(self):
+        """Domyślna kolejność klientów: Android TV, iOS, Android"""
         return [
             {
                 'name': 'Android TV Client',
@@ -71,112 +185,261 @@ class YouTubeDownloader:
             }
         ]
         
-    def get_video_info(self, url):
-        """Pobieranie informacji o filmie"""
-        # Użyj standardowych konfiguracji klientów
-        base_configs = self._get_client_configs()
-        
-        # Dodaj specyficzne opcje dla pobierania informacji
-        configs = []
-        for config in base_configs:
-            info_config = {
-                'name': config['name'],
-                'opts': {
-                    'quiet': True,
-                    'no_warnings': True,
-                    'extract_flat': False,
-                    **config['opts']  # Dodaj opcje z base config
-                }
-            }
-            configs.append(info_config)
+    def get_video_info(self, url, use_cache=True, hedge_delay=None):
+        """Pobieranie informacji o filmie (z cache po ID filmu)"""
+        video_id = parse_youtube_id(url) if use_cache else None
+        if video_id:
+            cached, fresh = self.info_cache.lookup(video_id)
+            if cached is not None:
+                if not fresh:
+                    # Zwróć nieaktualny wpis od razu, odśwież w tle
+                    self.info_cache.revalidate(video_id, lambda: self._extract_video_info(url))
+                logging.info(f"⚡ Informacje o filmie {video_id} z cache")
+                return cached
+
+        video_info = self._extract_video_info(url, hedge_delay)
+        if video_id:
+            self.info_cache.put(video_id, video_info)
+        return video_info
+
+    def _extract_video_info(self, url, hedge_delay=None):
+        """Ekstrakcja informacji o filmie przez kolejne klienty"""
+        # Użyj standardowych konfiguracji klientów (opcje pobierania informacji: INFO_OPTS)
+        configs = self._get_client_configs()
         
-        # Próbuj każdą konfigurację
-        for config in configs:
-            try:
-                logging.info(f"🔄 Próba z {config['name']}...")
-                with yt_dlp.YoutubeDL(config['opts']) as ydl:
-                    info = ydl.extract_info(url, download=False)
-                
-                    # Przygotowanie informacji
-                    video_info = {
-                        'title': info.get('title', t('Nieznany tytuł')),
-                        'duration': self._format_duration(info.get('duration', 0)),
-                        'description': info.get('description', ''),
-                        'formats': info.get('formats', []),
-                        'thumbnail': info.get('thumbnail', ''),
-                        'uploader': info.get('uploader', t('Nieznany autor')),
-                        'view_count': info.get('view_count', 0),
-                        'upload_date': info.get('upload_date', ''),
-                    }
-                    
-                    logging.info(f"✅ {config['name']} zadziałał!")
-                    return video_info
-                    
-            except Exception as e:
-                logging.warning(f"❌ {config['name']} nie zadziałał: {str(e)[:100]}...")
-                continue
+        if hedge_delay is None:
+            hedge_delay = self.hedge_delay
+        if hedge_delay is not None:
+            video_info = self._extract_video_info_hedged(url, configs, hedge_delay)
+            if video_info:
+                return video_info
+        else:
+            # Próbuj każdą konfigurację
+            for config in configs:
+                try:
+                    return self._extract_with_client(url, config)
+                except Exception:
+                    continue
                 
         # Jeśli żadna konfiguracja nie zadziałała
         raise Exception(t("Nie udało się pobrać informacji o filmie żadną z dostępnych metod. YouTube może blokować dostęp z Twojego IP."))
+
+    def _extract_with_client(self, url, config):
+        """Pojedyncza próba ekstrakcji informacji danym klientem"""
+        started = time.monotonic()
+        try:
+            logging.info(f"🔄 Próba z {config['name']}...")
+            with self.pool.checkout(config['name'], self._profile_opts(config), INFO_OPTS) as ydl:
+                info = ydl.sanitize_info(ydl.extract_info(url, download=False), remove_private_keys=True)
             
-    def download_video(self, url, output_dir, resolution=None, audio_only=False, progress_callback=None):
-        """Pobieranie filmu"""
+                # Przygotowanie informacji
+                video_info = {
+                    'title': info.get('title', t('Nieznany tytuł')),
+                    'duration': self._format_duration(info.get('duration', 0)),
+                    'description': info.get('description', ''),
+                    'chapters': info.get('chapters') or [],
+                    'formats': info.get('formats', []),
+                    'thumbnail': info.get('thumbnail', ''),
+                    'uploader': info.get('uploader', t('Nieznany autor')),
+                    'view_count': info.get('view_count', 0),
+                    'upload_date': info.get('upload_date', ''),
+                    # Pełny info dict do ponownego użycia w download_video
+                    'info_dict': info,
+                    'client': config['name'],
+                }
+                
+                logging.info(f"✅ {config['name']} zadziałał!")
+                self.scoreboard.record_success(config['name'], time.monotonic() - started)
+                return video_info
+                
+        except Exception as e:
+            logging.warning(f"❌ {config['name']} nie zadziałał: {str(e)[:100]}...")
+            self.scoreboard.record_failure(config['name'], e, time.monotonic() - started)
+            raise
+
+    def _extract_video_info_hedged(self, url, configs, hedge_delay):
+        """
+        Ekstrakcja z asekuracją (hedging): startuje preferowany klient, a kolejny
+        dołącza, gdy w ciągu `hedge_delay` sekund nie ma odpowiedzi (lub od razu
+        po błędzie). Wygrywa pierwszy udany wynik, reszta jest anulowana.
+        hedge_delay=0 uruchamia wszystkie klienty naraz.
+        """
+        remaining = list(configs)
+        executor = ThreadPoolExecutor(max_workers=len(configs), thread_name_prefix='ytdl-hedge')
+        pending = set()
+        try:
+            while remaining or pending:
+                # Uruchom kolejnego klienta (wszystkich przy hedge_delay=0)
+                launch = len(remaining) if hedge_delay <= 0 else 1
+                for config in remaining[:launch]:
+                    pending.add(executor.submit(self._extract_with_client, url, config))
+                del remaining[:launch]
+                
+                # Czekaj na wynik; po upływie budżetu startuje kolejny klient
+                while pending:
+                    done, pending = wait(pending, timeout=hedge_delay if remaining else None,
+                                         return_when=FIRST_COMPLETED)
+                    for future in done:
+                        if future.exception() is None:
+                            logging.info(f"🏁 Hedged: wygrał {future.result()['client']}")
+                            return future.result()
+                    if remaining:
+                        break
+            return None
+        finally:
+            # Nie czekaj na przegranych - ich wyniki zostaną odrzucone
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def download_video(self, url, output_dir, resolution=None, audio_only=False, progress_callback=None,
+                       info=None, job_id=None, backend=None, priority=PRIORITY_NORMAL, weight=1.0,
+                       skip_existing=True):
+        """
+        Pobieranie filmu
+
+        Args:
+            progress_callback (callable): Subskrybent zdarzeń postępu (dict) na
+                szynie postępu - wywoływany z ograniczoną częstotliwością
+            info (dict): Wynik get_video_info (lub surowy info dict) - jeśli linki
+                strumieni są nadal ważne, pobieranie pomija ponowną ekstrakcję
+            job_id: Identyfikator zadania w zdarzeniach postępu
+            backend (str): Backend pobierania dla tego zadania ('native' / 'aria2c',
+                None = domyślny downloadera)
+            priority (int): Priorytet zadania we wspólnym limicie przepustowości
+                (PRIORITY_INTERACTIVE / PRIORITY_NORMAL / PRIORITY_BACKGROUND)
+            weight (float): Waga zadania wśród zadań o tym samym priorytecie
+            skip_existing (bool): Pominięcie filmu, który jest w archiwum pobrań
+                i nadal leży na dysku (bez żadnego zapytania do YouTube)
+        """
+        if job_id is None:
+            job_id = uuid.uuid4().hex[:12]
+        token = self.progress_bus.subscribe(progress_callback, job_id) if progress_callback else None
+        tracker = ProgressTracker(job_id, ignored_postprocessors={
+            journal_postprocessor_class().pp_key(), callback_postprocessor_class().pp_key()})
+        video_id = parse_youtube_id(url) if url else None
+        variant = format_variant(resolution, audio_only)
+        self.bandwidth.register(job_id, weight, priority)
+        try:
+            record = self.archive.lookup(video_id, variant, output_dir) if skip_existing else None
+            if record:
+                logging.info(f"🗃️ Już pobrane, pomijam: {record['path']}")
+                result = self._archived_result(record)
+            else:
+                result = self._download_video(url, output_dir, resolution, audio_only, info, tracker,
+                                              backend or self.backend)
+                self.archive.add(video_id, variant, output_dir, result.get('full_path'), result.get('title'))
+            self.progress_bus.publish(tracker.done_event())
+            return result
+        finally:
+            self.progress_bus.flush(job_id)
+            if token is not None:
+                self.progress_bus.unsubscribe(token)
+            self.progress_bus.forget(job_id)
+            self.path_planner.release(job_id)
+            self.bandwidth.unregister(job_id)
+
+    def _download_video(self, url, output_dir, resolution, audio_only, info, tracker, backend=None):
+        """Pobieranie filmu - próby kolejnych klientów"""
+        
+        # Konwersja MP3 bez ffmpeg nie zadziała z żadnym klientem - przerwij od razu
+        if audio_only and not self.toolchain.can_extract_mp3:
+            raise Exception(t("FFmpeg nie jest zainstalowany. Konwersja MP3 wymaga FFmpeg."))
         
         # Użyj standardowych konfiguracji klientów dla pobierania
         download_configs = self._get_client_configs()
         
+        # Dziennik zadań - wznowienie przerwanego pobierania tym samym klientem i formatem
+        journal = DownloadJournal(output_dir)
+        job_key = journal.make_key(url, resolution, audio_only)
+        resume = journal.get_resumable(job_key)
+        if resume:
+            logging.info(f"♻️ Wznawianie przerwanego pobierania ({resume['client']}, format {resume.get('format')})")
+            download_configs.sort(key=lambda c: c['name'] != resume['client'])
+        attempt = {'client': None}
+        
         # Bazowe opcje dla wszystkich klientów
+        progress_hooks = [lambda d: self._progress_hook(d, tracker.job_id, tracker)]
+        if job_key:
+            progress_hooks.append(lambda d: journal.update_from_progress(job_key, d))
+        fragments = self.fragment_controller.session()
+        progress_hooks.append(fragments.progress_hook)
+        progress_hooks.append(self.bandwidth.progress_hook(tracker.job_id, self._cancel_event))
         base_opts = {
-            'outtmpl': os.path.join(output_dir, '%(title)s.%(ext)s'),
-            'progress_hooks': [lambda d: self._progress_hook(d, progress_callback)],
+            # Nazwa z planera ścieżek (ustawiana po wyborze formatu), tytuł jako rezerwa
+            'outtmpl': os.path.join(output_dir, '%(planned_filename,title)s.%(ext)s'),
+            'progress_hooks': progress_hooks,
+            'postprocessor_hooks': [lambda d: self._postprocessor_hook(d, tracker)],
+            'continuedl': True,  # Wznawianie z plików .part
             'extractor_retries': 1,  # Tylko 1 retry per client
             'retry_sleep_functions': {'http': lambda n: 2},
             'skip_unavailable_fragments': True,
             'fragment_retries': 3,
             'abort_on_unavailable_fragments': False,
+            'concurrent_fragment_downloads': fragments.level,
         }
+        if self.quiet:
+            base_opts.update({'quiet': True, 'no_warnings': True, 'noprogress': True})
+
+        def plan_output(info):
+            # Rozszerzenie pliku końcowego znane dopiero po wyborze formatu (scalenie / MP3)
+            ext = 'mp3' if audio_only else info.get('ext')
+            # Ponowne pobranie tego samego filmu i wariantu trafia do tego samego pliku
+            previous = self.archive.get(info.get('id'), format_variant(resolution, audio_only), output_dir)
+            path = self.path_planner.reserve(output_dir, info.get('title') or info.get('id'), ext,
+                                             owner=tracker.job_id, existing=previous and previous['path'])
+            info['planned_filename'] = os.path.basename(path)[:-len(ext) - 1] if ext else os.path.basename(path)
+        # Backend pobierania (np. aria2c z wieloma połączeniami na plik) - proces
+        # zewnętrzny dostaje udział zadania we wspólnym limicie z chwili startu
+        base_opts.update(build_backend_opts(backend, self.toolchain,
+                                            ratelimit=self.bandwidth.job_rate(tracker.job_id)))
+        
+        # Ponowne użycie wcześniej pobranego info dict (bez drugiej ekstrakcji)
+        if info:
+            raw_info = info.get('info_dict', info)
+            if raw_info.get('id') != parse_youtube_id(url):
+                # Informacje sprawdzone dla innego linku - nie pobieraj innego filmu
+                logging.info("🔄 Informacje dotyczą innego filmu - ponowna ekstrakcja")
+            elif self._info_is_fresh(raw_info):
+                preferred_client = resume['client'] if resume else info.get('client')
+                config = next((c for c in download_configs if c['name'] == preferred_client),
+                              download_configs[0])
+                try:
+                    logging.info(f"⚡ Pobieranie z gotowych informacji ({config['name']})...")
+                    ydl_opts = self._build_download_opts(base_opts, config, resolution, audio_only, resume)
+                    attempt['client'] = config['name']
+                    with self.pool.checkout(config['name'], self._profile_opts(config), ydl_opts) as ydl:
+                        self.current_download = ydl
+                        self._attach_hooks(ydl, journal, job_key, attempt, tracker, plan_output)
+                        result_info = ydl.process_ie_result(copy.deepcopy(raw_info), download=True)
+                        logging.info(f"✅ {config['name']} - pobieranie zakończone pomyślnie!")
+                        journal.complete(job_key)
+                        return self._build_result(ydl, result_info, audio_only)
+                except Exception as e:
+                    if self._cancel_event.is_set():
+                        raise Exception(t("Pobieranie zostało anulowane"))
+                    base_opts['concurrent_fragment_downloads'] = fragments.record_failure(e)
+                    logging.warning(f"❌ Gotowe informacje nie zadziałały, ponowna ekstrakcja: {str(e)[:100]}...")
+            else:
+                logging.info("🔄 Linki strumieni wygasły - ponowna ekstrakcja")
         
         # Próbuj każdy klient
         for config in download_configs:
             try:
                 logging.info(f"🔄 Pobieranie z {config['name']}...")
                 
-                # Połącz bazowe opcje z opcjami klienta
-                ydl_opts = {**base_opts, **config['opts']}
-                
-                # Konfiguracja formatu
-                if audio_only:
-                    ydl_opts['format'] = 'bestaudio[ext=mp3]/bestaudio'
-                    ydl_opts['postprocessors'] = [{
-                        'key': 'FFmpegExtractAudio',
-                        'preferredcodec': 'mp3',
-                        'preferredquality': '192',
-                    }]
-                    # Sprawdź czy ffmpeg jest dostępny
-                    if not os.system('which ffmpeg >/dev/null 2>&1') == 0:
-                        raise Exception(t("FFmpeg nie jest zainstalowany. Konwersja MP3 wymaga FFmpeg."))
-                else:
-                    # Ulepszona logika wyboru formatu dla wideo
-                    ydl_opts['format'] = self._get_video_format_selector(resolution)
+                # Połącz bazowe opcje z opcjami klienta i konfiguracją formatu
+                ydl_opts = self._build_download_opts(base_opts, config, resolution, audio_only, resume)
+                attempt['client'] = config['name']
                         
-                # Pobieranie
-                with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+                # Pobieranie (instancja z puli, opcje zadania nakładane na profil klienta)
+                with self.pool.checkout(config['name'], self._profile_opts(config), ydl_opts) as ydl:
                     self.current_download = ydl
+                    self._attach_hooks(ydl, journal, job_key, attempt, tracker, plan_output)
                     info = ydl.extract_info(url, download=True)
                     
-                    # Przygotowanie wyniku
-                    filename = ydl.prepare_filename(info)
-                    if audio_only and not filename.endswith('.mp3'):
-                        filename = filename.rsplit('.', 1)[0] + '.mp3'
-                        
                     logging.info(f"✅ {config['name']} - pobieranie zakończone pomyślnie!")
-                    return {
-                        'filename': os.path.basename(filename),
-                        'full_path': filename,
-                        'title': info.get('title', t('Nieznany tytuł')),
-                        'duration': info.get('duration', 0),
-                        'filesize': os.path.getsize(filename) if os.path.exists(filename) else 0,
-                    }
+                    self.scoreboard.record_success(config['name'])
+                    journal.complete(job_key)
+                    return self._build_result(ydl, info, audio_only)
                     
             except Exception as e:
                 error_msg = str(e)
@@ -185,6 +448,9 @@ class YouTubeDownloader:
                 # Sprawdź czy to błąd anulowania
                 if self._cancel_event.is_set():
                     raise Exception(t("Pobieranie zostało anulowane"))
+                self.scoreboard.record_failure(config['name'], error_msg)
+                # Ograniczanie (403/429/timeout) - mniej równoległych fragmentów w kolejnej próbie
+                base_opts['concurrent_fragment_downloads'] = fragments.record_failure(error_msg)
                 
                 # Sprawdź czy to błędy YouTube lub formatów - spróbuj następny klient
                 format_errors = [
@@ -206,19 +472,15 @@ class YouTubeDownloader:
                             fallback_opts = {**ydl_opts}
                             fallback_opts['format'] = 'best'  # Najprostszy możliwy format
                             
-                            with yt_dlp.YoutubeDL(fallback_opts) as ydl_fallback:
+                            with self.pool.checkout(config['name'], self._profile_opts(config),
+                                                    fallback_opts) as ydl_fallback:
                                 self.current_download = ydl_fallback
+                                self._attach_hooks(ydl_fallback, journal, job_key, attempt, tracker, plan_output)
                                 info = ydl_fallback.extract_info(url, download=True)
                                 
-                                filename = ydl_fallback.prepare_filename(info)
                                 logging.info(f"✅ {config['name']} - fallback format worked!")
-                                return {
-                                    'filename': os.path.basename(filename),
-                                    'full_path': filename,
-                                    'title': info.get('title', t('Nieznany tytuł')),
-                                    'duration': info.get('duration', 0),
-                                    'filesize': os.path.getsize(filename) if os.path.exists(filename) else 0,
-                                }
+                                journal.complete(job_key)
+                                return self._build_result(ydl_fallback, info, False)
                         except Exception:
                             pass  # Fallback też nie zadziałał, spróbuj następny klient
                     
@@ -229,18 +491,172 @@ class YouTubeDownloader:
         self._cancel_event.clear()
         raise Exception(t("Nie udało się pobrać filmu żadnym z dostępnych klientów. YouTube może blokować dostęp lub film może być niedostępny."))
             
-    def _progress_hook(self, d, callback):
-        """Hook do śledzenia postępu pobierania"""
+    def _build_download_opts(self, base_opts, config, resolution, audio_only, resume=None):
+        """
+        Połączenie bazowych opcji z opcjami klienta i konfiguracją formatu
+
+        Format wideo wybiera katalog formatów (catalog_format_selector) na
+        każdej ścieżce - z gotowego info dict i po ponownej ekstrakcji.
+        """
+        ydl_opts = {**base_opts, **config['opts']}
+        toolchain = self.toolchain
+        if toolchain.has('ffmpeg'):
+            ydl_opts['ffmpeg_location'] = toolchain.path('ffmpeg')
+        
+        if audio_only:
+            ydl_opts['format'] = 'bestaudio[ext=mp3]/bestaudio'
+            ydl_opts['postprocessors'] = [{
+                'key': 'FFmpegExtractAudio',
+                'preferredcodec': 'mp3',
+                'preferredquality': '192',
+            }]
+        else:
+            if not toolchain.can_merge:
+                logging.warning("⚠️ Brak ffmpeg - wybór ograniczony do formatów bez łączenia strumieni")
+            ydl_opts['format'] = catalog_format_selector(parse_height(resolution), can_merge=toolchain.can_merge)
+        
+        # Wznowienie: te same ID formatów co w przerwanym pobieraniu
+        if resume and resume.get('format') and resume.get('client') == config['name']:
+            ydl_opts['format'] = resume['format']
+        return ydl_opts
+
+    def _attach_hooks(self, ydl, journal, job_key, attempt, tracker, plan_output=None):
+        """Rejestracja postprocesorów: ścieżka wynikowa ('video'), plan strumieni i dziennik zadań ('before_dl')"""
+        # Każda próba (klient, fallback) liczy postęp od zera
+        tracker.reset()
+        callback_pp = callback_postprocessor_class()
+        if plan_output is not None:
+            ydl.add_post_processor(callback_pp(plan_output), when='video')
+        ydl.add_post_processor(callback_pp(tracker.plan), when='before_dl')
+        if job_key:
+            ydl.add_post_processor(journal_postprocessor_class()(journal, job_key, attempt), when='before_dl')
+
+    def _archived_result(self, record):
+        """Wynik pobierania dla filmu z archiwum (plik już jest na dysku)"""
+        return {
+            'filename': os.path.basename(record['path']),
+            'full_path': record['path'],
+            'title': record['title'] or t('Nieznany tytuł'),
+            'duration': 0,
+            'filesize': record['size'],
+            'skipped': True,
+        }
+
+    def _build_result(self, ydl, info, audio_only):
+        """Przygotowanie wyniku pobierania"""
+        # Faktyczna ścieżka po scaleniu/konwersji (ustawiana przez yt-dlp po postprocesorach)
+        downloads = info.get('requested_downloads') or []
+        filename = downloads[-1].get('filepath') if downloads else None
+        if not filename:
+            filename = ydl.prepare_filename(info)
+            if audio_only and not filename.endswith('.mp3'):
+                filename = filename.rsplit('.', 1)[0] + '.mp3'
+        
+        return {
+            'filename': os.path.basename(filename),
+            'full_path': filename,
+            'title': info.get('title', t('Nieznany tytuł')),
+            'duration': info.get('duration', 0),
+            'filesize': os.path.getsize(filename) if os.path.exists(filename) else 0,
+        }
+
+    def _info_is_fresh(self, info, margin=300):
+        """
+        Sprawdzenie czy linki strumieni w info dict są nadal ważne.
+
+        YouTube podpisuje linki parametrem `expire` (timestamp); bez niego
+        zakładamy ważność przez 5h od czasu ekstrakcji (`epoch`).
+        """
+        if not info or not info.get('formats'):
+            return False
+        now = time.time()
+        expiries = []
+        for fmt in info['formats']:
+            fmt_url = fmt.get('url') or ''
+            if 'expire' not in fmt_url:
+                continue
+            query = parse_qs(urlparse(fmt_url).query)
+            expire = query.get('expire', [None])[0]
+            if expire and expire.isdigit():
+                expiries.append(int(expire))
+        if expiries:
+            return min(expiries) - margin > now
+        epoch = info.get('epoch')
+        return bool(epoch) and epoch + 5 * 3600 - margin > now
+
+    def iter_playlist_entries(self, url):
+        """
+        Leniwe rozwijanie playlisty lub kanału.
+
+        Płaska ekstrakcja (extract_flat) zwraca generator wpisów - kolejne
+        strony listy są pobierane dopiero gdy konsument ich potrzebuje,
+        więc pierwsze pobieranie może ruszyć przed końcem listowania.
+
+        Yields:
+            dict: {'id', 'url', 'title'} dla każdego filmu
+        """
+        ydl_opts = {
+            'quiet': True,
+            'no_warnings': True,
+            'extract_flat': 'in_playlist',
+            'lazy_playlist': True,
+        }
+        
+        with self.pool.checkout('Playlist', {'allowed_extractors': YOUTUBE_EXTRACTORS}, ydl_opts) as ydl:
+            result = ydl.extract_info(url, download=False, process=False)
+            yield from self._iter_flat_entries(ydl, result)
+
+    def _iter_flat_entries(self, ydl, result):
+        """Iteracja po wpisach wyniku płaskiej ekstrakcji (z zagnieżdżonymi zakładkami)"""
+        if not result:
+            return
+        if result.get('_type') not in ('playlist', 'multi_video'):
+            if result.get('id'):
+                yield {
+                    'id': result['id'],
+                    'url': result.get('webpage_url') or result.get('url')
+                           or f"https://www.youtube.com/watch?v={result['id']}",
+                    'title': result.get('title'),
+                }
+            return
+        
+        for entry in result.get('entries') or []:
+            if self._cancel_event.is_set():
+                return
+            if not entry:
+                continue
+            # Zakładki kanału / zagnieżdżone playlisty - rozwiń rekurencyjnie
+            if entry.get('_type') == 'url' and entry.get('ie_key') == 'YoutubeTab':
+                nested = ydl.extract_info(entry['url'], download=False, process=False)
+                yield from self._iter_flat_entries(ydl, nested)
+                continue
+            if entry.get('_type') == 'playlist':
+                yield from self._iter_flat_entries(ydl, entry)
+                continue
+            video_id = entry.get('id')
+            if not video_id:
+                continue
+            yield {
+                'id': video_id,
+                'url': entry.get('url') or f"https://www.youtube.com/watch?v={video_id}",
+                'title': entry.get('title'),
+            }
+
+    def _progress_hook(self, d, job_id=None, tracker=None):
+        """Hook do śledzenia postępu pobierania - publikacja na szynie postępu"""
         if self._cancel_event.is_set():
             raise Exception(t("Pobieranie zostało anulowane"))
-        if d['status'] == 'downloading':
-            if 'total_bytes' in d and d['total_bytes']:
-                percentage = (d['downloaded_bytes'] / d['total_bytes']) * 100
-                if callback:
-                    callback(int(percentage))
-        elif d['status'] == 'finished':
-            if callback:
-                callback(100)
+        if d.get('status') in ('downloading', 'finished'):
+            event = tracker.update(d) if tracker else make_progress_event(d, job_id)
+            self.progress_bus.publish(event)
+
+    def _postprocessor_hook(self, d, tracker):
+        """Hook postprocessingu - fazy łączenia strumieni i konwersji"""
+        if self._cancel_event.is_set():
+            raise Exception(t("Pobieranie zostało anulowane"))
+        event = tracker.postprocessor_event(d)
+        if event:
+            self.progress_bus.publish(event)
                 
     def _format_duration(self, seconds):
         """Formatowanie czasu trwania"""
@@ -287,35 +703,35 @@ class YouTubeDownloader:
         except Exception as e:
             logging.error(f"{t('Błąd podczas zapisywania timestampów')}: {e}")
             
+    @staticmethod
+    def _mobile_profile_opts():
+        """Profil mobilny (get_available_formats, validate_url)"""
+        return {
+            # Mobilny user agent dla mweb client
+            'user_agent': 'Mozilla/5.0 (iPhone; CPU iPhone OS 17_0 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.0 Mobile/15E148 Safari/604.1',
+            'referer': 'https://m.youtube.com/',
+            'extractor_retries': 3,
+            'allowed_extractors': YOUTUBE_EXTRACTORS,
+            
+            # YouTube 2025 - spróbuj różnych klientów
+            'extractor_args': {
+                'youtube': {
+                    'player_client': ['ios', 'android'],  # Natywne klienty mobilne
+                    'skip': ['hls', 'dash'],
+                    'player_skip': ['configs', 'webpage'],  # Pomiń więcej requestów
+                }
+            },
+        }
+            
     def get_available_formats(self, url):
         """Pobieranie dostępnych formatów"""
         try:
-            ydl_opts = {
-                'quiet': True,
-                'no_warnings': True,
-                
-                # Mobilny user agent dla mweb client
-                'user_agent': 'Mozilla/5.0 (iPhone; CPU iPhone OS 17_0 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.0 Mobile/15E148 Safari/604.1',
-                'referer': 'https://m.youtube.com/',
-                'extractor_retries': 3,
-                
-                # YouTube 2025 - spróbuj różnych klientów
-                'extractor_args': {
-                    'youtube': {
-                        'player_client': ['ios', 'android'],  # Natywne klienty mobilne
-                        'skip': ['hls', 'dash'],
-                        'player_skip': ['configs', 'webpage'],  # Pomiń więcej requestów
-                    }
-                },
-            }
-            
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+            with self.pool.checkout(MOBILE_PROFILE, self._mobile_profile_opts(), INFO_OPTS) as ydl:
                 info = ydl.extract_info(url, download=False)
-                formats = info.get('formats', [])
                 
-                # Filtrowanie i sortowanie formatów
+                # Formaty z obrazem od najlepszego (katalog: wysokość, kontener, fps, bitrate)
                 video_formats = []
-                for fmt in formats:
+                for fmt in catalog_for(info).video_formats():
                     if fmt.get('height') and fmt.get('ext'):
                         video_formats.append({
                             'format_id': fmt.get('format_id', ''),
@@ -323,9 +739,6 @@ class YouTubeDownloader:
                             'ext': fmt.get('ext', ''),
                             'filesize': fmt.get('filesize', 0),
                         })
-                        
-                # Sortowanie po rozdzielczości
-                video_formats.sort(key=lambda x: int(x['resolution'].split('x')[1]), reverse=True)
                 
                 return video_formats
                 
@@ -335,68 +748,9 @@ class YouTubeDownloader:
     def validate_url(self, url):
         """Walidacja URL YouTube"""
         try:
-            ydl_opts = {
-                'quiet': True,
-                'no_warnings': True,
-                
-                # Mobilny user agent dla mweb client
-                'user_agent': 'Mozilla/5.0 (iPhone; CPU iPhone OS 17_0 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.0 Mobile/15E148 Safari/604.1',
-                'referer': 'https://m.youtube.com/',
-                'extractor_retries': 3,
-                
-                # YouTube 2025 - spróbuj różnych klientów
-                'extractor_args': {
-                    'youtube': {
-                        'player_client': ['ios', 'android'],  # Natywne klienty mobilne
-                        'skip': ['hls', 'dash'],
-                        'player_skip': ['configs', 'webpage'],  # Pomiń więcej requestów
-                    }
-                },
-            }
-            
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+            with self.pool.checkout(MOBILE_PROFILE, self._mobile_profile_opts(), INFO_OPTS) as ydl:
                 ydl.extract_info(url, download=False)
                 return True
                 
         except Exception:
             return False
-            
-    def _get_video_format_selector(self, resolution):
-        """
-        Generuje optymalny selektor formatu dla żądanej rozdzielczości.
-        
-        Implementuje hierarchię selektorów dla maksymalnej kompatybilności
-        z różnymi klientami YouTube (Android TV, iOS, Android).
-        """
-        if not resolution:
-            # Brak konkretnej rozdzielczości - użyj najlepszego dostępnego formatu
-            return 'bestvideo[ext=mp4]+bestaudio[ext=m4a]/bestvideo+bestaudio/best[ext=mp4]/best'
-        
-        try:
-            # Wyciągnij wysokość z rozdzielczości (np. "1920x1080" -> 1080)
-            target_height = int(resolution.split('x')[1])
-            
-            # Buduj hierarchię selektorów od najbardziej precyzyjnego do fallback
-            format_selectors = [
-                # 1. Najlepszy format wideo + audio dla dokładnej wysokości
-                f'bestvideo[height={target_height}][ext=mp4]+bestaudio[ext=m4a]/bestvideo[height={target_height}]+bestaudio',
-                
-                # 2. Najlepszy format dla wysokości <= target (preferowane)
-                f'bestvideo[height<={target_height}][ext=mp4]+bestaudio[ext=m4a]/bestvideo[height<={target_height}]+bestaudio',
-                
-                # 3. Najlepszy format ogólnie z ograniczeniem wysokości
-                f'best[height<={target_height}][ext=mp4]/best[height<={target_height}]',
-                
-                # 4. Fallback - jakikolwiek format z ograniczeniem wysokości
-                f'worst[height>={max(360, target_height//2)}][height<={target_height}]/best[height<={target_height}]',
-                
-                # 5. Ostateczny fallback - najlepszy dostępny
-                'bestvideo[ext=mp4]+bestaudio[ext=m4a]/bestvideo+bestaudio/best[ext=mp4]/best'
-            ]
-            
-            # Połącz wszystkie selektory w jeden ciąg fallback
-            return '/'.join(format_selectors)
-            
-        except (ValueError, IndexError):
-            logging.warning(f"Nieprawidłowy format rozdzielczości: {resolution}. Używam domyślnego.")
-            return 'bestvideo[ext=mp4]+bestaudio[ext=m4a]/bestvideo+bestaudio/best[ext=mp4]/best'
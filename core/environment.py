@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+YouTube Downloader v1.3.0 - Environment Diagnostics Cache
+
+Cached results of the launcher GUI checks (tkinter, test window).
+Part of the modular architecture introduced in v1.2.0.
+
+Features:
+- Fingerprint of DISPLAY, WAYLAND_DISPLAY, WSL state, interpreter and Tk build
+- Cheap revalidation: display sockets are checked with a single stat()
+- Checks run again only when the fingerprint changes (or on demand)
+- Failed checks remembered only briefly (X/Wayland may just not be up yet)
+- Several environments remembered at once (local X, ssh -X, WSL)
+
+Architecture: Dual-Repository Workflow v1.2.0
+"""
+
+import importlib.util
+import json
+import logging
+import os
+import re
+import sys
+import time
+import zlib
+
+from .utils import CACHE_DIR, ensure_parent_dir
+
+DEFAULT_ENVIRONMENT_CACHE = os.path.join(CACHE_DIR, "environment.json")
+
+# Wynik sprawdzenia ważny najwyżej tydzień nawet bez zmian środowiska
+MAX_AGE = 7 * 24 * 3600
+
+# Nieudane sprawdzenie (np. serwer X jeszcze nie wystartował) ponawiane po kilku minutach
+FAILURE_MAX_AGE = 5 * 60
+
+# Liczba zapamiętanych środowisk (najstarsze usuwane)
+MAX_ENVIRONMENTS = 16
+
+_LOCAL_DISPLAY_RE = re.compile(r'^(?:unix)?:(\d+)(?:\.\d+)?$')
+
+
+def _display_socket(display):
+    """Czy socket lokalnego serwera X istnieje (None dla zdalnego DISPLAY, np. ssh -X)"""
+    match = _LOCAL_DISPLAY_RE.match(display)
+    if not match:
+        return None
+    return os.path.exists(f"/tmp/.X11-unix/X{match.group(1)}")
+
+
+def _wayland_socket(wayland_display):
+    """Czy socket kompozytora Wayland istnieje"""
+    if os.path.isabs(wayland_display):
+        return os.path.exists(wayland_display)
+    runtime_dir = os.environ.get('XDG_RUNTIME_DIR')
+    if not runtime_dir:
+        return None
+    return os.path.exists(os.path.join(runtime_dir, wayland_display))
+
+
+def _tk_build():
+    """Ścieżka i mtime modułu _tkinter - bez importowania tkintera"""
+    try:
+        spec = importlib.util.find_spec('_tkinter')
+    except (ImportError, ValueError):
+        spec = None
+    if spec is None:
+        return None
+    origin = spec.origin
+    try:
+        return [origin, os.stat(origin).st_mtime]
+    except (OSError, TypeError):
+        return [origin, None]
+
+
+def environment_fingerprint():
+    """Stan środowiska, od którego zależy dostępność GUI"""
+    display = os.environ.get('DISPLAY', '')
+    wayland_display = os.environ.get('WAYLAND_DISPLAY', '')
+    return {
+        'platform': sys.platform,
+        'display': display,
+        'display_socket': _display_socket(display) if display else None,
+        'wayland_display': wayland_display,
+        'wayland_socket': _wayland_socket(wayland_display) if wayland_display else None,
+        'wsl': os.environ.get('WSL_DISTRO_NAME', ''),
+        'python': sys.executable,
+        'python_version': list(sys.version_info[:3]),
+        'tk': _tk_build(),
+    }
+
+
+def _fingerprint_key(fingerprint):
+    return f"{zlib.crc32(json.dumps(fingerprint, sort_keys=True).encode('utf-8')):08x}"
+
+
+def _load_cache(cache_path):
+    """Odczyt cache diagnostyki z dysku"""
+    if not cache_path or not os.path.exists(cache_path):
+        return {}
+    try:
+        with open(cache_path, 'r') as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_cache(cache_path, data):
+    """Zapis cache diagnostyki (atomowo)"""
+    if not cache_path:
+        return
+    try:
+        ensure_parent_dir(cache_path)
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        logging.debug(f"Environment cache save failed: {e}")
+
+
+def cached_check(name, check, cache_path=DEFAULT_ENVIRONMENT_CACHE, refresh=False, max_age=MAX_AGE,
+                 failure_max_age=FAILURE_MAX_AGE):
+    """
+    Wynik sprawdzenia środowiska z cache.
+
+    check() jest wywoływane tylko gdy dla bieżącego środowiska nie ma
+    wyniku, wynik jest starszy niż max_age (failure_max_age dla wyniku
+    negatywnego) albo refresh=True.
+
+    Returns:
+        tuple: (wynik, czy z cache)
+    """
+    fingerprint = environment_fingerprint()
+    key = _fingerprint_key(fingerprint)
+    data = _load_cache(cache_path)
+    entry = data.get(key) or {}
+    cached = (entry.get('checks') or {}).get(name) if entry.get('fingerprint') == fingerprint else None
+    if not refresh and cached:
+        limit = max_age if cached.get('result') else failure_max_age
+        if time.time() - cached.get('checked', 0) < limit:
+            return cached.get('result'), True
+
+    result = check()
+    # Odczyt ponowny - inny proces mógł w tym czasie zapisać swoje wyniki
+    data = _load_cache(cache_path)
+    entry = data.get(key)
+    if not isinstance(entry, dict) or entry.get('fingerprint') != fingerprint:
+        entry = data[key] = {'fingerprint': fingerprint, 'checks': {}}
+    entry.setdefault('checks', {})[name] = {'result': result, 'checked': time.time()}
+    entry['updated'] = time.time()
+    if len(data) > MAX_ENVIRONMENTS:
+        for old_key in sorted(data, key=lambda k: (data[k] or {}).get('updated', 0))[:len(data) - MAX_ENVIRONMENTS]:
+            del data[old_key]
+    _save_cache(cache_path, data)
+    return result, False
+
+
+def invalidate_checks(cache_path=DEFAULT_ENVIRONMENT_CACHE):
+    """Usunięcie wyników dla bieżącego środowiska (np. gdy GUI jednak nie wystartowało)"""
+    data = _load_cache(cache_path)
+    if data.pop(_fingerprint_key(environment_fingerprint()), None) is not None:
+        _save_cache(cache_path, data)
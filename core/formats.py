@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+"""
+YouTube Downloader v1.3.0 - Format Catalog
+
+Indexed view of the formats of one video with exact format selection.
+Part of the modular architecture introduced in v1.2.0.
+
+Features:
+- Built once per info dict, indexed by height, codec, container, fps and bitrate
+- "Best pair at or below 1080p, mp4 preferred" answered with concrete format IDs
+- Expected file size and merge requirements known before the download starts
+- One source for the GUI resolution list, get_available_formats and the download step
+- Format selector for yt-dlp answered from the catalog on every download path
+
+Architecture: Dual-Repository Workflow v1.2.0
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+
+from .startup import lazy_import
+
+yt_dlp = lazy_import('yt_dlp')
+
+# Kodeki zgodne z kontenerem (jak get_compatible_ext w yt-dlp)
+MP4_CODECS = frozenset({'avc1', 'av1', 'hevc', 'hev1', 'hvc1', 'h264', 'mp4a', 'ac-4', 'ec-3'})
+WEBM_CODECS = frozenset({'av1', 'vp9', 'vp8', 'opus', 'vrbs'})
+
+# Kontenery preferowane przy wyborze (jak [ext=mp4] / [ext=m4a] w selektorach)
+PREFERRED_VIDEO_EXT = 'mp4'
+PREFERRED_AUDIO_EXT = 'm4a'
+
+# Liczba katalogów pamiętanych dla ostatnich info dict
+MAX_CATALOGS = 32
+
+# Tagi kodeków, których nazwa rodziny różni się od tagu w codecs
+CODEC_FAMILIES = {'vp09': 'vp9', 'av01': 'av1'}
+
+
+def parse_height(resolution):
+    """Wysokość z rozdzielczości "1920x1080" (None gdy brak lub nieprawidłowa)"""
+    if not resolution:
+        return None
+    try:
+        return int(str(resolution).split('x')[1]) or None
+    except (ValueError, IndexError):
+        return None
+
+
+def codec_family(codec):
+    """Rodzina kodeka: 'avc1.640028' -> 'avc1', 'vp09.00.40.08' -> 'vp9', 'none' -> None"""
+    if not codec or codec == 'none':
+        return None
+    tag = codec.split('.')[0].lower()
+    return CODEC_FAMILIES.get(tag, tag)
+
+
+def merge_ext(video, audio):
+    """Kontener pliku po scaleniu strumieni (mp4 / webm / mkv)"""
+    codecs = {codec_family(video.get('vcodec')), codec_family(audio.get('acodec'))}
+    if codecs <= MP4_CODECS:
+        return 'mp4'
+    if codecs <= WEBM_CODECS:
+        return 'webm'
+    return 'mkv'
+
+
+def _rate(fmt):
+    return fmt.get('vbr') or fmt.get('tbr') or 0
+
+
+def _direct(fmt):
+    """Bezpośredni link HTTP(S) zamiast HLS/DASH - jeden plik, wznawialny"""
+    return (fmt.get('protocol') or 'https') in ('https', 'http')
+
+
+def _video_key(fmt):
+    """Jakość obrazu: wysokość, preferowany kontener, fps, bitrate, protokół"""
+    return (fmt.get('height') or 0, fmt.get('ext') == PREFERRED_VIDEO_EXT, fmt.get('fps') or 0, _rate(fmt),
+            _direct(fmt), fmt.get('width') or 0)
+
+
+def _audio_key(fmt):
+    """Jakość dźwięku: oryginalna ścieżka językowa, bitrate, częstotliwość próbkowania, protokół"""
+    return (fmt.get('language_preference') or 0, fmt.get('abr') or fmt.get('tbr') or 0, fmt.get('asr') or 0,
+            _direct(fmt))
+
+
+class FormatCatalog:
+    """
+    Katalog formatów jednego filmu.
+
+    Formaty są dzielone na strumienie wideo, audio i progresywne (wideo +
+    audio w jednym pliku) i indeksowane po wysokości, kodeku i kontenerze,
+    każda grupa posortowana od najlepszej (fps, bitrate). Wybór formatu to
+    odczyt z indeksów - wynik to konkretne ID formatów dla yt-dlp.
+    """
+
+    def __init__(self, formats, duration=None):
+        """
+        Args:
+            formats (list): Formaty z info dict yt-dlp
+            duration (float): Czas trwania w sekundach (szacowanie rozmiaru z bitrate)
+        """
+        # Wynik get_video_info ma czas trwania jako tekst ("3:32") - tylko liczby
+        self.duration = duration if isinstance(duration, (int, float)) else None
+        self.video, self.audio, self.progressive = [], [], []
+        for fmt in formats or ():
+            if not fmt.get('format_id'):
+                continue
+            has_video = fmt.get('vcodec') != 'none' and bool(fmt.get('height') or fmt.get('vcodec'))
+            has_audio = fmt.get('acodec') != 'none' and bool(fmt.get('acodec') or fmt.get('abr'))
+            if has_video and has_audio:
+                self.progressive.append(fmt)
+            elif has_video:
+                self.video.append(fmt)
+            elif has_audio:
+                self.audio.append(fmt)
+        for streams, key in ((self.video, _video_key), (self.progressive, _video_key), (self.audio, _audio_key)):
+            streams.sort(key=key, reverse=True)
+
+        self.by_height = {'video': self._index(self.video, lambda f: f.get('height') or 0),
+                          'progressive': self._index(self.progressive, lambda f: f.get('height') or 0)}
+        self.by_codec = {kind: self._index(streams, lambda f, c=codec: codec_family(f.get(c)))
+                         for kind, streams, codec in (('video', self.video, 'vcodec'),
+                                                      ('progressive', self.progressive, 'vcodec'),
+                                                      ('audio', self.audio, 'acodec'))}
+        self.by_ext = {kind: self._index(streams, lambda f: f.get('ext'))
+                       for kind, streams in (('video', self.video), ('progressive', self.progressive),
+                                             ('audio', self.audio))}
+        self._heights = {kind: sorted((h for h in index if h), reverse=True) for kind, index in self.by_height.items()}
+        self._selections = {}
+
+    @staticmethod
+    def _index(streams, key):
+        """Grupy strumieni według klucza (kolejność w grupie: od najlepszego)"""
+        index = {}
+        for fmt in streams:
+            index.setdefault(key(fmt), []).append(fmt)
+        return index
+
+    def heights(self, kind='video'):
+        """Dostępne wysokości od najwyższej (kind: 'video', 'progressive' lub 'all')"""
+        if kind == 'all':
+            return sorted(set(self._heights['video']) | set(self._heights['progressive']), reverse=True)
+        return self._heights[kind]
+
+    def streams(self, kind='video', height=None, codec=None, ext=None):
+        """
+        Strumienie danego rodzaju z indeksów, od najlepszego
+
+        Args:
+            kind (str): 'video', 'audio' lub 'progressive'
+            codec (str): Rodzina kodeka ('avc1', 'vp9', 'av1', 'mp4a', 'opus')
+        """
+        groups = [index.get(kind, {}).get(value, []) for index, value in
+                  ((self.by_height, height), (self.by_codec, codec), (self.by_ext, ext)) if value is not None]
+        if not groups:
+            return list(getattr(self, kind))
+        smallest = min(groups, key=len)
+        others = [{id(fmt) for fmt in group} for group in groups if group is not smallest]
+        return [fmt for fmt in smallest if all(id(fmt) in ids for ids in others)]
+
+    def resolutions(self):
+        """Unikalne rozdzielczości "WxH" od najwyższej (lista wyboru w GUI)"""
+        seen = OrderedDict()
+        for fmt in sorted(self.video + self.progressive,
+                          key=lambda f: (f.get('height') or 0, f.get('width') or 0), reverse=True):
+            if fmt.get('height'):
+                seen.setdefault(f"{fmt.get('width') or 0}x{fmt['height']}", None)
+        return list(seen)
+
+    def video_formats(self, progressive_only=False):
+        """Formaty z obrazem od najlepszego (wysokość, kontener, fps, bitrate)"""
+        if progressive_only:
+            return list(self.progressive)
+        return sorted(self.video + self.progressive, key=_video_key, reverse=True)
+
+    def _best_at_or_below(self, kind, max_height):
+        """Najlepszy strumień o najwyższej dostępnej wysokości <= max_height"""
+        for height in self.heights(kind):
+            if max_height is None or height <= max_height:
+                return self.by_height[kind][height][0]
+        return None
+
+    def _best_audio(self, video):
+        """Dźwięk do pary z obrazem: najpierw zgodny kontener, potem najwyższy bitrate"""
+        if not self.audio:
+            return None
+        preferred = PREFERRED_AUDIO_EXT if video.get('ext') == PREFERRED_VIDEO_EXT else video.get('ext')
+        return (self.by_ext['audio'].get(preferred) or self.audio)[0]
+
+    def select(self, max_height=None, can_merge=True):
+        """
+        Najlepszy wybór o wysokości nie większej niż max_height.
+
+        Kolejność jak w dawnym łańcuchu selektorów: para wideo + audio
+        (tylko gdy można scalać), format progresywny w limicie wysokości,
+        a gdy nic się nie mieści - najlepszy dostępny format.
+
+        Returns:
+            dict: format ('137+140'), format_ids, width, height, fps, vcodec,
+                  acodec, ext, requires_merge, filesize (None gdy nieznany)
+                  - albo None, gdy film nie ma formatów z obrazem
+        """
+        key = (max_height, can_merge)
+        if key not in self._selections:
+            streams = self.select_streams(max_height, can_merge)
+            self._selections[key] = self._selection(streams, streams[0], streams[-1]) if streams else None
+        selection = self._selections[key]
+        return dict(selection) if selection else None
+
+    def select_streams(self, max_height=None, can_merge=True):
+        """Formaty wybrane przez select(): [wideo, audio], [progresywny] albo None"""
+        for limit in ((max_height, None) if max_height else (None,)):
+            video = self._best_at_or_below('video', limit) if can_merge else None
+            audio = self._best_audio(video) if video is not None else None
+            if video is not None and audio is not None:
+                return [video, audio]
+            progressive = self._best_at_or_below('progressive', limit)
+            if progressive is not None:
+                return [progressive]
+        return None
+
+    def _selection(self, streams, video, audio):
+        return {
+            'format': '+'.join(fmt['format_id'] for fmt in streams),
+            'format_ids': [fmt['format_id'] for fmt in streams],
+            'width': video.get('width'),
+            'height': video.get('height'),
+            'fps': video.get('fps'),
+            'vcodec': video.get('vcodec'),
+            'acodec': audio.get('acodec'),
+            'ext': merge_ext(video, audio) if len(streams) > 1 else video.get('ext'),
+            'requires_merge': len(streams) > 1,
+            'filesize': self._expected_size(streams),
+        }
+
+    def _expected_size(self, streams):
+        """Rozmiar pliku: znany z formatów albo szacowany z bitrate i czasu trwania"""
+        total = 0
+        for fmt in streams:
+            size = fmt.get('filesize') or fmt.get('filesize_approx')
+            if not size and fmt.get('tbr') and self.duration:
+                size = int(fmt['tbr'] * 125 * self.duration)  # kbit/s -> B/s
+            if not size:
+                return None
+            total += size
+        return total
+
+
+def merged_format(video, audio):
+    """Format scalony z pary strumieni (pola jak w formatach 'A+B' yt-dlp)"""
+    streams = [video, audio]
+    sizes = [fmt.get('filesize') or fmt.get('filesize_approx') for fmt in streams]
+    return {
+        'requested_formats': streams,
+        'format': '+'.join(fmt.get('format') or fmt['format_id'] for fmt in streams),
+        'format_id': '+'.join(fmt['format_id'] for fmt in streams),
+        'ext': merge_ext(video, audio),
+        'protocol': '+'.join(yt_dlp.utils.determine_protocol(fmt) for fmt in streams),
+        'language': audio.get('language'),
+        'filesize_approx': sum(sizes) if all(sizes) else None,
+        'tbr': sum(fmt.get('tbr') or fmt.get('vbr') or fmt.get('abr') or 0 for fmt in streams),
+        'width': video.get('width'),
+        'height': video.get('height'),
+        'resolution': video.get('resolution'),
+        'fps': video.get('fps'),
+        'dynamic_range': video.get('dynamic_range'),
+        'vcodec': video.get('vcodec'),
+        'vbr': video.get('vbr'),
+        'stretched_ratio': video.get('stretched_ratio'),
+        'aspect_ratio': video.get('aspect_ratio'),
+        'acodec': audio.get('acodec'),
+        'abr': audio.get('abr'),
+        'asr': audio.get('asr'),
+        'audio_channels': audio.get('audio_channels'),
+    }
+
+
+def catalog_format_selector(max_height=None, can_merge=True):
+    """
+    Selektor formatu dla opcji 'format' yt-dlp oparty na katalogu.
+
+    yt-dlp wywołuje go z listą formatów każdej ekstrakcji - wybór jest
+    ten sam niezależnie od ścieżki (gotowe info, ponowna ekstrakcja,
+    kolejka, serwer, playlista), bez parsowania łańcucha selektorów.
+    """
+    def select_format(ctx):
+        catalog = FormatCatalog(ctx['formats'])
+        streams = catalog.select_streams(max_height, can_merge)
+        if not streams:
+            return
+        selected = merged_format(*streams) if len(streams) > 1 else streams[0]
+        logging.info(f"🎯 Format {selected['format_id']} ({selected.get('height')}p, {selected.get('ext')})")
+        yield selected
+    return select_format
+
+
+_catalogs = OrderedDict()
+_catalogs_lock = threading.Lock()
+
+
+def catalog_for(info):
+    """
+    Katalog formatów dla info dict - budowany raz na listę formatów.
+
+    Wynik get_video_info i jego 'info_dict' mają tę samą listę formatów,
+    więc GUI, lista formatów i pobieranie korzystają z jednego katalogu.
+    """
+    raw = info.get('info_dict') or info
+    formats = info.get('formats') or raw.get('formats') or []
+    key = id(formats)
+    with _catalogs_lock:
+        entry = _catalogs.get(key)
+        if entry is not None and entry[0] is formats:
+            _catalogs.move_to_end(key)
+            return entry[1]
+    catalog = FormatCatalog(formats, raw.get('duration'))
+    with _catalogs_lock:
+        # Lista formatów trzymana w cache - jej id() nie zostanie użyte ponownie
+        _catalogs[key] = (formats, catalog)
+        while len(_catalogs) > MAX_CATALOGS:
+            _catalogs.popitem(last=False)
+    return catalog
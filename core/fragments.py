@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+YouTube Downloader v1.3.0 - Adaptive Fragment Concurrency
+
+AIMD controller for concurrent fragment downloads of DASH/HLS formats.
+Part of the modular architecture introduced in v1.2.0.
+
+Features:
+- Concurrency ramps up while measured throughput keeps growing
+- Multiplicative back-off on HTTP 403 / 429 and timeouts
+- Shared per process so every download benefits from earlier measurements
+- Statistics for diagnostics (level, throughput per level, back-offs)
+
+Architecture: Dual-Repository Workflow v1.2.0
+"""
+
+import threading
+import time
+
+# Błędy oznaczające ograniczanie po stronie serwera - zmniejsz równoległość
+THROTTLE_ERRORS = ('http error 403', 'http error 429', 'too many requests', 'forbidden',
+                   'timed out', 'timeout')
+
+
+def is_throttle_error(message):
+    """Czy błąd wskazuje na ograniczanie (403, 429, timeout)"""
+    message = str(message).lower()
+    return any(keyword in message for keyword in THROTTLE_ERRORS)
+
+
+class FragmentConcurrencyController:
+    """
+    Sterownik liczby równoległych fragmentów (AIMD).
+
+    yt-dlp ustala pulę wątków fragmentów na początku pobierania, więc
+    poziom jest dobierany na każde pobieranie (i każdą próbę klienta)
+    na podstawie przepustowości zmierzonej w poprzednich pobraniach:
+    wzrost o `increase`, dopóki przepustowość rośnie, oraz spadek
+    o czynnik `decrease` po błędach 403 / 429 / timeout.
+    """
+
+    def __init__(self, initial=4, minimum=1, maximum=16, increase=1, decrease=0.5,
+                 tolerance=0.05, alpha=0.5):
+        """Inicjalizacja sterownika"""
+        self.minimum = minimum
+        self.maximum = maximum
+        self.increase = increase
+        self.decrease = decrease
+        self.tolerance = tolerance
+        self.alpha = alpha
+        self._level = max(minimum, min(maximum, initial))
+        self._throughput = {}
+        self._samples = 0
+        self._backoffs = 0
+        self._last_error = None
+        self._lock = threading.Lock()
+
+    @property
+    def level(self):
+        """Aktualna liczba równoległych fragmentów"""
+        with self._lock:
+            return self._level
+
+    def record_throughput(self, level, bytes_per_second):
+        """
+        Zapis przepustowości pobierania fragmentów przy danym poziomie.
+
+        Poziom rośnie, gdy przepustowość przy nim jest wyraźnie wyższa niż
+        przy poziomie niższym; spada o krok, gdy jest wyraźnie niższa.
+        """
+        if not bytes_per_second or bytes_per_second <= 0:
+            return
+        with self._lock:
+            previous = self._throughput.get(level)
+            self._throughput[level] = (bytes_per_second if previous is None else
+                                       self.alpha * bytes_per_second + (1 - self.alpha) * previous)
+            self._samples += 1
+            if level != self._level:
+                # Pomiar ze starszego poziomu (równoległe zadania) - tylko statystyka
+                return
+
+            current = self._throughput[level]
+            lower = max((n for n in self._throughput if n < level), default=None)
+            if lower is None or current > self._throughput[lower] * (1 + self.tolerance):
+                self._level = min(self.maximum, level + self.increase)
+            elif current < self._throughput[lower] * (1 - self.tolerance):
+                self._level = max(self.minimum, lower)
+
+    def record_error(self, message):
+        """Zapis błędu pobierania - zmniejszenie poziomu przy ograniczaniu"""
+        if not is_throttle_error(message):
+            return False
+        with self._lock:
+            self._level = max(self.minimum, int(self._level * self.decrease))
+            self._backoffs += 1
+            self._last_error = str(message)[:200]
+            # Stare pomiary przy wyższych poziomach są niewiarygodne po ograniczeniu
+            for level in [n for n in self._throughput if n > self._level]:
+                del self._throughput[level]
+        return True
+
+    def session(self):
+        """Pomiar jednego pobierania (hook postępu + zapis wyniku)"""
+        return FragmentSession(self)
+
+    def stats(self):
+        """Podsumowanie stanu sterownika"""
+        with self._lock:
+            return {
+                'level': self._level,
+                'throughput': dict(sorted(self._throughput.items())),
+                'samples': self._samples,
+                'backoffs': self._backoffs,
+                'last_error': self._last_error,
+            }
+
+    def reset(self, initial=4):
+        """Wyczyszczenie pomiarów"""
+        with self._lock:
+            self._level = max(self.minimum, min(self.maximum, initial))
+            self._throughput.clear()
+            self._samples = 0
+            self._backoffs = 0
+            self._last_error = None
+
+
+class FragmentSession:
+    """Pomiar przepustowości fragmentów pojedynczego pobierania"""
+
+    def __init__(self, controller):
+        self.controller = controller
+        self.level = controller.level
+        self._files = {}
+
+    def progress_hook(self, d):
+        """Hook postępu yt-dlp - liczy tylko pobrania fragmentowe"""
+        filename = d.get('filename')
+        now = time.monotonic()
+        state = self._files.get(filename)
+        if state is None:
+            # Zdarzenie 'finished' yt-dlp nie zawiera fragment_count - śledzimy plik od pierwszego fragmentu
+            if not d.get('fragment_count') or d.get('status') != 'downloading':
+                return
+            state = self._files[filename] = {'started': now, 'start_bytes': d.get('downloaded_bytes') or 0}
+        if d.get('status') == 'finished' and not state.get('recorded'):
+            state['recorded'] = True
+            elapsed = now - state['started']
+            downloaded = (d.get('downloaded_bytes') or d.get('total_bytes') or 0) - state['start_bytes']
+            if elapsed > 0 and downloaded > 0:
+                self.controller.record_throughput(self.level, downloaded / elapsed)
+
+    def record_failure(self, message):
+        """Nieudana próba - ewentualne zmniejszenie poziomu dla kolejnej próby"""
+        self.controller.record_error(message)
+        self.level = self.controller.level
+        self._files.clear()
+        return self.level
+
+
+_default_controller = None
+_default_controller_lock = threading.Lock()
+
+
+def get_fragment_controller():
+    """Współdzielony (na proces) sterownik równoległości fragmentów"""
+    global _default_controller
+    with _default_controller_lock:
+        if _default_controller is None:
+            _default_controller = FragmentConcurrencyController()
+        return _default_controller
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+YouTube Downloader v1.3.0 - Download Journal
+
+Crash-safe journal of in-progress downloads for byte-level resume.
+Part of the modular architecture introduced in v1.2.0.
+
+Features:
+- Per-job record of client, format IDs, byte/fragment offsets and paths
+- Atomic JSON writes next to the downloaded files
+- Read-modify-write under an OS file lock - safe for jobs in several processes
+- Resume with the same client and format after a crash or cancel
+- Cleanup of leftover .part files for abandoned jobs
+
+Architecture: Dual-Repository Workflow v1.2.0
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+
+try:
+    import fcntl
+except ImportError:  # Windows - tylko blokada w obrębie procesu
+    fcntl = None
+
+from .utils import format_variant, parse_youtube_id
+
+JOURNAL_FILENAME = ".youtube-downloader-journal.json"
+# Plik blokady (flock) - sam dziennik jest podmieniany przez os.replace, więc nie nadaje się do blokowania
+JOURNAL_LOCK_FILENAME = ".youtube-downloader-journal.lock"
+
+
+@lru_cache(maxsize=None)
+def journal_postprocessor_class():
+    """Klasa postprocesora dziennika (tworzona po załadowaniu yt-dlp)"""
+    from yt_dlp.postprocessor.common import PostProcessor
+
+    class JournalPostProcessor(PostProcessor):
+        """Postprocesor 'before_dl' zapisujący wybrane formaty przed pobieraniem"""
+
+        def __init__(self, journal, key, attempt):
+            super().__init__()
+            self.journal = journal
+            self.key = key
+            self.attempt = attempt
+
+        def run(self, info):
+            format_ids = [f['format_id'] for f in (info.get('requested_formats') or [info]) if f.get('format_id')]
+            self.journal.record_selection(self.key, self.attempt.get('client'), info.get('format_id'),
+                                          format_ids, info.get('webpage_url'))
+            return [], info
+
+    return JournalPostProcessor
+
+
+def __getattr__(name):
+    # Klasa dziedzicząca po yt-dlp tworzona leniwie - import modułu nie ładuje yt-dlp
+    if name == 'JournalPostProcessor':
+        return journal_postprocessor_class()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+class DownloadJournal:
+    """
+    Dziennik przerwanych pobrań przechowywany w katalogu docelowym.
+
+    Zapis jest atomowy (plik tymczasowy + os.replace), więc przerwanie
+    procesu w dowolnym momencie nie uszkadza dziennika. Odczyt-modyfikacja-
+    zapis odbywa się pod blokadą wątków i blokadą pliku (flock), więc
+    zadania w różnych procesach nie nadpisują sobie wpisów.
+    """
+
+    _locks = {}
+    _locks_guard = threading.Lock()
+
+    def __init__(self, output_dir, save_interval=1.0):
+        """Inicjalizacja dziennika dla katalogu docelowego"""
+        self.output_dir = output_dir
+        self.path = os.path.join(output_dir, JOURNAL_FILENAME)
+        self.lock_path = os.path.join(output_dir, JOURNAL_LOCK_FILENAME)
+        self.save_interval = save_interval
+        self._last_save = {}
+        # Jeden lock na plik dziennika - wiele zadań może pisać do tego samego katalogu
+        with DownloadJournal._locks_guard:
+            self._lock = DownloadJournal._locks.setdefault(os.path.abspath(self.path), threading.Lock())
+
+    @staticmethod
+    def make_key(url, resolution=None, audio_only=False):
+        """Klucz zadania: ID filmu + wariant formatu (None gdy brak ID)"""
+        video_id = parse_youtube_id(url) if url else None
+        if not video_id:
+            return None
+        return f"{video_id}:{format_variant(resolution, audio_only)}"
+
+    @contextmanager
+    def _locked(self):
+        """Wyłączny dostęp do dziennika: wątki tego procesu i inne procesy"""
+        with self._lock:
+            fd = None
+            if fcntl is not None:
+                try:
+                    fd = os.open(self.lock_path, os.O_CREAT | os.O_RDWR, 0o644)
+                    fcntl.flock(fd, fcntl.LOCK_EX)
+                except OSError as e:
+                    # Katalog bez zapisu itp. - dziennik i tak nie zostanie zapisany
+                    logging.debug(f"Journal lock unavailable: {e}")
+                    if fd is not None:
+                        os.close(fd)
+                        fd = None
+            try:
+                yield
+            finally:
+                if fd is not None:
+                    os.close(fd)  # Zamknięcie zwalnia flock
+
+    def _read(self):
+        """Odczyt całego dziennika"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write(self, entries):
+        """Atomowy zapis dziennika"""
+        try:
+            if not entries:
+                if os.path.exists(self.path):
+                    os.remove(self.path)
+                return
+            tmp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(entries, f, indent=2)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logging.debug(f"Journal write failed: {e}")
+
+    def _update(self, key, updater):
+        """Odczyt-modyfikacja-zapis pojedynczego wpisu"""
+        with self._locked():
+            entries = self._read()
+            entry = entries.setdefault(key, {'files': {}})
+            updater(entry)
+            entry['updated'] = time.time()
+            self._write(entries)
+
+    def get(self, key):
+        """Wpis dziennika dla zadania"""
+        if not key:
+            return None
+        with self._locked():
+            return self._read().get(key)
+
+    def entries(self):
+        """Wszystkie wpisy dziennika"""
+        with self._locked():
+            return self._read()
+
+    def get_resumable(self, key):
+        """Wpis do wznowienia - tylko jeśli pliki częściowe nadal istnieją"""
+        entry = self.get(key)
+        if not entry or not entry.get('client'):
+            return None
+        for state in entry.get('files', {}).values():
+            for path in (state.get('tmpfilename'), state.get('filename')):
+                if path and os.path.exists(path):
+                    return entry
+        return None
+
+    def record_selection(self, key, client, format_spec, format_ids, url=None):
+        """Zapis wybranego klienta i formatów (przed rozpoczęciem pobierania)"""
+        def updater(entry):
+            entry['client'] = client
+            entry['format'] = format_spec
+            entry['format_ids'] = format_ids
+            if url:
+                entry['url'] = url
+        self._update(key, updater)
+
+    def update_from_progress(self, key, d):
+        """Zapis postępu z hooka yt-dlp (ograniczony do save_interval)"""
+        filename = d.get('filename')
+        if not filename:
+            return
+        now = time.monotonic()
+        finished = d.get('status') == 'finished'
+        if not finished and now - self._last_save.get(filename, 0) < self.save_interval:
+            return
+        self._last_save[filename] = now
+
+        def updater(entry):
+            entry['files'][filename] = {
+                'filename': filename,
+                'tmpfilename': d.get('tmpfilename'),
+                'format_id': (d.get('info_dict') or {}).get('format_id'),
+                'downloaded_bytes': d.get('downloaded_bytes'),
+                'total_bytes': d.get('total_bytes') or d.get('total_bytes_estimate'),
+                'fragment_index': d.get('fragment_index'),
+                'fragment_count': d.get('fragment_count'),
+                'finished': finished,
+            }
+        self._update(key, updater)
+
+    def complete(self, key):
+        """Usunięcie wpisu po udanym pobraniu"""
+        if not key:
+            return
+        with self._locked():
+            entries = self._read()
+            if entries.pop(key, None) is not None:
+                self._write(entries)
+
+    def discard(self, key):
+        """Porzucenie zadania: usunięcie plików częściowych i wpisu"""
+        entry = self.get(key)
+        if entry:
+            for state in entry.get('files', {}).values():
+                tmp = state.get('tmpfilename')
+                for path in (tmp, f"{tmp}.ytdl" if tmp else None):
+                    if path and path != state.get('filename') and os.path.exists(path):
+                        try:
+                            os.remove(path)
+                        except OSError as e:
+                            logging.debug(f"Could not remove {path}: {e}")
+        self.complete(key)
@@ -0,0 +1,445 @@
+#!/usr/bin/env python3
+"""
+YouTube Downloader v1.3.0 - Download Manager
+
+Concurrent download manager built on top of YouTubeDownloader.
+Part of the modular architecture introduced in v1.2.0.
+
+Features:
+- Bounded worker pool (threads or processes) with configurable size
+- Per-job cancel token and progress stream
+- Futures-based API for batch and interactive use
+- Streaming playlist/channel expansion with bounded in-flight jobs
+- Finished jobs kept in a bounded LRU (flat memory in long-running use), totals as counters
+
+Architecture: Dual-Repository Workflow v1.2.0
+"""
+
+import logging
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, CancelledError
+
+from .bandwidth import PRIORITY_BACKGROUND
+from .downloader import YouTubeDownloader
+from .progress import ProgressBus
+from .translations import t
+
+# Stany zadania
+JOB_QUEUED = 'queued'
+JOB_RUNNING = 'running'
+JOB_FINISHED = 'finished'
+JOB_FAILED = 'failed'
+JOB_CANCELLED = 'cancelled'
+
+# Liczba zakończonych zadań pamiętanych do odczytu wyniku (starsze są zapominane)
+DEFAULT_MAX_FINISHED = 256
+
+
+def _run_job_in_process(job_id, url, output_dir, options, cancel_event, progress_queue):
+    """Wykonanie zadania w procesie roboczym (ProcessPoolExecutor)"""
+    # Zadanie wyjęte z kolejki puli - dopiero teraz jest w toku
+    progress_queue.put((JOB_RUNNING, job_id))
+    # Token anulowania współdzielony z procesem głównym
+    downloader = YouTubeDownloader(cancel_event=cancel_event)
+
+    # Zdarzenia są już ograniczone przez szynę procesu roboczego
+    def progress_callback(event):
+        progress_queue.put(event)
+
+    return downloader.download_video(url, output_dir, progress_callback=progress_callback,
+                                     job_id=job_id, **options)
+
+
+class DownloadJob:
+    """Pojedyncze zadanie pobierania zarządzane przez DownloadManager"""
+
+    def __init__(self, url, output_dir, options, progress_callback=None):
+        self.id = uuid.uuid4().hex[:12]
+        self.url = url
+        self.output_dir = output_dir
+        self.options = options
+        self.progress_callback = progress_callback
+        self.status = JOB_QUEUED
+        self.progress = None
+        self.error = None
+        self.future = None
+        self.cancel_event = threading.Event()
+        self._subscription = None
+
+    def cancel(self):
+        """Anulowanie zadania (przed startem lub w trakcie)"""
+        if self.future is not None and self.future.cancel():
+            self.status = JOB_CANCELLED
+            return
+        self.cancel_event.set()
+
+    def done(self):
+        """Czy zadanie zostało zakończone"""
+        return self.future is not None and self.future.done()
+
+    def result(self, timeout=None):
+        """Wynik zadania (blokuje do zakończenia)"""
+        return self.future.result(timeout)
+
+    def _on_progress(self, progress):
+        """Aktualizacja postępu zadania"""
+        self.progress = progress
+        if self.progress_callback:
+            try:
+                self.progress_callback(self, progress)
+            except Exception as e:
+                logging.debug(f"Progress callback error for job {self.id}: {e}")
+
+    def to_dict(self):
+        """Reprezentacja zadania jako słownik"""
+        return {
+            'id': self.id,
+            'url': self.url,
+            'output_dir': self.output_dir,
+            'status': self.status,
+            'progress': self.progress,
+            'error': self.error,
+            'result': self.future.result() if self.status == JOB_FINISHED and self.done() else None,
+        }
+
+
+class PlaylistExpansion:
+    """
+    Strumieniowe rozwijanie playlisty/kanału do kolejki pobrań.
+
+    Wpisy są listowane w wątku producenta i od razu trafiają do puli;
+    liczba zadań w locie jest ograniczona, więc pamięć pozostaje stała
+    niezależnie od długości playlisty.
+    """
+
+    def __init__(self, manager, url, output_dir, max_pending, options):
+        self.id = uuid.uuid4().hex[:12]
+        self.manager = manager
+        self.url = url
+        self.output_dir = output_dir
+        self.options = options
+        self.status = JOB_RUNNING
+        self.error = None
+        self.submitted = 0
+        self.finished = 0
+        self.failed = 0
+        self._slots = threading.Semaphore(max_pending)
+        self._active = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._done = threading.Event()
+        self._thread = threading.Thread(target=self._produce, daemon=True,
+                                        name=f"ytdl-playlist-{self.id}")
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def _produce(self):
+        """Wątek producenta: listowanie wpisów i dodawanie zadań"""
+        self.lister = self.manager.downloader_factory()
+        try:
+            for entry in self.lister.iter_playlist_entries(self.url):
+                # Czekaj na wolne miejsce w kolejce (stała pamięć)
+                while not self._slots.acquire(timeout=0.5):
+                    if self._stop.is_set():
+                        break
+                if self._stop.is_set():
+                    break
+                job = self.manager.submit(entry['url'], self.output_dir, **self.options)
+                job.playlist_id = self.id
+                job.title = entry.get('title')
+                with self._lock:
+                    self._active.add(job)
+                    self.submitted += 1
+                job.future.add_done_callback(lambda f, job=job: self._on_job_done(job))
+            self.status = JOB_CANCELLED if self._stop.is_set() else JOB_FINISHED
+        except Exception as e:
+            self.error = str(e)
+            self.status = JOB_FAILED
+            logging.warning(f"❌ Rozwijanie playlisty nie powiodło się: {self.error[:100]}")
+        finally:
+            self._wait_active()
+            self._done.set()
+
+    def _on_job_done(self, job):
+        """Zwolnienie miejsca w kolejce po zakończeniu zadania"""
+        with self._lock:
+            self._active.discard(job)
+            if job.status == JOB_FINISHED:
+                self.finished += 1
+            else:
+                self.failed += 1
+        self._slots.release()
+
+    def _wait_active(self):
+        """Oczekiwanie na zakończenie zadań w locie"""
+        with self._lock:
+            active = list(self._active)
+        for job in active:
+            try:
+                job.future.result()
+            except (Exception, CancelledError):
+                pass
+
+    def cancel(self):
+        """Zatrzymanie listowania i anulowanie zadań w locie"""
+        self._stop.set()
+        if getattr(self, 'lister', None) is not None:
+            self.lister.cancel_download()
+        with self._lock:
+            active = list(self._active)
+        for job in active:
+            job.cancel()
+
+    def wait(self, timeout=None):
+        """Oczekiwanie na zakończenie całej playlisty"""
+        return self._done.wait(timeout)
+
+    def done(self):
+        return self._done.is_set()
+
+    def to_dict(self):
+        """Reprezentacja rozwijania jako słownik"""
+        return {
+            'id': self.id,
+            'url': self.url,
+            'status': self.status if self.done() else JOB_RUNNING,
+            'submitted': self.submitted,
+            'finished': self.finished,
+            'failed': self.failed,
+            'error': self.error,
+        }
+
+
+class DownloadManager:
+    """
+    Menedżer współbieżnych pobrań z ograniczoną pulą wątków lub procesów.
+
+    Każde zadanie dostaje własną instancję YouTubeDownloader, a więc własny
+    token anulowania. Postęp wszystkich zadań trafia na wspólną szynę
+    `progress_bus` (zdarzenia z polem job_id). `jobs` zawiera zadania
+    w kolejce i w toku; zakończone trafiają do ograniczonej listy ostatnich
+    (`max_finished`), a w `counts` zostają tylko liczniki.
+    """
+
+    def __init__(self, max_workers=4, use_processes=False, downloader_factory=YouTubeDownloader,
+                 progress_bus=None, on_job_done=None, max_finished=DEFAULT_MAX_FINISHED):
+        """
+        Inicjalizacja menedżera pobrań
+
+        Args:
+            on_job_done (callable): Wywoływany jako on_job_done(job) po zakończeniu
+                każdego zadania (także zadań z playlist), ze stanem już ustalonym
+            max_finished (int): Liczba zakończonych zadań dostępnych przez get_job
+        """
+        self.max_workers = max(1, int(max_workers))
+        self.max_finished = max(0, int(max_finished))
+        self.on_job_done = on_job_done
+        self.use_processes = use_processes
+        self.downloader_factory = downloader_factory
+        self.progress_bus = progress_bus if progress_bus is not None else ProgressBus()
+        self.jobs = {}
+        self._finished = OrderedDict()
+        self.counts = {JOB_FINISHED: 0, JOB_FAILED: 0, JOB_CANCELLED: 0}
+        self._lock = threading.Lock()
+
+        if use_processes:
+            import multiprocessing
+            self._mp_manager = multiprocessing.Manager()
+            self._progress_queue = self._mp_manager.Queue()
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            self._pump_thread = threading.Thread(target=self._pump_progress, daemon=True)
+            self._pump_thread.start()
+        else:
+            self._mp_manager = None
+            self._progress_queue = None
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                thread_name_prefix='ytdl-job')
+
+    def submit(self, url, output_dir, resolution=None, audio_only=False, progress_callback=None, **options):
+        """
+        Dodanie zadania do kolejki.
+
+        Args:
+            url (str): URL filmu
+            output_dir (str): Katalog docelowy
+            resolution (str): Rozdzielczość np. "1920x1080"
+            audio_only (bool): Tylko audio (MP3)
+            progress_callback (callable): Wywoływany jako callback(job, progress)
+
+        Returns:
+            DownloadJob: Zadanie z przypisanym future
+        """
+        options = {'resolution': resolution, 'audio_only': audio_only, **options}
+        job = DownloadJob(url, output_dir, options, progress_callback)
+        job._subscription = self.progress_bus.subscribe(job._on_progress, job.id)
+
+        if self.use_processes:
+            # Event z managera działa między procesami
+            job.cancel_event = self._mp_manager.Event()
+            with self._lock:
+                self.jobs[job.id] = job
+            future = self._executor.submit(_run_job_in_process, job.id, url, output_dir,
+                                           options, job.cancel_event, self._progress_queue)
+        else:
+            with self._lock:
+                self.jobs[job.id] = job
+            future = self._executor.submit(self._run_job, job)
+
+        job.future = future
+        future.add_done_callback(lambda f, job=job: self._on_job_done(job, f))
+        return job
+
+    def submit_many(self, urls, output_dir, **options):
+        """Dodanie wielu zadań naraz"""
+        return [self.submit(url, output_dir, **options) for url in urls]
+
+    def submit_playlist(self, url, output_dir, max_pending=None, **options):
+        """
+        Strumieniowe pobieranie playlisty lub kanału.
+
+        Args:
+            url (str): URL playlisty lub kanału
+            output_dir (str): Katalog docelowy
+            max_pending (int): Limit zadań w locie (domyślnie 2 x liczba workerów)
+
+        Returns:
+            PlaylistExpansion: Uchwyt z postępem, wait() i cancel()
+        """
+        max_pending = max_pending or self.max_workers * 2
+        # Zadania wsadowe ustępują pobieraniom interaktywnym we wspólnym limicie przepustowości
+        options.setdefault('priority', PRIORITY_BACKGROUND)
+        return PlaylistExpansion(self, url, output_dir, max_pending, options).start()
+
+    def _run_job(self, job):
+        """Wykonanie zadania w wątku roboczym"""
+        try:
+            if job.cancel_event.is_set():
+                raise Exception(t("Pobieranie zostało anulowane"))
+
+            job.status = JOB_RUNNING
+            # Token anulowania zadania staje się tokenem downloadera
+            downloader = self.downloader_factory(cancel_event=job.cancel_event, progress_bus=self.progress_bus)
+            result = downloader.download_video(job.url, job.output_dir, job_id=job.id, **job.options)
+        except Exception as e:
+            self._mark_failed(job, e)
+            raise
+        job.status = JOB_FINISHED
+        return result
+
+    def _mark_failed(self, job, error):
+        """Oznaczenie zadania jako nieudanego lub anulowanego"""
+        job.error = str(error)
+        job.status = JOB_CANCELLED if job.cancel_event.is_set() else JOB_FAILED
+        if job.status == JOB_FAILED:
+            logging.warning(f"❌ Zadanie {job.id} nie powiodło się: {job.error[:100]}")
+
+    def _on_job_done(self, job, future):
+        """Aktualizacja stanu zadania po zakończeniu (anulowanie przed startem, tryb procesów)"""
+        self.progress_bus.unsubscribe(job._subscription)
+        if future.cancelled():
+            job.status = JOB_CANCELLED
+        elif self.use_processes:
+            error = future.exception()
+            if error is not None:
+                self._mark_failed(job, error)
+            else:
+                job.status = JOB_FINISHED
+        self._retire(job)
+        if self.on_job_done:
+            try:
+                self.on_job_done(job)
+            except Exception as e:
+                logging.debug(f"on_job_done callback error for job {job.id}: {e}")
+
+    def _retire(self, job):
+        """Przeniesienie zakończonego zadania do listy ostatnich (najstarsze zapominane)"""
+        with self._lock:
+            self.jobs.pop(job.id, None)
+            self.counts[job.status] = self.counts.get(job.status, 0) + 1
+            if self.max_finished:
+                self._finished[job.id] = job
+            while len(self._finished) > self.max_finished:
+                self._finished.popitem(last=False)
+
+    def _pump_progress(self):
+        """Przekazywanie postępu z procesów roboczych do callbacków zadań"""
+        while True:
+            try:
+                item = self._progress_queue.get()
+            except (EOFError, OSError):
+                return
+            if item is None:
+                return
+            if isinstance(item, tuple):
+                # Znacznik startu zadania w procesie roboczym
+                _, job_id = item
+                job = self.get_job(job_id)
+                if job is not None and job.status == JOB_QUEUED:
+                    job.status = JOB_RUNNING
+                continue
+            self.progress_bus.publish(item)
+
+    def get_job(self, job_id):
+        """Pobranie zadania po ID (aktywnego lub jednego z ostatnio zakończonych)"""
+        with self._lock:
+            return self.jobs.get(job_id) or self._finished.get(job_id)
+
+    def list_jobs(self):
+        """Lista zadań: ostatnio zakończone, potem w kolejce i w toku"""
+        with self._lock:
+            return list(self._finished.values()) + list(self.jobs.values())
+
+    def forget(self, job_id):
+        """Usunięcie zakończonego zadania (i jego wyniku) z pamięci"""
+        with self._lock:
+            return self._finished.pop(job_id, None) is not None
+
+    def stats(self):
+        """Liczba zadań aktywnych oraz liczniki zakończonych od startu"""
+        with self._lock:
+            return {'active': len(self.jobs), **self.counts}
+
+    def cancel(self, job_id):
+        """Anulowanie zadania po ID"""
+        job = self.get_job(job_id)
+        if job:
+            job.cancel()
+            return True
+        return False
+
+    def cancel_all(self):
+        """Anulowanie wszystkich zadań"""
+        for job in self.list_jobs():
+            job.cancel()
+
+    def wait(self, jobs=None, timeout=None):
+        """Oczekiwanie na zakończenie zadań; zwraca listę (job, wynik lub wyjątek)"""
+        results = []
+        for job in (jobs if jobs is not None else self.list_jobs()):
+            try:
+                results.append((job, job.result(timeout)))
+            except (Exception, CancelledError) as e:
+                results.append((job, e))
+        return results
+
+    def shutdown(self, wait=True, cancel=False):
+        """Zamknięcie puli roboczej"""
+        if cancel:
+            self.cancel_all()
+        self._executor.shutdown(wait=wait)
+        if self._mp_manager is not None:
+            try:
+                self._progress_queue.put(None)
+            except (EOFError, OSError):
+                pass
+            self._mp_manager.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.shutdown(wait=True, cancel=exc_type is not None)
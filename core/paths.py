@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+YouTube Downloader v1.3.0 - Output Path Planner
+
+Final file paths computed before download, with collision handling across jobs.
+Part of the modular architecture introduced in v1.2.0.
+
+Features:
+- Single-pass translate-table filename sanitiser (Unicode kept by default)
+- UTF-8 byte-length limits of the target filesystem (NAME_MAX)
+- Atomic name reservation (O_EXCL marker files) shared by threads and processes
+- Identical titles get numbered names instead of overwriting each other
+- Re-runs of the same video and variant reuse their file instead of numbering a duplicate
+
+Architecture: Dual-Repository Workflow v1.2.0
+"""
+
+import logging
+import os
+import re
+import threading
+
+DEFAULT_NAME_MAX = 255
+# Zapas na pliki tymczasowe yt-dlp: "name.f137.mp4.part", "-Frag123.part", ".temp.mp4"
+TEMP_SUFFIX_BYTES = 40
+RESERVATION_SUFFIX = '.lock'
+
+_INVALID_CHARS = '<>:"/\\|?*'
+# Jedna tabela: znaki niedozwolone i sterujące -> '_'
+_FILENAME_TABLE = str.maketrans({char: '_' for char in _INVALID_CHARS + ''.join(map(chr, range(32))) + '\x7f'})
+_NON_ASCII_RE = re.compile(r'[^\x00-\x7f]')
+_COLLAPSE_RE = re.compile(r'\s+|_{2,}')
+
+
+def _collapse(match):
+    return '_' if match.group()[0] == '_' else ' '
+
+
+def truncate_utf8(text, max_bytes):
+    """Skrócenie tekstu do max_bytes bajtów UTF-8 bez przecinania znaków"""
+    encoded = text.encode('utf-8')
+    if len(encoded) <= max_bytes:
+        return text
+    return encoded[:max(max_bytes, 0)].decode('utf-8', 'ignore')
+
+
+def sanitize_component(name, allow_unicode=True, max_bytes=DEFAULT_NAME_MAX, fallback="sanitized_file"):
+    """
+    Sanityzacja pojedynczego składnika ścieżki (nazwy pliku)
+
+    Args:
+        allow_unicode (bool): Zachowanie znaków spoza ASCII (np. polskich liter)
+        max_bytes (int): Limit długości w bajtach UTF-8
+        fallback (str): Nazwa gdy po sanityzacji nic nie zostało
+    """
+    name = name.translate(_FILENAME_TABLE)
+    if not allow_unicode:
+        name = _NON_ASCII_RE.sub('_', name)
+    name = _COLLAPSE_RE.sub(_collapse, name).strip('. ')
+    name = truncate_utf8(name, max_bytes).rstrip('. ')
+    return name or fallback
+
+
+_name_max_cache = {}
+
+
+def name_max_bytes(directory):
+    """Maksymalna długość nazwy pliku w katalogu (bajty, NAME_MAX)"""
+    if directory not in _name_max_cache:
+        try:
+            _name_max_cache[directory] = os.pathconf(directory, 'PC_NAME_MAX')
+        except (OSError, ValueError, AttributeError):
+            _name_max_cache[directory] = DEFAULT_NAME_MAX
+    return _name_max_cache[directory]
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except (PermissionError, OverflowError):
+        return True
+    return True
+
+
+class OutputPathPlanner:
+    """
+    Planowanie ścieżek plików wynikowych.
+
+    Nazwa jest rezerwowana atomowo plikiem-znacznikiem (O_CREAT | O_EXCL)
+    obok pliku docelowego, więc równoległe zadania - także w innych
+    procesach - nigdy nie dostaną tej samej nazwy. Nazwa zajęta przez inny
+    film dostaje numer: "Tytuł (1).mp4"; plik tego samego filmu i wariantu
+    z poprzedniego pobrania jest używany ponownie. Znaczniki po procesach, które już nie żyją,
+    są przejmowane (wznowienie po awarii zachowuje nazwę i pliki .part).
+    """
+
+    def __init__(self, allow_unicode=True):
+        """Inicjalizacja planera"""
+        self.allow_unicode = allow_unicode
+        self._owners = {}
+        self._by_owner = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _marker(path):
+        directory, name = os.path.split(path)
+        return os.path.join(directory, f".{name}{RESERVATION_SUFFIX}")
+
+    def reserve(self, output_dir, title, ext, owner, existing=None):
+        """
+        Rezerwacja ścieżki pliku wynikowego
+
+        Args:
+            title (str): Tytuł filmu (przed sanityzacją)
+            ext (str): Rozszerzenie pliku końcowego (po scaleniu/konwersji)
+            owner: Identyfikator zadania - kolejne próby tego samego zadania
+                dostają tę samą ścieżkę
+            existing (str): Plik tego samego filmu i wariantu z poprzedniego
+                pobrania (archiwum) - ta nazwa nie jest traktowana jako zajęta
+
+        Returns:
+            str: Pełna ścieżka pliku wynikowego
+        """
+        suffix = f".{ext}" if ext else ''
+        budget = (name_max_bytes(output_dir) - TEMP_SUFFIX_BYTES - len(RESERVATION_SUFFIX) - 1
+                  - len(suffix.encode('utf-8')))
+        base = sanitize_component(title or '', self.allow_unicode, budget, fallback="video")
+        existing = os.path.abspath(existing) if existing else None
+        with self._lock:
+            number = 0
+            while True:
+                counter = f" ({number})" if number else ''
+                stem = truncate_utf8(base, budget - len(counter)).rstrip('. ') + counter
+                path = os.path.join(output_dir, stem + suffix)
+                current = self._owners.get(path)
+                if current == owner:
+                    return path
+                free = not os.path.exists(path) or os.path.abspath(path) == existing
+                if current is None and free and self._claim(path, owner):
+                    self._owners[path] = owner
+                    self._by_owner.setdefault(owner, set()).add(path)
+                    return path
+                number += 1
+
+    def _claim(self, path, owner):
+        """Atomowe utworzenie znacznika rezerwacji (wywoływane pod lockiem)"""
+        marker = self._marker(path)
+        for _ in range(2):
+            try:
+                fd = os.open(marker, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+            except FileExistsError:
+                if not self._is_stale(marker):
+                    return False
+                logging.debug(f"Reclaiming stale reservation {marker}")
+                try:
+                    os.unlink(marker)
+                except OSError:
+                    return False
+                continue
+            except OSError as e:
+                # Katalog bez zapisu itp. - rezerwacja tylko w tym procesie
+                logging.debug(f"Reservation marker unavailable for {path}: {e}")
+                return True
+            with os.fdopen(fd, 'w') as f:
+                f.write(f"{os.getpid()} {owner}\n")
+            return True
+        return False
+
+    def _is_stale(self, marker):
+        """Znacznik po procesie, który już nie żyje"""
+        try:
+            with open(marker, 'r') as f:
+                pid = int(f.read().split()[0])
+        except (OSError, ValueError, IndexError):
+            return False
+        return pid != os.getpid() and not _pid_alive(pid)
+
+    def release(self, owner):
+        """Zwolnienie rezerwacji zadania (pliki wynikowe zostają)"""
+        with self._lock:
+            for path in self._by_owner.pop(owner, ()):
+                self._owners.pop(path, None)
+                try:
+                    os.unlink(self._marker(path))
+                except OSError:
+                    pass
+
+    def reserved(self):
+        """Aktualnie zarezerwowane ścieżki"""
+        with self._lock:
+            return dict(self._owners)
+
+
+_default_planner = None
+_default_planner_lock = threading.Lock()
+
+
+def get_path_planner():
+    """Współdzielony (na proces) planer ścieżek"""
+    global _default_planner
+    with _default_planner_lock:
+        if _default_planner is None:
+            _default_planner = OutputPathPlanner()
+        return _default_planner
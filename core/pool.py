@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+YouTube Downloader v1.3.0 - YoutubeDL Pool
+
+Warm, reusable yt-dlp instances per client profile.
+Part of the modular architecture introduced in v1.2.0.
+
+Features:
+- One pool of idle YoutubeDL instances per client profile (options + name)
+- Per-job overrides (hooks, outtmpl, format, postprocessors) applied on checkout
+- Instance state restored on return - nothing leaks between jobs
+- Extractor instances, cookie jar and HTTP handlers built once per instance
+- Requests go through the shared keep-alive connection pool when enabled (core.session)
+
+Architecture: Dual-Repository Workflow v1.2.0
+"""
+
+import copy
+import json
+import logging
+import threading
+from contextlib import contextmanager
+
+from .startup import lazy_import
+
+yt_dlp = lazy_import('yt_dlp')
+
+# Domyślna liczba bezczynnych instancji na profil
+DEFAULT_MAX_IDLE = 2
+
+# Hooki rejestrowane w __init__ YoutubeDL (opcja -> metoda dodająca, lista w instancji)
+_HOOK_OPTIONS = {
+    'progress_hooks': ('add_progress_hook', '_progress_hooks'),
+    'postprocessor_hooks': ('add_postprocessor_hook', '_postprocessor_hooks'),
+    'post_hooks': ('add_post_hook', '_post_hooks'),
+}
+
+# Opcje czytane tylko przy budowie instancji - muszą należeć do profilu
+BUILD_OPTIONS = frozenset({
+    'allowed_extractors', 'http_headers', 'cookiefile', 'cookiesfrombrowser', 'proxy', 'source_address',
+    'compat_opts', 'js_runtimes', 'remote_components', 'download_archive', 'forceprint', 'color',
+    'restrictfilenames', 'logtostderr',
+})
+
+# Atrybuty klasy wymagane do bezpiecznego nakładania opcji zadania
+_POOLABLE_ATTRS = ('add_progress_hook', 'add_postprocessor_hook', 'add_post_processor',
+                   'build_format_selector', '_parse_outtmpl')
+
+
+def _is_poolable(factory):
+    """Czy fabryka to YoutubeDL (obiekty zastępcze, np. w testach, nie są współdzielone)"""
+    return isinstance(factory, type) and all(hasattr(factory, attr) for attr in _POOLABLE_ATTRS)
+
+
+def _profile_key(profile, opts, factory):
+    return (profile, json.dumps(opts, sort_keys=True, default=repr), factory)
+
+
+def _snapshot(ydl):
+    """Stan instancji zmieniany przez opcje i postprocesory zadania"""
+    params = dict(ydl.params)
+    params['outtmpl'] = dict(ydl.params.get('outtmpl') or {})
+    return {
+        'params': params,
+        'hooks': {attr: list(getattr(ydl, attr)) for _, attr in _HOOK_OPTIONS.values()},
+        'pps': {when: list(pps) for when, pps in ydl._pps.items()},
+        'pp_hooks': {id(pp): list(pp._progress_hooks) for pps in ydl._pps.values() for pp in pps},
+        'format_selector': ydl.format_selector,
+    }
+
+
+def apply_overrides(ydl, overrides):
+    """
+    Nałożenie opcji zadania na instancję z puli.
+
+    Opcje przetwarzane przez YoutubeDL.__init__ (hooki, outtmpl, format,
+    postprocessors) są przeliczane tak jak przy budowie instancji; pozostałe
+    yt-dlp czyta z params przy każdym użyciu.
+    """
+    build_only = BUILD_OPTIONS.intersection(overrides)
+    if build_only:
+        raise ValueError(f"Options must be part of the client profile: {', '.join(sorted(build_only))}")
+    for key, value in overrides.items():
+        ydl.params[key] = value
+    for option, (add_hook, _) in _HOOK_OPTIONS.items():
+        for hook in overrides.get(option) or ():
+            getattr(ydl, add_hook)(hook)
+    if 'outtmpl' in overrides:
+        outtmpl = overrides['outtmpl']
+        ydl.params['outtmpl'] = dict(outtmpl) if isinstance(outtmpl, dict) else {'default': outtmpl}
+        ydl._parse_outtmpl()
+    if 'format' in overrides:
+        spec = overrides['format']
+        ydl.format_selector = spec if spec in (None, '-') or callable(spec) else ydl.build_format_selector(spec)
+    # Postprocesory po hookach - set_downloader podpina im hooki postępu instancji
+    for pp_def in overrides.get('postprocessors') or ():
+        pp_def = dict(pp_def)
+        when = pp_def.pop('when', 'post_process')
+        pp_class = yt_dlp.postprocessor.get_postprocessor(pp_def.pop('key'))
+        ydl.add_post_processor(pp_class(ydl, **pp_def), when=when)
+
+
+def _restore(ydl, state):
+    """Przywrócenie stanu instancji sprzed zadania"""
+    ydl.params.clear()
+    ydl.params.update(state['params'])
+    for attr, hooks in state['hooks'].items():
+        setattr(ydl, attr, hooks)
+    for when, pps in state['pps'].items():
+        ydl._pps[when] = pps
+        for pp in pps:
+            pp._progress_hooks = list(state['pp_hooks'].get(id(pp), ()))
+    ydl.format_selector = state['format_selector']
+    ydl._download_retcode = 0
+    ydl._num_downloads = 0
+    ydl._playlist_level = 0
+    ydl._playlist_urls = set()
+
+
+class YoutubeDLPool:
+    """
+    Pula gotowych instancji YoutubeDL.
+
+    Instancja należy do jednego zadania naraz (checkout). Profil to nazwa
+    klienta i opcje czytane przy budowie instancji (ekstraktory, nagłówki,
+    extractor_args); opcje zadania nakładane są przy wydaniu i cofane przy
+    zwrocie. Instancja po nieoczekiwanym wyjątku (nie błędzie yt-dlp) jest
+    zamykana zamiast wracać do puli.
+    """
+
+    def __init__(self, max_idle=DEFAULT_MAX_IDLE):
+        """Inicjalizacja puli"""
+        self.max_idle = max_idle
+        self._idle = {}
+        self._lock = threading.Lock()
+        self._stats = {'created': 0, 'reused': 0, 'discarded': 0}
+
+    @contextmanager
+    def checkout(self, profile, opts, overrides=None):
+        """
+        Instancja YoutubeDL dla profilu z nałożonymi opcjami zadania
+
+        Args:
+            profile (str): Nazwa profilu (np. nazwa klienta YouTube)
+            opts (dict): Opcje profilu (wspólne dla wszystkich zadań)
+            overrides (dict): Opcje zadania (hooki, outtmpl, format, postprocessors...)
+        """
+        factory = yt_dlp.YoutubeDL
+        # Opcje zadania równe opcjom profilu nie wymagają nakładania
+        overrides = {k: v for k, v in (overrides or {}).items() if k not in opts or opts[k] != v}
+        if not _is_poolable(factory):
+            with factory({**opts, **overrides}) as ydl:
+                yield ydl
+            return
+
+        key = _profile_key(profile, opts, factory)
+        ydl = self._acquire(key, factory, opts)
+        state = _snapshot(ydl)
+        healthy = False
+        try:
+            apply_overrides(ydl, overrides)
+            yield ydl
+            healthy = True
+        except (yt_dlp.utils.DownloadError, yt_dlp.utils.ExtractorError):
+            # Zwykła nieudana próba - instancja nadaje się do dalszego użycia
+            healthy = True
+            raise
+        finally:
+            self._release(key, ydl, state, healthy)
+
+    def _acquire(self, key, factory, opts):
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                self._stats['reused'] += 1
+                return idle.pop()
+            self._stats['created'] += 1
+        return factory(copy.deepcopy(opts))
+
+    def _release(self, key, ydl, state, healthy):
+        if healthy:
+            try:
+                _restore(ydl, state)
+            except Exception as e:
+                logging.debug(f"YoutubeDL restore failed: {e}")
+                healthy = False
+        if healthy:
+            with self._lock:
+                idle = self._idle.setdefault(key, [])
+                if len(idle) < self.max_idle:
+                    idle.append(ydl)
+                    return
+        with self._lock:
+            self._stats['discarded'] += 1
+        self._close(ydl)
+
+    @staticmethod
+    def _close(ydl):
+        try:
+            ydl.close()
+        except Exception as e:
+            logging.debug(f"YoutubeDL close failed: {e}")
+
+    def stats(self):
+        """Liczniki puli: utworzone, ponownie użyte, odrzucone, bezczynne"""
+        with self._lock:
+            return {**self._stats, 'idle': sum(len(idle) for idle in self._idle.values())}
+
+    def clear(self):
+        """Zamknięcie wszystkich bezczynnych instancji"""
+        with self._lock:
+            idle = [ydl for instances in self._idle.values() for ydl in instances]
+            self._idle.clear()
+        for ydl in idle:
+            self._close(ydl)
+
+
+_default_pool = None
+_default_pool_lock = threading.Lock()
+
+
+def get_ytdl_pool():
+    """Współdzielona (na proces) pula instancji YoutubeDL"""
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = YoutubeDLPool()
+        return _default_pool
@@ -0,0 +1,371 @@
+#!/usr/bin/env python3
+"""
+YouTube Downloader v1.3.0 - Progress Event Bus
+
+Throttled publish/subscribe bus for structured download progress events.
+Part of the modular architecture introduced in v1.2.0.
+
+Features:
+- Structured events (bytes, total, speed, ETA, fragments, phase, job ID)
+- Per-job coalescing to a configurable update rate
+- Trailing-edge flush: the last event of a burst is delivered when the interval ends
+- Status and phase changes are always delivered immediately
+- Any number of subscribers (GUI, CLI, server) per job or for all jobs
+- Progress model with time-weighted EWMA speed, ETA, per-stream (video/audio) progress
+  and merge/post-processing phases
+
+Architecture: Dual-Repository Workflow v1.2.0
+"""
+
+import itertools
+import logging
+import math
+import threading
+import time
+
+# Fazy pobierania
+PHASE_DOWNLOAD = 'download'
+PHASE_MERGE = 'merge'
+PHASE_POSTPROCESS = 'postprocess'
+PHASE_DONE = 'done'
+
+# Postprocesory yt-dlp łączące strumienie
+MERGE_POSTPROCESSORS = {'Merger'}
+
+
+def make_progress_event(d, job_id=None):
+    """
+    Budowa zdarzenia postępu ze słownika hooka yt-dlp.
+
+    Returns:
+        dict: Zdarzenie z polami status, phase, downloaded_bytes, total_bytes,
+              percent, speed, eta, fragment_index, fragment_count, filename, job_id
+    """
+    status = d.get('status')
+    downloaded = d.get('downloaded_bytes') or 0
+    total = d.get('total_bytes') or d.get('total_bytes_estimate')
+    if status == 'finished':
+        percent = 100.0
+    elif total:
+        percent = min(100.0, downloaded / total * 100)
+    else:
+        percent = None
+
+    return {
+        'job_id': job_id,
+        'status': status,
+        'phase': PHASE_DOWNLOAD,
+        'downloaded_bytes': downloaded,
+        'total_bytes': total,
+        'percent': percent,
+        'speed': d.get('speed'),
+        'eta': d.get('eta'),
+        'fragment_index': d.get('fragment_index'),
+        'fragment_count': d.get('fragment_count'),
+        'filename': d.get('filename'),
+        'timestamp': time.time(),
+    }
+
+
+class ProgressBus:
+    """
+    Szyna zdarzeń postępu z ograniczaniem częstotliwości.
+
+    Zdarzenia `downloading` danego zadania są łączone (wygrywa najnowsze)
+    do co najwyżej `max_rate` dostarczeń na sekundę. Zmiana statusu lub fazy
+    jest dostarczana natychmiast, więc koszt po stronie UI nie zależy od
+    szybkości łącza. Połączone zdarzenie czeka najwyżej do końca przedziału
+    (timer), nie do następnego chunka.
+    """
+
+    def __init__(self, max_rate=10.0):
+        """Inicjalizacja szyny"""
+        self.min_interval = 1.0 / max_rate if max_rate else 0.0
+        self._subscribers = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._last_sent = {}
+        self._last_state = {}
+        self._pending = {}
+        self._timers = {}
+        # Kolejność dostarczeń zachowana między wątkiem pobierania a timerami
+        self._delivery_lock = threading.RLock()
+
+    def subscribe(self, callback, job_id=None):
+        """
+        Subskrypcja zdarzeń.
+
+        Args:
+            callback (callable): Wywoływany jako callback(event)
+            job_id: Tylko zdarzenia tego zadania (None = wszystkie)
+
+        Returns:
+            int: Token do unsubscribe()
+        """
+        with self._lock:
+            token = next(self._ids)
+            self._subscribers[token] = (callback, job_id)
+            return token
+
+    def unsubscribe(self, token):
+        """Anulowanie subskrypcji"""
+        with self._lock:
+            self._subscribers.pop(token, None)
+
+    def publish(self, event):
+        """Publikacja zdarzenia (może zostać połączone z kolejnymi)"""
+        job_id = event.get('job_id')
+        state = (event.get('status'), event.get('phase'))
+        with self._delivery_lock:
+            with self._lock:
+                now = time.monotonic()
+                changed = self._last_state.get(job_id) != state
+                wait = self.min_interval - (now - self._last_sent.get(job_id, float('-inf')))
+                if not changed and wait > 0:
+                    # Połącz - zachowaj tylko najnowsze, timer dostarczy je po przedziale
+                    self._pending[job_id] = event
+                    if job_id not in self._timers:
+                        timer = threading.Timer(wait, self._flush_trailing, args=(job_id,))
+                        timer.daemon = True
+                        self._timers[job_id] = timer
+                        timer.start()
+                    return False
+                self._pending.pop(job_id, None)
+                self._last_sent[job_id] = now
+                self._last_state[job_id] = state
+                targets = self._targets(job_id)
+            self._deliver(targets, event)
+        return True
+
+    def _flush_trailing(self, job_id):
+        """Dostarczenie ostatniego połączonego zdarzenia po upływie przedziału (wątek timera)"""
+        with self._delivery_lock:
+            with self._lock:
+                self._timers.pop(job_id, None)
+                event = self._pending.pop(job_id, None)
+                if event is None:
+                    return
+                self._last_sent[job_id] = time.monotonic()
+                targets = self._targets(job_id)
+            self._deliver(targets, event)
+
+    def flush(self, job_id=None):
+        """Dostarczenie zaległych (połączonych) zdarzeń"""
+        with self._delivery_lock:
+            with self._lock:
+                if job_id is None:
+                    pending = list(self._pending.values())
+                    self._pending.clear()
+                else:
+                    event = self._pending.pop(job_id, None)
+                    pending = [event] if event else []
+                deliveries = [(self._targets(event.get('job_id')), event) for event in pending]
+            for targets, event in deliveries:
+                self._deliver(targets, event)
+
+    def forget(self, job_id):
+        """Usunięcie stanu ograniczania dla zakończonego zadania"""
+        with self._lock:
+            self._last_sent.pop(job_id, None)
+            self._last_state.pop(job_id, None)
+            self._pending.pop(job_id, None)
+            timer = self._timers.pop(job_id, None)
+        if timer is not None:
+            timer.cancel()
+
+    def _targets(self, job_id):
+        """Subskrybenci zainteresowani zadaniem (wywoływane pod lockiem)"""
+        return [callback for callback, wanted in self._subscribers.values()
+                if wanted is None or wanted == job_id]
+
+    def _deliver(self, targets, event):
+        """Dostarczenie zdarzenia (błąd subskrybenta nie przerywa pobierania)"""
+        for callback in targets:
+            try:
+                callback(event)
+            except Exception as e:
+                logging.debug(f"Progress subscriber error: {e}")
+
+
+def _stream_kind(fmt):
+    """Rodzaj strumienia: video, audio lub av (oba)"""
+    vcodec = fmt.get('vcodec')
+    acodec = fmt.get('acodec')
+    has_video = vcodec not in (None, 'none') or bool(fmt.get('height'))
+    has_audio = acodec not in (None, 'none')
+    if has_video and not has_audio and acodec == 'none':
+        return 'video'
+    if has_audio and not has_video:
+        return 'audio'
+    return 'av'
+
+
+class ProgressTracker:
+    """
+    Model postępu pojedynczego zadania.
+
+    Przelicza surowe słowniki hooków yt-dlp na zdarzenia z wygładzoną
+    (EWMA ważona czasem) prędkością, ETA i postępem per strumień. Postęp całkowity
+    obejmuje wszystkie zaplanowane strumienie (np. wideo + audio), także
+    te, których pobieranie jeszcze się nie zaczęło.
+    """
+
+    def __init__(self, job_id=None, tau=2.0, ignored_postprocessors=()):
+        """
+        Inicjalizacja modelu postępu
+
+        Args:
+            tau (float): Stała czasowa wygładzania prędkości w sekundach
+        """
+        self.job_id = job_id
+        self.tau = tau
+        self.ignored_postprocessors = set(ignored_postprocessors)
+        self.phase = PHASE_DOWNLOAD
+        self.speed = None
+        self.streams = {}
+        self._last_sample = None
+
+    def reset(self):
+        """Początek nowej próby pobierania - strumienie i prędkość poprzedniej próby nie są liczone"""
+        self.phase = PHASE_DOWNLOAD
+        self.speed = None
+        self.streams = {}
+        self._last_sample = None
+
+    def plan(self, info):
+        """Zaplanowanie strumieni na podstawie wybranych formatów (before_dl)"""
+        for fmt in info.get('requested_formats') or [info]:
+            format_id = fmt.get('format_id')
+            if format_id and format_id not in self.streams:
+                self.streams[format_id] = {
+                    'kind': _stream_kind(fmt),
+                    'downloaded_bytes': 0,
+                    'total_bytes': fmt.get('filesize') or fmt.get('filesize_approx'),
+                    'finished': False,
+                }
+
+    def update(self, d):
+        """Aktualizacja na podstawie hooka postępu yt-dlp; zwraca zdarzenie"""
+        info = d.get('info_dict') or {}
+        format_id = info.get('format_id') or d.get('filename') or '?'
+        stream = self.streams.setdefault(format_id, {
+            'kind': _stream_kind(info),
+            'downloaded_bytes': 0,
+            'total_bytes': None,
+            'finished': False,
+        })
+        downloaded = d.get('downloaded_bytes') or 0
+        total = d.get('total_bytes') or d.get('total_bytes_estimate') or stream['total_bytes']
+        previous = stream['downloaded_bytes']
+        stream['downloaded_bytes'] = downloaded
+        stream['total_bytes'] = total
+        if d.get('status') == 'finished':
+            stream['finished'] = True
+            stream['total_bytes'] = stream['total_bytes'] or downloaded
+        self.phase = PHASE_DOWNLOAD
+        self._sample(max(0, downloaded - previous))
+
+        event = make_progress_event(d, self.job_id)
+        event.update(self._summary())
+        event['raw_speed'] = d.get('speed')
+        event['stream'] = stream['kind']
+        event['stream_percent'] = self._percent(stream)
+        event['status'] = 'downloading' if d.get('status') == 'downloading' else d.get('status')
+        return event
+
+    def postprocessor_event(self, d):
+        """Zdarzenie fazy łączenia / postprocessingu (None dla ignorowanych)"""
+        name = d.get('postprocessor')
+        if name in self.ignored_postprocessors:
+            return None
+        self.phase = PHASE_MERGE if name in MERGE_POSTPROCESSORS else PHASE_POSTPROCESS
+        event = self._base_event('processing' if d.get('status') != 'finished' else 'processed')
+        event['postprocessor'] = name
+        return event
+
+    def done_event(self):
+        """Zdarzenie końcowe zadania"""
+        self.phase = PHASE_DONE
+        event = self._base_event('finished')
+        event['percent'] = 100.0
+        event['eta'] = 0
+        return event
+
+    def _base_event(self, status):
+        """Zdarzenie bez danych konkretnego chunka"""
+        event = {
+            'job_id': self.job_id,
+            'status': status,
+            'fragment_index': None,
+            'fragment_count': None,
+            'filename': None,
+            'timestamp': time.time(),
+        }
+        event.update(self._summary())
+        return event
+
+    def _sample(self, delta_bytes):
+        """
+        Aktualizacja EWMA prędkości na podstawie przyrostu bajtów
+
+        Waga próbki zależy od czasu, który obejmuje (1 - e^(-dt/tau)),
+        nie od liczby chunków - wynik nie zależy od rozmiaru chunka.
+        """
+        now = time.monotonic()
+        if self._last_sample is None:
+            self._last_sample = now
+            return
+        elapsed = now - self._last_sample
+        if elapsed <= 0:
+            return
+        self._last_sample = now
+        instant = delta_bytes / elapsed
+        if self.speed is None or self.tau <= 0:
+            self.speed = instant
+        else:
+            alpha = 1 - math.exp(-elapsed / self.tau)
+            self.speed = alpha * instant + (1 - alpha) * self.speed
+
+    @staticmethod
+    def _percent(stream):
+        """Procent postępu strumienia (None gdy rozmiar nieznany)"""
+        if stream['finished']:
+            return 100.0
+        if stream['total_bytes']:
+            return min(100.0, stream['downloaded_bytes'] / stream['total_bytes'] * 100)
+        return None
+
+    def _summary(self):
+        """Postęp całkowity, prędkość, ETA i postęp per strumień"""
+        downloaded = sum(s['downloaded_bytes'] for s in self.streams.values())
+        known_total = all(s['total_bytes'] for s in self.streams.values()) and self.streams
+        total = sum(s['total_bytes'] for s in self.streams.values()) if known_total else None
+
+        if self.phase != PHASE_DOWNLOAD:
+            percent = 100.0
+        elif total:
+            percent = min(100.0, downloaded / total * 100)
+        else:
+            percent = None
+
+        eta = None
+        if total and self.speed:
+            eta = max(0, int((total - downloaded) / self.speed))
+
+        streams = {}
+        for s in self.streams.values():
+            streams[s['kind']] = {
+                'downloaded_bytes': s['downloaded_bytes'],
+                'total_bytes': s['total_bytes'],
+                'percent': self._percent(s),
+            }
+
+        return {
+            'phase': self.phase,
+            'downloaded_bytes': downloaded,
+            'total_bytes': total,
+            'percent': percent,
+            'speed': self.speed,
+            'eta': eta,
+            'streams': streams,
+        }
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+YouTube Downloader v1.3.0 - Client Scoreboard
+
+Adaptive ordering of YouTube client configurations.
+Part of the modular architecture introduced in v1.2.0.
+
+Features:
+- Per-client success rate, median extraction time and last failure reason
+- Persistence between runs (SQLite in the application data directory)
+- One-row transactions per attempt - concurrent processes add up their results
+- Reordering of clients so the first attempt usually succeeds
+- Temporary cooldown for clients that keep failing
+
+Architecture: Dual-Repository Workflow v1.2.0
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import statistics
+import threading
+import time
+
+from .utils import DATA_DIR, ensure_parent_dir
+
+DEFAULT_SCOREBOARD_PATH = os.path.join(DATA_DIR, "clients.sqlite3")
+
+
+class ClientScoreboard:
+    """
+    Tablica wyników klientów YouTube (Android TV, iOS, Android...).
+
+    Klienci są sortowani po wygładzonym współczynniku sukcesu, a potem po
+    medianie czasu ekstrakcji. Klient, który zawiódł `skip_after` razy z rzędu,
+    trafia na koniec kolejki na `cooldown` sekund.
+
+    Każda próba to zapis jednego wiersza SQLite w transakcji (odczyt wiersza
+    i zapis pod blokadą bazy), więc równoległe procesy sumują swoje wyniki
+    zamiast nadpisywać cały plik. path=None - statystyki tylko w pamięci (testy).
+    """
+
+    def __init__(self, path=DEFAULT_SCOREBOARD_PATH, window=20, skip_after=3, cooldown=600):
+        """Inicjalizacja tablicy wyników"""
+        self.path = path
+        self.window = window
+        self.skip_after = skip_after
+        self.cooldown = cooldown
+        self._lock = threading.Lock()
+        self._stats = None
+        self._data_version = None
+        self._conn = None
+
+    def _get_conn(self):
+        """Leniwe otwarcie bazy SQLite (None jeśli dysk niedostępny)"""
+        if self._conn is None and self.path:
+            try:
+                ensure_parent_dir(self.path)
+                conn = sqlite3.connect(self.path, check_same_thread=False, timeout=10)
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS clients ("
+                    " name TEXT PRIMARY KEY,"
+                    " successes INTEGER NOT NULL, failures INTEGER NOT NULL,"
+                    " consecutive_failures INTEGER NOT NULL, durations TEXT NOT NULL,"
+                    " last_failure TEXT, last_failure_at REAL NOT NULL)"
+                )
+                conn.commit()
+                self._conn = conn
+            except (sqlite3.Error, OSError) as e:
+                logging.debug(f"Scoreboard database unavailable ({self.path}): {e}")
+                self.path = None
+        return self._conn
+
+    @staticmethod
+    def _new_entry():
+        return {
+            'successes': 0,
+            'failures': 0,
+            'consecutive_failures': 0,
+            'durations': [],
+            'last_failure': None,
+            'last_failure_at': 0,
+        }
+
+    @staticmethod
+    def _row_entry(row):
+        """Wiersz bazy -> statystyki klienta"""
+        successes, failures, consecutive, durations, last_failure, last_failure_at = row
+        return {
+            'successes': successes,
+            'failures': failures,
+            'consecutive_failures': consecutive,
+            'durations': json.loads(durations),
+            'last_failure': last_failure,
+            'last_failure_at': last_failure_at,
+        }
+
+    def _load(self):
+        """Statystyki w pamięci, doczytane gdy inny proces coś zapisał (wywoływane pod lockiem)"""
+        if self._stats is None:
+            self._stats = {}
+        conn = self._get_conn()
+        if conn is None:
+            return self._stats
+        try:
+            version = conn.execute("PRAGMA data_version").fetchone()[0]
+            if version != self._data_version:
+                rows = conn.execute(
+                    "SELECT name, successes, failures, consecutive_failures, durations,"
+                    " last_failure, last_failure_at FROM clients").fetchall()
+                self._stats = {row[0]: self._row_entry(row[1:]) for row in rows}
+                self._data_version = version
+        except (sqlite3.Error, ValueError) as e:
+            logging.debug(f"Scoreboard load failed: {e}")
+        return self._stats
+
+    def _record(self, name, update):
+        """Odczyt-modyfikacja-zapis wiersza klienta w jednej transakcji"""
+        with self._lock:
+            stats = self._load()
+            conn = self._get_conn()
+            if conn is None:
+                update(stats.setdefault(name, self._new_entry()))
+                return
+            try:
+                # BEGIN IMMEDIATE - blokada zapisu przed odczytem, inny proces nie wejdzie pomiędzy
+                conn.execute("BEGIN IMMEDIATE")
+                row = conn.execute(
+                    "SELECT successes, failures, consecutive_failures, durations, last_failure, last_failure_at"
+                    " FROM clients WHERE name = ?", (name,)).fetchone()
+                entry = self._row_entry(row) if row else self._new_entry()
+                update(entry)
+                conn.execute(
+                    "INSERT OR REPLACE INTO clients VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (name, entry['successes'], entry['failures'], entry['consecutive_failures'],
+                     json.dumps(entry['durations']), entry['last_failure'], entry['last_failure_at']))
+                conn.commit()
+            except (sqlite3.Error, ValueError) as e:
+                logging.debug(f"Scoreboard write failed for {name}: {e}")
+                conn.rollback()
+                entry = stats.setdefault(name, self._new_entry())
+                update(entry)
+            stats[name] = entry
+
+    def record_success(self, name, duration=None):
+        """Zapis udanej próby klienta"""
+        def update(entry):
+            entry['successes'] += 1
+            entry['consecutive_failures'] = 0
+            if duration is not None:
+                entry['durations'] = (entry['durations'] + [round(duration, 3)])[-self.window:]
+        self._record(name, update)
+
+    def record_failure(self, name, reason, duration=None):
+        """Zapis nieudanej próby klienta"""
+        def update(entry):
+            entry['failures'] += 1
+            entry['consecutive_failures'] += 1
+            entry['last_failure'] = str(reason)[:200]
+            entry['last_failure_at'] = time.time()
+            if duration is not None:
+                entry['durations'] = (entry['durations'] + [round(duration, 3)])[-self.window:]
+        self._record(name, update)
+
+    def _is_cooling_down(self, entry, now):
+        """Czy klient jest tymczasowo pomijany"""
+        return (entry['consecutive_failures'] >= self.skip_after and
+                now - entry['last_failure_at'] < self.cooldown)
+
+    def _sort_key(self, entry):
+        """Klucz sortowania: współczynnik sukcesu malejąco, mediana czasu rosnąco"""
+        total = entry['successes'] + entry['failures']
+        # Wygładzanie Laplace'a - nowy klient startuje z 0.5
+        success_rate = (entry['successes'] + 1) / (total + 2)
+        median = statistics.median(entry['durations']) if entry['durations'] else float('inf')
+        return (-success_rate, median)
+
+    def order(self, configs):
+        """
+        Uporządkowanie konfiguracji klientów według wyników.
+
+        Klienci bez historii zachowują domyślną kolejność; klienci w okresie
+        cooldown trafiają na koniec (nadal są ostatnią deską ratunku).
+        """
+        now = time.time()
+        with self._lock:
+            stats = self._load()
+            if not any(config['name'] in stats for config in configs):
+                return list(configs)
+
+            ranked = []
+            for index, config in enumerate(configs):
+                entry = stats.get(config['name'])
+                if entry is None:
+                    ranked.append(((0, -0.5, float('inf'), index), config))
+                else:
+                    cooling = 1 if self._is_cooling_down(entry, now) else 0
+                    ranked.append(((cooling, *self._sort_key(entry), index), config))
+
+        ranked.sort(key=lambda item: item[0])
+        return [config for _, config in ranked]
+
+    def stats(self):
+        """Podsumowanie statystyk wszystkich klientów"""
+        now = time.time()
+        with self._lock:
+            summary = {}
+            for name, entry in self._load().items():
+                total = entry['successes'] + entry['failures']
+                summary[name] = {
+                    'attempts': total,
+                    'success_rate': entry['successes'] / total if total else None,
+                    'median_time': statistics.median(entry['durations']) if entry['durations'] else None,
+                    'last_failure': entry['last_failure'],
+                    'cooling_down': self._is_cooling_down(entry, now),
+                }
+            return summary
+
+    def reset(self):
+        """Wyczyszczenie statystyk"""
+        with self._lock:
+            self._stats = {}
+            conn = self._get_conn()
+            if conn is not None:
+                try:
+                    conn.execute("DELETE FROM clients")
+                    conn.commit()
+                except sqlite3.Error as e:
+                    logging.debug(f"Scoreboard reset failed: {e}")
+
+    def close(self):
+        """Zamknięcie połączenia z bazą"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+_default_scoreboard = None
+_default_scoreboard_lock = threading.Lock()
+
+
+def get_client_scoreboard():
+    """Współdzielona (na proces) tablica wyników klientów"""
+    global _default_scoreboard
+    with _default_scoreboard_lock:
+        if _default_scoreboard is None:
+            _default_scoreboard = ClientScoreboard()
+        return _default_scoreboard
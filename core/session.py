@@ -0,0 +1,454 @@
+#!/usr/bin/env python3
+"""
+YouTube Downloader v1.3.0 - Shared HTTP Session
+
+Process-wide keep-alive connection pool used by every yt-dlp request.
+Part of the modular architecture introduced in v1.2.0.
+
+Features:
+- HTTP/1.1 keep-alive: one TCP/TLS connection serves many requests
+- Connections shared by all YoutubeDL instances (extraction and download)
+- Idle connections capped per host (active connections are not limited),
+  stale connections dropped before reuse
+- Connection-reuse metrics (opened, reused, TLS handshakes, per host)
+- yt-dlp request handler registered only on request (enable_keepalive, launcher --keepalive);
+  proxied requests stay with urllib
+- Only idempotent requests (GET/HEAD) are resent after a stale-connection error
+- Guarded to the tested yt-dlp versions - otherwise the stock handlers are used
+
+Architecture: Dual-Repository Workflow v1.2.0
+"""
+
+import http.client
+import io
+import logging
+import select
+import threading
+import time
+import urllib.parse
+import urllib.request
+from functools import lru_cache
+
+# Domyślna liczba bezczynnych połączeń na host (aktywnych nie ogranicza)
+DEFAULT_MAX_PER_HOST = 4
+
+# Bezczynne połączenie starsze niż limit jest zamykane (serwery zrywają je same)
+DEFAULT_IDLE_TIMEOUT = 60
+
+# Limit przekierowań jak w obsłudze urllib w yt-dlp
+MAX_REDIRECTS = 10
+
+REDIRECT_CODES = (301, 302, 303, 307, 308)
+
+# Preferencja wyżej niż urllib (0) i requests (100)
+HANDLER_PREFERENCE = 150
+
+# Wersje yt-dlp, z którymi sprawdzono wewnętrzne moduły sieciowe (od, do - bez górnej granicy)
+SUPPORTED_YT_DLP = ((2026, 2, 21), (2027, 1, 1))
+
+# Metody, które można bezpiecznie wysłać ponownie (serwer mógł już obsłużyć żądanie)
+IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS'})
+
+# Błędy ponownie użytego połączenia zamkniętego przez serwer przed odpowiedzią
+_STALE_ERRORS = (http.client.RemoteDisconnected, ConnectionResetError, ConnectionAbortedError, BrokenPipeError)
+
+
+def _is_stale(conn):
+    """Czy bezczynne połączenie zostało zamknięte (lub coś w nim czeka na odczyt)"""
+    sock = conn.sock
+    if sock is None:
+        return True
+    try:
+        readable, _, _ = select.select([sock], [], [], 0)
+    except (OSError, ValueError):
+        return True
+    return bool(readable)
+
+
+class HTTPSession:
+    """
+    Pula połączeń HTTP(S) keep-alive.
+
+    Połączenie należy do jednego żądania naraz (acquire) i wraca do puli po
+    pełnym odczycie odpowiedzi (release). Klucz puli to schemat, host, port,
+    konfiguracja TLS i adres źródłowy - połączenia są wspólne dla wszystkich
+    instancji YoutubeDL w procesie. `max_per_host` ogranicza tylko połączenia
+    bezczynne: równoległe żądania otwierają tyle połączeń, ile potrzebują,
+    a nadmiarowe są zamykane przy zwrocie.
+    """
+
+    def __init__(self, max_per_host=DEFAULT_MAX_PER_HOST, idle_timeout=DEFAULT_IDLE_TIMEOUT):
+        """Inicjalizacja puli"""
+        self.max_per_host = max_per_host
+        self.idle_timeout = idle_timeout
+        self._idle = {}
+        self._contexts = {}
+        self._lock = threading.Lock()
+        self._stats = {'requests': 0, 'opened': 0, 'reused': 0, 'tls_handshakes': 0, 'closed': 0, 'retried': 0}
+        self._hosts = {}
+
+    def ssl_context(self, key, factory):
+        """Kontekst SSL współdzielony przez połączenia o tej samej konfiguracji TLS"""
+        with self._lock:
+            context = self._contexts.get(key)
+        if context is None:
+            context = factory()
+            with self._lock:
+                context = self._contexts.setdefault(key, context)
+        return context
+
+    def acquire(self, scheme, host, port, timeout, ssl_context=None, tls_key=None, source_address=None):
+        """
+        Połączenie do hosta: bezczynne z puli albo nowe
+
+        Returns:
+            tuple: (połączenie, czy ponownie użyte)
+        """
+        key = (scheme, host, port, tls_key if scheme == 'https' else None, source_address)
+        origin = f"{scheme}://{host}:{port}"
+        stale = []
+        conn = None
+        with self._lock:
+            self._stats['requests'] += 1
+            host_stats = self._hosts.setdefault(origin, {'opened': 0, 'reused': 0})
+            idle = self._idle.get(key) or []
+            now = time.monotonic()
+            while idle:
+                candidate, released = idle.pop()
+                if now - released > self.idle_timeout or _is_stale(candidate):
+                    stale.append(candidate)
+                    continue
+                conn = candidate
+                break
+            self._stats['closed'] += len(stale)
+            if conn is not None:
+                self._stats['reused'] += 1
+                host_stats['reused'] += 1
+            else:
+                self._stats['opened'] += 1
+                host_stats['opened'] += 1
+                if scheme == 'https':
+                    self._stats['tls_handshakes'] += 1
+        for candidate in stale:
+            candidate.close()
+
+        reused = conn is not None
+        if conn is None:
+            conn = self._connect(scheme, host, port, timeout, ssl_context, source_address)
+            conn._session_key = key
+        else:
+            conn.timeout = timeout
+            conn.sock.settimeout(timeout)
+        return conn, reused
+
+    @staticmethod
+    def _connect(scheme, host, port, timeout, ssl_context, source_address):
+        from yt_dlp.networking._helper import create_connection
+        if scheme == 'https':
+            conn = http.client.HTTPSConnection(host, port, timeout=timeout, context=ssl_context)
+        else:
+            conn = http.client.HTTPConnection(host, port, timeout=timeout)
+        # Wybór rodziny adresów zgodny z source_address (jak w urllib yt-dlp)
+        conn._create_connection = create_connection
+        if source_address:
+            conn.source_address = (source_address, 0)
+        return conn
+
+    def release(self, conn, reusable=True):
+        """Zwrot połączenia po pełnym odczycie odpowiedzi (albo zamknięcie)"""
+        key = getattr(conn, '_session_key', None)
+        if reusable and key is not None and conn.sock is not None:
+            with self._lock:
+                idle = self._idle.setdefault(key, [])
+                if len(idle) < self.max_per_host:
+                    idle.append((conn, time.monotonic()))
+                    return
+        with self._lock:
+            self._stats['closed'] += 1
+        conn.close()
+
+    def discard(self, conn, retried=False):
+        """Zamknięcie połączenia, które nie nadaje się do dalszego użycia"""
+        if retried:
+            with self._lock:
+                self._stats['retried'] += 1
+        self.release(conn, reusable=False)
+
+    def stats(self):
+        """Liczniki puli: żądania, połączenia otwarte i ponownie użyte, handshake TLS, hosty"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['idle'] = sum(len(idle) for idle in self._idle.values())
+            stats['reuse_ratio'] = round(stats['reused'] / stats['requests'], 3) if stats['requests'] else 0.0
+            stats['hosts'] = {origin: dict(counts) for origin, counts in self._hosts.items()}
+        return stats
+
+    def clear(self):
+        """Zamknięcie wszystkich bezczynnych połączeń"""
+        with self._lock:
+            idle = [conn for conns in self._idle.values() for conn, _ in conns]
+            self._idle.clear()
+            self._stats['closed'] += len(idle)
+        for conn in idle:
+            conn.close()
+
+
+_default_session = None
+_default_session_lock = threading.Lock()
+
+
+def get_http_session():
+    """Współdzielona (na proces) pula połączeń HTTP"""
+    global _default_session
+    with _default_session_lock:
+        if _default_session is None:
+            _default_session = HTTPSession()
+        return _default_session
+
+
+def _version_tuple(version):
+    """'2026.08.19' / '2026.08.19.232830' -> (2026, 8, 19)"""
+    try:
+        return tuple(int(part) for part in version.split('.')[:3])
+    except (AttributeError, ValueError):
+        return None
+
+
+def _redirect_location(response, url):
+    """Adres przekierowania (nagłówek Location względem bieżącego URL)"""
+    from yt_dlp.utils.networking import normalize_url
+    location = response.headers.get('Location')
+    if not location:
+        return None
+    try:
+        # http.client dekoduje nagłówki jako iso-8859-1
+        location = location.encode('iso-8859-1').decode()
+    except UnicodeError:
+        pass
+    return normalize_url(urllib.parse.urljoin(url, location))
+
+
+@lru_cache(maxsize=None)
+def keepalive_handler_class():
+    """
+    Obsługa żądań yt-dlp oparta na wspólnej puli połączeń.
+
+    Tworzona przy pierwszym użyciu, żeby import modułu nie ładował yt-dlp;
+    rejestruje ją dopiero enable_keepalive().
+
+    Korzysta z wewnętrznych modułów yt-dlp (networking._helper, _urllib) -
+    dla wersji spoza SUPPORTED_YT_DLP albo gdy modułów brakuje zwraca None
+    i yt-dlp używa własnych obsług (requests / urllib).
+
+    Returns:
+        type: Klasa obsługi albo None (obsługi standardowe yt-dlp)
+    """
+    try:
+        from yt_dlp.version import __version__ as yt_dlp_version
+        version = _version_tuple(yt_dlp_version)
+        if version is None or not SUPPORTED_YT_DLP[0] <= version < SUPPORTED_YT_DLP[1]:
+            raise ImportError(f"yt-dlp {yt_dlp_version}")
+        from yt_dlp.networking._helper import add_accept_encoding_header, get_redirect_method
+        from yt_dlp.networking._urllib import SUPPORTED_ENCODINGS, HTTPHandler, handle_response_read_exceptions
+        from yt_dlp.networking.common import Features, RequestHandler, Response
+        from yt_dlp.networking.exceptions import HTTPError, RequestError
+        from yt_dlp.utils.networking import normalize_url
+
+        decoders = {encoding: decode for encoding, decode in
+                    (('gzip', HTTPHandler.gz), ('deflate', HTTPHandler.deflate), ('br', HTTPHandler.brotli))
+                    if encoding in SUPPORTED_ENCODINGS}
+        for name in ('_make_sslcontext', '_calculate_timeout', '_get_cookiejar', '_get_headers'):
+            if not hasattr(RequestHandler, name):
+                raise AttributeError(f"RequestHandler.{name}")
+    except (ImportError, AttributeError) as e:
+        logging.warning(f"⚠️ Nieobsługiwana wersja yt-dlp ({e}) - połączenia keep-alive wyłączone")
+        return None
+
+    class KeepAliveResponse(Response):
+        """Odpowiedź zwracająca połączenie do puli po pełnym odczycie"""
+
+        def __init__(self, res, url, session, conn):
+            super().__init__(fp=res, headers=res.headers, url=url, status=res.status, reason=res.reason)
+            self._session = session
+            self._conn = conn
+            if res.length == 0:
+                res.read()  # HEAD, 204, 304 - http.client zamyka odpowiedź dopiero przy odczycie
+            if res.isclosed():
+                self._finish()
+
+        def _finish(self):
+            conn, self._conn = self._conn, None
+            if conn is not None:
+                self._session.release(conn, reusable=self.fp.isclosed())
+
+        def read(self, amt=None):
+            if self.closed:
+                return b''
+            try:
+                data = self.fp.read(amt)
+            except Exception as e:
+                self.close()
+                handle_response_read_exceptions(e)
+                raise
+            if self.fp.isclosed():
+                self._finish()
+            return data
+
+        def close(self):
+            # Nieodczytana do końca odpowiedź - połączenia nie da się użyć ponownie
+            self._finish()
+            return super().close()
+
+    class KeepAliveRH(RequestHandler):
+        """Żądania HTTP(S) przez wspólną pulę połączeń keep-alive"""
+
+        _SUPPORTED_URL_SCHEMES = ('http', 'https')
+        _SUPPORTED_PROXY_SCHEMES = ()
+        _SUPPORTED_FEATURES = (Features.NO_PROXY,)
+        RH_NAME = 'keepalive'
+
+        def __init__(self, **kwargs):
+            super().__init__(**kwargs)
+            self.session = get_http_session()
+
+        def _check_extensions(self, extensions):
+            super()._check_extensions(extensions)
+            extensions.pop('cookiejar', None)
+            extensions.pop('timeout', None)
+            extensions.pop('legacy_ssl', None)
+            # Obsługiwane przez RequestHandler._get_headers (nazwy nagłówków bez zmiany wielkości liter)
+            extensions.pop('keep_header_casing', None)
+
+        def _prepare_headers(self, _, headers):
+            add_accept_encoding_header(headers, SUPPORTED_ENCODINGS)
+
+        def _ssl_context(self, request):
+            legacy = request.extensions.get('legacy_ssl')
+            legacy = self.legacy_ssl_support if legacy is None else legacy
+            tls_key = (self.verify, legacy, self.prefer_system_certs, tuple(sorted(getattr(self, '_client_cert', {}).items())))
+            context = self.session.ssl_context(tls_key, lambda: self._make_sslcontext(legacy_ssl_support=legacy))
+            return context, tls_key
+
+        def _send(self, request):
+            headers = self._get_headers(request)
+            cookiejar = self._get_cookiejar(request)
+            timeout = self._calculate_timeout(request)
+            url, method, data = normalize_url(request.url), request.method, request.data
+            for _ in range(MAX_REDIRECTS + 1):
+                response = self._open(request, url, method, data, headers, cookiejar, timeout)
+                location = _redirect_location(response, url) if response.status in REDIRECT_CODES else None
+                if location is None:
+                    break
+                # Treść przekierowania odczytana - połączenie wraca do puli
+                response.read()
+                response.close()
+                new_method = get_redirect_method(method, response.status)
+                remove = {'Cookie'}
+                if new_method != method:
+                    data = None
+                    remove |= {'Content-Length', 'Content-Type'}
+                headers = {k: v for k, v in headers.items() if k.title() not in remove}
+                url, method = location, new_method
+            else:
+                raise HTTPError(response, redirect_loop=True)
+            if not 200 <= response.status < 300:
+                raise HTTPError(response)
+            return response
+
+        def _open(self, request, url, method, data, headers, cookiejar, timeout):
+            """Jedno żądanie bez przekierowań (ponowienie, gdy serwer zamknął bezczynne połączenie)"""
+            parts = urllib.parse.urlsplit(url)
+            scheme = parts.scheme.lower()
+            try:
+                port = parts.port or (443 if scheme == 'https' else 80)
+                host = parts.hostname
+                if not host:
+                    raise ValueError(f"No host in URL: {url}")
+            except ValueError as e:
+                raise RequestError(cause=e) from e
+            path = urllib.parse.urlunsplit(('', '', parts.path or '/', parts.query, ''))
+
+            cookie_req = urllib.request.Request(url, headers=headers, method=method)
+            cookiejar.add_cookie_header(cookie_req)
+            send_headers = {**headers, **cookie_req.unredirected_hdrs}
+            ssl_context, tls_key = self._ssl_context(request) if scheme == 'https' else (None, None)
+            # Ponowienie tylko dla metod idempotentnych - POST (np. API innertube)
+            # mógł zostać obsłużony, zanim serwer zamknął połączenie
+            replayable = method.upper() in IDEMPOTENT_METHODS and (data is None or isinstance(data, bytes))
+
+            while True:
+                conn, reused = self.session.acquire(scheme, host, port, timeout, ssl_context, tls_key,
+                                                    self.source_address)
+                conn.set_debuglevel(int(bool(self.verbose)))
+                try:
+                    conn.request(method, path, body=data, headers=send_headers)
+                    res = conn.getresponse()
+                    break
+                except _STALE_ERRORS as e:
+                    self.session.discard(conn, retried=reused and replayable)
+                    if reused and replayable:
+                        continue
+                    handle_response_read_exceptions(e)
+                    raise
+                except (http.client.InvalidURL, ValueError) as e:
+                    self.session.discard(conn)
+                    raise RequestError(cause=e) from e
+                except Exception as e:
+                    self.session.discard(conn)
+                    handle_response_read_exceptions(e)
+                    raise
+
+            cookiejar.extract_cookies(res, cookie_req)
+            response = KeepAliveResponse(res, url, self.session, conn)
+            encodings = [e.strip() for e in reversed(res.headers.get('Content-Encoding', '').split(','))]
+            if not any(encoding in decoders for encoding in encodings):
+                return response
+            # Treść kodowana - dekodowana w całości, połączenie od razu wraca do puli
+            content = response.read()
+            response.close()
+            try:
+                for encoding in encodings:
+                    if encoding in decoders:
+                        content = decoders[encoding](content)
+            except Exception as e:
+                handle_response_read_exceptions(e)
+                raise
+            return Response(io.BytesIO(content), url, res.headers, status=res.status, reason=res.reason)
+
+        def close(self):
+            # Połączenia należą do wspólnej puli - zostają dla innych instancji
+            pass
+
+    return KeepAliveRH
+
+
+@lru_cache(maxsize=None)
+def enable_keepalive():
+    """
+    Rejestracja obsługi keep-alive w yt-dlp (globalnie, dla całego procesu).
+
+    Opcjonalna (launcher --keepalive). Musi nastąpić przed pierwszym
+    żądaniem instancji YoutubeDL - lista obsług jest budowana przy
+    pierwszym żądaniu.
+
+    Returns:
+        bool: Czy obsługa została zarejestrowana
+    """
+    handler = keepalive_handler_class()
+    if handler is None:
+        return False
+    from yt_dlp.networking.common import register_preference, register_rh
+    register_rh(handler)
+
+    @register_preference(handler)
+    def keepalive_preference(rh, request):
+        return HANDLER_PREFERENCE
+
+    logging.debug("🔌 Keep-alive request handler registered")
+    return True
+
+
+def __getattr__(name):
+    if name == 'KeepAliveRH':
+        return keepalive_handler_class()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+YouTube Downloader v1.3.0 - Startup Profiling
+
+Lazy imports of heavy dependencies and a built-in import-time report.
+Part of the modular architecture introduced in v1.2.0.
+
+Features:
+- Lazy module loading (yt-dlp, customtkinter) until first attribute access
+- Import-time report (python -X importtime) with the slowest modules
+- Cold-start measurement of launcher commands against a fixed target
+
+Architecture: Dual-Repository Workflow v1.2.0
+"""
+
+import importlib.util
+import os
+import subprocess
+import sys
+import time
+
+# Cel zimnego startu komend bez pobierania (--version, --help, --test): dziesiątki ms
+COLD_START_TARGET_MS = 100
+
+# Komendy launchera mierzone w raporcie
+COLD_START_COMMANDS = (('--version',), ('--help',), ('--test',))
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def lazy_import(name):
+    """
+    Moduł ładowany dopiero przy pierwszym dostępie do atrybutu.
+
+    Moduł już zaimportowany jest zwracany bez zmian. Brak modułu zgłasza
+    ImportError od razu (jak zwykły import), a nie przy pierwszym użyciu.
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ImportError(f"No module named {name!r}", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+def parse_importtime(output):
+    """
+    Odczyt wyjścia `python -X importtime`.
+
+    Returns:
+        list: (moduł, czas własny us, czas łączny us) w kolejności importu
+    """
+    entries = []
+    for line in output.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        parts = line[len('import time:'):].split('|')
+        if len(parts) != 3:
+            continue
+        try:
+            self_us, cumulative_us = int(parts[0]), int(parts[1])
+        except ValueError:
+            continue  # Nagłówek "self [us] | cumulative | imported package"
+        entries.append((parts[2].strip(), self_us, cumulative_us))
+    return entries
+
+
+def import_time_report(module, top=10):
+    """
+    Profil importu modułu w świeżym interpreterze.
+
+    Returns:
+        dict: module, total_ms (suma czasów własnych), top (najwolniejsze
+              moduły wg czasu łącznego), count (liczba zaimportowanych modułów)
+    """
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                          cwd=PROJECT_ROOT, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else module)
+    entries = parse_importtime(proc.stderr)
+    slowest = sorted(entries, key=lambda entry: entry[2], reverse=True)[:top]
+    return {
+        'module': module,
+        'total_ms': sum(entry[1] for entry in entries) / 1000,
+        'count': len(entries),
+        'top': [{'module': name, 'self_ms': self_us / 1000, 'cumulative_ms': cumulative_us / 1000}
+                for name, self_us, cumulative_us in slowest],
+    }
+
+
+def measure_command(args, repeat=3):
+    """Najlepszy czas (ms) uruchomienia interpretera z argumentami"""
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, *args], cwd=PROJECT_ROOT, stdout=subprocess.DEVNULL,
+                       stderr=subprocess.DEVNULL)
+        elapsed = (time.perf_counter() - started) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def cold_start_report(commands=COLD_START_COMMANDS, repeat=3, target_ms=COLD_START_TARGET_MS):
+    """
+    Pomiar zimnego startu komend launchera.
+
+    Returns:
+        dict: interpreter_ms (samo `python -c pass`) oraz commands - lista
+              {'command', 'wall_ms', 'overhead_ms', 'ok'}
+    """
+    baseline = measure_command(('-c', 'pass'), repeat)
+    results = []
+    for command in commands:
+        wall = measure_command(('launcher.py', *command), repeat)
+        overhead = max(wall - baseline, 0.0)
+        results.append({'command': ' '.join(command), 'wall_ms': wall, 'overhead_ms': overhead,
+                        'ok': wall <= target_ms})
+    return {'interpreter_ms': baseline, 'target_ms': target_ms, 'commands': results}
+
+
+def format_startup_report(imports, cold_start=None):
+    """Raport tekstowy dla --import-report"""
+    lines = [f"⏱️  Import {imports['module']}: {imports['total_ms']:.1f} ms ({imports['count']} modules)"]
+    for entry in imports['top']:
+        lines.append(f"   {entry['cumulative_ms']:8.1f} ms  {entry['self_ms']:7.1f} ms  {entry['module']}")
+    if cold_start:
+        lines.append(f"🚀 Cold start (interpreter {cold_start['interpreter_ms']:.0f} ms, "
+                     f"target {cold_start['target_ms']} ms):")
+        for entry in cold_start['commands']:
+            mark = '✅' if entry['ok'] else '⚠️'
+            lines.append(f"   {mark} {entry['command']:<12} {entry['wall_ms']:6.0f} ms "
+                         f"(+{entry['overhead_ms']:.0f} ms)")
+    return '\n'.join(lines)
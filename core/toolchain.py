@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+YouTube Downloader v1.3.0 - Toolchain Probe
+
+One-time detection of external tools used for merging, conversion and downloading.
+Part of the modular architecture introduced in v1.2.0.
+
+Features:
+- ffmpeg / ffprobe versions, available encoders and muxers
+- Optional accelerators (aria2c)
+- Probe runs once per process and is cached on disk against binary mtime
+- No shell forks on the download hot path
+
+Architecture: Dual-Repository Workflow v1.2.0
+"""
+
+import json
+import logging
+import os
+import re
+import shutil
+import subprocess
+import threading
+
+from .utils import CACHE_DIR, ensure_parent_dir
+
+DEFAULT_TOOLCHAIN_CACHE = os.path.join(CACHE_DIR, "toolchain.json")
+
+# Narzędzia i polecenia wersji
+TOOLS = {
+    'ffmpeg': ['-hide_banner', '-version'],
+    'ffprobe': ['-hide_banner', '-version'],
+    'aria2c': ['--version'],
+}
+
+PROBE_TIMEOUT = 10
+
+
+def _run(args):
+    """Uruchomienie narzędzia i zwrócenie stdout (pusty string przy błędzie)"""
+    try:
+        completed = subprocess.run(args, capture_output=True, text=True, timeout=PROBE_TIMEOUT)
+        return completed.stdout or ''
+    except (OSError, subprocess.SubprocessError) as e:
+        logging.debug(f"Toolchain probe failed for {args[0]}: {e}")
+        return ''
+
+
+def parse_version(output):
+    """Wersja z pierwszej linii np. 'ffmpeg version 6.1.1-3ubuntu5' lub 'aria2 version 1.37.0'"""
+    match = re.search(r'version\s+(\S+)', output.splitlines()[0] if output else '')
+    return match.group(1) if match else None
+
+
+def parse_ffmpeg_list(output):
+    """
+    Nazwy z listy `ffmpeg -encoders` / `ffmpeg -muxers`.
+
+    Linie mają postać ' A..... libmp3lame  opis' lub '  E mp4  opis';
+    nagłówek kończy się linią ' ------' / ' --'.
+    """
+    names = set()
+    in_body = False
+    for line in output.splitlines():
+        stripped = line.strip()
+        if not in_body:
+            in_body = stripped.startswith('--')
+            continue
+        parts = stripped.split()
+        if len(parts) >= 2:
+            # Nazwy muxerów mogą być listą 'mov,mp4,m4a'
+            names.update(parts[1].split(','))
+    return names
+
+
+class Toolchain:
+    """Wynik sondowania narzędzi - zapytania o możliwości maszyny"""
+
+    def __init__(self, tools):
+        self.tools = tools
+
+    def has(self, name):
+        """Czy narzędzie jest dostępne"""
+        return bool(self.tools.get(name, {}).get('path'))
+
+    def path(self, name):
+        """Ścieżka do narzędzia (lub None)"""
+        return self.tools.get(name, {}).get('path')
+
+    def version(self, name):
+        """Wersja narzędzia (lub None)"""
+        return self.tools.get(name, {}).get('version')
+
+    def has_encoder(self, name):
+        """Czy ffmpeg ma enkoder (np. libmp3lame)"""
+        return name in self.tools.get('ffmpeg', {}).get('encoders', ())
+
+    def has_muxer(self, name):
+        """Czy ffmpeg ma muxer (np. mp4)"""
+        return name in self.tools.get('ffmpeg', {}).get('muxers', ())
+
+    @property
+    def can_merge(self):
+        """Łączenie osobnych strumieni wideo i audio (wymaga ffmpeg)"""
+        return self.has('ffmpeg')
+
+    @property
+    def can_extract_mp3(self):
+        """Konwersja do MP3 (ffmpeg z enkoderem libmp3lame lub mp3)"""
+        if not self.has('ffmpeg'):
+            return False
+        encoders = self.tools['ffmpeg'].get('encoders')
+        # Brak listy (stary cache / nietypowy build) - zakładamy, że działa
+        return not encoders or 'libmp3lame' in encoders or 'mp3' in encoders
+
+    def to_dict(self):
+        """Słownik do diagnostyki"""
+        return {
+            name: {k: (sorted(v) if isinstance(v, (set, list)) else v) for k, v in info.items()}
+            for name, info in self.tools.items()
+        }
+
+
+def _probe_tool(name, path):
+    """Sondowanie jednego narzędzia"""
+    info = {'path': path, 'version': parse_version(_run([path, *TOOLS[name]]))}
+    if name == 'ffmpeg':
+        info['encoders'] = sorted(parse_ffmpeg_list(_run([path, '-hide_banner', '-encoders'])))
+        info['muxers'] = sorted(parse_ffmpeg_list(_run([path, '-hide_banner', '-muxers'])))
+    return info
+
+
+def _load_cache(cache_path):
+    """Odczyt cache sondowania z dysku"""
+    if not cache_path or not os.path.exists(cache_path):
+        return {}
+    try:
+        with open(cache_path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_cache(cache_path, data):
+    """Zapis cache sondowania (atomowo)"""
+    if not cache_path:
+        return
+    try:
+        ensure_parent_dir(cache_path)
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        logging.debug(f"Toolchain cache save failed: {e}")
+
+
+def probe_toolchain(cache_path=DEFAULT_TOOLCHAIN_CACHE, search_path=None):
+    """
+    Sondowanie narzędzi z użyciem cache na dysku.
+
+    Wpis z cache jest ważny, dopóki ścieżka, mtime i rozmiar binarki się nie
+    zmienią - uaktualnienie ffmpeg wymusza ponowne sondowanie.
+    """
+    cached = _load_cache(cache_path)
+    tools = {}
+    dirty = False
+    for name in TOOLS:
+        path = shutil.which(name, path=search_path)
+        if not path:
+            tools[name] = {'path': None}
+            dirty = dirty or cached.get(name, {}).get('path') is not None
+            continue
+        try:
+            stat = os.stat(path)
+            fingerprint = [path, stat.st_mtime, stat.st_size]
+        except OSError:
+            fingerprint = [path, None, None]
+        entry = cached.get(name)
+        if entry and entry.get('fingerprint') == fingerprint:
+            tools[name] = entry
+            continue
+        logging.info(f"🔧 Sondowanie narzędzia {name} ({path})...")
+        tools[name] = {**_probe_tool(name, path), 'fingerprint': fingerprint}
+        dirty = True
+    if dirty:
+        _save_cache(cache_path, tools)
+    return Toolchain(tools)
+
+
+_default_toolchain = None
+_default_toolchain_lock = threading.Lock()
+
+
+def get_toolchain(refresh=False):
+    """Wynik sondowania współdzielony w procesie (sondowanie tylko raz)"""
+    global _default_toolchain
+    with _default_toolchain_lock:
+        if _default_toolchain is None or refresh:
+            _default_toolchain = probe_toolchain()
+        return _default_toolchain
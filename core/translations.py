@@ -86,6 +86,10 @@ TRANSLATIONS = {
     "Wprowadź link YouTube": "Enter YouTube link",
     "Nieprawidłowy link YouTube": "Invalid YouTube link",
     "Sprawdzanie filmu...": "Checking video...",
+    "Łączenie audio i wideo...": "Merging audio and video...",
+    "Przetwarzanie...": "Post-processing...",
+    "Nie znaleziono zadania": "Job not found",
+    "Katalog docelowy nie istnieje": "Destination folder does not exist",
     
     # Comments in code (for documentation purposes)
     "Inicjalizacja downloadera": "Downloader initialization",
@@ -7,19 +7,47 @@ Part of the modular architecture introduced in v1.2.0.
 
 Functions:
 - sanitize_filename(): Cross-platform filename sanitization
+- classify_youtube_url(): Single precompiled URL classifier (kind, IDs, start time)
+- normalize_youtube_urls(): Bulk normalisation and deduplication of URL lists
 - validate_youtube_url(): URL validation with pattern matching
-- extract_video_id(): Video ID extraction from various URL formats
+- is_playlist_url(): Playlist and channel URL detection
+- parse_youtube_id(): Video ID extraction from various URL formats
 - get_safe_path(): Path handling with proper escaping
+- CONFIG_DIR / DATA_DIR / CACHE_DIR: Application state directories (XDG, outside /tmp)
 
 Architecture: Dual-Repository Workflow v1.2.0
 """
 
 import re
+import sys
 import logging
 import os
+from collections import namedtuple
+from functools import lru_cache
 from pathlib import Path
-from urllib.parse import urlparse
 from .translations import t
+from .paths import sanitize_component
+
+
+
+def _xdg_dir(variable, default):
+    """Katalog aplikacji w katalogu bazowym XDG (zmienna środowiskowa lub domyślny)"""
+    return os.path.join(os.environ.get(variable) or os.path.expanduser(default), 'youtube-downloader')
+
+
+# Stan aplikacji poza /tmp - przetrwa restart i czyszczenie /tmp.
+# CONFIG_DIR: ustawienia użytkownika (limity przepustowości),
+# DATA_DIR: dane trwałe (archiwum pobrań, statystyki klientów),
+# CACHE_DIR: dane odtwarzalne (informacje o filmach, sondowanie narzędzi i środowiska)
+CONFIG_DIR = _xdg_dir('XDG_CONFIG_HOME', '~/.config')
+DATA_DIR = _xdg_dir('XDG_DATA_HOME', '~/.local/share')
+CACHE_DIR = _xdg_dir('XDG_CACHE_HOME', '~/.cache')
+
+
+def ensure_parent_dir(path):
+    """Utworzenie katalogu nadrzędnego pliku stanu (OSError gdy się nie da)"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+
 
 def setup_logging(enable_file_logging=True):
     """Konfiguracja logowania
@@ -34,7 +62,8 @@ def setup_logging(enable_file_logging=True):
         log_dir = "/tmp"
         log_file = os.path.join(log_dir, "youtube_downloader.log")
         handlers.append(logging.FileHandler(log_file))
-        print(f"📝 Logi zapisywane w: {log_file}")
+        # stderr - stdout zostaje czysty dla wyjścia NDJSON trybu wsadowego
+        print(f"📝 Logi zapisywane w: {log_file}", file=sys.stderr)
     
     logging.basicConfig(
         level=logging.INFO,
@@ -42,75 +71,182 @@ def setup_logging(enable_file_logging=True):
         handlers=handlers
     )
 
-def validate_youtube_url(url):
-    """Walidacja URL YouTube"""
+# Rodzaje linków YouTube
+URL_VIDEO = 'video'
+URL_PLAYLIST = 'playlist'
+URL_CHANNEL = 'channel'
+
+YouTubeURL = namedtuple('YouTubeURL', ['kind', 'video_id', 'playlist_id', 'start_time', 'canonical_url'])
+
+# Jeden prekompilowany wzorzec dla wszystkich obsługiwanych postaci linków
+# (wielkość liter ignorowana tylko w schemacie i domenie - ID są case-sensitive)
+_YOUTUBE_URL_RE = re.compile(r"""
+    (?i:https?://)?(?i:(?:www|m|music)\.)?
+    (?:
+        (?i:youtu\.be)/(?P<short_id>[\w-]{11})
+      | (?i:youtube(?:-nocookie)?\.com)
+        (?:
+            /(?:embed|v|e|shorts|live)/(?P<path_id>[\w-]{11})
+          | /(?P<channel>(?:channel/|c/|user/|@)[\w.-]+)(?:/\w+)?
+          | /(?P<page>watch|playlist)
+        )?
+    )
+    /?(?:\?(?P<query>[^\#\s]*))?(?:\#(?P<fragment>\S*))?
+""", re.VERBOSE)
+_URL_PARAM_RES = {name: re.compile(rf'(?:^|[&;]){name}=([^&;]*)') for name in ('v', 'list', 't', 'start')}
+_VIDEO_ID_RE = re.compile(r'[\w-]{11}')
+_START_TIME_RE = re.compile(r'(?:(\d+)h)?(?:(\d+)m)?(?:(\d+)s?)?')
+
+def _url_param(params, name):
+    """Wartość parametru z query/fragmentu - regex tylko gdy nazwa w ogóle występuje"""
+    if name + '=' not in params:
+        return None
+    found = _URL_PARAM_RES[name].search(params)
+    return found.group(1) if found else None
+
+def _parse_start_time(value):
+    """Czas startu z parametru t/start ('90', '90s', '1m30s', '1h2m3s')"""
+    match = _START_TIME_RE.fullmatch(value) if value else None
+    if not match or not any(match.groups()):
+        return None
+    hours, minutes, seconds = (int(part or 0) for part in match.groups())
+    return hours * 3600 + minutes * 60 + seconds
+
+@lru_cache(maxsize=4096)
+def _classify(url):
+    match = _YOUTUBE_URL_RE.fullmatch(url)
+    if not match:
+        return None
+    short_id, path_id, channel, page, query, fragment = match.group(
+        'short_id', 'path_id', 'channel', 'page', 'query', 'fragment')
+    # Parametry z query i fragmentu (#t=...) przeszukiwane razem
+    params = f"{query}&{fragment}" if fragment else (query or '')
+
+    video_id = short_id or path_id
+    if not video_id and page == 'watch':
+        video_id = _url_param(params, 'v')
+        if video_id and not _VIDEO_ID_RE.fullmatch(video_id):
+            video_id = None
+    if video_id:
+        start_time = _parse_start_time(_url_param(params, 't') or _url_param(params, 'start'))
+        return YouTubeURL(URL_VIDEO, video_id, _url_param(params, 'list') or None, start_time,
+                          'https://www.youtube.com/watch?v=' + video_id)
+    if page == 'playlist':
+        playlist_id = _url_param(params, 'list')
+        if playlist_id:
+            return YouTubeURL(URL_PLAYLIST, None, playlist_id, None,
+                              'https://www.youtube.com/playlist?list=' + playlist_id)
+    if channel:
+        return YouTubeURL(URL_CHANNEL, None, None, None, 'https://www.youtube.com/' + channel)
+    return None
+
+def classify_youtube_url(url):
+    """
+    Rozpoznanie linku YouTube jednym prekompilowanym wzorcem
+
+    Obsługuje watch (parametr v w dowolnym miejscu), youtu.be, embed, shorts,
+    live, domeny m./music., playlisty i kanały.
+
+    Returns:
+        YouTubeURL: (kind, video_id, playlist_id, start_time, canonical_url)
+            lub None dla linku spoza YouTube / niepoprawnego
+    """
     if not url or not isinstance(url, str):
-        return False
-        
-    # Podstawowe sprawdzenie
-    youtube_patterns = [
-        r'(?:https?://)?(?:www\.)?youtube\.com/watch\?v=[\w-]+',
-        r'(?:https?://)?(?:www\.)?youtu\.be/[\w-]+',
-        r'(?:https?://)?(?:www\.)?youtube\.com/embed/[\w-]+',
-        r'(?:https?://)?(?:www\.)?youtube\.com/v/[\w-]+',
-    ]
-    
-    for pattern in youtube_patterns:
-        if re.match(pattern, url):
-            return True
-            
-    return False
+        return None
+    return _classify(url.strip())
+
+def normalize_youtube_urls(urls, dedupe=True, invalid=None):
+    """
+    Masowa normalizacja listy linków (np. wiersze dużego pliku)
+
+    Args:
+        urls: Dowolny iterowalny zbiór napisów (także otwarty plik)
+        dedupe (bool): Pomijanie powtórzeń (po kanonicznym URL)
+        invalid (list): Opcjonalna lista na odrzucone wiersze
+
+    Yields:
+        YouTubeURL: Rozpoznane linki w kolejności wejścia
+    """
+    seen = set()
+    for url in urls:
+        parsed = classify_youtube_url(url)
+        if parsed is None:
+            if invalid is not None and url.strip():
+                invalid.append(url.strip())
+            continue
+        if dedupe:
+            if parsed.canonical_url in seen:
+                continue
+            seen.add(parsed.canonical_url)
+        yield parsed
+
+def validate_youtube_url(url):
+    """Walidacja URL YouTube (pojedynczy film)"""
+    parsed = classify_youtube_url(url)
+    return parsed is not None and parsed.kind == URL_VIDEO
+
+def is_playlist_url(url):
+    """Sprawdzenie czy URL wskazuje playlistę lub kanał YouTube"""
+    parsed = classify_youtube_url(url)
+    return parsed is not None and parsed.kind in (URL_PLAYLIST, URL_CHANNEL)
+
+# Znacznik czasu: M:SS, MM:SS lub H:MM:SS (opcjonalnie w nawiasach)
+_TIME = r'[\(\[]?((?:\d{1,2}:)?\d{1,2}:\d{2})[\)\]]?'
+# "0:00 - Tekst", "[0:00] Tekst", "0:00-1:30 Tekst" (zakres - liczy się początek)
+_LEADING_TIMESTAMP_RE = re.compile(_TIME + r'(?:\s*[-–—]\s*[\(\[]?(?:\d{1,2}:)?\d{1,2}:\d{2}[\)\]]?)?[\s\-–—:|.]+(\S.*)')
+# "Tekst - 0:00", "Tekst (0:00)"
+_TRAILING_TIMESTAMP_RE = re.compile(r'\s' + _TIME + r'$')
+_LINE_BULLETS = ' \t-*•·>'
+
+def _seconds_to_timestamp(seconds):
+    """Sekundy na znacznik w stylu opisów YouTube (M:SS lub H:MM:SS)"""
+    hours, rest = divmod(int(seconds), 3600)
+    minutes, seconds = divmod(rest, 60)
+    if hours:
+        return f"{hours}:{minutes:02d}:{seconds:02d}"
+    return f"{minutes}:{seconds:02d}"
+
+def extract_timestamps(description, chapters=None):
+    """
+    Ekstrakcja timestampów (rozdziałów) filmu
+
+    Rozdziały z yt-dlp (info['chapters']) mają pierwszeństwo; w przeciwnym
+    razie opis jest parsowany jednym przejściem po liniach - jeden
+    prekompilowany wzorzec na linię, czas liniowy względem długości opisu.
+
+    Returns:
+        list: Słowniki {'time', 'description', 'seconds'} posortowane chronologicznie
+    """
+    if chapters:
+        return [{
+            'time': _seconds_to_timestamp(chapter.get('start_time') or 0),
+            'description': (chapter.get('title') or '').strip(),
+            'seconds': int(chapter.get('start_time') or 0),
+        } for chapter in sorted(chapters, key=lambda c: c.get('start_time') or 0)]
 
-def extract_timestamps(description):
-    """Ekstrakcja timestampów z opisu filmu"""
     if not description:
         return []
-        
-    timestamps = []
-    
-    # Wzorce timestampów
-    patterns = [
-        # 0:00 - Tekst
-        r'(\d{1,2}:\d{2})\s*[-–]\s*(.+)',
-        # 0:00 Tekst
-        r'(\d{1,2}:\d{2})\s+(.+)',
-        # 0:00:00 - Tekst
-        r'(\d{1,2}:\d{2}:\d{2})\s*[-–]\s*(.+)',
-        # 0:00:00 Tekst
-        r'(\d{1,2}:\d{2}:\d{2})\s+(.+)',
-        # (0:00) Tekst
-        r'\((\d{1,2}:\d{2})\)\s+(.+)',
-        # [0:00] Tekst
-        r'\[(\d{1,2}:\d{2})\]\s+(.+)',
-    ]
-    
-    for pattern in patterns:
-        matches = re.findall(pattern, description, re.IGNORECASE)
-        for match in matches:
-            time_str = match[0]
-            description = match[1].strip()
-            
-            # Walidacja czasu
-            if is_valid_timestamp(time_str):
-                timestamps.append({
-                    'time': time_str,
-                    'description': description,
-                    'seconds': timestamp_to_seconds(time_str)
-                })
-    
-    # Usuwanie duplikatów i sortowanie
-    unique_timestamps = []
-    seen_times = set()
-    
-    for ts in timestamps:
-        if ts['time'] not in seen_times:
-            unique_timestamps.append(ts)
-            seen_times.add(ts['time'])
-    
-    # Sortowanie chronologiczne
-    unique_timestamps.sort(key=lambda x: x['seconds'])
-    
-    return unique_timestamps
+
+    timestamps = {}
+    for line in description.splitlines():
+        line = line.strip().lstrip(_LINE_BULLETS)
+        if not line or ':' not in line:
+            continue
+        match = _LEADING_TIMESTAMP_RE.match(line)
+        if match:
+            time_str, text = match.group(1), match.group(2)
+        else:
+            match = _TRAILING_TIMESTAMP_RE.search(line)
+            if not match:
+                continue
+            time_str, text = match.group(1), line[:match.start()]
+        text = text.strip(' \t-–—:|')
+        seconds = timestamp_to_seconds(time_str)
+        # Pierwsze wystąpienie danego czasu wygrywa
+        if text and seconds is not None and seconds not in timestamps:
+            timestamps[seconds] = {'time': time_str, 'description': text, 'seconds': seconds}
+
+    return sorted(timestamps.values(), key=lambda x: x['seconds'])
 
 def is_valid_timestamp(timestamp):
     """Sprawdzenie czy timestamp jest poprawny"""
@@ -126,54 +262,27 @@ def is_valid_timestamp(timestamp):
     return False
 
 def timestamp_to_seconds(timestamp):
-    """Konwersja timestamp na sekundy"""
+    """Konwersja timestamp na sekundy (None gdy minuty/sekundy poza zakresem)"""
     parts = timestamp.split(':')
     
     if len(parts) == 2:
         # MM:SS
         minutes, seconds = map(int, parts)
-        return minutes * 60 + seconds
+        return minutes * 60 + seconds if seconds < 60 else None
     elif len(parts) == 3:
         # HH:MM:SS
         hours, minutes, seconds = map(int, parts)
+        if minutes >= 60 or seconds >= 60:
+            return None
         return hours * 3600 + minutes * 60 + seconds
     else:
         return 0
 
 def sanitize_filename(filename):
-    """Sanityzacja nazwy pliku z wzmocnioną walidacją"""
+    """Sanityzacja nazwy pliku z wzmocnioną walidacją (tylko ASCII, maks. 200 znaków)"""
     if not filename or not isinstance(filename, str):
         return "unknown_file"
-    
-    # Usuwanie niedozwolonych znaków i potencjalnie niebezpiecznych sekwencji
-    invalid_chars = '<>:"/\\|?*'
-    for char in invalid_chars:
-        filename = filename.replace(char, '_')
-    
-    # Zabezpieczenie przed path traversal
-    filename = filename.replace('..', '_')
-    filename = filename.replace('./', '_')
-    filename = filename.replace('\\', '_')
-    
-    # Usuwanie znaków kontrolnych i nie-ASCII w niebezpiecznym kontekście
-    filename = ''.join(char if (char.isprintable() and ord(char) < 127) or char in ' .-_' else '_' for char in filename)
-    
-    # Usuwanie wielokrotnych spacji i podkreślników
-    filename = re.sub(r'\s+', ' ', filename)
-    filename = re.sub(r'_+', '_', filename)
-    
-    # Usuwanie kropek na początku/końcu (ukryte pliki/rozszerzenia)
-    filename = filename.strip('. ')
-    
-    # Zabezpieczenie przed pustym wynikiem
-    if not filename:
-        filename = "sanitized_file"
-    
-    # Ograniczenie długości (kompatybilność z systemami plików)
-    if len(filename) > 200:
-        filename = filename[:200]
-    
-    return filename
+    return sanitize_component(filename, allow_unicode=False, max_bytes=200)
 
 def get_file_size_mb(file_path):
     """Pobieranie rozmiaru pliku w MB"""
@@ -251,16 +360,12 @@ def get_safe_filename(title, extension='.mp4'):
 
 def parse_youtube_id(url):
     """Parsowanie ID filmu z URL YouTube"""
-    patterns = [
-        r'(?:youtube\.com/watch\?v=|youtu\.be/|youtube\.com/embed/|youtube\.com/v/)([\w-]+)',
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, url)
-        if match:
-            return match.group(1)
-    
-    return None
+    parsed = classify_youtube_url(url)
+    return parsed.video_id if parsed else None
+
+def format_variant(resolution=None, audio_only=False):
+    """Wariant formatu w kluczach dziennika i archiwum ('audio', rozdzielczość lub 'best')"""
+    return 'audio' if audio_only else (resolution or 'best')
 
 def format_duration(seconds):
     """Formatowanie czasu trwania"""
@@ -276,6 +381,38 @@ def format_duration(seconds):
     else:
         return f"{minutes:02d}:{seconds:02d}"
 
+def format_progress(event):
+    """
+    Tekst postępu wspólny dla GUI i CLI
+
+    Args:
+        event (dict): Zdarzenie z szyny postępu
+
+    Returns:
+        str: np. "45.3% | 3.2 MB/s | ETA 01:23" lub opis fazy
+    """
+    phase = event.get('phase')
+    if phase == 'merge':
+        return t("Łączenie audio i wideo...")
+    if phase == 'postprocess':
+        return t("Przetwarzanie...")
+    if phase == 'done':
+        return t("Pobieranie zakończone")
+    
+    parts = []
+    percent = event.get('percent')
+    if percent is not None:
+        parts.append(f"{percent:.1f}%")
+    else:
+        parts.append(format_file_size(event.get('downloaded_bytes') or 0))
+    speed = event.get('speed')
+    if speed:
+        parts.append(f"{format_file_size(speed)}/s")
+    eta = event.get('eta')
+    if eta is not None and percent is not None and percent < 100:
+        parts.append(f"ETA {format_duration(int(eta)) if eta else '00:00'}")
+    return " | ".join(parts)
+
 def clean_text(text):
     """Czyszczenie tekstu z niepotrzebnych znaków"""
     if not text:
@@ -16,10 +16,28 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from version import __version__
 from core.utils import setup_logging
 from core.translations import t
+from core.environment import DEFAULT_ENVIRONMENT_CACHE, cached_check, invalidate_checks
 
 class LauncherDiagnostics:
     """Diagnostic tools for GUI/CLI capability detection"""
     
+    def __init__(self, cache_path=DEFAULT_ENVIRONMENT_CACHE, refresh=False):
+        """Tk checks are cached per environment (DISPLAY, Wayland, WSL, interpreter)"""
+        self.cache_path = cache_path
+        self.refresh = refresh
+        self.cached_checks = set()
+    
+    def cached(self, name, check):
+        """Run a check only when the environment changed since the last run"""
+        result, from_cache = cached_check(name, check, self.cache_path, self.refresh)
+        if from_cache:
+            self.cached_checks.add(name)
+        return result
+    
+    def invalidate(self):
+        """Forget cached results for the current environment"""
+        invalidate_checks(self.cache_path)
+    
     @staticmethod
     def check_display():
         """Check if DISPLAY is available"""
@@ -72,29 +90,54 @@ class LauncherDiagnostics:
 class YouTubeDownloaderLauncher:
     """Main launcher class"""
     
-    def __init__(self):
-        self.diagnostics = LauncherDiagnostics()
+    def __init__(self, skip_checks=False, recheck=False):
+        self.diagnostics = LauncherDiagnostics(refresh=recheck)
+        self.skip_checks = skip_checks
         setup_logging()
         
     def print_diagnostics(self):
         """Print environment diagnostics"""
         print(f"🔍 YouTube Downloader v{__version__} - Environment Diagnostics")
         print("=" * 60)
-        print(f"📺 DISPLAY:     {self.diagnostics.check_display()}")
-        print(f"🖼️  Tkinter:     {self.diagnostics.check_tkinter()}")
+        display = self.diagnostics.check_display()
+        # Without DISPLAY no Tk window can be created - skip the slow window tests
+        headless = sys.platform != 'win32' and not display
+        print(f"📺 DISPLAY:     {display}")
+        tkinter_ok = False if headless else self.diagnostics.cached('tkinter', self.diagnostics.check_tkinter)
+        window_ok = False if headless else self.diagnostics.cached('gui_window', self.diagnostics.test_gui_window)
+        print(f"🖼️  Tkinter:     {tkinter_ok}")
         print(f"🐧 WSL:         {self.diagnostics.check_wsl()}")
-        print(f"🖱️  GUI Test:    {self.diagnostics.test_gui_window()}")
+        print(f"🖱️  GUI Test:    {window_ok}")
+        if self.diagnostics.cached_checks:
+            print(f"💾 Cached:      {', '.join(sorted(self.diagnostics.cached_checks))} (--recheck to probe again)")
+        print("=" * 60)
+    
+    def print_import_report(self, module):
+        """Print import-time profile of a module and launcher cold-start timings"""
+        from core.startup import import_time_report, cold_start_report, format_startup_report
+        
+        print(f"🔍 YouTube Downloader v{__version__} - Startup Report")
+        print("=" * 60)
+        try:
+            imports = import_time_report(module)
+        except RuntimeError as e:
+            print(f"❌ Import of {module} failed: {e}")
+            sys.exit(1)
+        print(format_startup_report(imports, cold_start_report()))
         print("=" * 60)
     
     def can_use_gui(self):
         """Determine if GUI can be used"""
+        if self.skip_checks:
+            return True
+        
         # On Windows, DISPLAY is not used — skip that check
         if sys.platform != 'win32':
             if not self.diagnostics.check_display():
                 logging.info("No DISPLAY environment variable")
                 return False
 
-        if not self.diagnostics.check_tkinter():
+        if not self.diagnostics.cached('tkinter', self.diagnostics.check_tkinter):
             logging.info("Tkinter not available or failed import")
             return False
 
@@ -103,9 +146,10 @@ class YouTubeDownloaderLauncher:
     def launch_gui(self):
         """Launch GUI interface"""
         try:
-            from ui.gui import YouTubeDownloaderGUI
+            from ui.gui import YouTubeDownloaderGUI, apply_theme
             import customtkinter as ctk
 
+            apply_theme()
             print(f"🚀 Starting YouTube Downloader v{__version__} (GUI Mode)")
 
             root = ctk.CTk()
@@ -126,6 +170,8 @@ class YouTubeDownloaderLauncher:
             
         except Exception as e:
             import traceback
+            # Cached checks said GUI works - probe again on the next start
+            self.diagnostics.invalidate()
             log_path = os.path.join(os.environ.get('TEMP', '/tmp'), 'youtube-downloader-error.log')
             with open(log_path, 'w') as f:
                 f.write(f"GUI error: {e}\n\n")
@@ -147,11 +193,55 @@ class YouTubeDownloaderLauncher:
             print(f"❌ CLI failed to start: {e}")
             sys.exit(1)
     
+    def launch_server(self, host, port, workers, output_dir=None):
+        """Launch headless HTTP job server"""
+        try:
+            from ui.server import JobServer
+            
+            server = JobServer(host=host, port=port, output_dir=output_dir, max_workers=workers)
+            host, port = server.address
+            print(f"🌐 Starting YouTube Downloader v{__version__} (Server Mode)")
+            print(f"📡 Listening on http://{host}:{port} - press Ctrl+C to stop")
+        except Exception as e:
+            print(f"❌ Server failed to start: {e}")
+            sys.exit(1)
+        
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            print("\n🛑 Stopping server...")
+        finally:
+            server.manager.shutdown(wait=True, cancel=True)
+    
+    def launch_batch(self, args):
+        """Run non-interactive batch downloads; returns exit code"""
+        from ui.cli import YouTubeDownloaderCLI
+        
+        cli = YouTubeDownloaderCLI()
+        return cli.run_batch(args.batch, jobs=args.jobs, format_spec=args.format,
+                             json_output=args.json, output_dir=args.output_dir, backend=args.backend)
+    
     def run(self, args):
         """Main run method"""
         if args.test:
             self.print_diagnostics()
             return
+        
+        if args.import_report:
+            self.print_import_report(args.import_report)
+            return
+        
+        if args.keepalive:
+            from core.session import enable_keepalive
+            if not enable_keepalive():
+                print("⚠️ Keep-alive handler unavailable for this yt-dlp version - using stock handlers")
+        
+        if args.serve:
+            self.launch_server(args.host, args.port, args.workers, args.output_dir)
+            return
+        
+        if args.batch:
+            sys.exit(self.launch_batch(args))
             
         if args.cli:
             self.launch_cli()
@@ -190,7 +280,14 @@ Examples:
   %(prog)s              # Auto-detect and use best available interface
   %(prog)s --gui        # Force GUI mode (fails if not available)
   %(prog)s --cli        # Force CLI mode
-  %(prog)s --test       # Show environment diagnostics
+  %(prog)s --test       # Show environment diagnostics (cached, --recheck to probe again)
+  %(prog)s --gui --skip-checks  # Start GUI without environment checks
+  %(prog)s --import-report ui.gui   # Profile startup (import times, cold start)
+  %(prog)s --serve      # Run headless HTTP job server on 127.0.0.1:8765
+  %(prog)s --cli --batch urls.txt --jobs 8 --format 720p --json
+  cat urls.txt | %(prog)s --batch - --format audio
+
+Batch exit codes: 0 all downloaded, 1 some failed, 2 usage error, 130 interrupted
         """
     )
     
@@ -200,16 +297,46 @@ Examples:
                        help='Force CLI mode')
     parser.add_argument('--test', action='store_true',
                        help='Show environment diagnostics')
+    parser.add_argument('--import-report', nargs='?', const='ui.cli', metavar='MODULE',
+                       help='Show import-time report for MODULE (default: ui.cli) and cold-start timings')
+    parser.add_argument('--skip-checks', action='store_true',
+                       help='Skip GUI environment checks and start the GUI directly')
+    parser.add_argument('--recheck', action='store_true',
+                       help='Probe the environment again instead of using cached diagnostics')
+    parser.add_argument('--serve', action='store_true',
+                       help='Run headless HTTP job server (JSON API)')
+    parser.add_argument('--host', default='127.0.0.1',
+                       help='Server bind address (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8765,
+                       help='Server port (default: 8765)')
+    parser.add_argument('--workers', type=int, default=4,
+                       help='Concurrent downloads in server mode (default: 4)')
+    parser.add_argument('--output-dir',
+                       help='Download directory for server and batch modes (default: ~/Downloads)')
+    parser.add_argument('--batch', metavar='FILE',
+                       help="Download URLs listed in FILE ('-' for stdin) without prompts")
+    parser.add_argument('--jobs', type=int, default=4,
+                       help='Concurrent downloads in batch mode (default: 4)')
+    parser.add_argument('--format', default='best',
+                       help='Batch format: best, audio, 720p or 1280x720 (default: best)')
+    parser.add_argument('--json', action='store_true',
+                       help='Batch mode: emit NDJSON records (job, progress, result, summary)')
+    parser.add_argument('--backend', choices=['native', 'aria2c'],
+                       help='Download backend for batch mode (default: native)')
+    parser.add_argument('--keepalive', action='store_true',
+                       help='Reuse HTTP connections across requests (experimental, tested yt-dlp versions only)')
     parser.add_argument('--version', action='version',
                        version=f'YouTube Downloader {__version__}')
     
     args = parser.parse_args()
     
     # Validate arguments
-    if sum([args.gui, args.cli, args.test]) > 1:
+    if sum([args.gui, args.cli, args.test, args.serve, bool(args.import_report)]) > 1:
         parser.error("Only one mode can be specified")
+    if args.batch and (args.gui or args.test or args.serve):
+        parser.error("--batch can only be combined with --cli")
     
-    launcher = YouTubeDownloaderLauncher()
+    launcher = YouTubeDownloaderLauncher(skip_checks=args.skip_checks, recheck=args.recheck)
     launcher.run(args)
 
 if __name__ == "__main__":
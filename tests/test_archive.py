@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""Tests for the download archive — indexed lookups, stale entries and skipping finished videos"""
+import os
+import tempfile
+import unittest
+import sys
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from core.archive import DownloadArchive, file_sha256
+from core.cache import VideoInfoCache
+from core.scoreboard import ClientScoreboard
+from core.downloader import YouTubeDownloader
+
+URL = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
+
+
+class TestDownloadArchive(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        # Katalog danych tworzony przy pierwszym otwarciu archiwum
+        self.db = os.path.join(self.tmp.name, 'data', 'archive.sqlite3')
+        self.video = os.path.join(self.tmp.name, 'Video.mp4')
+        with open(self.video, 'wb') as f:
+            f.write(b'x' * 1000)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_add_and_lookup(self):
+        archive = DownloadArchive(self.db)
+        record = archive.add('dQw4w9WgXcQ', 'best', self.tmp.name, self.video, 'Video')
+        self.assertEqual(record['size'], 1000)
+        # Suma SHA-256 tylko na żądanie (pełny odczyt pliku)
+        self.assertIsNone(record['sha256'])
+        record = DownloadArchive(self.db, checksums=True).add('dQw4w9WgXcQ', 'audio', self.tmp.name, self.video)
+        self.assertEqual(record['sha256'], file_sha256(self.video))
+        self.assertTrue(archive.contains('dQw4w9WgXcQ', 'best', self.tmp.name))
+        self.assertFalse(archive.contains('dQw4w9WgXcQ', '1280x720', self.tmp.name))
+        self.assertEqual(archive.lookup('dQw4w9WgXcQ', 'best', self.tmp.name)['path'], self.video)
+        # Brak pliku - nic do zapisania
+        self.assertIsNone(archive.add('aaaaaaaaaaa', 'best', self.tmp.name, '/nonexistent.mp4'))
+
+    def test_entries_from_other_instance_are_visible(self):
+        writer, reader = DownloadArchive(self.db), DownloadArchive(self.db)
+        self.assertEqual(len(reader), 0)
+        writer.add('dQw4w9WgXcQ', 'best', self.tmp.name, self.video)
+        self.assertTrue(reader.contains('dQw4w9WgXcQ', 'best', self.tmp.name))
+        self.assertEqual(len(DownloadArchive(self.db)), 1)
+
+    def test_changed_or_missing_file_invalidates_entry(self):
+        archive = DownloadArchive(self.db, checksums=True)
+        archive.add('dQw4w9WgXcQ', 'best', self.tmp.name, self.video)
+        with open(self.video, 'wb') as f:
+            f.write(b'y' * 1000)
+        self.assertIsNone(archive.lookup('dQw4w9WgXcQ', 'best', self.tmp.name, verify_checksum=True))
+        self.assertFalse(archive.contains('dQw4w9WgXcQ', 'best', self.tmp.name))
+
+        archive.add('dQw4w9WgXcQ', 'best', self.tmp.name, self.video)
+        os.unlink(self.video)
+        self.assertIsNone(archive.lookup('dQw4w9WgXcQ', 'best', self.tmp.name))
+        self.assertEqual(len(DownloadArchive(self.db)), 0)
+
+
+class TestDownloaderSkipsArchived(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.archive = DownloadArchive(db_path=None)
+        self.downloader = YouTubeDownloader(info_cache=VideoInfoCache(db_path=None),
+                                            scoreboard=ClientScoreboard(path=None), archive=self.archive)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_second_download_is_skipped_without_extraction(self):
+        path = os.path.join(self.tmp.name, 'Video.mp4')
+
+        def fake_download(*args, **kwargs):
+            with open(path, 'wb') as f:
+                f.write(b'x' * 10)
+            return {'filename': 'Video.mp4', 'full_path': path, 'title': 'Video', 'duration': 5, 'filesize': 10}
+
+        with mock.patch.object(self.downloader, '_download_video', side_effect=fake_download) as download:
+            self.downloader.download_video(URL, self.tmp.name)
+            result = self.downloader.download_video(URL, self.tmp.name)
+            self.assertEqual(download.call_count, 1)
+            self.assertTrue(result['skipped'])
+            self.assertEqual(result['full_path'], path)
+
+            # Inny wariant lub wymuszenie - normalne pobieranie
+            self.downloader.download_video(URL, self.tmp.name, audio_only=True)
+            self.downloader.download_video(URL, self.tmp.name, skip_existing=False)
+            self.assertEqual(download.call_count, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""Tests for download backends — aria2c option building, progress translation and cancel"""
+import os
+import tempfile
+import time
+import unittest
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import yt_dlp
+from yt_dlp.downloader import get_suitable_downloader
+
+from core.backends import Aria2cBackendFD, build_backend_opts, parse_aria2c_readout
+from core.toolchain import Toolchain
+
+WITH_ARIA2C = Toolchain({'aria2c': {'path': '/usr/bin/aria2c'}})
+
+FAKE_ARIA2C = """#!/bin/sh
+printf '[#2089b0 1.0MiB/20MiB(5%%) CN:8 DL:2.0MiB ETA:9s]\\r'
+sleep 1
+printf '[#2089b0 10MiB/20MiB(50%%) CN:8 DL:4.0MiB ETA:2s]\\r'
+sleep 30
+"""
+
+
+class TestBackendOptions(unittest.TestCase):
+
+    def test_native_backend_has_no_options(self):
+        self.assertEqual(build_backend_opts(None), {})
+        self.assertEqual(build_backend_opts('native'), {})
+
+    def test_aria2c_options(self):
+        opts = build_backend_opts('aria2c', WITH_ARIA2C, connections=4)
+        name = Aria2cBackendFD.get_basename()
+        self.assertEqual(opts['external_downloader'], {'http': name})
+        self.assertEqual(opts['external_downloader_args'][name], ['-x', '4', '-s', '4', '-k', '1M'])
+
+    def test_aria2c_gets_the_job_rate_limit(self):
+        opts = build_backend_opts('aria2c', WITH_ARIA2C, ratelimit=250000.5)
+        self.assertEqual(opts['ratelimit'], 250000)
+        with yt_dlp.YoutubeDL({'quiet': True, **opts}) as ydl:
+            fd = Aria2cBackendFD(ydl, ydl.params)
+            cmd = fd._make_cmd('/tmp/video.mp4.part', {'url': 'https://example.com/v.mp4'})
+        self.assertIn('--max-overall-download-limit', cmd)
+        self.assertNotIn('ratelimit', build_backend_opts('aria2c', WITH_ARIA2C))
+        self.assertEqual(build_backend_opts('native', ratelimit=250000), {})
+
+    def test_console_readout_and_allocation_are_forced(self):
+        opts = build_backend_opts('aria2c', WITH_ARIA2C)
+        name = Aria2cBackendFD.get_basename()
+        opts['external_downloader_args'][name] += ['--file-allocation', 'falloc', '--show-console-readout=false']
+        with yt_dlp.YoutubeDL({'quiet': True, 'noprogress': True, **opts}) as ydl:
+            fd = Aria2cBackendFD(ydl, ydl.params)
+            cmd = fd._make_cmd('/tmp/video.mp4.part', {'url': 'https://example.com/v.mp4'})
+        options = [arg for arg in cmd if arg.startswith(('--show-console-readout', '--file-allocation'))]
+        self.assertEqual(options, ['--show-console-readout=true', '--file-allocation=none'])
+        self.assertNotIn('falloc', cmd)
+
+    def test_missing_aria2c_falls_back_to_native(self):
+        self.assertEqual(build_backend_opts('aria2c', Toolchain({'aria2c': {'path': None}})), {})
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            build_backend_opts('wget')
+
+    def test_small_files_stay_native(self):
+        opts = build_backend_opts('aria2c', WITH_ARIA2C)
+        small = {'url': 'https://example.com/a.m4a', 'protocol': 'https', 'filesize': 1024}
+        large = {'url': 'https://example.com/v.mp4', 'protocol': 'https', 'filesize': 500 * 1024 * 1024}
+        self.assertFalse(Aria2cBackendFD.supports(small))
+        self.assertTrue(Aria2cBackendFD.supports(large))
+        self.assertEqual(get_suitable_downloader(small, opts).__name__, 'HttpFD')
+
+
+class TestAria2cProgress(unittest.TestCase):
+
+    def test_parse_readout(self):
+        readout = parse_aria2c_readout('[#1 1.0MiB/20MiB(5%) CN:8 DL:2.0MiB ETA:1m5s]\r'
+                                       '[#1 10MiB/20MiB(50%) CN:8 DL:4.0MiB ETA:2s]')
+        self.assertEqual(readout['downloaded_bytes'], 10 * 1024 * 1024)
+        self.assertEqual(readout['total_bytes'], 20 * 1024 * 1024)
+        self.assertEqual(readout['speed'], 4 * 1024 * 1024)
+        self.assertEqual(readout['eta'], 2)
+        self.assertEqual(parse_aria2c_readout('[#1 0B/0B(0%) CN:1 DL:0B]')['eta'], None)
+        self.assertIsNone(parse_aria2c_readout('Download Results:'))
+
+    def test_progress_hooks_and_cancel_kill_process(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            script = os.path.join(tmp, 'aria2c')
+            with open(script, 'w') as f:
+                f.write(FAKE_ARIA2C)
+            os.chmod(script, 0o755)
+
+            events = []
+
+            def hook(d):
+                events.append(d)
+                if d['downloaded_bytes'] >= 10 * 1024 * 1024:
+                    raise Exception('cancelled')
+
+            with yt_dlp.YoutubeDL({'quiet': True}) as ydl:
+                fd = Aria2cBackendFD(ydl, {})
+                fd.add_progress_hook(hook)
+                fd._tmpfilename = os.path.join(tmp, 'video.mp4.part')
+                fd._started = time.time()
+                started = time.monotonic()
+                with self.assertRaises(Exception):
+                    fd._call_process([script], {'filesize': 20 * 1024 * 1024})
+
+            self.assertLess(time.monotonic() - started, 10)
+            self.assertEqual(events[-1]['status'], 'downloading')
+            self.assertEqual(events[-1]['filename'], os.path.join(tmp, 'video.mp4'))
+            self.assertEqual(events[-1]['speed'], 4 * 1024 * 1024)
+
+    def test_preallocated_file_is_not_reported_as_progress(self):
+        events = []
+        with tempfile.TemporaryDirectory() as tmp, yt_dlp.YoutubeDL({'quiet': True}) as ydl:
+            fd = Aria2cBackendFD(ydl, {})
+            fd.add_progress_hook(events.append)
+            fd._tmpfilename = os.path.join(tmp, 'video.mp4.part')
+            fd._started = time.time()
+            # Plik prealokowany przez aria2c - pełny rozmiar od początku
+            with open(fd._tmpfilename, 'wb') as f:
+                f.truncate(20 * 1024 * 1024)
+            fd._report_progress('', {'filesize': 20 * 1024 * 1024})
+        self.assertEqual(events[-1]['downloaded_bytes'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""Tests for the bandwidth scheduler — shares, priorities, profiles and throttling"""
+import datetime
+import json
+import os
+import tempfile
+import types
+import unittest
+import sys
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from core.bandwidth import (BandwidthScheduler, BandwidthProfile, PRIORITY_BACKGROUND,
+                            PRIORITY_INTERACTIVE, PRIORITY_NORMAL, CONFIG_PATH, load_bandwidth_config)
+from core.utils import CONFIG_DIR
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestBandwidthScheduler(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+
+    def make(self, **kwargs):
+        return BandwidthScheduler(clock=self.clock, **kwargs)
+
+    def test_unlimited_never_waits(self):
+        scheduler = self.make()
+        scheduler.register('a')
+        self.assertEqual(scheduler.consume('a', 10 ** 9), 0.0)
+
+    def test_weights_split_the_global_cap(self):
+        scheduler = self.make(rate=3000)
+        scheduler.register('a', weight=2)
+        scheduler.register('b', weight=1)
+        shares = {job: info['share'] for job, info in scheduler.stats()['jobs'].items()}
+        self.assertAlmostEqual(shares['a'], 2 / 3)
+        self.assertAlmostEqual(shares['b'], 1 / 3)
+
+    def test_interactive_preempts_background_without_starving_it(self):
+        scheduler = self.make(rate=1000, min_share=0.1)
+        scheduler.register('gui', priority=PRIORITY_INTERACTIVE)
+        scheduler.register('batch1', priority=PRIORITY_BACKGROUND)
+        scheduler.register('batch2', priority=PRIORITY_BACKGROUND)
+        shares = {job: info['share'] for job, info in scheduler.stats()['jobs'].items()}
+        self.assertAlmostEqual(shares['gui'], 0.9)
+        self.assertAlmostEqual(shares['batch1'], 0.05)
+        self.assertAlmostEqual(shares['batch2'], 0.05)
+
+    def test_job_rate_for_external_downloaders(self):
+        self.assertIsNone(self.make().job_rate('a'))
+        scheduler = self.make(rate=1000, min_share=0.1)
+        scheduler.register('gui', priority=PRIORITY_INTERACTIVE)
+        scheduler.register('batch', priority=PRIORITY_BACKGROUND)
+        self.assertAlmostEqual(scheduler.job_rate('gui'), 900)
+        self.assertAlmostEqual(scheduler.job_rate('batch'), 100)
+
+    def test_idle_jobs_release_their_share(self):
+        scheduler = self.make(rate=1000, idle_after=2.0)
+        scheduler.register('gui', priority=PRIORITY_INTERACTIVE)
+        scheduler.register('batch', priority=PRIORITY_NORMAL)
+        self.clock.now += 10
+        self.assertAlmostEqual(scheduler.stats()['jobs']['batch']['share'], 1.0)
+
+    def test_consume_waits_for_tokens(self):
+        scheduler = self.make(rate=1000, burst=0)
+        scheduler.register('a')
+        with mock.patch('core.bandwidth.time.sleep') as sleep:
+            delay = scheduler.consume('a', 500)
+        self.assertAlmostEqual(delay, 0.5)
+        sleep.assert_called_once_with(delay)
+        # Po odczekaniu tokeny są uzupełnione
+        self.clock.now += 0.5
+        with mock.patch('core.bandwidth.time.sleep'):
+            self.assertAlmostEqual(scheduler.consume('a', 0.001), 0.0, places=3)
+
+    def test_progress_hook_counts_deltas_per_file(self):
+        scheduler = self.make(rate=10 ** 9)
+        scheduler.register('a')
+        hook = scheduler.progress_hook('a')
+        for downloaded in (100, 300, 600):
+            hook({'status': 'downloading', 'filename': 'v.mp4', 'downloaded_bytes': downloaded})
+        self.assertEqual(scheduler.stats()['jobs']['a']['consumed_bytes'], 500)
+
+    def test_time_of_day_profiles(self):
+        moment = datetime.time(12, 0)
+        scheduler = self.make(rate=5000, now=lambda: moment,
+                              profiles=[{'start': '08:00', 'end': '18:00', 'rate': 1000}])
+        self.assertEqual(scheduler.current_rate(), 1000)
+        moment = datetime.time(20, 0)
+        self.assertEqual(scheduler.current_rate(), 5000)
+
+    def test_profile_across_midnight(self):
+        night = BandwidthProfile('22:00', '06:00', None)
+        self.assertTrue(night.matches(datetime.time(23, 30)))
+        self.assertTrue(night.matches(datetime.time(5, 0)))
+        self.assertFalse(night.matches(datetime.time(12, 0)))
+
+
+class TestBandwidthConfig(unittest.TestCase):
+
+    def test_limits_live_in_user_config_dir(self):
+        self.assertEqual(os.path.dirname(CONFIG_PATH), CONFIG_DIR)
+
+    def test_saving_last_directory_keeps_limits(self):
+        from ui.gui import YouTubeDownloaderGUI
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'config.json')
+            with open(path, 'w') as f:
+                json.dump({'bandwidth_limit': 500000,
+                           'bandwidth_profiles': [{'start': '09:00', 'end': '17:00', 'rate': 100000}]}, f)
+            YouTubeDownloaderGUI.save_last_directory(types.SimpleNamespace(config_file=path), tmp)
+            rate, profiles = load_bandwidth_config(path)
+            self.assertEqual(rate, 500000)
+            self.assertEqual(len(profiles), 1)
+            with open(path) as f:
+                self.assertEqual(json.load(f)['last_directory'], tmp)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""Tests for the non-interactive batch CLI — URL lists, NDJSON records and exit codes"""
+import io
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+import sys
+from contextlib import redirect_stdout
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from core.manager import DownloadManager
+from ui.cli import (YouTubeDownloaderCLI, parse_format_option, read_batch_urls,
+                    EXIT_OK, EXIT_FAILED, EXIT_USAGE)
+
+
+class FakeDownloader:
+    """Downloader stand-in: fails for video IDs containing 'fail'"""
+
+    def __init__(self, cancel_event=None, progress_bus=None):
+        self._cancel_event = cancel_event or threading.Event()
+        self.progress_bus = progress_bus
+
+    def download_video(self, url, output_dir, job_id=None, **options):
+        self.progress_bus.publish({'job_id': job_id, 'status': 'downloading', 'phase': 'download',
+                                   'percent': 50.0})
+        if 'fail' in url:
+            raise Exception("boom")
+        return {'title': url[-11:], 'full_path': os.path.join(output_dir, 'v.mp4'), 'options': options}
+
+
+class SlowDownloader(FakeDownloader):
+    """Downloader stand-in that takes a moment per video"""
+
+    def download_video(self, url, output_dir, job_id=None, **options):
+        time.sleep(0.01)
+        return super().download_video(url, output_dir, job_id=job_id, **options)
+
+
+class TestBatchHelpers(unittest.TestCase):
+
+    def test_parse_format_option(self):
+        self.assertEqual(parse_format_option('best'), {})
+        self.assertEqual(parse_format_option('audio'), {'audio_only': True})
+        self.assertEqual(parse_format_option('720p'), {'resolution': '0x720'})
+        self.assertEqual(parse_format_option('1280x720'), {'resolution': '1280x720'})
+        with self.assertRaises(ValueError):
+            parse_format_option('ultra')
+
+    def test_read_batch_urls_skips_blanks_and_comments(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False) as f:
+            f.write("# lista\nhttps://youtu.be/aaaaaaaaaaa\n\n  https://youtu.be/bbbbbbbbbbb  \n")
+        try:
+            self.assertEqual(read_batch_urls(f.name),
+                             [(2, 'https://youtu.be/aaaaaaaaaaa'), (4, 'https://youtu.be/bbbbbbbbbbb')])
+        finally:
+            os.unlink(f.name)
+
+
+class TestRunBatch(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cli = YouTubeDownloaderCLI.__new__(YouTubeDownloaderCLI)
+        self.cli.download_directory = self.tmp.name
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def run_batch(self, lines, **kwargs):
+        path = os.path.join(self.tmp.name, 'urls.txt')
+        with open(path, 'w') as f:
+            f.write('\n'.join(lines))
+        manager = DownloadManager(max_workers=2, downloader_factory=FakeDownloader)
+        out = io.StringIO()
+        with redirect_stdout(out):
+            code = self.cli.run_batch(path, json_output=True, manager=manager, **kwargs)
+        return code, [json.loads(line) for line in out.getvalue().splitlines()]
+
+    def test_all_jobs_succeed(self):
+        code, records = self.run_batch(['https://youtu.be/aaaaaaaaaaa', 'https://youtu.be/bbbbbbbbbbb'],
+                                       format_spec='720p')
+        self.assertEqual(code, EXIT_OK)
+        results = [r for r in records if r['type'] == 'result']
+        self.assertEqual(len(results), 2)
+        self.assertTrue(all(r['status'] == 'finished' for r in results))
+        self.assertEqual(results[0]['result']['options']['resolution'], '0x720')
+        self.assertIn('progress', {r['type'] for r in records})
+        self.assertEqual(records[-1]['type'], 'summary')
+        self.assertEqual(records[-1]['finished'], 2)
+
+    def test_failures_and_invalid_urls_give_exit_code_1(self):
+        code, records = self.run_batch(['https://youtu.be/aaaaaaaaaaa', 'not a url', 'https://youtu.be/failfailfai'])
+        self.assertEqual(code, EXIT_FAILED)
+        self.assertEqual([r['line'] for r in records if r['type'] == 'error'], [2])
+        self.assertEqual(records[-1]['failed'], 1)
+        self.assertEqual(records[-1]['invalid'], 1)
+
+    def test_duplicate_urls_are_downloaded_once(self):
+        code, records = self.run_batch(['https://youtu.be/aaaaaaaaaaa',
+                                        'https://www.youtube.com/watch?v=aaaaaaaaaaa&t=10'])
+        self.assertEqual(code, EXIT_OK)
+        self.assertEqual(len([r for r in records if r['type'] == 'job']), 1)
+        self.assertEqual(records[-1]['duplicates'], 1)
+
+    def test_input_is_streamed_with_bounded_submission(self):
+        manager = DownloadManager(max_workers=2, downloader_factory=SlowDownloader)
+        submit = manager.submit
+        in_flight = []
+        first_done = threading.Event()
+        manager_done = manager._on_job_done
+
+        def tracking_submit(*args, **kwargs):
+            in_flight.append(len(manager.jobs))
+            return submit(*args, **kwargs)
+
+        def tracking_done(job, future):
+            manager_done(job, future)
+            first_done.set()
+
+        def stdin_lines():
+            yield 'https://youtu.be/aaaaaaaaaaa\n'
+            # Kolejne linie dopiero po zakończeniu pierwszego zadania - wejście nie jest czytane z góry
+            self.assertTrue(first_done.wait(5))
+            for i in range(40):
+                yield f'https://youtu.be/bbbbbbbbb{i:02d}\n'
+
+        out = io.StringIO()
+        with mock.patch.object(manager, 'submit', tracking_submit), \
+                mock.patch.object(manager, '_on_job_done', tracking_done), \
+                mock.patch('sys.stdin', stdin_lines()), redirect_stdout(out):
+            code = self.cli.run_batch('-', json_output=True, manager=manager)
+        self.assertEqual(code, EXIT_OK)
+        self.assertEqual(json.loads(out.getvalue().splitlines()[-1])['finished'], 41)
+        self.assertLessEqual(max(in_flight), 4)
+
+    def test_usage_errors_give_exit_code_2(self):
+        out = io.StringIO()
+        with redirect_stdout(out):
+            self.assertEqual(self.cli.run_batch('/nonexistent/urls.txt', json_output=True), EXIT_USAGE)
+            self.assertEqual(self.run_batch([])[0], EXIT_USAGE)
+            self.assertEqual(self.run_batch(['https://youtu.be/aaaaaaaaaaa'], format_spec='ultra')[0], EXIT_USAGE)
+
+
+if __name__ == '__main__':
+    unittest.main()
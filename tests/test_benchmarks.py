@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""Tests for the offline benchmark suite — fake backend, offline download and baseline comparison"""
+import os
+import tempfile
+import unittest
+import sys
+import urllib.request
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+
+from fake_youtube import FakeYouTubeServer, synthetic_bytes
+from run import compare_results, make_downloader, metric, HIGHER
+
+
+class TestFakeYouTubeServer(unittest.TestCase):
+
+    def setUp(self):
+        self.server = FakeYouTubeServer().start()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_range_requests(self):
+        url = self.server.media_url('v', 200000, 'mp4')
+        request = urllib.request.Request(url, headers={'Range': 'bytes=70000-70009'})
+        with urllib.request.urlopen(request, timeout=5) as response:
+            self.assertEqual(response.status, 206)
+            self.assertEqual(response.headers['Content-Range'], 'bytes 70000-70009/200000')
+            self.assertEqual(response.read(), synthetic_bytes(70000, 70010))
+
+    def test_offline_download_from_injected_info(self):
+        info = self.server.make_info(video_id='aaaaaaaaaaa', size=300000, formats=('18',))
+        with tempfile.TemporaryDirectory() as output_dir:
+            result = make_downloader().download_video('https://youtu.be/aaaaaaaaaaa', output_dir,
+                                                      info={'info_dict': info, 'client': 'iOS Client'})
+            self.assertEqual(result['filesize'], 300000)
+            self.assertEqual(result['full_path'], os.path.join(output_dir, 'Benchmark video.mp4'))
+
+
+class TestCompareResults(unittest.TestCase):
+
+    def test_regressions_respect_metric_direction(self):
+        baseline = {'hook': metric(10.0, 'µs'), 'download': metric(100.0, 'MB/s', HIGHER),
+                    'classify': metric(2.0, 'µs')}
+        current = {'hook': metric(14.0, 'µs'), 'download': metric(70.0, 'MB/s', HIGHER),
+                   'classify': metric(2.2, 'µs'), 'new': metric(1.0, 'ms')}
+        regressions = compare_results(current, baseline, tolerance=0.25)
+        self.assertEqual(sorted(r['name'] for r in regressions), ['download', 'hook'])
+        self.assertEqual(compare_results(current, baseline, tolerance=0.5), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""Tests for VideoInfoCache — LRU, SQLite persistence, TTL and revalidation"""
+import os
+import tempfile
+import threading
+import time
+import unittest
+import sys
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from core.cache import VideoInfoCache
+from core.downloader import YouTubeDownloader
+
+
+class TestVideoInfoCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmpdir.name, 'cache.sqlite3')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_put_and_lookup_fresh(self):
+        cache = VideoInfoCache(db_path=self.db_path)
+        cache.put('abc', {'title': 'A'})
+        value, fresh = cache.lookup('abc')
+        self.assertEqual(value, {'title': 'A'})
+        self.assertTrue(fresh)
+        cache.close()
+
+    def test_lookup_returns_independent_copy(self):
+        cache = VideoInfoCache(db_path=None)
+        cache.put('abc', {'formats': [{'format_id': '18'}], 'info_dict': {'title': 'A'}})
+        value, _ = cache.lookup('abc')
+        value['formats'].append({'format_id': '137'})
+        value['info_dict']['title'] = 'B'
+        self.assertEqual(cache.get('abc'), {'formats': [{'format_id': '18'}], 'info_dict': {'title': 'A'}})
+
+    def test_database_directory_is_created(self):
+        db_path = os.path.join(self.tmpdir.name, 'state', 'cache.sqlite3')
+        cache = VideoInfoCache(db_path=db_path)
+        cache.put('abc', {'title': 'A'})
+        cache.close()
+        self.assertTrue(os.path.exists(db_path))
+
+    def test_persists_between_instances(self):
+        cache = VideoInfoCache(db_path=self.db_path)
+        cache.put('abc', {'title': 'A'})
+        cache.close()
+        reopened = VideoInfoCache(db_path=self.db_path)
+        self.assertEqual(reopened.get('abc'), {'title': 'A'})
+        reopened.close()
+
+    def test_memory_lru_eviction(self):
+        cache = VideoInfoCache(db_path=None, max_entries=2)
+        cache.put('a', {'n': 1})
+        cache.put('b', {'n': 2})
+        cache.lookup('a')
+        cache.put('c', {'n': 3})
+        self.assertIsNotNone(cache.get('a'))
+        self.assertIsNone(cache.get('b'))
+
+    def test_stale_and_expired_entries(self):
+        cache = VideoInfoCache(db_path=None, ttl=0.05, stale_ttl=0.2)
+        cache.put('a', {'n': 1})
+        time.sleep(0.1)
+        value, fresh = cache.lookup('a')
+        self.assertEqual(value, {'n': 1})
+        self.assertFalse(fresh)
+        time.sleep(0.2)
+        self.assertEqual(cache.lookup('a'), (None, False))
+
+    def test_disk_size_eviction(self):
+        cache = VideoInfoCache(db_path=self.db_path, max_entries=1, max_disk_bytes=200)
+        for i in range(10):
+            cache.put(f'k{i}', {'payload': 'x' * 50})
+        self.assertIsNone(cache.get('k0'))
+        self.assertIsNotNone(cache.get('k9'))
+        cache.close()
+
+    def test_revalidate_refreshes_in_background(self):
+        cache = VideoInfoCache(db_path=None)
+        done = threading.Event()
+
+        def fetch():
+            done.set()
+            return {'n': 2}
+
+        cache.put('a', {'n': 1})
+        cache.revalidate('a', fetch)
+        self.assertTrue(done.wait(1))
+        for _ in range(50):
+            if cache.get('a') == {'n': 2}:
+                break
+            time.sleep(0.01)
+        self.assertEqual(cache.get('a'), {'n': 2})
+
+    def test_downloader_uses_cache_by_video_id(self):
+        cache = VideoInfoCache(db_path=None)
+        cache.put('dQw4w9WgXcQ', {'title': 'Cached'})
+        d = YouTubeDownloader(info_cache=cache)
+        info = d.get_video_info('https://youtu.be/dQw4w9WgXcQ')
+        self.assertEqual(info['title'], 'Cached')
+
+
+    def test_info_returned_after_miss_is_not_the_cached_entry(self):
+        cache = VideoInfoCache(db_path=None)
+        d = YouTubeDownloader(info_cache=cache)
+        extracted = {'title': 'Fresh', 'formats': [{'format_id': '18'}], 'info_dict': {'id': 'dQw4w9WgXcQ'}}
+        with mock.patch.object(d, '_extract_video_info', return_value=extracted):
+            info = d.get_video_info('https://youtu.be/dQw4w9WgXcQ')
+        # Jak process_ie_result na ścieżce ponownego użycia
+        info['formats'].append({'format_id': '137'})
+        info['info_dict']['requested_downloads'] = []
+        value, _ = cache.lookup('dQw4w9WgXcQ')
+        self.assertEqual(value['formats'], [{'format_id': '18'}])
+        self.assertEqual(value['info_dict'], {'id': 'dQw4w9WgXcQ'})
+
+
+if __name__ == '__main__':
+    unittest.main()
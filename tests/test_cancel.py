@@ -17,6 +17,12 @@ class TestCancelMechanism(unittest.TestCase):
         self.assertIsInstance(d._cancel_event, threading.Event)
         self.assertFalse(d._cancel_event.is_set())
 
+    def test_cancel_event_passed_to_constructor(self):
+        event = threading.Event()
+        d = YouTubeDownloader(cancel_event=event)
+        d.cancel_download()
+        self.assertTrue(event.is_set())
+
     def test_cancel_download_sets_event(self):
         d = YouTubeDownloader()
         d.cancel_download()
@@ -28,7 +34,7 @@ class TestCancelMechanism(unittest.TestCase):
         with self.assertRaises(Exception) as ctx:
             d._progress_hook(
                 {'status': 'downloading', 'downloaded_bytes': 500, 'total_bytes': 1000},
-                callback=None
+                job_id=None
             )
         msg = str(ctx.exception).lower()
         self.assertTrue('anulowane' in msg or 'cancelled' in msg or 'canceled' in msg)
@@ -38,7 +44,7 @@ class TestCancelMechanism(unittest.TestCase):
         # Should not raise
         d._progress_hook(
             {'status': 'downloading', 'downloaded_bytes': 500, 'total_bytes': 1000},
-            callback=None
+            job_id=None
         )
 
     def test_cancel_event_cleared_after_reset(self):
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""Tests for cached launcher diagnostics — environment fingerprint, revalidation and invalidation"""
+import os
+import tempfile
+import time
+import unittest
+import sys
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from core.environment import cached_check, environment_fingerprint, invalidate_checks, _display_socket
+
+
+class CountingCheck:
+    """Sprawdzenie zliczające wywołania"""
+
+    def __init__(self, result=True):
+        self.result = result
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return self.result
+
+
+class TestEnvironmentCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache_path = os.path.join(self.tmp.name, 'environment.json')
+        self.env = mock.patch.dict(os.environ, {'DISPLAY': 'remote:10.0', 'WSL_DISTRO_NAME': ''})
+        self.env.start()
+
+    def tearDown(self):
+        self.env.stop()
+        self.tmp.cleanup()
+
+    def test_check_runs_once_per_environment(self):
+        check = CountingCheck()
+        self.assertEqual(cached_check('tkinter', check, self.cache_path), (True, False))
+        self.assertEqual(cached_check('tkinter', check, self.cache_path), (True, True))
+        self.assertEqual(check.calls, 1)
+
+    def test_environment_change_triggers_probe(self):
+        check = CountingCheck()
+        cached_check('tkinter', check, self.cache_path)
+        with mock.patch.dict(os.environ, {'DISPLAY': 'other:11.0'}):
+            self.assertEqual(cached_check('tkinter', check, self.cache_path), (True, False))
+        with mock.patch.dict(os.environ, {'WSL_DISTRO_NAME': 'Ubuntu'}):
+            cached_check('tkinter', check, self.cache_path)
+        self.assertEqual(check.calls, 3)
+        # Powrót do pierwszego środowiska - wynik nadal w cache
+        self.assertEqual(cached_check('tkinter', check, self.cache_path), (True, True))
+
+    def test_refresh_max_age_and_invalidate(self):
+        check = CountingCheck(result=False)
+        cached_check('gui_window', check, self.cache_path)
+        cached_check('gui_window', check, self.cache_path, refresh=True)
+        with mock.patch('core.environment.time.time', return_value=time.time() + 3600):
+            cached_check('gui_window', check, self.cache_path, max_age=60)
+        self.assertEqual(check.calls, 3)
+        invalidate_checks(self.cache_path)
+        self.assertEqual(cached_check('gui_window', check, self.cache_path), (False, False))
+
+    def test_failed_check_is_retried_after_short_ttl(self):
+        check = CountingCheck(result=False)
+        cached_check('tkinter', check, self.cache_path)
+        self.assertEqual(cached_check('tkinter', check, self.cache_path), (False, True))
+        with mock.patch('core.environment.time.time', return_value=time.time() + 10 * 60):
+            check.result = True
+            self.assertEqual(cached_check('tkinter', check, self.cache_path), (True, False))
+        # Wynik pozytywny ważny dłużej niż negatywny
+        with mock.patch('core.environment.time.time', return_value=time.time() + 20 * 60):
+            self.assertEqual(cached_check('tkinter', check, self.cache_path), (True, True))
+        self.assertEqual(check.calls, 2)
+
+    def test_corrupted_cache_is_ignored(self):
+        with open(self.cache_path, 'w') as f:
+            f.write('{not json')
+        self.assertEqual(cached_check('tkinter', CountingCheck(), self.cache_path), (True, False))
+
+    def test_fingerprint_tracks_display_socket(self):
+        self.assertIsNone(_display_socket('remote:10.0'))
+        self.assertIsNotNone(_display_socket(':0'))
+        self.assertIsNotNone(_display_socket('unix:1.0'))
+        with mock.patch.dict(os.environ, {'DISPLAY': ':0'}):
+            fingerprint = environment_fingerprint()
+        self.assertEqual(fingerprint['display'], ':0')
+        self.assertEqual(fingerprint['python'], sys.executable)
+
+
+class TestLauncherDiagnostics(unittest.TestCase):
+
+    def test_can_use_gui_uses_cache_and_skip_flag(self):
+        import launcher
+        with tempfile.TemporaryDirectory() as tmp, \
+                mock.patch.dict(os.environ, {'DISPLAY': 'remote:10.0'}), \
+                mock.patch.object(launcher, 'setup_logging'):
+            app = launcher.YouTubeDownloaderLauncher()
+            app.diagnostics.cache_path = os.path.join(tmp, 'environment.json')
+            check = CountingCheck()
+            with mock.patch.object(app.diagnostics, 'check_tkinter', check):
+                self.assertTrue(app.can_use_gui())
+                self.assertTrue(app.can_use_gui())
+            self.assertEqual(check.calls, 1)
+
+            skipping = launcher.YouTubeDownloaderLauncher(skip_checks=True)
+            with mock.patch.object(skipping.diagnostics, 'check_tkinter', check):
+                self.assertTrue(skipping.can_use_gui())
+            self.assertEqual(check.calls, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""Tests for the format catalog — indexes, exact selection, expected size and downloader integration"""
+import os
+import unittest
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+
+from core.formats import FormatCatalog, catalog_for, catalog_format_selector, codec_family, merge_ext, parse_height
+from core.toolchain import Toolchain
+from core.archive import DownloadArchive
+from core.cache import VideoInfoCache
+from core.downloader import YouTubeDownloader
+from core.scoreboard import ClientScoreboard
+from fake_youtube import FakeYouTubeServer
+
+FORMATS = [
+    {'format_id': '18', 'ext': 'mp4', 'width': 640, 'height': 360, 'vcodec': 'avc1.42001E',
+     'acodec': 'mp4a.40.2', 'tbr': 500},
+    {'format_id': '137', 'ext': 'mp4', 'width': 1920, 'height': 1080, 'vcodec': 'avc1.640028',
+     'acodec': 'none', 'tbr': 4000, 'filesize': 40000000},
+    {'format_id': '248', 'ext': 'webm', 'width': 1920, 'height': 1080, 'vcodec': 'vp09.00.40.08',
+     'acodec': 'none', 'tbr': 3000, 'fps': 60},
+    {'format_id': '136', 'ext': 'mp4', 'width': 1280, 'height': 720, 'vcodec': 'avc1.4d401f',
+     'acodec': 'none', 'tbr': 2000},
+    {'format_id': '251', 'ext': 'webm', 'vcodec': 'none', 'acodec': 'opus', 'abr': 160, 'tbr': 160},
+    {'format_id': '140', 'ext': 'm4a', 'vcodec': 'none', 'acodec': 'mp4a.40.2', 'abr': 128, 'tbr': 128,
+     'filesize': 3000000},
+    {'format_id': 'sb0', 'ext': 'mhtml', 'vcodec': 'none', 'acodec': 'none'},
+]
+# Formaty po ekstrakcji (yt-dlp zawsze podaje URL strumienia)
+EXTRACTED = [dict(fmt, url=f"https://example.com/{fmt['format_id']}") for fmt in FORMATS]
+
+
+class TestFormatCatalog(unittest.TestCase):
+
+    def setUp(self):
+        self.catalog = FormatCatalog(FORMATS, duration=200)
+
+    def test_streams_are_split_and_indexed(self):
+        self.assertEqual([f['format_id'] for f in self.catalog.video], ['137', '248', '136'])
+        self.assertEqual([f['format_id'] for f in self.catalog.audio], ['251', '140'])
+        self.assertEqual([f['format_id'] for f in self.catalog.progressive], ['18'])
+        self.assertEqual(self.catalog.heights('all'), [1080, 720, 360])
+        self.assertEqual([f['format_id'] for f in self.catalog.streams('video', height=1080, codec='vp9')], ['248'])
+        self.assertEqual([f['format_id'] for f in self.catalog.streams('audio', ext='m4a')], ['140'])
+
+    def test_best_mp4_pair_at_or_below_height(self):
+        selection = self.catalog.select(1080)
+        self.assertEqual(selection['format'], '137+140')
+        self.assertEqual(selection['ext'], 'mp4')
+        self.assertTrue(selection['requires_merge'])
+        self.assertEqual(selection['filesize'], 43000000)
+        self.assertEqual(self.catalog.select(1000)['format'], '136+140')
+        # Rozmiar szacowany z bitrate i czasu trwania (2000 kbit/s * 200 s)
+        self.assertEqual(self.catalog.select(720)['filesize'], 2000 * 125 * 200 + 3000000)
+
+    def test_progressive_without_merge_and_fallback_to_best(self):
+        selection = self.catalog.select(1080, can_merge=False)
+        self.assertEqual(selection['format'], '18')
+        self.assertFalse(selection['requires_merge'])
+        # Nic w limicie wysokości - najlepszy dostępny format
+        self.assertEqual(self.catalog.select(144)['format'], '137+140')
+        self.assertIsNone(FormatCatalog([FORMATS[4]]).select(720))
+
+    def test_resolutions_for_gui(self):
+        self.assertEqual(self.catalog.resolutions(), ['1920x1080', '1280x720', '640x360'])
+
+    def test_helpers(self):
+        self.assertEqual(parse_height('1920x1080'), 1080)
+        self.assertEqual(parse_height('0x720'), 720)
+        self.assertIsNone(parse_height('invalid'))
+        self.assertEqual(codec_family('vp09.00.40.08'), 'vp9')
+        self.assertEqual(codec_family('av01.0.08M.08'), 'av1')
+        self.assertEqual(codec_family('vp8.0'), 'vp8')
+        self.assertEqual(codec_family('ec-3'), 'ec-3')
+        self.assertEqual(codec_family('hev1.1.6.L120.90'), 'hev1')
+        self.assertIsNone(codec_family('none'))
+        self.assertEqual(merge_ext(FORMATS[2], FORMATS[4]), 'webm')
+        self.assertEqual(merge_ext(FORMATS[2], FORMATS[5]), 'mkv')
+
+    def test_catalog_is_built_once_per_info_dict(self):
+        raw = {'formats': list(FORMATS), 'duration': 200}
+        video_info = {'formats': raw['formats'], 'duration': '3:20', 'info_dict': raw}
+        self.assertIs(catalog_for(video_info), catalog_for(raw))
+        self.assertIsNot(catalog_for({'formats': list(FORMATS)}), catalog_for(raw))
+
+    def test_large_format_ladder(self):
+        info = FakeYouTubeServer().make_info(ladder=True)
+        self.assertGreaterEqual(len(info['formats']), 100)
+        selection = FormatCatalog(info['formats'], info['duration']).select(1080)
+        self.assertEqual(selection['format'], '1080h60+a128m-en')
+        self.assertEqual(selection['height'], 1080)
+
+    def test_yt_dlp_selects_through_catalog(self):
+        import yt_dlp
+        info = FakeYouTubeServer().make_info(ladder=True)
+        with yt_dlp.YoutubeDL({'quiet': True, 'no_warnings': True,
+                               'format': catalog_format_selector(1080)}) as ydl:
+            result = ydl.process_ie_result(info, download=False)
+        # Ten sam wybór co katalog nad formatami po przetworzeniu przez yt-dlp
+        self.assertEqual(result['format_id'], FormatCatalog(result['formats']).select(1080)['format'])
+        self.assertTrue(result['format_id'].startswith('1080h60+a128m-'))
+        self.assertEqual(result['ext'], 'mp4')
+        self.assertEqual(len(result['requested_formats']), 2)
+
+
+class TestDownloaderFormats(unittest.TestCase):
+
+    def make_downloader(self, tools):
+        return YouTubeDownloader(info_cache=VideoInfoCache(db_path=None),
+                                 scoreboard=ClientScoreboard(path=None),
+                                 toolchain=Toolchain(tools),
+                                 archive=DownloadArchive(db_path=None))
+
+    @staticmethod
+    def selected(opts):
+        return [f['format_id'] for f in opts['format']({'formats': EXTRACTED, 'incomplete_formats': False})]
+
+    def test_format_is_selected_from_catalog(self):
+        config = {'name': 'iOS Client', 'opts': {}}
+        merging = self.make_downloader({'ffmpeg': {'path': '/opt/ffmpeg/bin/ffmpeg', 'encoders': []}})
+        opts = merging._build_download_opts({}, config, '1280x720', False)
+        self.assertEqual(self.selected(opts), ['136+140'])
+        plain = self.make_downloader({'ffmpeg': {'path': None}})
+        opts = plain._build_download_opts({}, config, '1280x720', False)
+        self.assertEqual(self.selected(opts), ['18'])
+        # Wznowienie ma pierwszeństwo przed katalogiem
+        opts = merging._build_download_opts({}, config, '1280x720', False,
+                                            resume={'client': 'iOS Client', 'format': '248+251'})
+        self.assertEqual(opts['format'], '248+251')
+
+    def test_merged_format_matches_yt_dlp(self):
+        import yt_dlp
+        ctx = {'formats': EXTRACTED, 'incomplete_formats': False, 'has_merged_format': True}
+        expected = next(yt_dlp.YoutubeDL({'quiet': True}).build_format_selector('136+140')(ctx))
+        merged = next(catalog_format_selector(720)(ctx))
+        for key in ('format_id', 'ext', 'protocol', 'width', 'height', 'vcodec', 'acodec', 'tbr'):
+            self.assertEqual(merged[key], expected[key], key)
+        self.assertEqual([f['format_id'] for f in merged['requested_formats']], ['136', '140'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""Tests for adaptive fragment concurrency — ramp-up, back-off and per-download sessions"""
+import os
+import unittest
+import sys
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from core.fragments import FragmentConcurrencyController, is_throttle_error
+
+
+class TestFragmentConcurrencyController(unittest.TestCase):
+
+    def test_ramps_up_while_throughput_grows(self):
+        controller = FragmentConcurrencyController(initial=2)
+        controller.record_throughput(2, 1_000_000)
+        self.assertEqual(controller.level, 3)
+        controller.record_throughput(3, 1_500_000)
+        self.assertEqual(controller.level, 4)
+
+    def test_holds_on_plateau_and_steps_back_when_slower(self):
+        controller = FragmentConcurrencyController(initial=2)
+        controller.record_throughput(2, 1_000_000)
+        controller.record_throughput(3, 1_010_000)
+        self.assertEqual(controller.level, 3)
+        controller.record_throughput(3, 500_000)
+        self.assertEqual(controller.level, 2)
+
+    def test_backs_off_on_throttling(self):
+        controller = FragmentConcurrencyController(initial=8)
+        self.assertTrue(controller.record_error('ERROR: HTTP Error 429: Too Many Requests'))
+        self.assertEqual(controller.level, 4)
+        self.assertFalse(controller.record_error('Video unavailable'))
+        self.assertEqual(controller.level, 4)
+        controller.record_error('The read operation timed out')
+        self.assertEqual(controller.stats()['backoffs'], 2)
+        self.assertEqual(controller.level, 2)
+
+    def test_respects_bounds(self):
+        controller = FragmentConcurrencyController(initial=16, maximum=16)
+        controller.record_throughput(16, 10_000_000)
+        self.assertEqual(controller.level, 16)
+        controller = FragmentConcurrencyController(initial=1)
+        controller.record_error('HTTP Error 403: Forbidden')
+        self.assertEqual(controller.level, 1)
+
+    def test_is_throttle_error(self):
+        self.assertTrue(is_throttle_error('HTTP Error 403: Forbidden'))
+        self.assertFalse(is_throttle_error('Sign in to confirm you are not a bot'))
+
+
+class TestFragmentSession(unittest.TestCase):
+
+    def test_session_measures_fragmented_downloads_only(self):
+        controller = FragmentConcurrencyController(initial=4)
+        session = controller.session()
+        with mock.patch('core.fragments.time.monotonic', side_effect=[0.0, 2.0, 5.0, 6.0]):
+            session.progress_hook({'status': 'downloading', 'filename': 'v.mp4', 'downloaded_bytes': 0,
+                                   'fragment_index': 1, 'fragment_count': 10})
+            session.progress_hook({'status': 'finished', 'filename': 'v.mp4', 'downloaded_bytes': 4_000_000})
+            # Pobieranie progresywne (bez fragmentów) nie jest mierzone
+            session.progress_hook({'status': 'downloading', 'filename': 'a.m4a', 'downloaded_bytes': 10})
+            session.progress_hook({'status': 'finished', 'filename': 'a.m4a', 'downloaded_bytes': 100})
+        self.assertEqual(controller.stats()['throughput'], {4: 2_000_000})
+        self.assertEqual(controller.level, 5)
+
+    def test_session_failure_lowers_level_for_next_attempt(self):
+        controller = FragmentConcurrencyController(initial=8)
+        session = controller.session()
+        self.assertEqual(session.record_failure('HTTP Error 403: Forbidden'), 4)
+        self.assertEqual(session.level, 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
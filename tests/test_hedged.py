@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""Tests for hedged client racing in get_video_info"""
+import os
+import threading
+import time
+import unittest
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from core.cache import VideoInfoCache
+from core.downloader import YouTubeDownloader
+from core.scoreboard import ClientScoreboard
+
+
+class HedgedDownloader(YouTubeDownloader):
+    """Downloader with scripted per-client latency and outcome"""
+
+    def __init__(self, behaviour, **kwargs):
+        super().__init__(info_cache=VideoInfoCache(db_path=None),
+                         scoreboard=ClientScoreboard(path=None), **kwargs)
+        self.behaviour = behaviour
+        self.started = []
+        self.lock = threading.Lock()
+
+    def _extract_with_client(self, url, config):
+        with self.lock:
+            self.started.append((config['name'], time.monotonic()))
+        delay, ok = self.behaviour[config['name']]
+        time.sleep(delay)
+        if not ok:
+            raise Exception(f"{config['name']} failed")
+        return {'title': 'T', 'client': config['name']}
+
+
+class TestHedgedExtraction(unittest.TestCase):
+
+    def test_sequential_by_default(self):
+        d = HedgedDownloader({'Android TV Client': (0, False), 'iOS Client': (0, True),
+                              'Android Client': (0, True)})
+        info = d.get_video_info('https://youtu.be/x', use_cache=False)
+        self.assertEqual(info['client'], 'iOS Client')
+        self.assertEqual([name for name, _ in d.started], ['Android TV Client', 'iOS Client'])
+
+    def test_slow_client_is_hedged_after_budget(self):
+        d = HedgedDownloader({'Android TV Client': (1.0, True), 'iOS Client': (0.05, True),
+                              'Android Client': (0.05, True)}, hedge_delay=0.1)
+        started = time.monotonic()
+        info = d.get_video_info('https://youtu.be/x', use_cache=False)
+        self.assertEqual(info['client'], 'iOS Client')
+        self.assertLess(time.monotonic() - started, 0.5)
+
+    def test_failure_launches_next_immediately(self):
+        d = HedgedDownloader({'Android TV Client': (0, False), 'iOS Client': (0, False),
+                              'Android Client': (0, True)}, hedge_delay=5)
+        started = time.monotonic()
+        info = d.get_video_info('https://youtu.be/x', use_cache=False)
+        self.assertEqual(info['client'], 'Android Client')
+        self.assertLess(time.monotonic() - started, 1)
+
+    def test_zero_delay_starts_all_clients(self):
+        d = HedgedDownloader({'Android TV Client': (0.3, True), 'iOS Client': (0.3, True),
+                              'Android Client': (0.01, True)})
+        info = d.get_video_info('https://youtu.be/x', use_cache=False, hedge_delay=0)
+        self.assertEqual(info['client'], 'Android Client')
+        self.assertEqual(len(d.started), 3)
+
+    def test_all_clients_fail(self):
+        d = HedgedDownloader({name: (0, False) for name in
+                              ('Android TV Client', 'iOS Client', 'Android Client')}, hedge_delay=0.1)
+        with self.assertRaises(Exception):
+            d.get_video_info('https://youtu.be/x', use_cache=False)
+
+
+if __name__ == '__main__':
+    unittest.main()
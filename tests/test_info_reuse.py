@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""Tests for check-then-download info reuse — no second extraction while URLs are valid"""
+import os
+import time
+import unittest
+import sys
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from core.archive import DownloadArchive
+from core.cache import VideoInfoCache
+from core.downloader import YouTubeDownloader
+from core.scoreboard import ClientScoreboard
+
+
+def make_info(expire):
+    return {
+        'id': 'dQw4w9WgXcQ',
+        'title': 'Test',
+        'ext': 'mp4',
+        'formats': [{'format_id': '18', 'url': f'https://rr1.googlevideo.com/videoplayback?expire={expire}&id=1'}],
+    }
+
+
+class FakeYDL:
+    """Minimal YoutubeDL stand-in that records which entry point was used"""
+    calls = []
+
+    def __init__(self, params):
+        self.params = params
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def process_ie_result(self, info, download=True):
+        FakeYDL.calls.append('process_ie_result')
+        return info
+
+    def extract_info(self, url, download=True):
+        FakeYDL.calls.append('extract_info')
+        return make_info(int(time.time()) + 3600)
+
+    def add_post_processor(self, pp, when='post_process'):
+        pass
+
+    def prepare_filename(self, info):
+        return f"/tmp/{info['title']}.{info['ext']}"
+
+
+class TestInfoReuse(unittest.TestCase):
+
+    def setUp(self):
+        FakeYDL.calls = []
+        self.downloader = YouTubeDownloader(info_cache=VideoInfoCache(db_path=None),
+                                             scoreboard=ClientScoreboard(path=None),
+                                             archive=DownloadArchive(db_path=None))
+
+    def test_fresh_and_expired_urls(self):
+        self.assertTrue(self.downloader._info_is_fresh(make_info(int(time.time()) + 3600)))
+        self.assertFalse(self.downloader._info_is_fresh(make_info(int(time.time()) + 10)))
+        self.assertFalse(self.downloader._info_is_fresh({'formats': []}))
+
+    def test_fresh_info_skips_extraction(self):
+        info = {'info_dict': make_info(int(time.time()) + 3600), 'client': 'iOS Client'}
+        with mock.patch('core.downloader.yt_dlp.YoutubeDL', FakeYDL):
+            result = self.downloader.download_video('https://youtu.be/dQw4w9WgXcQ', '/tmp', info=info)
+        self.assertEqual(FakeYDL.calls, ['process_ie_result'])
+        self.assertEqual(result['filename'], 'Test.mp4')
+
+    def test_expired_info_falls_back_to_extraction(self):
+        info = {'info_dict': make_info(int(time.time()) - 10), 'client': 'iOS Client'}
+        with mock.patch('core.downloader.yt_dlp.YoutubeDL', FakeYDL):
+            self.downloader.download_video('https://youtu.be/dQw4w9WgXcQ', '/tmp', info=info)
+        self.assertEqual(FakeYDL.calls, ['extract_info'])
+
+    def test_info_for_other_video_falls_back_to_extraction(self):
+        info = {'info_dict': make_info(int(time.time()) + 3600), 'client': 'iOS Client'}
+        with mock.patch('core.downloader.yt_dlp.YoutubeDL', FakeYDL):
+            self.downloader.download_video('https://youtu.be/jNQXAC9IVRw', '/tmp', info=info)
+        self.assertEqual(FakeYDL.calls, ['extract_info'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""Tests for DownloadJournal — crash-safe record of interrupted downloads"""
+import multiprocessing
+import os
+import tempfile
+import unittest
+import sys
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from core.archive import DownloadArchive
+from core.cache import VideoInfoCache
+from core.downloader import YouTubeDownloader
+from core.journal import DownloadJournal, JournalPostProcessor, JOURNAL_FILENAME, fcntl
+from core.scoreboard import ClientScoreboard
+
+URL = 'https://www.youtube.com/watch?v=dQw4w9WgXcQ'
+
+
+def _record_many(output_dir, worker, count):
+    """Zadania jednego procesu zapisujące wpisy do wspólnego dziennika"""
+    journal = DownloadJournal(output_dir, save_interval=0)
+    for i in range(count):
+        journal.record_selection(f'{worker}:{i}', 'iOS Client', '18', ['18'])
+
+
+class TestDownloadJournal(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.dir = self.tmpdir.name
+        self.journal = DownloadJournal(self.dir, save_interval=0)
+        self.key = DownloadJournal.make_key(URL, '1920x1080')
+        self.part = os.path.join(self.dir, 'Video.f137.mp4.part')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _interrupt(self):
+        JournalPostProcessor(self.journal, self.key, {'client': 'iOS Client'}).run({
+            'format_id': '137+140',
+            'requested_formats': [{'format_id': '137'}, {'format_id': '140'}],
+        })
+        with open(self.part, 'wb') as f:
+            f.write(b'x' * 100)
+        self.journal.update_from_progress(self.key, {
+            'status': 'downloading', 'filename': self.part[:-5], 'tmpfilename': self.part,
+            'downloaded_bytes': 100, 'total_bytes': 1000, 'info_dict': {'format_id': '137'},
+        })
+
+    def test_make_key(self):
+        self.assertEqual(self.key, 'dQw4w9WgXcQ:1920x1080')
+        self.assertEqual(DownloadJournal.make_key(URL, audio_only=True), 'dQw4w9WgXcQ:audio')
+        self.assertIsNone(DownloadJournal.make_key('https://example.com/video'))
+
+    def test_records_selection_and_offsets(self):
+        self._interrupt()
+        entry = self.journal.get_resumable(self.key)
+        self.assertEqual(entry['client'], 'iOS Client')
+        self.assertEqual(entry['format_ids'], ['137', '140'])
+        state = entry['files'][self.part[:-5]]
+        self.assertEqual(state['downloaded_bytes'], 100)
+        self.assertEqual(state['format_id'], '137')
+
+    def test_not_resumable_without_partial_files(self):
+        self._interrupt()
+        os.remove(self.part)
+        self.assertIsNone(self.journal.get_resumable(self.key))
+
+    def test_complete_removes_entry_and_file(self):
+        self._interrupt()
+        self.journal.complete(self.key)
+        self.assertIsNone(self.journal.get(self.key))
+        self.assertFalse(os.path.exists(os.path.join(self.dir, JOURNAL_FILENAME)))
+
+    def test_discard_removes_partial_files(self):
+        self._interrupt()
+        self.journal.discard(self.key)
+        self.assertFalse(os.path.exists(self.part))
+        self.assertIsNone(self.journal.get(self.key))
+
+    @unittest.skipIf(fcntl is None, 'flock unavailable')
+    def test_processes_do_not_overwrite_each_other(self):
+        ctx = multiprocessing.get_context('fork')
+        workers = [ctx.Process(target=_record_many, args=(self.dir, worker, 25)) for worker in range(4)]
+        for process in workers:
+            process.start()
+        for process in workers:
+            process.join(30)
+            self.assertEqual(process.exitcode, 0)
+        self.assertEqual(len(self.journal.entries()), 100)
+
+    def test_downloader_resumes_with_same_client_and_format(self):
+        self._interrupt()
+        used = []
+
+        class FakeYDL:
+            def __init__(self, params):
+                self.params = params
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *args):
+                return False
+
+            def add_post_processor(self, pp, when='post_process'):
+                pass
+
+            def extract_info(self, url, download=True):
+                used.append((self.params['user_agent'], self.params['format']))
+                return {'title': 'Video', 'ext': 'mp4'}
+
+            def prepare_filename(self, info):
+                return os.path.join(self.params['outtmpl'].rsplit(os.sep, 1)[0], 'Video.mp4')
+
+        d = YouTubeDownloader(info_cache=VideoInfoCache(db_path=None), scoreboard=ClientScoreboard(path=None),
+                              archive=DownloadArchive(db_path=None))
+        with mock.patch('core.downloader.yt_dlp.YoutubeDL', FakeYDL):
+            d.download_video(URL, self.dir, resolution='1920x1080')
+        self.assertIn('iPhone', used[0][0])
+        self.assertEqual(used[0][1], '137+140')
+        self.assertIsNone(self.journal.get(self.key))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""Tests for DownloadManager — bounded pool, per-job cancel and progress"""
+import threading
+import time
+import unittest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from core.bandwidth import PRIORITY_BACKGROUND
+from core.manager import (DownloadJob, DownloadManager, JOB_FINISHED, JOB_CANCELLED, JOB_FAILED, JOB_QUEUED,
+                          JOB_RUNNING)
+
+
+class FakeDownloader:
+    """Stand-in downloader that reports progress and honours cancel"""
+    running = 0
+    peak = 0
+    lock = threading.Lock()
+    playlist_size = 0
+    list_delay = 0
+    listed = []
+    priorities = []
+
+    def __init__(self, cancel_event=None, progress_bus=None):
+        self._cancel_event = cancel_event or threading.Event()
+        self.progress_bus = progress_bus
+
+    def download_video(self, url, output_dir, resolution=None, audio_only=False, job_id=None, priority=None):
+        with FakeDownloader.lock:
+            FakeDownloader.priorities.append(priority)
+            FakeDownloader.running += 1
+            FakeDownloader.peak = max(FakeDownloader.peak, FakeDownloader.running)
+        try:
+            for status, percent in (('downloading', 50), ('finished', 100)):
+                if self._cancel_event.wait(0.02):
+                    raise Exception("Pobieranie zostało anulowane")
+                self.progress_bus.publish({'job_id': job_id, 'status': status, 'percent': percent})
+            if 'fail' in url:
+                raise Exception("boom")
+            return {'filename': url.rsplit('/', 1)[-1], 'full_path': url}
+        finally:
+            with FakeDownloader.lock:
+                FakeDownloader.running -= 1
+
+    def cancel_download(self):
+        self._cancel_event.set()
+
+    def iter_playlist_entries(self, url):
+        for i in range(FakeDownloader.playlist_size):
+            FakeDownloader.listed.append(i)
+            if FakeDownloader.list_delay:
+                time.sleep(FakeDownloader.list_delay)
+            yield {'id': f'v{i}', 'url': f'https://youtu.be/v{i}', 'title': f'Video {i}'}
+
+
+class TestDownloadManager(unittest.TestCase):
+
+    def setUp(self):
+        FakeDownloader.running = 0
+        FakeDownloader.peak = 0
+        FakeDownloader.playlist_size = 0
+        FakeDownloader.list_delay = 0
+        FakeDownloader.listed = []
+
+    def test_runs_jobs_with_bounded_concurrency(self):
+        with DownloadManager(max_workers=2, downloader_factory=FakeDownloader) as manager:
+            jobs = manager.submit_many([f"https://youtu.be/v{i}" for i in range(6)], "/tmp")
+            results = manager.wait(jobs)
+        self.assertEqual(len(results), 6)
+        self.assertTrue(all(job.status == JOB_FINISHED for job in jobs))
+        self.assertLessEqual(FakeDownloader.peak, 2)
+
+    def test_progress_is_routed_per_job(self):
+        seen = {}
+
+        def on_progress(job, progress):
+            seen.setdefault(job.id, []).append(progress['percent'])
+
+        with DownloadManager(max_workers=2, downloader_factory=FakeDownloader) as manager:
+            jobs = manager.submit_many(["https://youtu.be/a", "https://youtu.be/b"], "/tmp",
+                                       progress_callback=on_progress)
+            manager.wait(jobs)
+        for job in jobs:
+            self.assertEqual(seen[job.id], [50, 100])
+
+    def test_cancel_only_affects_target_job(self):
+        with DownloadManager(max_workers=2, downloader_factory=FakeDownloader) as manager:
+            first = manager.submit("https://youtu.be/a", "/tmp")
+            second = manager.submit("https://youtu.be/b", "/tmp")
+            manager.cancel(first.id)
+            manager.wait([first, second])
+        self.assertEqual(first.status, JOB_CANCELLED)
+        self.assertEqual(second.status, JOB_FINISHED)
+
+    def test_failed_job_records_error(self):
+        with DownloadManager(max_workers=1, downloader_factory=FakeDownloader) as manager:
+            job = manager.submit("https://youtu.be/fail", "/tmp")
+            manager.wait([job])
+        self.assertEqual(job.status, JOB_FAILED)
+        self.assertIn("boom", job.error)
+
+    def test_finished_jobs_are_evicted_and_counted(self):
+        with DownloadManager(max_workers=2, downloader_factory=FakeDownloader, max_finished=2) as manager:
+            jobs = manager.submit_many([f"https://youtu.be/v{i}" for i in range(5)] + ["https://youtu.be/fail"], "/tmp")
+            manager.wait(jobs)
+            self.assertEqual(manager.stats(), {'active': 0, 'finished': 5, 'failed': 1, 'cancelled': 0})
+            self.assertEqual(len(manager.list_jobs()), 2)
+            self.assertEqual(manager.jobs, {})
+            last = manager.list_jobs()[-1]
+            self.assertIs(manager.get_job(last.id), last)
+            self.assertIsNone(manager.get_job(jobs[0].id))
+            self.assertTrue(manager.forget(last.id))
+            self.assertIsNone(manager.get_job(last.id))
+
+    def test_playlist_downloads_start_before_listing_ends(self):
+        FakeDownloader.playlist_size = 5
+        FakeDownloader.list_delay = 0.05
+        first_started = []
+
+        def on_progress(job, progress):
+            if not first_started:
+                first_started.append(len(FakeDownloader.listed))
+
+        with DownloadManager(max_workers=2, downloader_factory=FakeDownloader) as manager:
+            expansion = manager.submit_playlist("https://www.youtube.com/playlist?list=PL1", "/tmp",
+                                                progress_callback=on_progress)
+            self.assertTrue(expansion.wait(5))
+        self.assertEqual(expansion.to_dict()['finished'], 5)
+        self.assertLess(first_started[0], 5)
+
+    def test_playlist_bounds_jobs_in_flight(self):
+        FakeDownloader.playlist_size = 40
+        with DownloadManager(max_workers=2, downloader_factory=FakeDownloader) as manager:
+            expansion = manager.submit_playlist("https://www.youtube.com/@channel", "/tmp", max_pending=3)
+            time.sleep(0.05)
+            # Listing is throttled by the in-flight limit, not run ahead to the end
+            self.assertLess(len(FakeDownloader.listed), 40)
+            self.assertTrue(expansion.wait(10))
+        self.assertEqual(expansion.submitted, 40)
+
+    def test_playlist_jobs_run_at_background_priority(self):
+        FakeDownloader.playlist_size = 2
+        FakeDownloader.priorities = []
+        with DownloadManager(max_workers=2, downloader_factory=FakeDownloader) as manager:
+            self.assertTrue(manager.submit_playlist("https://www.youtube.com/playlist?list=PL1", "/tmp").wait(5))
+        self.assertEqual(FakeDownloader.priorities, [PRIORITY_BACKGROUND] * 2)
+
+
+class TestProcessMode(unittest.TestCase):
+
+    def test_job_is_running_only_after_worker_starts(self):
+        manager = DownloadManager(max_workers=1, use_processes=True)
+        try:
+            job = DownloadJob("https://youtu.be/a", "/tmp", {})
+            manager.jobs[job.id] = job
+            self.assertEqual(job.status, JOB_QUEUED)
+            # Znacznik wysyłany przez _run_job_in_process po wyjęciu zadania z kolejki
+            manager._progress_queue.put((JOB_RUNNING, job.id))
+            deadline = time.time() + 5
+            while job.status != JOB_RUNNING and time.time() < deadline:
+                time.sleep(0.01)
+            self.assertEqual(job.status, JOB_RUNNING)
+        finally:
+            manager.shutdown()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""Tests for the output path planner — sanitising, byte limits and atomic name reservation"""
+import os
+import subprocess
+import tempfile
+import threading
+import unittest
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from core.paths import OutputPathPlanner, sanitize_component, truncate_utf8, name_max_bytes
+
+
+class TestSanitize(unittest.TestCase):
+
+    def test_invalid_and_control_characters(self):
+        self.assertEqual(sanitize_component('a/b:c?*\tżółw  x'), 'a_b_c_żółw x')
+        self.assertEqual(sanitize_component('a/b żółw', allow_unicode=False), 'a_b _w')
+        self.assertEqual(sanitize_component('..'), 'sanitized_file')
+
+    def test_utf8_byte_limit(self):
+        self.assertEqual(truncate_utf8('żółw', 3), 'ż')
+        name = sanitize_component('ż' * 300, max_bytes=255)
+        self.assertLessEqual(len(name.encode('utf-8')), 255)
+        self.assertEqual(set(name), {'ż'})
+
+
+class TestOutputPathPlanner(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = self.tmp.name
+        self.planner = OutputPathPlanner()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_parallel_jobs_with_identical_titles_get_distinct_names(self):
+        paths = []
+        threads = [threading.Thread(target=lambda n=n: paths.append(self.planner.reserve(self.dir, 'Film', 'mp4', n)))
+                   for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(set(paths)), 8)
+        self.assertIn(os.path.join(self.dir, 'Film.mp4'), paths)
+        self.assertIn(os.path.join(self.dir, 'Film (7).mp4'), paths)
+
+    def test_same_owner_keeps_name_and_existing_files_are_skipped(self):
+        open(os.path.join(self.dir, 'Film.mp4'), 'w').close()
+        path = self.planner.reserve(self.dir, 'Film', 'mp4', 'job')
+        self.assertEqual(path, os.path.join(self.dir, 'Film (1).mp4'))
+        self.assertEqual(self.planner.reserve(self.dir, 'Film', 'mp4', 'job'), path)
+
+    def test_file_of_same_video_is_reused_on_rerun(self):
+        existing = os.path.join(self.dir, 'Film.mp4')
+        open(existing, 'w').close()
+        self.assertEqual(self.planner.reserve(self.dir, 'Film', 'mp4', 'rerun', existing=existing), existing)
+        self.planner.release('rerun')
+        # Inny film o tym samym tytule (albo brak wpisu w archiwum) - nowa nazwa
+        other = os.path.join(self.dir, 'Inny.mp4')
+        self.assertEqual(self.planner.reserve(self.dir, 'Film', 'mp4', 'other', existing=other),
+                         os.path.join(self.dir, 'Film (1).mp4'))
+        # Plik w użyciu przez trwające zadanie nie jest współdzielony
+        self.assertEqual(self.planner.reserve(self.dir, 'Film', 'mp4', 'a', existing=existing), existing)
+        self.assertEqual(self.planner.reserve(self.dir, 'Film', 'mp4', 'b', existing=existing),
+                         os.path.join(self.dir, 'Film (2).mp4'))
+
+    def test_reservations_are_shared_through_markers_and_released(self):
+        other = OutputPathPlanner()
+        first = self.planner.reserve(self.dir, 'Film', 'mp4', 'a')
+        self.assertNotEqual(other.reserve(self.dir, 'Film', 'mp4', 'b'), first)
+        self.planner.release('a')
+        self.assertEqual(os.listdir(self.dir).count('.Film.mp4.lock'), 0)
+        self.assertEqual(OutputPathPlanner().reserve(self.dir, 'Film', 'mp4', 'c'), first)
+
+    def test_stale_marker_from_dead_process_is_reclaimed(self):
+        process = subprocess.Popen(['true'])
+        process.wait()
+        with open(os.path.join(self.dir, '.Film.mp4.lock'), 'w') as f:
+            f.write(f"{process.pid} old-job\n")
+        self.assertEqual(self.planner.reserve(self.dir, 'Film', 'mp4', 'job'), os.path.join(self.dir, 'Film.mp4'))
+
+    def test_long_titles_fit_name_limit_with_temp_suffixes(self):
+        path = self.planner.reserve(self.dir, 'ą' * 500, 'mp4', 'job')
+        self.assertLessEqual(len((os.path.basename(path) + '.f137.mp4.part').encode('utf-8')),
+                             name_max_bytes(self.dir))
+
+
+if __name__ == '__main__':
+    unittest.main()
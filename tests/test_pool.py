@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""Tests for the YoutubeDL pool — reuse per client profile, per-job overrides and state restore"""
+import os
+import tempfile
+import unittest
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+
+import yt_dlp
+from core.pool import YoutubeDLPool
+from core.downloader import YOUTUBE_EXTRACTORS
+from fake_youtube import FakeYouTubeServer
+from run import make_downloader
+
+PROFILE_OPTS = {'allowed_extractors': YOUTUBE_EXTRACTORS,
+                'extractor_args': {'youtube': {'player_client': ['ios']}}}
+
+
+class TestYoutubeDLPool(unittest.TestCase):
+
+    def setUp(self):
+        self.pool = YoutubeDLPool()
+
+    def test_instances_are_reused_per_profile(self):
+        with self.pool.checkout('iOS Client', PROFILE_OPTS) as first:
+            pass
+        with self.pool.checkout('iOS Client', PROFILE_OPTS, {'quiet': True}) as second:
+            self.assertTrue(second.params['quiet'])
+        with self.pool.checkout('Android Client', PROFILE_OPTS) as other:
+            pass
+        self.assertIs(first, second)
+        self.assertIsNot(first, other)
+        self.assertEqual(self.pool.stats(), {'created': 2, 'reused': 1, 'discarded': 0, 'idle': 2})
+
+    def test_job_overrides_are_applied_and_restored(self):
+        hook = lambda d: None
+        overrides = {'outtmpl': '/tmp/job/%(title)s.%(ext)s', 'format': 'best', 'progress_hooks': [hook],
+                     'postprocessors': [{'key': 'Exec', 'exec_cmd': 'true', 'when': 'after_move'}],
+                     'concurrent_fragment_downloads': 4}
+        with self.pool.checkout('iOS Client', PROFILE_OPTS, overrides) as ydl:
+            self.assertEqual(ydl.params['outtmpl']['default'], '/tmp/job/%(title)s.%(ext)s')
+            self.assertIsNotNone(ydl.format_selector)
+            self.assertEqual(ydl._progress_hooks, [hook])
+            self.assertEqual(len(ydl._pps['after_move']), 1)
+            ydl.add_post_processor(yt_dlp.postprocessor.get_postprocessor('Exec')(ydl, 'true'), when='video')
+        self.assertNotEqual(ydl.params['outtmpl']['default'], '/tmp/job/%(title)s.%(ext)s')
+        self.assertIsNone(ydl.format_selector)
+        self.assertEqual(ydl._progress_hooks, [])
+        self.assertFalse(any(ydl._pps.values()))
+        self.assertNotIn('concurrent_fragment_downloads', ydl.params)
+
+    def test_build_time_options_must_be_in_profile(self):
+        with self.assertRaises(ValueError):
+            with self.pool.checkout('iOS Client', PROFILE_OPTS, {'proxy': 'http://127.0.0.1:1'}):
+                pass
+        # Ta sama wartość co w profilu nie jest nadpisaniem
+        with self.pool.checkout('iOS Client', PROFILE_OPTS, {'allowed_extractors': YOUTUBE_EXTRACTORS}):
+            pass
+
+    def test_errors_keep_or_discard_instance(self):
+        with self.assertRaises(yt_dlp.utils.DownloadError):
+            with self.pool.checkout('iOS Client', PROFILE_OPTS):
+                raise yt_dlp.utils.DownloadError('format not available')
+        with self.assertRaises(RuntimeError):
+            with self.pool.checkout('iOS Client', PROFILE_OPTS):
+                raise RuntimeError('cancelled')
+        self.assertEqual(self.pool.stats(), {'created': 1, 'reused': 1, 'discarded': 1, 'idle': 0})
+
+    def test_idle_instances_are_bounded(self):
+        pool = YoutubeDLPool(max_idle=1)
+        with pool.checkout('iOS Client', PROFILE_OPTS) as first:
+            with pool.checkout('iOS Client', PROFILE_OPTS) as second:
+                self.assertIsNot(first, second)
+        self.assertEqual(pool.stats()['idle'], 1)
+        self.assertEqual(pool.stats()['discarded'], 1)
+        pool.clear()
+        self.assertEqual(pool.stats()['idle'], 0)
+
+
+class TestPooledDownloads(unittest.TestCase):
+
+    def test_sequential_jobs_share_one_instance(self):
+        with FakeYouTubeServer() as server, tempfile.TemporaryDirectory() as output_dir:
+            downloader = make_downloader()
+            paths = []
+            for video_id in ('aaaaaaaaaaa', 'bbbbbbbbbbb'):
+                info = server.make_info(video_id=video_id, title=video_id, size=100000, formats=('18',))
+                result = downloader.download_video(f'https://youtu.be/{video_id}', output_dir,
+                                                   info={'info_dict': info, 'client': 'iOS Client'},
+                                                   skip_existing=False)
+                paths.append(result['full_path'])
+        self.assertEqual([os.path.basename(p) for p in paths], ['aaaaaaaaaaa.mp4', 'bbbbbbbbbbb.mp4'])
+        self.assertEqual(downloader.pool.stats()['created'], 1)
+        self.assertEqual(downloader.pool.stats()['reused'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
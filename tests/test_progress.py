@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""Tests for ProgressBus — throttled structured progress events"""
+import math
+import os
+import tempfile
+import threading
+import unittest
+import sys
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from core.archive import DownloadArchive
+from core.cache import VideoInfoCache
+from core.downloader import YouTubeDownloader
+from core.progress import ProgressBus, ProgressTracker, make_progress_event
+from core.scoreboard import ClientScoreboard
+from core.utils import format_progress
+
+
+def downloading(job_id, n):
+    return {'job_id': job_id, 'status': 'downloading', 'phase': 'download', 'downloaded_bytes': n}
+
+
+class TestProgressBus(unittest.TestCase):
+
+    def test_coalesces_fast_updates(self):
+        bus = ProgressBus(max_rate=1)
+        seen = []
+        bus.subscribe(seen.append)
+        for n in range(1000):
+            bus.publish(downloading('a', n))
+        self.assertEqual([e['downloaded_bytes'] for e in seen], [0])
+        bus.flush()
+        self.assertEqual(seen[-1]['downloaded_bytes'], 999)
+
+    def test_last_event_of_burst_is_delivered_without_flush(self):
+        bus = ProgressBus(max_rate=20)
+        seen = []
+        delivered = threading.Event()
+
+        def subscriber(event):
+            seen.append(event['downloaded_bytes'])
+            if event['downloaded_bytes'] == 99:
+                delivered.set()
+
+        bus.subscribe(subscriber)
+        for n in range(100):
+            bus.publish(downloading('a', n))
+        self.assertTrue(delivered.wait(2))
+        self.assertEqual(seen, [0, 99])
+
+    def test_forget_cancels_pending_flush(self):
+        bus = ProgressBus(max_rate=20)
+        seen = []
+        bus.subscribe(seen.append)
+        bus.publish(downloading('a', 1))
+        bus.publish(downloading('a', 2))
+        bus.forget('a')
+        threading.Event().wait(0.15)
+        self.assertEqual([e['downloaded_bytes'] for e in seen], [1])
+
+    def test_status_change_is_delivered_immediately(self):
+        bus = ProgressBus(max_rate=1)
+        seen = []
+        bus.subscribe(seen.append)
+        bus.publish(downloading('a', 1))
+        bus.publish({'job_id': 'a', 'status': 'finished', 'phase': 'download'})
+        self.assertEqual([e['status'] for e in seen], ['downloading', 'finished'])
+
+    def test_jobs_are_throttled_and_filtered_independently(self):
+        bus = ProgressBus(max_rate=1)
+        only_b = []
+        bus.subscribe(only_b.append, job_id='b')
+        bus.publish(downloading('a', 1))
+        bus.publish(downloading('b', 2))
+        self.assertEqual([e['job_id'] for e in only_b], ['b'])
+
+    def test_subscriber_errors_are_isolated(self):
+        bus = ProgressBus()
+        seen = []
+
+        def broken(event):
+            raise RuntimeError("ui gone")
+
+        bus.subscribe(broken)
+        bus.subscribe(seen.append)
+        bus.publish(downloading('a', 1))
+        self.assertEqual(len(seen), 1)
+
+    def test_unsubscribe(self):
+        bus = ProgressBus(max_rate=0)
+        seen = []
+        token = bus.subscribe(seen.append)
+        bus.unsubscribe(token)
+        bus.publish(downloading('a', 1))
+        self.assertEqual(seen, [])
+
+    def test_make_progress_event_uses_estimate(self):
+        event = make_progress_event({'status': 'downloading', 'downloaded_bytes': 250,
+                                     'total_bytes_estimate': 1000, 'speed': 10.0, 'eta': 75,
+                                     'fragment_index': 3, 'fragment_count': 12}, job_id='j1')
+        self.assertEqual(event['percent'], 25.0)
+        self.assertEqual(event['job_id'], 'j1')
+        self.assertEqual(event['fragment_index'], 3)
+
+
+
+VIDEO = {'format_id': '137', 'vcodec': 'avc1', 'acodec': 'none', 'height': 1080, 'filesize': 9000}
+AUDIO = {'format_id': '140', 'vcodec': 'none', 'acodec': 'mp4a', 'filesize': 1000}
+
+
+class TestProgressTracker(unittest.TestCase):
+
+    def test_overall_progress_covers_planned_streams(self):
+        tracker = ProgressTracker('j1')
+        tracker.plan({'format_id': '137+140', 'requested_formats': [VIDEO, AUDIO]})
+        event = tracker.update({'status': 'downloading', 'downloaded_bytes': 4500,
+                                'total_bytes': 9000, 'info_dict': VIDEO})
+        self.assertEqual(event['stream'], 'video')
+        self.assertEqual(event['stream_percent'], 50.0)
+        self.assertEqual(event['percent'], 45.0)
+        self.assertEqual(event['streams']['audio']['percent'], 0.0)
+
+    def test_estimate_is_used_for_fragmented_downloads(self):
+        tracker = ProgressTracker()
+        event = tracker.update({'status': 'downloading', 'downloaded_bytes': 100,
+                                'total_bytes_estimate': 400, 'info_dict': {'format_id': '299'}})
+        self.assertEqual(event['percent'], 25.0)
+
+    def test_ewma_speed_and_eta(self):
+        tracker = ProgressTracker(tau=2.0)
+        tracker._last_sample = 0
+        tracker.speed = 100.0
+        tracker._sample(0)
+        self.assertLess(tracker.speed, 100.0)
+        tracker.speed = 100.0
+        tracker.streams['x'] = {'kind': 'av', 'downloaded_bytes': 500, 'total_bytes': 1500, 'finished': False}
+        self.assertEqual(tracker._summary()['eta'], 10)
+
+    def test_ewma_weight_depends_on_elapsed_time_not_chunk_count(self):
+        clock = [0.0]
+
+        def run(chunks):
+            tracker = ProgressTracker(tau=1.0)
+            tracker.speed = 100.0
+            tracker._last_sample = clock[0] = 0.0
+            # Te same 2 s przy 1000 B/s - w 2 lub 200 chunkach
+            for _ in range(chunks):
+                clock[0] += 2.0 / chunks
+                tracker._sample(2000 / chunks)
+            return tracker.speed
+
+        with mock.patch('core.progress.time.monotonic', lambda: clock[0]):
+            few, many = run(2), run(200)
+        expected = 1000 - 900 * math.exp(-2)
+        self.assertAlmostEqual(few, expected, places=6)
+        self.assertAlmostEqual(many, expected, places=6)
+
+    def test_merge_and_postprocess_phases(self):
+        tracker = ProgressTracker(ignored_postprocessors={'Internal'})
+        self.assertIsNone(tracker.postprocessor_event({'status': 'started', 'postprocessor': 'Internal'}))
+        self.assertEqual(tracker.postprocessor_event({'status': 'started', 'postprocessor': 'Merger'})['phase'],
+                         'merge')
+        self.assertEqual(tracker.postprocessor_event({'status': 'started', 'postprocessor': 'ExtractAudio'})['phase'],
+                         'postprocess')
+        self.assertEqual(tracker.done_event()['percent'], 100.0)
+
+    def test_format_progress_text(self):
+        text = format_progress({'phase': 'download', 'percent': 45.25, 'speed': 2 * 1024 * 1024, 'eta': 83})
+        self.assertEqual(text, "45.2% | 2.0 MB/s | ETA 01:23")
+
+
+class TestProgressAcrossAttempts(unittest.TestCase):
+
+    def test_failed_attempt_does_not_count_toward_retry(self):
+        attempts = []
+
+        class FakeYDL:
+            def __init__(self, params):
+                self.params = params
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *args):
+                return False
+
+            def add_post_processor(self, pp, when='post_process'):
+                pass
+
+            def extract_info(self, url, download=True):
+                attempts.append(url)
+                hook = self.params['progress_hooks'][0]
+                if len(attempts) == 1:
+                    hook({'status': 'downloading', 'downloaded_bytes': 300, 'total_bytes': 1000,
+                          'info_dict': {'format_id': '137'}})
+                    raise Exception("Requested format is not available")
+                hook({'status': 'downloading', 'downloaded_bytes': 500, 'total_bytes': 500,
+                      'info_dict': {'format_id': '18'}})
+                return {'title': 'Video', 'ext': 'mp4'}
+
+            def prepare_filename(self, info):
+                return os.path.join(self.params['outtmpl'].rsplit(os.sep, 1)[0], 'Video.mp4')
+
+        events = []
+        d = YouTubeDownloader(info_cache=VideoInfoCache(db_path=None), scoreboard=ClientScoreboard(path=None),
+                              archive=DownloadArchive(db_path=None), progress_bus=ProgressBus(max_rate=0))
+        with tempfile.TemporaryDirectory() as tmp, mock.patch('core.downloader.yt_dlp.YoutubeDL', FakeYDL):
+            d.download_video('https://youtu.be/dQw4w9WgXcQ', tmp, progress_callback=events.append)
+        self.assertEqual(len(attempts), 2)
+        last = [e for e in events if e['status'] == 'downloading'][-1]
+        self.assertEqual((last['downloaded_bytes'], last['total_bytes'], last['percent']), (500, 500, 100.0))
+        self.assertEqual(list(last['streams']), ['av'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""Tests for ClientScoreboard — adaptive client ordering and persistence"""
+import os
+import tempfile
+import unittest
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from core.scoreboard import ClientScoreboard
+from core.downloader import YouTubeDownloader
+from core.cache import VideoInfoCache
+
+CONFIGS = [{'name': 'TV'}, {'name': 'iOS'}, {'name': 'Android'}]
+
+
+def names(configs):
+    return [config['name'] for config in configs]
+
+
+class TestClientScoreboard(unittest.TestCase):
+
+    def test_default_order_without_history(self):
+        board = ClientScoreboard(path=None)
+        self.assertEqual(names(board.order(CONFIGS)), ['TV', 'iOS', 'Android'])
+
+    def test_successful_client_moves_first(self):
+        board = ClientScoreboard(path=None)
+        board.record_failure('TV', 'Sign in to confirm')
+        board.record_success('Android', 1.2)
+        self.assertEqual(names(board.order(CONFIGS))[0], 'Android')
+
+    def test_faster_client_wins_ties(self):
+        board = ClientScoreboard(path=None)
+        board.record_success('TV', 3.0)
+        board.record_success('iOS', 0.5)
+        self.assertEqual(names(board.order(CONFIGS))[:2], ['iOS', 'TV'])
+
+    def test_failing_client_cools_down_to_the_end(self):
+        board = ClientScoreboard(path=None, skip_after=2, cooldown=60)
+        board.record_success('TV', 0.1)
+        board.record_failure('TV', 'blocked')
+        board.record_failure('TV', 'blocked')
+        self.assertEqual(names(board.order(CONFIGS))[-1], 'TV')
+        self.assertTrue(board.stats()['TV']['cooling_down'])
+        self.assertEqual(board.stats()['TV']['last_failure'], 'blocked')
+
+    def test_persists_between_runs(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'clients.sqlite3')
+            board = ClientScoreboard(path=path)
+            board.record_success('iOS', 0.7)
+            board.close()
+            reloaded = ClientScoreboard(path=path)
+            self.assertEqual(reloaded.stats()['iOS']['attempts'], 1)
+            self.assertEqual(names(reloaded.order(CONFIGS))[0], 'iOS')
+            reloaded.close()
+
+    def test_concurrent_processes_add_up_results(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'clients.sqlite3')
+            # Dwie instancje = dwa procesy z osobnymi połączeniami, obie wczytane przed zapisami
+            first, second = ClientScoreboard(path=path), ClientScoreboard(path=path)
+            self.assertEqual(first.stats(), second.stats())
+            first.record_success('iOS', 0.5)
+            second.record_failure('iOS', 'blocked')
+            second.record_success('TV', 0.2)
+            first.record_success('iOS', 0.7)
+            for board in (first, second):
+                stats = board.stats()
+                self.assertEqual(stats['iOS']['attempts'], 3)
+                self.assertEqual(stats['iOS']['median_time'], 0.6)
+                self.assertEqual(stats['TV']['attempts'], 1)
+                board.close()
+
+    def test_downloader_uses_scoreboard_order(self):
+        board = ClientScoreboard(path=None)
+        board.record_success('Android Client', 0.3)
+        d = YouTubeDownloader(info_cache=VideoInfoCache(db_path=None), scoreboard=board)
+        self.assertEqual(d._get_client_configs()[0]['name'], 'Android Client')
+
+
+if __name__ == '__main__':
+    unittest.main()
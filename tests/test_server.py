@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""Tests for the headless job server — JSON API, SSE progress stream and cancel"""
+import http.client
+import json
+import os
+import tempfile
+import threading
+import unittest
+import sys
+import urllib.error
+import urllib.request
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from core.manager import DownloadManager
+from ui.server import MAX_BODY_SIZE, JobServer
+
+URL = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
+
+
+class FakeDownloader:
+    """Downloader stand-in that waits for a release signal before finishing"""
+    release = threading.Event()
+
+    def __init__(self, cancel_event=None, progress_bus=None):
+        self._cancel_event = cancel_event or threading.Event()
+        self.progress_bus = progress_bus
+
+    def download_video(self, url, output_dir, job_id=None, **options):
+        self.progress_bus.publish({'job_id': job_id, 'status': 'downloading', 'percent': 50.0})
+        while not FakeDownloader.release.wait(0.01):
+            if self._cancel_event.is_set():
+                raise Exception("Pobieranie zostało anulowane")
+        self.progress_bus.publish({'job_id': job_id, 'status': 'finished', 'percent': 100.0})
+        return {'filename': 'video.mp4', 'full_path': os.path.join(output_dir, 'video.mp4'),
+                'options': options}
+
+
+class TestJobServer(unittest.TestCase):
+
+    def setUp(self):
+        FakeDownloader.release = threading.Event()
+        self.tmp = tempfile.TemporaryDirectory()
+        manager = DownloadManager(max_workers=2, downloader_factory=FakeDownloader)
+        self.server = JobServer(port=0, output_dir=self.tmp.name, manager=manager).start()
+        host, port = self.server.address
+        self.base = f"http://{host}:{port}"
+
+    def tearDown(self):
+        FakeDownloader.release.set()
+        self.server.shutdown()
+        self.tmp.cleanup()
+
+    def request(self, method, path, payload=None, headers=None):
+        data = json.dumps(payload).encode() if payload is not None else None
+        req = urllib.request.Request(self.base + path, data=data, method=method,
+                                     headers={'Content-Type': 'application/json', **(headers or {})})
+        try:
+            with urllib.request.urlopen(req, timeout=5) as response:
+                return response.status, json.loads(response.read())
+        except urllib.error.HTTPError as e:
+            return e.code, json.loads(e.read())
+
+    def test_submit_stream_and_fetch_result(self):
+        status, job = self.request('POST', '/jobs', {'url': URL, 'resolution': '1280x720'})
+        self.assertEqual(status, 202)
+
+        events = []
+        with urllib.request.urlopen(f"{self.base}/jobs/{job['id']}/events", timeout=5) as stream:
+            for raw in stream:
+                line = raw.decode().strip()
+                if line.startswith('event:'):
+                    events.append(line.split(':', 1)[1].strip())
+                    if events[-1] == 'progress' and not FakeDownloader.release.is_set():
+                        FakeDownloader.release.set()
+
+        self.assertEqual(events[0], 'progress')
+        self.assertEqual(events[-1], 'done')
+        status, finished = self.request('GET', f"/jobs/{job['id']}")
+        self.assertEqual(finished['status'], 'finished')
+        self.assertEqual(finished['result']['filename'], 'video.mp4')
+        self.assertEqual(finished['result']['options']['resolution'], '1280x720')
+
+        status, listing = self.request('GET', '/jobs')
+        self.assertEqual([j['id'] for j in listing['jobs']], [job['id']])
+
+    def test_cancel(self):
+        _, job = self.request('POST', '/jobs', {'url': URL})
+        status, _ = self.request('POST', f"/jobs/{job['id']}/cancel")
+        self.assertEqual(status, 202)
+        self.server.manager.get_job(job['id']).future.exception(timeout=5)
+        _, cancelled = self.request('GET', f"/jobs/{job['id']}")
+        self.assertEqual(cancelled['status'], 'cancelled')
+
+    def test_validation_and_unknown_jobs(self):
+        self.assertEqual(self.request('POST', '/jobs', {'url': 'https://example.com/x'})[0], 400)
+        self.assertEqual(self.request('POST', '/jobs', {'url': URL, 'output_dir': '/nonexistent/dir'})[0], 400)
+        self.assertEqual(self.request('GET', '/jobs/unknown')[0], 404)
+        self.assertEqual(self.request('DELETE', '/jobs/unknown')[0], 404)
+        self.assertEqual(self.request('GET', '/health')[1]['status'], 'ok')
+
+    def test_option_types_and_output_dir_are_validated(self):
+        for options in ({'priority': '2'}, {'priority': 7}, {'weight': 'heavy'}, {'weight': 0},
+                        {'audio_only': 'yes'}, {'backend': 'curl'}, {'resolution': 720},
+                        {'output_dir': os.path.dirname(self.tmp.name)}, {'output_dir': '../'}):
+            self.assertEqual(self.request('POST', '/jobs', {'url': URL, **options})[0], 400, options)
+        os.mkdir(os.path.join(self.tmp.name, 'music'))
+        status, job = self.request('POST', '/jobs', {'url': URL, 'output_dir': 'music', 'audio_only': True})
+        self.assertEqual(status, 202)
+        self.assertEqual(self.server.manager.get_job(job['id']).output_dir,
+                         os.path.join(os.path.realpath(self.tmp.name), 'music'))
+
+    def test_invalid_or_oversized_body_is_rejected(self):
+        host, port = self.server.address
+        for length, status in (('abc', 400), ('-1', 400), (str(MAX_BODY_SIZE + 1), 413), ('1' * 30, 413)):
+            conn = http.client.HTTPConnection(host, port, timeout=5)
+            conn.putrequest('POST', '/jobs')
+            conn.putheader('Content-Type', 'application/json')
+            conn.putheader('Content-Length', length)
+            conn.endheaders()
+            response = conn.getresponse()
+            self.assertEqual(response.status, status, length)
+            self.assertIn('error', json.loads(response.read()))
+            conn.close()
+        self.assertEqual(self.server.manager.list_jobs(), [])
+
+    def test_requests_from_web_pages_are_rejected(self):
+        _, port = self.server.address
+        self.assertEqual(self.request('GET', '/jobs', headers={'Host': f'attacker.example:{port}'})[0], 403)
+        self.assertEqual(self.request('POST', '/jobs', {'url': URL},
+                                      headers={'Origin': 'https://attacker.example'})[0], 403)
+        self.assertEqual(self.request('POST', '/jobs', {'url': URL}, headers={'Content-Type': 'text/plain'})[0], 415)
+        self.assertEqual(self.request('GET', '/health', headers={'Origin': f'http://localhost:{port}'})[0], 200)
+        self.assertEqual(self.server.manager.list_jobs(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""Tests for the shared HTTP session — keep-alive reuse across YoutubeDL instances, per-host idle cap, metrics and fallback"""
+import gzip
+import http.client
+import os
+import threading
+import unittest
+import sys
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import yt_dlp
+from yt_dlp.networking import Request
+from yt_dlp.networking.exceptions import HTTPError, UnsupportedRequest
+from core.session import HTTPSession, enable_keepalive, keepalive_handler_class
+from core.pool import YoutubeDLPool
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Serwer testowy HTTP/1.1: przekierowanie, gzip, cookies, zamknięcie połączenia"""
+
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, body, status=200, headers=()):
+        self.send_response(status)
+        for name, value in headers:
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == '/redirect':
+            self._reply(b'moved', 302, [('Location', '/cookie')])
+        elif self.path == '/cookie':
+            self._reply(b'ok', headers=[('Set-Cookie', 'session=abc; Path=/')])
+        elif self.path == '/echo':
+            self._reply((self.headers.get('Cookie') or '').encode())
+        elif self.path == '/gzip':
+            self._reply(gzip.compress(b'x' * 1000), headers=[('Content-Encoding', 'gzip')])
+        elif self.path == '/close':
+            self.close_connection = True
+            self._reply(b'bye', headers=[('Connection', 'close')])
+        elif self.path == '/missing':
+            self._reply(b'not found', 404)
+        elif self.path == '/headers':
+            self._reply(','.join(self.headers.keys()).encode())
+        else:
+            self._reply(b'hello')
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        self._reply(b'posted')
+
+
+class _StaleConnection:
+    """Ponownie użyte połączenie, które serwer zamknął w trakcie wysyłania żądania"""
+
+    def __init__(self):
+        self.sock = None
+
+    def set_debuglevel(self, level):
+        pass
+
+    def request(self, *args, **kwargs):
+        raise http.client.RemoteDisconnected('closed')
+
+    def close(self):
+        pass
+
+
+class TestKeepAliveHandler(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        enable_keepalive()
+        cls.httpd = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+        cls.httpd.daemon_threads = True
+        threading.Thread(target=cls.httpd.serve_forever, daemon=True).start()
+        cls.base_url = 'http://%s:%d' % cls.httpd.server_address[:2]
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.httpd.shutdown()
+        cls.httpd.server_close()
+
+    def setUp(self):
+        self.session = HTTPSession()
+        patcher = mock.patch('core.session._default_session', self.session)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.session.clear)
+
+    def test_connection_shared_by_pooled_instances(self):
+        pool = YoutubeDLPool()
+        for profile in ('iOS Client', 'Android Client'):
+            with pool.checkout(profile, {'quiet': True}) as ydl:
+                for _ in range(3):
+                    self.assertEqual(ydl.urlopen(f'{self.base_url}/').read(), b'hello')
+        stats = self.session.stats()
+        self.assertEqual((stats['requests'], stats['opened'], stats['reused']), (6, 1, 5))
+        self.assertEqual(stats['hosts'][self.base_url], {'opened': 1, 'reused': 5})
+        self.assertEqual(stats['reuse_ratio'], 0.833)
+
+    def test_redirect_cookies_and_gzip(self):
+        with yt_dlp.YoutubeDL({'quiet': True}) as ydl:
+            response = ydl.urlopen(f'{self.base_url}/redirect')
+            self.assertEqual(response.url, f'{self.base_url}/cookie')
+            self.assertEqual(response.read(), b'ok')
+            self.assertEqual(ydl.urlopen(f'{self.base_url}/echo').read(), b'session=abc')
+            self.assertEqual(ydl.urlopen(f'{self.base_url}/gzip').read(), b'x' * 1000)
+        self.assertEqual(self.session.stats()['opened'], 1)
+
+    def test_closed_and_failed_responses_are_not_reused(self):
+        with yt_dlp.YoutubeDL({'quiet': True}) as ydl:
+            self.assertEqual(ydl.urlopen(f'{self.base_url}/close').read(), b'bye')
+            with self.assertRaises(HTTPError) as ctx:
+                ydl.urlopen(f'{self.base_url}/missing')
+            self.assertEqual(ctx.exception.status, 404)
+            # Odczytana treść błędu - połączenie wraca do puli
+            self.assertEqual(ctx.exception.response.read(), b'not found')
+            # Odpowiedź przerwana w połowie - połączenie zamknięte zamiast wrócić do puli
+            ydl.urlopen(f'{self.base_url}/gzip')
+            partial = ydl.urlopen(f'{self.base_url}/')
+            partial.read(1)
+            partial.close()
+        stats = self.session.stats()
+        self.assertEqual((stats['opened'], stats['reused'], stats['idle']), (2, 2, 0))
+
+    def _send_after_stale(self, method, data=None):
+        """Żądanie, którego pierwsza próba trafia na zamknięte połączenie; zwraca (odpowiedź, liczba prób)"""
+        acquire = self.session.acquire
+        calls = []
+
+        def flaky_acquire(*args, **kwargs):
+            calls.append(args)
+            return (_StaleConnection(), True) if len(calls) == 1 else acquire(*args, **kwargs)
+
+        handler = keepalive_handler_class()(logger=None)
+        with mock.patch.object(self.session, 'acquire', side_effect=flaky_acquire):
+            try:
+                return handler.send(Request(f'{self.base_url}/', data=data, method=method)).read(), len(calls)
+            except Exception:
+                return None, len(calls)
+
+    def test_only_idempotent_requests_are_resent(self):
+        self.assertEqual(self._send_after_stale('GET'), (b'hello', 2))
+        # POST mógł zostać obsłużony - błąd zamiast ponownego wysłania
+        self.assertEqual(self._send_after_stale('POST', b'{}'), (None, 1))
+        self.assertEqual(self.session.stats()['retried'], 1)
+
+    def test_keep_header_casing_extension(self):
+        handler = keepalive_handler_class()(logger=None)
+        headers = {'x-lower-Case': '1'}
+        sent = handler.send(Request(f'{self.base_url}/headers', headers=headers)).read().decode()
+        self.assertIn('X-Lower-Case', sent.split(','))
+        sent = handler.send(Request(f'{self.base_url}/headers', headers=headers,
+                                    extensions={'keep_header_casing': True})).read().decode()
+        self.assertIn('x-lower-Case', sent.split(','))
+
+    def test_unsupported_yt_dlp_version_keeps_stock_handlers(self):
+        with mock.patch('yt_dlp.version.__version__', '2027.01.05'), self.assertLogs(level='WARNING'):
+            self.assertIsNone(keepalive_handler_class.__wrapped__())
+
+    def test_proxied_requests_fall_back_to_urllib(self):
+        handler = keepalive_handler_class()(logger=None, proxies={'http': 'http://127.0.0.1:1'})
+        with self.assertRaises(UnsupportedRequest):
+            handler.validate(Request(f'{self.base_url}/'))
+
+    def test_missing_yt_dlp_internals_keep_stock_handlers(self):
+        # Wewnętrzny moduł yt-dlp usunięty w nowszej wersji - nic nie jest rejestrowane
+        with mock.patch.dict(sys.modules, {'yt_dlp.networking._urllib': None}), \
+                mock.patch('yt_dlp.networking.common.register_rh') as register, \
+                self.assertLogs(level='WARNING'):
+            self.assertIsNone(keepalive_handler_class.__wrapped__())
+        register.assert_not_called()
+
+
+class TestHTTPSession(unittest.TestCase):
+
+    def test_idle_connections_are_bounded_per_host(self):
+        session = HTTPSession(max_per_host=1)
+        first, _ = session.acquire('http', '127.0.0.1', 9, timeout=1)
+        second, _ = session.acquire('http', '127.0.0.1', 9, timeout=1)
+        other, _ = session.acquire('http', '127.0.0.2', 9, timeout=1)
+        for conn in (first, second, other):
+            conn.sock = mock.Mock()
+            session.release(conn)
+        stats = session.stats()
+        self.assertEqual((stats['opened'], stats['idle'], stats['closed']), (3, 2, 1))
+
+    def test_expired_idle_connection_is_replaced(self):
+        session = HTTPSession(idle_timeout=0)
+        conn, _ = session.acquire('http', '127.0.0.1', 9, timeout=1)
+        conn.sock = mock.Mock()
+        session.release(conn)
+        with mock.patch('core.session.time.monotonic', return_value=10 ** 9):
+            replacement, reused = session.acquire('http', '127.0.0.1', 9, timeout=1)
+        self.assertFalse(reused)
+        self.assertIsNot(replacement, conn)
+        self.assertEqual(session.stats()['closed'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""Tests for fast startup — lazy yt-dlp/customtkinter imports, YouTube-only extractors and the import report"""
+import json
+import os
+import subprocess
+import unittest
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from core.startup import lazy_import, parse_importtime, format_startup_report, PROJECT_ROOT
+from core.downloader import YOUTUBE_EXTRACTORS
+
+SAMPLE_IMPORTTIME = """import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:      2000 |       5000 | core.utils
+import time:      3000 |       3000 |   re
+"""
+
+
+def loaded_modules(statement):
+    """Moduły załadowane w świeżym interpreterze po wykonaniu instrukcji"""
+    code = f"import sys, json; {statement}; print(json.dumps(sorted(sys.modules)))"
+    proc = subprocess.run([sys.executable, '-c', code], cwd=PROJECT_ROOT, capture_output=True, text=True,
+                          check=True)
+    return set(json.loads(proc.stdout))
+
+
+class TestLazyImports(unittest.TestCase):
+
+    def test_core_and_cli_do_not_load_ytdlp(self):
+        modules = loaded_modules("import core.downloader, core.journal, core.backends, ui.cli, ui.server")
+        self.assertNotIn('yt_dlp.YoutubeDL', modules)
+        self.assertNotIn('yt_dlp.extractor', modules)
+
+    def test_gui_module_does_not_load_customtkinter(self):
+        modules = loaded_modules("import ui.gui")
+        self.assertFalse({m for m in modules if m.startswith('customtkinter.')})
+
+    def test_ytdlp_subclasses_are_built_on_demand(self):
+        modules = loaded_modules("from core.journal import JournalPostProcessor")
+        self.assertIn('yt_dlp.postprocessor.common', modules)
+
+    def test_lazy_import_reuses_loaded_module(self):
+        self.assertIs(lazy_import('json'), json)
+        with self.assertRaises(ImportError):
+            lazy_import('no_such_module_for_tests')
+
+
+class TestYouTubeExtractors(unittest.TestCase):
+
+    def test_only_youtube_extractors_are_loaded(self):
+        import yt_dlp
+        with yt_dlp.YoutubeDL({'quiet': True, 'allowed_extractors': YOUTUBE_EXTRACTORS}) as ydl:
+            names = set(ydl._ies)
+        self.assertIn('Youtube', names)
+        self.assertIn('YoutubeTab', names)  # Playlisty i kanały
+        self.assertTrue(all(name.startswith('Youtube') for name in names))
+
+
+class TestImportReport(unittest.TestCase):
+
+    def test_parse_importtime_skips_header(self):
+        self.assertEqual(parse_importtime(SAMPLE_IMPORTTIME),
+                         [('_io', 120, 120), ('core.utils', 2000, 5000), ('re', 3000, 3000)])
+
+    def test_format_startup_report(self):
+        imports = {'module': 'ui.cli', 'total_ms': 5.12, 'count': 3,
+                   'top': [{'module': 'core.utils', 'self_ms': 2.0, 'cumulative_ms': 5.0}]}
+        cold_start = {'interpreter_ms': 20, 'target_ms': 100,
+                      'commands': [{'command': '--version', 'wall_ms': 60, 'overhead_ms': 40, 'ok': True},
+                                   {'command': '--test', 'wall_ms': 150, 'overhead_ms': 130, 'ok': False}]}
+        report = format_startup_report(imports, cold_start)
+        self.assertIn('ui.cli: 5.1 ms (3 modules)', report)
+        self.assertIn('✅ --version', report)
+        self.assertIn('⚠️ --test', report)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""Tests for the toolchain probe — parsing, mtime-keyed disk cache and format fallback"""
+import os
+import tempfile
+import time
+import unittest
+import sys
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from core import toolchain as toolchain_module
+from core.toolchain import Toolchain, parse_ffmpeg_list, parse_version, probe_toolchain
+from core.archive import DownloadArchive
+from core.cache import VideoInfoCache
+from core.downloader import YouTubeDownloader
+from core.scoreboard import ClientScoreboard
+
+ENCODERS = """Encoders:
+ V..... = Video
+ A..... = Audio
+ ------
+ V....D libx264              libx264 H.264 / AVC / MPEG-4 AVC (codec h264)
+ A....D libmp3lame           libmp3lame MP3 (MPEG audio layer 3) (codec mp3)
+ A....D aac                  AAC (Advanced Audio Coding)
+"""
+
+MUXERS = """File formats:
+ D. = Demuxing supported
+ .E = Muxing supported
+ --
+  E mp4             MP4 (MPEG-4 Part 14)
+  E matroska        Matroska
+"""
+
+FAKE_FFMPEG = """#!/bin/sh
+echo "$@" >> "$(dirname "$0")/calls.log"
+case "$2" in
+  -version) echo "ffmpeg version 6.1.1 Copyright (c) 2000-2023" ;;
+  -encoders) cat "$(dirname "$0")/encoders.txt" ;;
+  -muxers) cat "$(dirname "$0")/muxers.txt" ;;
+esac
+"""
+
+
+class TestParsing(unittest.TestCase):
+
+    def test_parse_version(self):
+        self.assertEqual(parse_version("ffmpeg version 6.1.1-3ubuntu5 Copyright"), '6.1.1-3ubuntu5')
+        self.assertEqual(parse_version("aria2 version 1.37.0\nCopyright"), '1.37.0')
+        self.assertIsNone(parse_version(''))
+
+    def test_parse_encoders_and_muxers(self):
+        self.assertEqual(parse_ffmpeg_list(ENCODERS), {'libx264', 'libmp3lame', 'aac'})
+        self.assertEqual(parse_ffmpeg_list(MUXERS), {'mp4', 'matroska'})
+
+
+class TestToolchain(unittest.TestCase):
+
+    def test_capabilities(self):
+        tc = Toolchain({'ffmpeg': {'path': '/usr/bin/ffmpeg', 'encoders': ['aac']}, 'aria2c': {'path': None}})
+        self.assertTrue(tc.can_merge)
+        self.assertFalse(tc.can_extract_mp3)
+        self.assertFalse(tc.has('aria2c'))
+        self.assertFalse(Toolchain({}).can_merge)
+
+    def test_probe_uses_disk_cache_until_binary_changes(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            bin_dir = os.path.join(tmp, 'bin')
+            os.mkdir(bin_dir)
+            ffmpeg = os.path.join(bin_dir, 'ffmpeg')
+            with open(ffmpeg, 'w') as f:
+                f.write(FAKE_FFMPEG)
+            os.chmod(ffmpeg, 0o755)
+            for name, text in (('encoders.txt', ENCODERS), ('muxers.txt', MUXERS)):
+                with open(os.path.join(bin_dir, name), 'w') as f:
+                    f.write(text)
+            cache_path = os.path.join(tmp, 'toolchain.json')
+            calls_log = os.path.join(bin_dir, 'calls.log')
+
+            def probe_calls():
+                with open(calls_log) as f:
+                    return len(f.readlines())
+
+            tc = probe_toolchain(cache_path=cache_path, search_path=bin_dir)
+            self.assertEqual(tc.version('ffmpeg'), '6.1.1')
+            self.assertTrue(tc.can_extract_mp3)
+            self.assertTrue(tc.has_muxer('mp4'))
+            self.assertFalse(tc.has('aria2c'))
+            self.assertEqual(probe_calls(), 3)
+
+            # Drugie sondowanie - z cache, bez uruchamiania ffmpeg
+            probe_toolchain(cache_path=cache_path, search_path=bin_dir)
+            self.assertEqual(probe_calls(), 3)
+
+            # Nowa binarka (zmiana mtime) - ponowne sondowanie
+            later = time.time() + 10
+            os.utime(ffmpeg, (later, later))
+            probe_toolchain(cache_path=cache_path, search_path=bin_dir)
+            self.assertEqual(probe_calls(), 6)
+
+    def test_get_toolchain_probes_once(self):
+        with mock.patch.object(toolchain_module, '_default_toolchain', None), \
+                mock.patch.object(toolchain_module, 'probe_toolchain', return_value=Toolchain({})) as probe:
+            toolchain_module.get_toolchain()
+            toolchain_module.get_toolchain()
+        self.assertEqual(probe.call_count, 1)
+
+
+class TestDownloaderToolchain(unittest.TestCase):
+
+    def make_downloader(self, tools):
+        return YouTubeDownloader(info_cache=VideoInfoCache(db_path=None),
+                                 scoreboard=ClientScoreboard(path=None),
+                                 toolchain=Toolchain(tools),
+                                 archive=DownloadArchive(db_path=None))
+
+    @staticmethod
+    def selected(opts):
+        formats = [
+            {'format_id': '18', 'ext': 'mp4', 'height': 360, 'vcodec': 'avc1.42001E', 'acodec': 'mp4a.40.2'},
+            {'format_id': '137', 'ext': 'mp4', 'height': 1080, 'vcodec': 'avc1.640028', 'acodec': 'none'},
+            {'format_id': '140', 'ext': 'm4a', 'vcodec': 'none', 'acodec': 'mp4a.40.2', 'abr': 128},
+        ]
+        for fmt in formats:
+            fmt['url'] = f"https://example.com/{fmt['format_id']}"
+        return [f['format_id'] for f in opts['format']({'formats': formats, 'incomplete_formats': False})]
+
+    def test_progressive_formats_without_ffmpeg(self):
+        d = self.make_downloader({'ffmpeg': {'path': None}})
+        opts = d._build_download_opts({}, {'name': 'iOS Client', 'opts': {}}, '1920x1080', False)
+        self.assertEqual(self.selected(opts), ['18'])
+        self.assertNotIn('ffmpeg_location', opts)
+
+    def test_merge_formats_with_ffmpeg(self):
+        d = self.make_downloader({'ffmpeg': {'path': '/opt/ffmpeg/bin/ffmpeg', 'encoders': ['libmp3lame']}})
+        opts = d._build_download_opts({}, {'name': 'iOS Client', 'opts': {}}, '1920x1080', False)
+        self.assertEqual(self.selected(opts), ['137+140'])
+        self.assertEqual(opts['ffmpeg_location'], '/opt/ffmpeg/bin/ffmpeg')
+
+    def test_mp3_without_ffmpeg_fails_before_any_client(self):
+        d = self.make_downloader({'ffmpeg': {'path': None}})
+        with mock.patch('core.downloader.yt_dlp.YoutubeDL') as ydl:
+            with self.assertRaises(Exception) as ctx:
+                d.download_video('https://youtu.be/dQw4w9WgXcQ', '/tmp', audio_only=True)
+        self.assertIn('FFmpeg', str(ctx.exception))
+        ydl.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""Tests for core.utils URL helpers"""
+import unittest
+import sys
+import os
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from core.utils import (is_playlist_url, validate_youtube_url, classify_youtube_url, normalize_youtube_urls,
+                        parse_youtube_id, extract_timestamps, URL_VIDEO, URL_PLAYLIST, URL_CHANNEL, DATA_DIR, CACHE_DIR,
+                        _xdg_dir)
+from core import archive, cache, environment, scoreboard, toolchain
+
+
+class TestUrlHelpers(unittest.TestCase):
+
+    def test_playlist_and_channel_urls(self):
+        for url in ('https://www.youtube.com/playlist?list=PLx0sYbCqOb8TBPRdmBHs5Iftvv9TPboYG',
+                    'https://youtube.com/@LinusTechTips',
+                    'https://www.youtube.com/channel/UC_x5XG1OV2P6uZZ5FSM9Ttw',
+                    'https://m.youtube.com/c/Google'):
+            self.assertTrue(is_playlist_url(url), url)
+
+    def test_single_video_is_not_playlist(self):
+        self.assertFalse(is_playlist_url('https://www.youtube.com/watch?v=dQw4w9WgXcQ'))
+        self.assertFalse(is_playlist_url(None))
+        self.assertTrue(validate_youtube_url('https://youtu.be/dQw4w9WgXcQ'))
+
+
+class TestUrlClassifier(unittest.TestCase):
+
+    def test_video_url_forms(self):
+        for url in ('https://www.youtube.com/watch?feature=share&v=dQw4w9WgXcQ',
+                    'youtu.be/dQw4w9WgXcQ',
+                    'https://m.youtube.com/shorts/dQw4w9WgXcQ',
+                    'https://www.youtube.com/live/dQw4w9WgXcQ?si=abc',
+                    'https://music.youtube.com/watch?v=dQw4w9WgXcQ&list=RDAMVMdQw4w9WgXcQ',
+                    'https://www.youtube-nocookie.com/embed/dQw4w9WgXcQ'):
+            parsed = classify_youtube_url(url)
+            self.assertEqual(parsed.kind, URL_VIDEO, url)
+            self.assertEqual(parsed.canonical_url, 'https://www.youtube.com/watch?v=dQw4w9WgXcQ')
+            self.assertEqual(parse_youtube_id(url), 'dQw4w9WgXcQ')
+
+    def test_ids_and_start_time(self):
+        parsed = classify_youtube_url('https://www.youtube.com/watch?v=dQw4w9WgXcQ&list=PLabc&t=1m30s')
+        self.assertEqual((parsed.playlist_id, parsed.start_time), ('PLabc', 90))
+        self.assertEqual(classify_youtube_url('https://youtu.be/dQw4w9WgXcQ?t=42').start_time, 42)
+        self.assertEqual(classify_youtube_url('https://www.youtube.com/playlist?list=PLabc').kind, URL_PLAYLIST)
+        self.assertEqual(classify_youtube_url('https://youtube.com/@Google/videos').canonical_url,
+                         'https://www.youtube.com/@Google')
+        self.assertEqual(classify_youtube_url('https://youtube.com/@Google').kind, URL_CHANNEL)
+
+    def test_rejected_urls(self):
+        for url in ('https://example.com/watch?v=dQw4w9WgXcQ', 'https://www.youtube.com/watch?v=short',
+                    'https://www.youtube.com/', 'not a url', '', None):
+            self.assertIsNone(classify_youtube_url(url), url)
+
+    def test_bulk_normalise_and_dedupe(self):
+        invalid = []
+        urls = ['https://youtu.be/dQw4w9WgXcQ\n', 'https://www.youtube.com/watch?v=dQw4w9WgXcQ&t=5\n',
+                'garbage\n', '\n', 'https://youtu.be/aaaaaaaaaaa\n']
+        parsed = list(normalize_youtube_urls(urls, invalid=invalid))
+        self.assertEqual([p.video_id for p in parsed], ['dQw4w9WgXcQ', 'aaaaaaaaaaa'])
+        self.assertEqual(invalid, ['garbage'])
+        self.assertEqual(len(list(normalize_youtube_urls(urls, dedupe=False))), 3)
+
+
+class TestExtractTimestamps(unittest.TestCase):
+
+    def test_description_styles(self):
+        description = "\n".join([
+            "Spotkanie o 10:30am",
+            "0:00 Intro",
+            "- 1:05 - Setup",
+            "[2:10] Nawiasy",
+            "4:00-5:30 Zakres",
+            "Outro - 9:59",
+            "1:02:03 Długi film",
+            "1:05 Duplikat",
+            "7:77 Zły czas",
+        ])
+        timestamps = extract_timestamps(description)
+        self.assertEqual([(ts['time'], ts['description']) for ts in timestamps],
+                         [('0:00', 'Intro'), ('1:05', 'Setup'), ('2:10', 'Nawiasy'), ('4:00', 'Zakres'),
+                          ('9:59', 'Outro'), ('1:02:03', 'Długi film')])
+        self.assertEqual(timestamps[-1]['seconds'], 3723)
+        self.assertEqual(extract_timestamps(None), [])
+
+    def test_native_chapters_take_precedence(self):
+        chapters = [{'start_time': 3725.0, 'end_time': 4000.0, 'title': 'Koniec'},
+                    {'start_time': 0.0, 'end_time': 3725.0, 'title': 'Początek'}]
+        self.assertEqual(extract_timestamps("0:00 Z opisu", chapters),
+                         [{'time': '0:00', 'description': 'Początek', 'seconds': 0},
+                          {'time': '1:02:05', 'description': 'Koniec', 'seconds': 3725}])
+
+
+class TestStateDirectories(unittest.TestCase):
+
+    def test_xdg_variables_and_home_fallback(self):
+        with mock.patch.dict(os.environ, {'XDG_CACHE_HOME': '/srv/cache', 'HOME': '/home/ala'}):
+            self.assertEqual(_xdg_dir('XDG_CACHE_HOME', '~/.cache'), '/srv/cache/youtube-downloader')
+        with mock.patch.dict(os.environ, {'XDG_CACHE_HOME': '', 'HOME': '/home/ala'}):
+            self.assertEqual(_xdg_dir('XDG_CACHE_HOME', '~/.cache'), '/home/ala/.cache/youtube-downloader')
+
+    def test_state_files_live_in_state_directories(self):
+        for path in (archive.DEFAULT_ARCHIVE_PATH, scoreboard.DEFAULT_SCOREBOARD_PATH):
+            self.assertEqual(os.path.dirname(path), DATA_DIR)
+        for path in (cache.DEFAULT_CACHE_PATH, toolchain.DEFAULT_TOOLCHAIN_CACHE,
+                     environment.DEFAULT_ENVIRONMENT_CACHE):
+            self.assertEqual(os.path.dirname(path), CACHE_DIR)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -7,6 +7,7 @@ application. Part of the modular architecture introduced in v1.2.0.
 Components:
 - gui.py: Complete Tkinter interface with progress tracking
 - cli.py: Command-line interface with interactive prompts
+- server.py: Headless HTTP job server with JSON API and SSE progress
 
 Features:
 - Intelligent launcher with auto-detection of GUI/CLI
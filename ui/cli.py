@@ -11,19 +11,36 @@ Features:
 - Dynamic format selection and directory management
 - Progress tracking with real-time download status
 - Fallback mode when GUI is unavailable
+- Non-interactive batch mode (URL list, concurrent jobs, NDJSON, exit codes)
 
 Architecture: Dual-Repository Workflow v1.2.0
 """
 
 import os
 import sys
+import json
+import time
+import functools
 import logging
+import threading
 from pathlib import Path
 from core.downloader import YouTubeDownloader
-from core.utils import validate_youtube_url
+from core.manager import DownloadManager, JOB_FINISHED, JOB_CANCELLED
+from core.bandwidth import PRIORITY_BACKGROUND
+from core.formats import catalog_for
+from core.utils import validate_youtube_url, format_progress, format_file_size, classify_youtube_url, URL_VIDEO
 from version import __version__
 from core.translations import t
 
+# Kody wyjścia trybu wsadowego
+EXIT_OK = 0
+EXIT_FAILED = 1       # Co najmniej jedno zadanie nie powiodło się
+EXIT_USAGE = 2        # Błędne argumenty lub brak listy URL
+EXIT_INTERRUPTED = 130  # Przerwano (Ctrl+C)
+
+# Pola zdarzeń postępu przekazywane do NDJSON
+PROGRESS_FIELDS = ('status', 'phase', 'percent', 'downloaded_bytes', 'total_bytes', 'speed', 'eta')
+
 def safe_input(prompt, default="n", auto_exit=False):
     """Bezpieczny input z obsługą błędów EOF w WSL"""
     try:
@@ -51,6 +68,69 @@ def safe_input(prompt, default="n", auto_exit=False):
         print(f"[Błąd wejścia: {e} - używam domyślnej odpowiedzi: {default}]")
         return default
 
+def open_batch_source(source):
+    """Otwarcie listy URL: plik lub stdin ('-')"""
+    if source == '-':
+        return sys.stdin
+    return open(os.path.expanduser(source), 'r', encoding='utf-8')
+
+
+def iter_batch_urls(lines):
+    """
+    Strumieniowe odczytywanie URL z kolejnych linii (plik, stdin).
+
+    Puste linie i komentarze (#) są pomijane.
+
+    Yields:
+        tuple: (numer_linii, url)
+    """
+    for number, line in enumerate(lines, 1):
+        line = line.strip()
+        if line and not line.startswith('#'):
+            yield number, line
+
+
+def read_batch_urls(source):
+    """
+    Wczytanie całej listy URL z pliku lub stdin ('-').
+
+    Returns:
+        list: Pary (numer_linii, url)
+    """
+    stream = open_batch_source(source)
+    try:
+        return list(iter_batch_urls(stream))
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+def parse_format_option(value):
+    """
+    Opcje pobierania z argumentu --format.
+
+    Akceptuje: best, audio / mp3, 720 / 720p, 1280x720.
+
+    Returns:
+        dict: resolution / audio_only dla download_video
+
+    Raises:
+        ValueError: Nieznany format
+    """
+    value = (value or 'best').strip().lower()
+    if value == 'best':
+        return {}
+    if value in ('audio', 'mp3'):
+        return {'audio_only': True}
+    if 'x' in value:
+        width, height = value.split('x', 1)
+        if width.isdigit() and height.isdigit():
+            return {'resolution': value}
+    elif value.rstrip('p').isdigit():
+        return {'resolution': f"0x{value.rstrip('p')}"}
+    raise ValueError(f"Unknown format: {value} (use best, audio, 720p or 1280x720)")
+
+
 class YouTubeDownloaderCLI:
     def __init__(self):
         """Inicjalizacja interfejsu CLI"""
@@ -137,27 +217,17 @@ class YouTubeDownloaderCLI:
         print("📋 Dostępne formaty:")
         print("0. 🎵 Tylko audio (MP3)")
         
-        # Filtruj i sortuj formaty wideo
-        video_formats = []
-        for f in formats:
-            if (f.get('vcodec') != 'none' and 
-                f.get('acodec') != 'none' and 
-                f.get('height')):
-                video_formats.append(f)
-        
-        # Sortuj według jakości (wysokość)
-        video_formats.sort(key=lambda x: x.get('height', 0), reverse=True)
-        
-        # Pokaż unikalne rozdzielczości
-        shown_heights = set()
+        # Jedna pozycja na wysokość - format wybrany z katalogu tak samo jak przy pobieraniu
+        catalog = catalog_for(info)
+        can_merge = self.downloader.toolchain.can_merge
         format_options = []
         
-        for i, fmt in enumerate(video_formats):
-            height = fmt.get('height')
-            if height and height not in shown_heights:
-                shown_heights.add(height)
-                format_options.append(fmt)
-                print(f"{len(format_options)}. 📺 {height}p - {fmt.get('ext', 'mp4')}")
+        for height in catalog.heights('all' if can_merge else 'progressive'):
+            selection = catalog.select(height, can_merge=can_merge)
+            if selection and selection['height'] == height:
+                format_options.append(selection)
+                size = f" (~{format_file_size(selection['filesize'])})" if selection['filesize'] else ""
+                print(f"{len(format_options)}. 📺 {height}p - {selection['ext']}{size}")
                 
                 if len(format_options) >= 5:  # Maksymalnie 5 opcji wideo
                     break
@@ -172,44 +242,39 @@ class YouTubeDownloaderCLI:
                 if choice_num == 0:
                     return {'audio_only': True}
                 elif 1 <= choice_num <= len(format_options):
-                    return {'format_id': format_options[choice_num - 1]['format_id']}
+                    chosen = format_options[choice_num - 1]
+                    return {'resolution': f"{chosen['width'] or 0}x{chosen['height']}"}
                 else:
                     print(f"❌ Nieprawidłowy wybór. Podaj liczbę od 0 do {len(format_options)}")
             except ValueError:
                 print("❌ Podaj prawidłową liczbę")
     
-    def download_video(self, url, format_choice):
+    def download_video(self, url, format_choice, info=None):
         """Pobierz film"""
         print("🚀 Rozpoczynam pobieranie...")
         
         def progress_callback(progress):
-            if progress.get('status') == 'downloading':
-                percent = progress.get('percent', 0)
-                speed = progress.get('speed', 0)
-                if percent and speed:
-                    speed_mb = speed / 1024 / 1024
-                    print(f"\r📥 Pobieranie: {percent:.1f}% | {speed_mb:.1f} MB/s", end='', flush=True)
-            elif progress.get('status') == 'finished':
-                print(f"\n✅ Pobieranie zakończone!")
+            # Ten sam model postępu co w GUI (prędkość EWMA, ETA, fazy)
+            if progress.get('phase') == 'done':
+                print(f"\r✅ Pobieranie zakończone!{' ' * 40}")
+            else:
+                print(f"\r📥 Pobieranie: {format_progress(progress)}{' ' * 10}", end='', flush=True)
         
         try:
             result = self.downloader.download_video(
                 url=url,
                 output_dir=self.download_directory,
+                resolution=format_choice.get('resolution'),
                 audio_only=format_choice.get('audio_only', False),
-                format_id=format_choice.get('format_id'),
-                progress_callback=progress_callback
+                progress_callback=progress_callback,
+                info=info
             )
             
-            if result['success']:
-                print(f"🎉 Sukces! Plik zapisany w: {result['file_path']}")
-                return True
-            else:
-                print(f"❌ Błąd pobierania: {result['error']}")
-                return False
+            print(f"🎉 Sukces! Plik zapisany w: {result['full_path']}")
+            return True
                 
         except Exception as e:
-            print(f"❌ Nieoczekiwany błąd: {e}")
+            print(f"\n❌ Błąd pobierania: {e}")
             return False
     
     def run_interactive(self):
@@ -243,7 +308,7 @@ class YouTubeDownloaderCLI:
                 continue
             
             # Pobierz film
-            success = self.download_video(url, format_choice)
+            success = self.download_video(url, format_choice, info)
             
             print()
             if success:
@@ -256,6 +321,162 @@ class YouTubeDownloaderCLI:
         print("👋 Dziękujemy za używanie YouTube Downloader!")
         print("💡 Jeśli potrzebujesz GUI, spróbuj VcXsrv lub użyj natywnego Linux/Windows")
 
+    def run_batch(self, source, jobs=4, format_spec='best', json_output=False, output_dir=None,
+                  backend=None, manager=None):
+        """
+        Nieinteraktywne pobieranie listy URL (plik lub '-' dla stdin).
+
+        W trybie json_output każde zdarzenie i wynik to jedna linia JSON (NDJSON)
+        na stdout: job, progress, result, error, summary.
+
+        Lista jest czytana strumieniowo: kolejne linie są wczytywane dopiero
+        gdy zwolni się miejsce w kolejce (jak w submit_playlist), więc pamięć
+        i kolejka menedżera nie rosną z długością listy.
+
+        Returns:
+            int: Kod wyjścia (EXIT_OK, EXIT_FAILED, EXIT_USAGE, EXIT_INTERRUPTED)
+        """
+        output_lock = threading.Lock()
+        counts = {JOB_FINISHED: 0, 'failed': 0, JOB_CANCELLED: 0}
+
+        def emit(record, text=None):
+            with output_lock:
+                if json_output:
+                    print(json.dumps(record, default=str), flush=True)
+                elif text:
+                    print(text, flush=True)
+
+        def on_progress(job, event):
+            if json_output:
+                emit({'type': 'progress', 'job_id': job.id, 'url': job.url,
+                      **{key: event.get(key) for key in PROGRESS_FIELDS}})
+
+        def on_job_done(job):
+            status = job.status if job.status in (JOB_FINISHED, JOB_CANCELLED) else 'failed'
+            with output_lock:
+                counts[status] += 1
+            result = job.future.result() if status == JOB_FINISHED else None
+            record = {'type': 'result', 'job_id': job.id, 'url': job.url, 'status': status,
+                      'playlist_id': getattr(job, 'playlist_id', None), 'error': job.error, 'result': result}
+            if status == JOB_FINISHED:
+                emit(record, f"✅ {result.get('title', job.url)} → {result.get('full_path')}")
+            else:
+                emit(record, f"❌ {job.url}: {job.error}")
+
+        try:
+            options = parse_format_option(format_spec)
+        except ValueError as e:
+            emit({'type': 'error', 'error': str(e)}, f"❌ {e}")
+            return EXIT_USAGE
+
+        output_dir = os.path.expanduser(output_dir or self.download_directory)
+        if not os.path.isdir(output_dir):
+            emit({'type': 'error', 'error': f"Directory does not exist: {output_dir}"},
+                 f"❌ Katalog nie istnieje: {output_dir}")
+            return EXIT_USAGE
+        try:
+            stream = open_batch_source(source)
+        except OSError as e:
+            emit({'type': 'error', 'error': str(e)}, f"❌ {e}")
+            return EXIT_USAGE
+        if backend:
+            options['backend'] = backend
+        # Zadania wsadowe ustępują pobieraniom interaktywnym we wspólnym limicie przepustowości
+        options['priority'] = PRIORITY_BACKGROUND
+
+        # Bez wyjścia yt-dlp - równoległe paski postępu mieszałyby się ze sobą (i z NDJSON)
+        manager = manager or DownloadManager(max_workers=jobs,
+                                             downloader_factory=functools.partial(YouTubeDownloader, quiet=True))
+        manager.on_job_done = on_job_done
+        invalid = 0
+        duplicates = 0
+        read = 0
+        seen = set()
+        # Zadania i playlisty w locie - każde zajmuje miejsce w kolejce
+        slots = threading.Semaphore(manager.max_workers * 2)
+        active = set()
+        playlists = []
+
+        def release(handle):
+            with output_lock:
+                active.discard(handle)
+            slots.release()
+
+        def release_playlists():
+            # Rozwijanie playlisty nie ma callbacku zakończenia - sprawdzane przy oczekiwaniu
+            for handle in playlists:
+                if handle in active and handle.done():
+                    release(handle)
+
+        try:
+            for line, url in iter_batch_urls(stream):
+                read += 1
+                parsed = classify_youtube_url(url)
+                if parsed is None:
+                    invalid += 1
+                    emit({'type': 'error', 'line': line, 'url': url, 'error': t("Nieprawidłowy link YouTube")},
+                         f"❌ {t('Nieprawidłowy link YouTube')} ({line}): {url}")
+                    continue
+                # Ten sam film/playlista w innej postaci linku - pobierany raz
+                if parsed.canonical_url in seen:
+                    duplicates += 1
+                    continue
+                seen.add(parsed.canonical_url)
+                # Czekaj na wolne miejsce w kolejce (stała pamięć); krótki timeout - Ctrl+C działa od razu
+                while not slots.acquire(timeout=0.2):
+                    release_playlists()
+                playlist = parsed.kind != URL_VIDEO
+                if playlist:
+                    handle = manager.submit_playlist(url, output_dir, progress_callback=on_progress, **options)
+                    playlists.append(handle)
+                    with output_lock:
+                        active.add(handle)
+                else:
+                    handle = manager.submit(url, output_dir, progress_callback=on_progress, **options)
+                    with output_lock:
+                        active.add(handle)
+                    handle.future.add_done_callback(lambda f, handle=handle: release(handle))
+                emit({'type': 'job', 'job_id': handle.id, 'line': line, 'url': url,
+                      'playlist': playlist}, f"📥 [{line}] {url}")
+
+            # Oczekiwanie z krótkim timeoutem - Ctrl+C działa od razu
+            while True:
+                release_playlists()
+                with output_lock:
+                    if not active:
+                        break
+                time.sleep(0.2)
+            manager.shutdown(wait=True)
+        except KeyboardInterrupt:
+            emit({'type': 'interrupted'}, "\n🛑 Przerwano - anulowanie zadań...")
+            with output_lock:
+                cancelled = list(active)
+            for handle in cancelled:
+                handle.cancel()
+            manager.shutdown(wait=True, cancel=True)
+            return EXIT_INTERRUPTED
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+        if not read:
+            emit({'type': 'error', 'error': 'No URLs to download'}, "❌ Brak URL do pobrania")
+            return EXIT_USAGE
+
+        # Nieudane rozwinięcia playlist (np. nieistniejąca playlista)
+        expansion_errors = [handle for handle in playlists if handle.error]
+        for handle in expansion_errors:
+            emit({'type': 'error', 'url': handle.url, 'playlist_id': handle.id, 'error': handle.error},
+                 f"❌ {handle.url}: {handle.error}")
+
+        failed = counts['failed'] + counts[JOB_CANCELLED] + invalid + len(expansion_errors)
+        exit_code = EXIT_FAILED if failed else EXIT_OK
+        emit({'type': 'summary', 'finished': counts[JOB_FINISHED], 'failed': counts['failed'],
+              'cancelled': counts[JOB_CANCELLED], 'invalid': invalid, 'duplicates': duplicates,
+              'exit_code': exit_code},
+             f"📊 Pobrano: {counts[JOB_FINISHED]}, błędy: {failed}")
+        return exit_code
+
 def main():
     """Główna funkcja CLI"""
     if len(sys.argv) > 1 and sys.argv[1] in ['--help', '-h']:
@@ -17,27 +17,39 @@ Architecture: Dual-Repository Workflow v1.2.0
 
 import tkinter as tk
 from tkinter import filedialog, messagebox
-import customtkinter as ctk
 import threading
 import logging
-
-ctk.set_appearance_mode("dark")
-ctk.set_default_color_theme("blue")
 import os
 import json
 from core.downloader import YouTubeDownloader
+from core.bandwidth import PRIORITY_INTERACTIVE
+from core.formats import catalog_for
+from core.startup import lazy_import
 from version import __version__
-from core.utils import validate_youtube_url, extract_timestamps
+from core.utils import validate_youtube_url, extract_timestamps, format_progress
 from core.translations import t
 
+# customtkinter ładowany dopiero przy budowie okna
+ctk = lazy_import('customtkinter')
+
+
+def apply_theme():
+    """Motyw customtkinter - przed utworzeniem okna głównego"""
+    ctk.set_appearance_mode("dark")
+    ctk.set_default_color_theme("blue")
+
+
 class YouTubeDownloaderGUI:
     def __init__(self, root):
         """Inicjalizacja interfejsu graficznego"""
         self.root = root
-        self.downloader = YouTubeDownloader()
+        # Hedging klientów skraca czas odpowiedzi przycisku "Sprawdź"
+        self.downloader = YouTubeDownloader(hedge_delay=3.0)
         self.selected_directory = ""
         self.video_info = None
+        self.checked_url = None
         self.download_thread = None
+        self._downloading_label = t('Pobieranie...')
         
         # Konfiguracja pliku konfiguracyjnego (z fallback)
         self.config_file = self._get_config_path()
@@ -129,10 +141,21 @@ class YouTubeDownloaderGUI:
             logging.debug(f"Tworzenie katalogu: {config_dir}")
             os.makedirs(config_dir, exist_ok=True)
             
-            config = {'last_directory': directory}
+            # Zachowaj pozostałe klucze konfiguracji - zmieniany jest tylko ostatni katalog
+            config = {}
+            if os.path.exists(self.config_file):
+                try:
+                    with open(self.config_file, 'r') as f:
+                        loaded = json.load(f)
+                    config = loaded if isinstance(loaded, dict) else {}
+                except (OSError, ValueError) as e:
+                    logging.debug(f"Config load failed: {e}")
+            config['last_directory'] = directory
             logging.debug(f"Zapisywanie do: {self.config_file}")
-            with open(self.config_file, 'w') as f:
+            tmp_path = f"{self.config_file}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w') as f:
                 json.dump(config, f)
+            os.replace(tmp_path, self.config_file)
             logging.info(f"✅ Zapisano konfigurację: {self.config_file}")
         except Exception as e:
             logging.error(f"❌ Błąd zapisu konfiguracji: {e}")
@@ -198,6 +221,8 @@ class YouTubeDownloaderGUI:
                                       placeholder_text="https://youtube.com/watch?v=...")
         self.url_entry.grid(row=1, column=0, columnspan=2, sticky=(tk.W, tk.E),
                             padx=(12, 8), pady=(0, 10))
+        # Zmiana linku unieważnia wynik sprawdzenia
+        self.url_entry.bind("<KeyRelease>", self.on_url_change)
 
         self.check_button = ctk.CTkButton(url_frame, text=t("Sprawdź"),
                                           command=self.check_video)
@@ -373,6 +398,7 @@ class YouTubeDownloaderGUI:
         """Sprawdzenie filmu w osobnym wątku"""
         try:
             self.video_info = self.downloader.get_video_info(url)
+            self.checked_url = url
             self.root.after(0, self._update_video_info)
         except Exception as e:
             error_msg = f"{t('Błąd podczas sprawdzania')}: {e}"
@@ -390,26 +416,8 @@ class YouTubeDownloaderGUI:
             self.info_text.delete(1.0, tk.END)
             self.info_text.insert(1.0, info_text)
             
-            # Aktualizacja listy rozdzielczości z sortowaniem
-            formats = self.video_info.get('formats', [])
-            resolutions = [f.get('resolution', t('Nieznana')) for f in formats if f.get('resolution')]
-            
-            # Usunięcie duplikatów i sortowanie od najwyższej do najniższej
-            unique_resolutions = list(set(resolutions))
-            
-            # Funkcja do parsowania rozdzielczości
-            def parse_resolution(res):
-                if 'x' in res:
-                    try:
-                        return int(res.split('x')[1])  # Wyciągamy wysokość
-                    except (ValueError, IndexError):
-                        return 0
-                return 0
-            
-            # Sortowanie od najwyższej do najniższej rozdzielczości
-            sorted_resolutions = sorted(unique_resolutions, 
-                                     key=parse_resolution, 
-                                     reverse=True)
+            # Lista rozdzielczości z katalogu formatów (ten sam katalog wybiera format przy pobieraniu)
+            sorted_resolutions = catalog_for(self.video_info).resolutions()
             
             self.resolution_combo.configure(values=sorted_resolutions)
             if sorted_resolutions:
@@ -420,6 +428,14 @@ class YouTubeDownloaderGUI:
         else:
             self.show_error(t("Nie udało się pobrać informacji o filmie"))
             
+    def on_url_change(self, event=None):
+        """Zmiana linku po sprawdzeniu - informacje dotyczą innego filmu"""
+        if self.video_info and self.url_entry.get().strip() != self.checked_url:
+            self.video_info = None
+            self.checked_url = None
+            self.status_var.set(t("Najpierw sprawdź film"))
+            self.status_bar.configure(text_color='#f39c12')
+            
     def on_audio_change(self):
         """Obsługa zmiany opcji audio"""
         state = "disabled" if self.audio_only_var.get() else "normal"
@@ -443,7 +459,9 @@ class YouTubeDownloaderGUI:
             
     def start_download(self):
         """Rozpoczęcie pobierania"""
-        if not self.video_info:
+        url = self.url_entry.get().strip()
+        if not self.video_info or url != self.checked_url:
+            self.video_info = None
             self.show_error(t("Najpierw sprawdź film"))
             return
             
@@ -451,7 +469,6 @@ class YouTubeDownloaderGUI:
             self.show_error(t("Wybierz folder docelowy"))
             return
             
-        url = self.url_entry.get().strip()
         resolution = self.resolution_var.get()
         audio_only = self.audio_only_var.get()
         
@@ -475,12 +492,15 @@ class YouTubeDownloaderGUI:
             # Pobieranie filmu
             result = self.downloader.download_video(
                 url, self.selected_directory, resolution, audio_only,
-                progress_callback=self._update_progress
+                progress_callback=self._update_progress,
+                info=self.video_info,
+                priority=PRIORITY_INTERACTIVE
             )
             
             # Pobieranie timestampów
             if result and not audio_only:
-                timestamps = extract_timestamps(self.video_info.get('description', ''))
+                timestamps = extract_timestamps(self.video_info.get('description', ''),
+                                                self.video_info.get('chapters'))
                 if timestamps:
                     self.downloader.save_timestamps(timestamps, result['filename'])
                     
@@ -494,10 +514,15 @@ class YouTubeDownloaderGUI:
         finally:
             self.root.after(0, self._reset_ui)
             
-    def _update_progress(self, percentage):
-        """Aktualizacja postępu pobierania"""
-        self.root.after(0, lambda: self.progress.set(percentage / 100))
-        self.root.after(0, lambda: self.status_var.set(f"{t('Pobieranie...')} {percentage}%"))
+    def _update_progress(self, event):
+        """Aktualizacja postępu pobierania (zdarzenia z szyny postępu, maks. ~10/s)"""
+        self.root.after(0, self._apply_progress, event.get('percent'), format_progress(event))
+        
+    def _apply_progress(self, percent, text):
+        """Odświeżenie paska postępu w wątku Tk"""
+        if percent is not None:
+            self.progress.set(percent / 100)
+        self.status_var.set(f"{self._downloading_label} {text}")
         
     def _download_complete(self, result):
         """Zakończenie pobierania"""
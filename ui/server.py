@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+"""
+YouTube Downloader v1.3.0 - Headless Job Server
+
+Long-lived local HTTP daemon with a JSON API for download jobs.
+Part of the modular architecture introduced in v1.2.0.
+
+Features:
+- Submit, list, inspect and cancel download jobs over HTTP
+- Live progress stream per job (Server-Sent Events)
+- Warm state shared by all requests (metadata cache, client scoreboard,
+  toolchain probe, fragment and bandwidth controllers)
+- Binds to localhost by default; requests from web pages (foreign Host or
+  Origin header, non-JSON POST bodies) are rejected
+- Request bodies validated and capped (400 / 413)
+- Downloads confined to the configured output directory
+
+API:
+- GET    /health               Status serwera
+- GET    /stats                Statystyki klientów, fragmentów, przepustowości i połączeń
+- POST   /jobs                 {"url", "output_dir"?, "resolution"?, "audio_only"?, "backend"?, "priority"?, "weight"?}
+                               (Content-Type: application/json, output_dir w katalogu serwera)
+- GET    /jobs                 Lista zadań
+- GET    /jobs/<id>            Stan i wynik zadania
+- GET    /jobs/<id>/events     Strumień postępu (text/event-stream)
+- POST   /jobs/<id>/cancel     Anulowanie zadania (także DELETE /jobs/<id>)
+
+Architecture: Dual-Repository Workflow v1.2.0
+"""
+
+import functools
+import json
+import logging
+import os
+import queue
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+from core.backends import BACKENDS
+from core.bandwidth import PRIORITY_BACKGROUND, PRIORITY_INTERACTIVE, PRIORITY_NORMAL, get_bandwidth_scheduler
+from core.downloader import YouTubeDownloader
+from core.fragments import get_fragment_controller
+from core.manager import DownloadManager
+from core.scoreboard import get_client_scoreboard
+from core.session import get_http_session
+from core.utils import validate_youtube_url
+from core.translations import t
+from version import __version__
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# Opcje zadania przyjmowane przez POST /jobs
+JOB_OPTIONS = ('resolution', 'audio_only', 'backend', 'priority', 'weight')
+
+PRIORITIES = (PRIORITY_BACKGROUND, PRIORITY_NORMAL, PRIORITY_INTERACTIVE)
+
+# Nazwy hosta pętli zwrotnej akceptowane w nagłówkach Host i Origin
+LOCAL_HOSTS = frozenset({'127.0.0.1', 'localhost', '::1'})
+
+# Maksymalny rozmiar treści żądania POST /jobs
+MAX_BODY_SIZE = 64 * 1024
+
+# Odstęp między komentarzami podtrzymującymi połączenie SSE
+KEEPALIVE_INTERVAL = 15.0
+# Jak często strumień SSE sprawdza zakończenie zadania (także po błędzie bez zdarzeń)
+POLL_INTERVAL = 0.5
+
+
+class _JobRequestHandler(BaseHTTPRequestHandler):
+    """Obsługa żądań API (instancja na żądanie, stan w self.server.app)"""
+
+    server_version = f"YouTubeDownloader/{__version__}"
+
+    def log_message(self, format, *args):
+        logging.debug(f"🌐 {self.address_string()} {format % args}")
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload, default=str).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(self, status, message):
+        self._send_json(status, {'error': message})
+
+    def _content_length(self):
+        """Długość treści żądania lub None (błąd 400/413 już wysłany)"""
+        value = (self.headers.get('Content-Length') or '0').strip()
+        # Nieodczytana treść zostałaby w strumieniu - po błędzie połączenie jest zamykane
+        if not value.isdigit():
+            self.close_connection = True
+            self._send_error(400, "Invalid Content-Length")
+            return None
+        length = int(value)
+        if length > MAX_BODY_SIZE:
+            self.close_connection = True
+            self._send_error(413, f"Request body larger than {MAX_BODY_SIZE} bytes")
+            return None
+        return length
+
+    def _read_json(self, length):
+        if not length:
+            return {}
+        payload = json.loads(self.rfile.read(length).decode('utf-8'))
+        if not isinstance(payload, dict):
+            raise ValueError("JSON object expected")
+        return payload
+
+    def _hostname(self, value):
+        """Nazwa hosta z nagłówka Host ("127.0.0.1:8765", "[::1]:8765")"""
+        return (urlparse(f"//{value}").hostname or '') if value else ''
+
+    def _check_origin(self):
+        """
+        Odrzucenie żądań ze stron WWW (CSRF, DNS rebinding)
+
+        Host musi wskazywać adres serwera, a nagłówek Origin (wysyłany przez
+        przeglądarki) - ten sam host.
+        """
+        allowed = self.server.app.allowed_hosts
+        if self._hostname(self.headers.get('Host')) not in allowed:
+            self._send_error(403, "Forbidden host")
+            return False
+        origin = self.headers.get('Origin')
+        if origin is not None and (urlparse(origin).hostname or '') not in allowed:
+            self._send_error(403, "Forbidden origin")
+            return False
+        return True
+
+    def _route(self):
+        """Podział ścieżki na segmenty: /jobs/<id>/events -> ['jobs', '<id>', 'events']"""
+        return [part for part in urlparse(self.path).path.split('/') if part]
+
+    def do_GET(self):
+        if not self._check_origin():
+            return
+        app = self.server.app
+        parts = self._route()
+        if parts == ['health']:
+            self._send_json(200, app.health())
+        elif parts == ['stats']:
+            self._send_json(200, app.stats())
+        elif parts == ['jobs']:
+            self._send_json(200, {'jobs': [job.to_dict() for job in app.manager.list_jobs()]})
+        elif len(parts) in (2, 3) and parts[0] == 'jobs':
+            job = app.manager.get_job(parts[1])
+            if job is None:
+                self._send_error(404, t("Nie znaleziono zadania"))
+            elif len(parts) == 2:
+                self._send_json(200, job.to_dict())
+            elif parts[2] == 'events':
+                self._stream_events(job)
+            else:
+                self._send_error(404, "Not found")
+        else:
+            self._send_error(404, "Not found")
+
+    def do_POST(self):
+        if not self._check_origin():
+            return
+        app = self.server.app
+        parts = self._route()
+        if parts == ['jobs']:
+            # Formularze HTML nie mogą wysłać application/json bez zapytania preflight
+            if self.headers.get_content_type() != 'application/json':
+                self._send_error(415, "Content-Type: application/json required")
+                return
+            length = self._content_length()
+            if length is None:
+                return
+            try:
+                payload = self._read_json(length)
+            except (ValueError, UnicodeDecodeError) as e:
+                self._send_error(400, f"Invalid JSON: {e}")
+                return
+            try:
+                job = app.submit(payload)
+            except ValueError as e:
+                self._send_error(400, str(e))
+                return
+            self._send_json(202, job.to_dict())
+        elif len(parts) == 3 and parts[0] == 'jobs' and parts[2] == 'cancel':
+            self._cancel(parts[1])
+        else:
+            self._send_error(404, "Not found")
+
+    def do_DELETE(self):
+        if not self._check_origin():
+            return
+        parts = self._route()
+        if len(parts) == 2 and parts[0] == 'jobs':
+            self._cancel(parts[1])
+        else:
+            self._send_error(404, "Not found")
+
+    def _cancel(self, job_id):
+        if not self.server.app.manager.cancel(job_id):
+            self._send_error(404, t("Nie znaleziono zadania"))
+            return
+        self._send_json(202, self.server.app.manager.get_job(job_id).to_dict())
+
+    def _stream_events(self, job):
+        """Strumień zdarzeń postępu zadania (Server-Sent Events)"""
+        events = queue.Queue()
+        token = self.server.app.manager.progress_bus.subscribe(events.put, job.id)
+        try:
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/event-stream')
+            self.send_header('Cache-Control', 'no-cache')
+            self.send_header('Connection', 'close')
+            self.end_headers()
+            if job.progress:
+                self._write_event('progress', job.progress)
+            idle = 0.0
+            while not job.done():
+                try:
+                    self._write_event('progress', events.get(timeout=POLL_INTERVAL))
+                    idle = 0.0
+                except queue.Empty:
+                    idle += POLL_INTERVAL
+                    if idle >= KEEPALIVE_INTERVAL:
+                        self.wfile.write(b": keepalive\n\n")
+                        self.wfile.flush()
+                        idle = 0.0
+            # Zdarzenia dostarczone tuż przed zakończeniem
+            while not events.empty():
+                self._write_event('progress', events.get_nowait())
+            self._write_event('done', job.to_dict())
+        except (BrokenPipeError, ConnectionResetError):
+            logging.debug(f"SSE client for job {job.id} disconnected")
+        finally:
+            self.server.app.manager.progress_bus.unsubscribe(token)
+            self.close_connection = True
+
+    def _write_event(self, name, payload):
+        data = json.dumps(payload, default=str)
+        self.wfile.write(f"event: {name}\ndata: {data}\n\n".encode('utf-8'))
+        self.wfile.flush()
+
+
+class JobServer:
+    """
+    Serwer HTTP zadań pobierania.
+
+    Jeden DownloadManager (i współdzielone w procesie cache, tablica
+    wyników klientów oraz sondowanie narzędzi) obsługuje wszystkie
+    żądania - kolejne filmy nie płacą kosztu startu Pythona i yt-dlp.
+    """
+
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, output_dir=None, manager=None, max_workers=4):
+        """Inicjalizacja serwera (nasłuchiwanie zaczyna się w serve_forever)"""
+        self.output_dir = os.path.realpath(output_dir or os.path.expanduser("~/Downloads"))
+        self.manager = manager if manager is not None else DownloadManager(
+            max_workers=max_workers, downloader_factory=functools.partial(YouTubeDownloader, quiet=True))
+        self.httpd = ThreadingHTTPServer((host, port), _JobRequestHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.app = self
+        # Adres nasłuchiwania (np. adres w sieci lokalnej) też jest dozwolonym hostem
+        self.allowed_hosts = LOCAL_HOSTS | {host} if host not in ('', '0.0.0.0', '::') else LOCAL_HOSTS
+
+    @property
+    def address(self):
+        """Adres nasłuchiwania (host, port)"""
+        return self.httpd.server_address[:2]
+
+    def submit(self, payload):
+        """Utworzenie zadania z treści żądania POST /jobs"""
+        url = payload.get('url')
+        if not url or not validate_youtube_url(url):
+            raise ValueError(t("Nieprawidłowy link YouTube"))
+        output_dir = self._output_dir(payload.get('output_dir'))
+        options = {key: payload[key] for key in JOB_OPTIONS if payload.get(key) is not None}
+        self._validate_options(options)
+        options.setdefault('priority', PRIORITY_NORMAL)
+        return self.manager.submit(url, output_dir, **options)
+
+    def _output_dir(self, requested):
+        """Katalog docelowy zadania - tylko wewnątrz katalogu serwera"""
+        if not requested:
+            return self.output_dir
+        if not isinstance(requested, str):
+            raise ValueError("output_dir must be a string")
+        # Ścieżki względne liczone od katalogu serwera, dowiązania rozwiązane
+        output_dir = os.path.realpath(os.path.join(self.output_dir, os.path.expanduser(requested)))
+        if os.path.commonpath([output_dir, self.output_dir]) != self.output_dir:
+            raise ValueError(f"output_dir must be inside {self.output_dir}")
+        if not os.path.isdir(output_dir):
+            raise ValueError(f"{t('Katalog docelowy nie istnieje')}: {requested}")
+        return output_dir
+
+    @staticmethod
+    def _validate_options(options):
+        """Typy i wartości opcji zadania (błąd 400 zamiast awarii w wątku roboczym)"""
+        if not isinstance(options.get('resolution', ''), str):
+            raise ValueError("resolution must be a string")
+        if not isinstance(options.get('audio_only', False), bool):
+            raise ValueError("audio_only must be a boolean")
+        if options.get('backend', BACKENDS[0]) not in BACKENDS:
+            raise ValueError(f"backend must be one of: {', '.join(BACKENDS)}")
+        priority = options.get('priority', PRIORITY_NORMAL)
+        if isinstance(priority, bool) or priority not in PRIORITIES:
+            raise ValueError(f"priority must be one of: {', '.join(map(str, PRIORITIES))}")
+        weight = options.get('weight', 1.0)
+        if isinstance(weight, bool) or not isinstance(weight, (int, float)) or not 0 < weight < float('inf'):
+            raise ValueError("weight must be a positive number")
+
+    def health(self):
+        """Stan serwera: zadania pamiętane, aktywne i liczniki zakończonych"""
+        return {
+            'status': 'ok',
+            'version': __version__,
+            'jobs': len(self.manager.list_jobs()),
+            **self.manager.stats(),
+        }
+
+    def stats(self):
+        """Statystyki stanu współdzielonego między zadaniami"""
+        return {
+            'clients': get_client_scoreboard().stats(),
+            'fragments': get_fragment_controller().stats(),
+            'bandwidth': get_bandwidth_scheduler().stats(),
+            'connections': get_http_session().stats(),
+        }
+
+    def serve_forever(self):
+        """Obsługa żądań do czasu shutdown()"""
+        host, port = self.address
+        logging.info(f"🌐 Serwer zadań nasłuchuje na http://{host}:{port}")
+        try:
+            self.httpd.serve_forever()
+        finally:
+            self.httpd.server_close()
+
+    def start(self):
+        """Uruchomienie serwera w wątku w tle"""
+        thread = threading.Thread(target=self.serve_forever, daemon=True)
+        thread.start()
+        return self
+
+    def shutdown(self, cancel=True):
+        """Zatrzymanie serwera i managera (domyślnie z anulowaniem zadań)"""
+        self.httpd.shutdown()
+        self.manager.shutdown(wait=True, cancel=cancel)
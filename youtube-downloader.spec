@@ -21,6 +21,7 @@ a = Analysis(
         'core.translations',
         'ui.gui',
         'ui.cli',
+        'ui.server',
         'yt_dlp',
         'yt_dlp.extractor',
         'tkinter',